@@ -0,0 +1,95 @@
+"""Language Analyzer Benchmark
+
+Measures per-file analysis cost on large Python modules: one `analyze()` call
+(a single parse and AST walk) against separate `analyze_imports`,
+`analyze_exports` and `analyze_dependencies` calls, which parse the file once
+each. Pass file paths to benchmark real modules; without arguments synthetic
+modules of increasing size are generated.
+
+    python examples/analyzer_benchmark.py [--repeat N] [FILE ...]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analyzer.content_analyzer import PythonAnalyzer
+
+
+def synthetic_module(functions: int) -> str:
+    """A module with imports, __all__ and `functions` functions spread over classes."""
+    lines = [
+        "import os",
+        "import json",
+        "from typing import Any, Dict, List",
+        "from collections import defaultdict as dd",
+        "",
+        f"__all__ = [{', '.join(repr(f'func_{i}') for i in range(0, functions, 10))}]",
+        "",
+    ]
+    for i in range(functions):
+        if i % 25 == 0:
+            lines.append(f"class Service{i}:")
+            lines.append(f"    \"\"\"Service number {i}.\"\"\"")
+        lines.extend([
+            f"    def func_{i}(self, items: List[int]) -> Dict[str, Any]:",
+            "        import math",
+            "        result = dd(list)",
+            "        for item in items:",
+            f"            result[str(item % {i + 1})].append(math.sqrt(item))",
+            "        return json.loads(json.dumps(result))",
+            "",
+        ])
+    return "\n".join(lines) + "\n"
+
+
+def time_call(fn, repeat: int) -> float:
+    """Median wall time of fn() in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def benchmark(name: str, content: str, analyzer: PythonAnalyzer, repeat: int) -> None:
+    def separate():
+        analyzer.analyze_imports(content, name)
+        analyzer.analyze_exports(content)
+        analyzer.analyze_dependencies(content)
+
+    separate_ms = time_call(separate, repeat)
+    single_ms = time_call(lambda: analyzer.analyze(content, name), repeat)
+    lines = content.count("\n")
+    print(
+        f"{name:<40} {lines:>8} {separate_ms:>12.2f} {single_ms:>12.2f} "
+        f"{separate_ms / single_ms if single_ms else 0:>8.2f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="Python files to benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (median is reported)")
+    args = parser.parse_args()
+
+    analyzer = PythonAnalyzer()
+    print(f"{'file':<40} {'lines':>8} {'separate ms':>12} {'single ms':>12} {'speedup':>9}")
+
+    if args.files:
+        for file in args.files:
+            content = Path(file).read_text(encoding="utf-8", errors="replace")
+            benchmark(file, content, analyzer, args.repeat)
+    else:
+        for functions in (200, 1000, 5000):
+            benchmark(f"<synthetic {functions} functions>", synthetic_module(functions), analyzer, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
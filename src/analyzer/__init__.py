@@ -19,10 +19,12 @@ from .content_analyzer import (
     analyze_file_content,
     analyze_project_content,
 )
+from .analysis_cache import AnalysisCache
 
 from .relationship_detector import (
     RelationshipDetector,
     DependencyGraphBuilder,
+    ModuleIndex,
     CrossReferenceRecommender,
     RelationshipAnalyzer,
     FileRelationship,
@@ -32,6 +34,8 @@ from .relationship_detector import (
     get_crossref_recommendations,
 )
 
+from .incremental import IncrementalRelationshipIndex, IncrementalDependencyGraph
+
 from .pattern_detector import (
     PatternDetector,
     DetectedPattern,
@@ -56,15 +60,19 @@ __all__ = [
     "ImportInfo",
     "CrossReference",
     "ContentPattern",
+    "AnalysisCache",
     
     # Relationship analysis
     "RelationshipDetector",
     "DependencyGraphBuilder",
+    "ModuleIndex",
     "CrossReferenceRecommender",
     "RelationshipAnalyzer",
     "FileRelationship",
     "DependencyGraph",
     "CrossReferenceRecommendation",
+    "IncrementalRelationshipIndex",
+    "IncrementalDependencyGraph",
     
     # Pattern detection
     "PatternDetector",
@@ -86,7 +94,7 @@ class UniversalAnalyzer:
     """Universal content analyzer that orchestrates all analysis components."""
     
     def __init__(self):
-        self.content_analyzer = ContentAnalyzer()
+        self.content_analyzer = ContentAnalyzer(use_cache=True)
         self.relationship_analyzer = RelationshipAnalyzer()
         self.pattern_detector = PatternDetector()
         self.settings = get_settings()
@@ -167,8 +175,10 @@ class UniversalAnalyzer:
 class AnalysisPipeline:
     """Analysis pipeline for batch processing and incremental updates."""
     
-    def __init__(self):
-        self.analyzer = UniversalAnalyzer()
+    def __init__(self, analyzer: Optional[UniversalAnalyzer] = None):
+        self.analyzer = analyzer or UniversalAnalyzer()
+        self._indexes: Dict[int, IncrementalRelationshipIndex] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
     
     async def process_file_batch(
         self,
@@ -191,12 +201,71 @@ class AnalysisPipeline:
         project_id: int,
         changed_files: List[str],
     ) -> "AnalysisReport":
-        """Perform incremental analysis on changed files."""
+        """Perform incremental analysis on changed files.
+        
+        changed_files are project-relative paths that were added, modified or
+        deleted since the previous call. Only those files are re-analyzed and
+        only relationships touching them are recomputed; the first call for a
+        project (or the first after reset) analyzes the whole project.
+        """
         logger.info("Starting incremental analysis", project_id=project_id, changed_files=len(changed_files))
         
-        # For now, we'll do a full re-analysis
-        # In the future, this could be optimized to only re-analyze affected relationships
-        return await self.analyzer.analyze_project(project_id)
+        lock = self._locks.setdefault(project_id, asyncio.Lock())
+        async with lock:
+            index = self._indexes.get(project_id)
+            content_analyzer = self.analyzer.content_analyzer
+            
+            if index is None:
+                logger.info("No previous analysis state, analyzing full project", project_id=project_id)
+                changes = dict(await content_analyzer.analyze_project_files(project_id))
+                relationship_analyzer = self.analyzer.relationship_analyzer
+                index = IncrementalRelationshipIndex(
+                    relationship_analyzer.relationship_detector, relationship_analyzer.graph_builder
+                )
+            else:
+                changed_files = list(dict.fromkeys(changed_files))
+                fresh = await content_analyzer.analyze_project_files(project_id, relative_paths=changed_files)
+                # Files that no longer come back were deleted or are no longer analyzable
+                changes = {path: fresh.get(path) for path in changed_files}
+            
+            try:
+                index.apply(changes)
+            except Exception:
+                # Partially applied state cannot be trusted; rebuild next time
+                self._indexes.pop(project_id, None)
+                raise
+            self._indexes[project_id] = index
+            
+            return self._build_report(project_id, index)
+    
+    def _build_report(self, project_id: int, index: IncrementalRelationshipIndex) -> "AnalysisReport":
+        content_results = dict(index.results)
+        relationships = index.relationships
+        dependency_graph = index.graph.to_graph()
+        
+        # Pattern and recommendation passes are linear in the current results
+        # and relationships; no detection work is repeated
+        pattern_report = self.analyzer.pattern_detector.detect_all_patterns(content_results)
+        recommendations = self.analyzer.relationship_analyzer.recommender.generate_recommendations(
+            relationships, dependency_graph, content_results
+        )
+        
+        return AnalysisReport(
+            project_id=project_id,
+            content_results=content_results,
+            relationships=relationships,
+            dependency_graph=dependency_graph,
+            pattern_report=pattern_report,
+            recommendations=recommendations,
+            analysis_complete=True,
+        )
+    
+    def reset(self, project_id: Optional[int] = None) -> None:
+        """Drop incremental state (for one project or all), forcing a full analysis next time."""
+        if project_id is None:
+            self._indexes.clear()
+        else:
+            self._indexes.pop(project_id, None)
 
 
 class AnalysisReport:
@@ -0,0 +1,209 @@
+"""Persistent Analysis Cache
+
+Stores the content-derived part of an analysis (imports, exports,
+dependencies, content patterns) keyed by (content_hash, language,
+analyzer_version), so files whose content has not changed are never
+re-parsed. Entries live in a local SQLite file, are evicted least recently
+used first once the store exceeds its size budget, and carry the analyzer
+name so a version bump of one analyzer drops only that analyzer's entries.
+"""
+
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# (content_hash, language, analyzer_version)
+CacheKey = Tuple[str, str, str]
+
+
+class AnalysisCache:
+    """Size-bounded, LRU-evicted SQLite store of per-content analysis payloads."""
+
+    def __init__(self, db_path: Path, max_bytes: int = 256 * 1024 * 1024, low_water: float = 0.9):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                content_hash TEXT NOT NULL,
+                language TEXT NOT NULL,
+                analyzer_version TEXT NOT NULL,
+                analyzer TEXT NOT NULL,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (content_hash, language, analyzer_version)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_analysis_cache_lru ON analysis_cache (last_used)")
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analysis_cache_analyzer ON analysis_cache (analyzer, analyzer_version)"
+        )
+        self.conn.commit()
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["AnalysisCache"]:
+        """Build the cache configured in settings (None when disabled or unavailable)."""
+        if not settings.analysis_cache_enabled:
+            return None
+        path = (
+            Path(settings.analysis_cache_path).expanduser()
+            if settings.analysis_cache_path
+            else Path.home() / ".cache" / "universal-crossref" / "analysis_cache.db"
+        )
+        try:
+            return cls(path, max_bytes=settings.analysis_cache_max_mb * 1024 * 1024)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Analysis cache unavailable", path=str(path), error=str(e))
+            return None
+
+    def get_many(self, keys: Iterable[CacheKey], chunk_size: int = 300) -> Dict[CacheKey, Any]:
+        """Look up payloads; hits are marked recently used."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[CacheKey, Any] = {}
+        if not keys:
+            return found
+
+        with self.lock:
+            for start in range(0, len(keys), chunk_size):
+                chunk = keys[start:start + chunk_size]
+                clause = " OR ".join(["(content_hash = ? AND language = ? AND analyzer_version = ?)"] * len(chunk))
+                params = [value for key in chunk for value in key]
+                rows = self.conn.execute(
+                    f"SELECT content_hash, language, analyzer_version, payload FROM analysis_cache WHERE {clause}",
+                    params,
+                ).fetchall()
+                for content_hash, language, analyzer_version, payload in rows:
+                    try:
+                        found[(content_hash, language, analyzer_version)] = pickle.loads(payload)
+                    except Exception as e:
+                        logger.warning("Dropping unreadable analysis cache entry", error=str(e))
+
+            if found:
+                now = time.time()
+                self.conn.executemany(
+                    "UPDATE analysis_cache SET last_used = ? "
+                    "WHERE content_hash = ? AND language = ? AND analyzer_version = ?",
+                    [(now, *key) for key in found],
+                )
+                self.conn.commit()
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries: Iterable[Tuple[CacheKey, str, Any]]) -> None:
+        """Store (key, analyzer_name, payload) entries, then evict down to budget."""
+        now = time.time()
+        rows = []
+        for (content_hash, language, analyzer_version), analyzer, payload in entries:
+            blob = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((content_hash, language, analyzer_version, analyzer, blob, len(blob), now))
+        if not rows:
+            return
+
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO analysis_cache "
+                "(content_hash, language, analyzer_version, analyzer, payload, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.commit()
+            self._evict()
+
+    def _evict(self) -> None:
+        # Caller holds self.lock
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM analysis_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Drop least recently used entries until under the low-water mark
+        target = total - int(self.max_bytes * self.low_water)
+        freed = 0
+        victims = []
+        for key_parts in self.conn.execute(
+            "SELECT content_hash, language, analyzer_version, size FROM analysis_cache ORDER BY last_used"
+        ):
+            if freed >= target:
+                break
+            victims.append(key_parts[:3])
+            freed += key_parts[3]
+
+        self.conn.executemany(
+            "DELETE FROM analysis_cache WHERE content_hash = ? AND language = ? AND analyzer_version = ?",
+            victims,
+        )
+        self.conn.commit()
+        self.evictions += len(victims)
+        logger.info("Evicted analysis cache entries", entries=len(victims), bytes_freed=freed)
+
+    def invalidate_analyzer(self, analyzer: str, keep_version: Optional[str] = None) -> int:
+        """Drop an analyzer's entries (except those of keep_version)."""
+        with self.lock:
+            if keep_version is None:
+                cursor = self.conn.execute("DELETE FROM analysis_cache WHERE analyzer = ?", (analyzer,))
+            else:
+                cursor = self.conn.execute(
+                    "DELETE FROM analysis_cache WHERE analyzer = ? AND analyzer_version != ?",
+                    (analyzer, keep_version),
+                )
+            self.conn.commit()
+            return cursor.rowcount
+
+    def purge_stale_versions(self, current_versions: Dict[str, str]) -> int:
+        """Drop entries written by older versions of the given analyzers."""
+        removed = 0
+        for analyzer, version in current_versions.items():
+            removed += self.invalidate_analyzer(analyzer, keep_version=version)
+        if removed:
+            logger.info("Purged stale analysis cache entries", entries=removed)
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self.lock:
+            self.conn.execute("DELETE FROM analysis_cache")
+            self.conn.commit()
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry counts, size and hit statistics."""
+        with self.lock:
+            entries, total = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analysis_cache"
+            ).fetchone()
+            by_analyzer: List[Tuple[str, str, int]] = self.conn.execute(
+                "SELECT analyzer, analyzer_version, COUNT(*) FROM analysis_cache GROUP BY analyzer, analyzer_version"
+            ).fetchall()
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.db_path),
+            "entries": entries,
+            "size_bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "analyzers": {f"{name}:{version}": count for name, version, count in by_analyzer},
+        }
@@ -6,18 +6,30 @@ and relationships for comprehensive cross-reference generation.
 
 import re
 import ast
+import asyncio
 import json
+import multiprocessing
+import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple, Any, Union
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple, Any, Union
 
 import structlog
 from src.database.operations import file_repo, get_db_session
 from src.utils.config import get_settings
+from src.utils.workers import configure_worker_logging
+
+from .analysis_cache import AnalysisCache, CacheKey
 
 logger = structlog.get_logger(__name__)
 
+# Work item shipped to analysis processes: (path, relative_path, encoding, language).
+# Workers read the file themselves, so file contents never cross the process boundary.
+AnalysisWorkItem = Tuple[str, str, Optional[str], Optional[str]]
+
 
 @dataclass
 class ImportInfo:
@@ -60,45 +72,74 @@ class AnalysisResult:
     patterns: List[ContentPattern] = field(default_factory=list)
     dependencies: List[str] = field(default_factory=list)
     exports: List[str] = field(default_factory=list)
+    symbols: List[str] = field(default_factory=list)
     hub_file_candidates: List[str] = field(default_factory=list)
     language: Optional[str] = None
     encoding: Optional[str] = None
     analysis_timestamp: Optional[str] = None
 
 
+@dataclass
+class LanguageAnalysis:
+    """Everything a language analyzer extracts from one parse of a file."""
+    imports: List[ImportInfo] = field(default_factory=list)
+    exports: List[str] = field(default_factory=list)
+    dependencies: List[str] = field(default_factory=list)
+    symbols: List[str] = field(default_factory=list)  # Names defined in the file, public or not
+
+
 class LanguageAnalyzer(ABC):
     """Base class for language-specific analyzers."""
     
+    # Bump when output changes so cached analyses for this analyzer are discarded
+    version = "2"
+    
     @abstractmethod
+    def analyze(self, content: str, file_path: str = "") -> LanguageAnalysis:
+        """Parse content once and extract imports, exports, dependencies and symbols."""
+        pass
+    
     def analyze_imports(self, content: str, file_path: str) -> List[ImportInfo]:
         """Extract import information from content."""
-        pass
+        return self.analyze(content, file_path).imports
     
-    @abstractmethod
     def analyze_exports(self, content: str) -> List[str]:
         """Extract export information from content."""
-        pass
+        return self.analyze(content).exports
     
-    @abstractmethod
     def analyze_dependencies(self, content: str) -> List[str]:
         """Extract dependency information from content."""
-        pass
+        return self.analyze(content).dependencies
 
 
 class PythonAnalyzer(LanguageAnalyzer):
     """Analyzer for Python files."""
     
-    def analyze_imports(self, content: str, file_path: str) -> List[ImportInfo]:
-        """Extract Python imports."""
-        imports = []
+    # Match: import module [as alias]
+    IMPORT_PATTERN = re.compile(r'^\s*import\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s*(?:as\s+([a-zA-Z_][a-zA-Z0-9_]*))?\s*$')
+    
+    # Match: from module import name [as alias]
+    FROM_IMPORT_PATTERN = re.compile(r'^\s*from\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s+import\s+([a-zA-Z_*][a-zA-Z0-9_,\s*]*)\s*$')
+    
+    ALL_PATTERN = re.compile(r'__all__\s*=\s*\[(.*?)\]', re.DOTALL)
+    
+    def analyze(self, content: str, file_path: str = "") -> LanguageAnalysis:
+        """Extract imports, exports (__all__, public definitions) and symbols in one AST walk."""
+        analysis = LanguageAnalysis()
         
         try:
             tree = ast.parse(content)
-            
+        except SyntaxError:
+            # Fallback to regex parsing for files with syntax errors
+            analysis.imports = self._regex_parse_imports(content)
+            match = self.ALL_PATTERN.search(content)
+            if match:
+                analysis.exports = re.findall(r'["\']([^"\']+)["\']', match.group(1))
+        else:
             for node in ast.walk(tree):
                 if isinstance(node, ast.Import):
                     for alias in node.names:
-                        imports.append(ImportInfo(
+                        analysis.imports.append(ImportInfo(
                             module=alias.name,
                             alias=alias.asname,
                             line_number=node.lineno,
@@ -108,34 +149,41 @@ class PythonAnalyzer(LanguageAnalyzer):
                 elif isinstance(node, ast.ImportFrom):
                     if node.module:
                         for alias in node.names:
-                            imports.append(ImportInfo(
+                            analysis.imports.append(ImportInfo(
                                 module=f"{node.module}.{alias.name}" if alias.name != "*" else node.module,
                                 alias=alias.asname,
                                 is_relative=node.level > 0,
                                 line_number=node.lineno,
                                 import_type="from_import"
                             ))
+                
+                # Look for __all__ definition
+                elif isinstance(node, ast.Assign):
+                    for target in node.targets:
+                        if isinstance(target, ast.Name) and target.id == "__all__":
+                            if isinstance(node.value, (ast.List, ast.Tuple)):
+                                for elt in node.value.elts:
+                                    if isinstance(elt, ast.Constant) and isinstance(elt.value, str):
+                                        analysis.exports.append(elt.value)
+                
+                # Functions and classes; public ones are exports
+                elif isinstance(node, (ast.FunctionDef, ast.ClassDef, ast.AsyncFunctionDef)):
+                    analysis.symbols.append(node.name)
+                    if not node.name.startswith('_'):
+                        analysis.exports.append(node.name)
         
-        except SyntaxError:
-            # Fallback to regex parsing for files with syntax errors
-            imports.extend(self._regex_parse_imports(content))
-        
-        return imports
+        # Top-level package of every import
+        analysis.dependencies = sorted({imp.module.split('.')[0] for imp in analysis.imports})
+        return analysis
     
     def _regex_parse_imports(self, content: str) -> List[ImportInfo]:
         """Fallback regex-based import parsing."""
         imports = []
         lines = content.split('\n')
         
-        # Match: import module [as alias]
-        import_pattern = re.compile(r'^\s*import\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s*(?:as\s+([a-zA-Z_][a-zA-Z0-9_]*))?\s*$')
-        
-        # Match: from module import name [as alias]
-        from_import_pattern = re.compile(r'^\s*from\s+([a-zA-Z_][a-zA-Z0-9_.]*)\s+import\s+([a-zA-Z_*][a-zA-Z0-9_,\s*]*)\s*$')
-        
         for i, line in enumerate(lines, 1):
             # Simple import
-            match = import_pattern.match(line)
+            match = self.IMPORT_PATTERN.match(line)
             if match:
                 imports.append(ImportInfo(
                     module=match.group(1),
@@ -146,7 +194,7 @@ class PythonAnalyzer(LanguageAnalyzer):
                 continue
             
             # From import
-            match = from_import_pattern.match(line)
+            match = self.FROM_IMPORT_PATTERN.match(line)
             if match:
                 module = match.group(1)
                 names = match.group(2)
@@ -176,89 +224,56 @@ class PythonAnalyzer(LanguageAnalyzer):
                             ))
         
         return imports
-    
-    def analyze_exports(self, content: str) -> List[str]:
-        """Extract Python exports (__all__, class/function definitions)."""
-        exports = []
-        
-        try:
-            tree = ast.parse(content)
-            
-            # Look for __all__ definition
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Assign):
-                    for target in node.targets:
-                        if isinstance(target, ast.Name) and target.id == "__all__":
-                            if isinstance(node.value, (ast.List, ast.Tuple)):
-                                for elt in node.value.elts:
-                                    if isinstance(elt, ast.Str):
-                                        exports.append(elt.s)
-                                    elif isinstance(elt, ast.Constant) and isinstance(elt.value, str):
-                                        exports.append(elt.value)
-                
-                # Public functions and classes
-                elif isinstance(node, (ast.FunctionDef, ast.ClassDef, ast.AsyncFunctionDef)):
-                    if not node.name.startswith('_'):
-                        exports.append(node.name)
-        
-        except SyntaxError:
-            # Fallback to regex
-            all_pattern = re.compile(r'__all__\s*=\s*\[(.*?)\]', re.DOTALL)
-            match = all_pattern.search(content)
-            if match:
-                items = re.findall(r'["\']([^"\']+)["\']', match.group(1))
-                exports.extend(items)
-        
-        return exports
-    
-    def analyze_dependencies(self, content: str) -> List[str]:
-        """Extract dependencies from Python files."""
-        dependencies = set()
-        
-        # Extract from imports
-        for imp in self.analyze_imports(content, ""):
-            # Split module to get top-level package
-            top_level = imp.module.split('.')[0]
-            dependencies.add(top_level)
-        
-        return list(dependencies)
 
 
 class JavaScriptAnalyzer(LanguageAnalyzer):
     """Analyzer for JavaScript/TypeScript files."""
     
-    def analyze_imports(self, content: str, file_path: str) -> List[ImportInfo]:
-        """Extract JavaScript/TypeScript imports."""
-        imports = []
-        lines = content.split('\n')
-        
-        # ES6 import patterns
-        import_patterns = [
-            # import module from 'path'
-            re.compile(r'^\s*import\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s+from\s+["\']([^"\']+)["\']\s*;?\s*$'),
-            # import { named } from 'path' 
-            re.compile(r'^\s*import\s+\{\s*([^}]+)\s*\}\s+from\s+["\']([^"\']+)["\']\s*;?\s*$'),
-            # import * as alias from 'path'
-            re.compile(r'^\s*import\s+\*\s+as\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s+from\s+["\']([^"\']+)["\']\s*;?\s*$'),
-            # import 'path'
-            re.compile(r'^\s*import\s+["\']([^"\']+)["\']\s*;?\s*$'),
-        ]
-        
-        # CommonJS require patterns
-        require_patterns = [
-            # const module = require('path')
-            re.compile(r'^\s*(?:const|let|var)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*=\s*require\s*\(\s*["\']([^"\']+)["\']\s*\)\s*;?\s*$'),
-            # const { named } = require('path')
-            re.compile(r'^\s*(?:const|let|var)\s+\{\s*([^}]+)\s*\}\s*=\s*require\s*\(\s*["\']([^"\']+)["\']\s*\)\s*;?\s*$'),
-        ]
+    # ES6 import patterns
+    IMPORT_PATTERNS = [
+        # import module from 'path'
+        re.compile(r'^\s*import\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s+from\s+["\']([^"\']+)["\']\s*;?\s*$'),
+        # import { named } from 'path' 
+        re.compile(r'^\s*import\s+\{\s*([^}]+)\s*\}\s+from\s+["\']([^"\']+)["\']\s*;?\s*$'),
+        # import * as alias from 'path'
+        re.compile(r'^\s*import\s+\*\s+as\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s+from\s+["\']([^"\']+)["\']\s*;?\s*$'),
+        # import 'path'
+        re.compile(r'^\s*import\s+["\']([^"\']+)["\']\s*;?\s*$'),
+    ]
+    
+    # CommonJS require patterns
+    REQUIRE_PATTERNS = [
+        # const module = require('path')
+        re.compile(r'^\s*(?:const|let|var)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*=\s*require\s*\(\s*["\']([^"\']+)["\']\s*\)\s*;?\s*$'),
+        # const { named } = require('path')
+        re.compile(r'^\s*(?:const|let|var)\s+\{\s*([^}]+)\s*\}\s*=\s*require\s*\(\s*["\']([^"\']+)["\']\s*\)\s*;?\s*$'),
+    ]
+    
+    EXPORT_PATTERNS = [
+        # export default
+        re.compile(r'^\s*export\s+default\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*;?\s*$'),
+        # export function/class/const
+        re.compile(r'^\s*export\s+(?:function|class|const|let|var)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*'),
+        # export { named }
+        re.compile(r'^\s*export\s+\{\s*([^}]+)\s*\}\s*;?\s*$'),
+    ]
+    
+    # function/class declarations, exported or not
+    SYMBOL_PATTERN = re.compile(
+        r'^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?(?:function\s*\*?|class)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)'
+    )
+    
+    def analyze(self, content: str, file_path: str = "") -> LanguageAnalysis:
+        """Extract imports, exports and symbols in one pass over the lines."""
+        analysis = LanguageAnalysis()
         
-        for i, line in enumerate(lines, 1):
+        for i, line in enumerate(content.split('\n'), 1):
             # ES6 imports
-            for pattern in import_patterns:
+            for pattern in self.IMPORT_PATTERNS:
                 match = pattern.match(line)
                 if match:
                     if len(match.groups()) == 2:
-                        imports.append(ImportInfo(
+                        analysis.imports.append(ImportInfo(
                             module=match.group(2),
                             alias=match.group(1),
                             is_relative=match.group(2).startswith('.'),
@@ -266,7 +281,7 @@ class JavaScriptAnalyzer(LanguageAnalyzer):
                             import_type="es6_import"
                         ))
                     else:
-                        imports.append(ImportInfo(
+                        analysis.imports.append(ImportInfo(
                             module=match.group(1),
                             is_relative=match.group(1).startswith('.'),
                             line_number=i,
@@ -275,10 +290,10 @@ class JavaScriptAnalyzer(LanguageAnalyzer):
                     break
             
             # CommonJS requires
-            for pattern in require_patterns:
+            for pattern in self.REQUIRE_PATTERNS:
                 match = pattern.match(line)
                 if match:
-                    imports.append(ImportInfo(
+                    analysis.imports.append(ImportInfo(
                         module=match.group(2),
                         alias=match.group(1),
                         is_relative=match.group(2).startswith('.'),
@@ -286,29 +301,13 @@ class JavaScriptAnalyzer(LanguageAnalyzer):
                         import_type="commonjs_require"
                     ))
                     break
-        
-        return imports
-    
-    def analyze_exports(self, content: str) -> List[str]:
-        """Extract JavaScript/TypeScript exports."""
-        exports = []
-        lines = content.split('\n')
-        
-        export_patterns = [
-            # export default
-            re.compile(r'^\s*export\s+default\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*;?\s*$'),
-            # export function/class/const
-            re.compile(r'^\s*export\s+(?:function|class|const|let|var)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*'),
-            # export { named }
-            re.compile(r'^\s*export\s+\{\s*([^}]+)\s*\}\s*;?\s*$'),
-        ]
-        
-        for line in lines:
-            for pattern in export_patterns:
+            
+            # Exports
+            for pattern in self.EXPORT_PATTERNS:
                 match = pattern.match(line)
                 if match:
                     if 'export default' in line:
-                        exports.append('default')
+                        analysis.exports.append('default')
                     elif 'export {' in line:
                         # Parse named exports
                         names = match.group(1)
@@ -316,18 +315,17 @@ class JavaScriptAnalyzer(LanguageAnalyzer):
                             name = name.strip()
                             if ' as ' in name:
                                 name = name.split(' as ')[1].strip()
-                            exports.append(name)
+                            analysis.exports.append(name)
                     else:
-                        exports.append(match.group(1))
+                        analysis.exports.append(match.group(1))
                     break
+            
+            match = self.SYMBOL_PATTERN.match(line)
+            if match:
+                analysis.symbols.append(match.group(1))
         
-        return exports
-    
-    def analyze_dependencies(self, content: str) -> List[str]:
-        """Extract dependencies from JavaScript/TypeScript files."""
         dependencies = set()
-        
-        for imp in self.analyze_imports(content, ""):
+        for imp in analysis.imports:
             if not imp.is_relative:
                 # Extract package name (handle scoped packages)
                 module = imp.module
@@ -337,72 +335,62 @@ class JavaScriptAnalyzer(LanguageAnalyzer):
                         dependencies.add(f"{parts[0]}/{parts[1]}")
                 else:
                     dependencies.add(module.split('/')[0])
+        analysis.dependencies = sorted(dependencies)
         
-        return list(dependencies)
+        return analysis
 
 
 class MarkdownAnalyzer(LanguageAnalyzer):
     """Analyzer for Markdown files."""
     
-    def analyze_imports(self, content: str, file_path: str) -> List[ImportInfo]:
-        """Extract markdown links and includes."""
-        imports = []
-        lines = content.split('\n')
-        
-        # Link patterns
-        link_patterns = [
-            # [text](path)
-            re.compile(r'\[([^\]]+)\]\(([^)]+)\)'),
-            # [text]: path
-            re.compile(r'^\s*\[([^\]]+)\]:\s*(.+)$'),
-        ]
+    # Link patterns
+    LINK_PATTERNS = [
+        # [text](path)
+        re.compile(r'\[([^\]]+)\]\(([^)]+)\)'),
+        # [text]: path
+        re.compile(r'^\s*\[([^\]]+)\]:\s*(.+)$'),
+    ]
+    
+    HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$')
+    
+    def analyze(self, content: str, file_path: str = "") -> LanguageAnalysis:
+        """Extract links (imports), referenced files (dependencies) and headings (exports)."""
+        analysis = LanguageAnalysis()
         
-        for i, line in enumerate(lines, 1):
-            for pattern in link_patterns:
-                matches = pattern.findall(line)
-                for text, path in matches:
+        for i, line in enumerate(content.split('\n'), 1):
+            for pattern in self.LINK_PATTERNS:
+                for text, path in pattern.findall(line):
                     # Filter out external URLs
                     if not path.startswith(('http:', 'https:', 'mailto:')):
-                        imports.append(ImportInfo(
+                        analysis.imports.append(ImportInfo(
                             module=path,
                             alias=text,
                             is_relative=True,
                             line_number=i,
                             import_type="markdown_link"
                         ))
-        
-        return imports
-    
-    def analyze_exports(self, content: str) -> List[str]:
-        """Extract headings as exports."""
-        exports = []
-        lines = content.split('\n')
-        
-        heading_pattern = re.compile(r'^(#{1,6})\s+(.+)$')
-        
-        for line in lines:
-            match = heading_pattern.match(line)
+            
+            match = self.HEADING_PATTERN.match(line)
             if match:
-                exports.append(match.group(2).strip())
+                analysis.exports.append(match.group(2).strip())
         
-        return exports
-    
-    def analyze_dependencies(self, content: str) -> List[str]:
-        """Extract referenced files from markdown."""
         dependencies = set()
-        
-        for imp in self.analyze_imports(content, ""):
+        for imp in analysis.imports:
             # Clean the path
             path = imp.module.split('#')[0]  # Remove anchors
             if path and not path.startswith(('http:', 'https:')):
                 dependencies.add(path)
+        analysis.dependencies = sorted(dependencies)
         
-        return list(dependencies)
+        return analysis
 
 
 class CrossReferenceDetector:
     """Detects cross-reference patterns in content."""
     
+    # Bump when pattern output changes (invalidates every cached analysis)
+    version = "1"
+    
     def __init__(self):
         # Cross-reference header patterns from methodology
         self.crossref_patterns = [
@@ -449,6 +437,10 @@ class CrossReferenceDetector:
     
     def detect_hub_files(self, content: str, file_path: str) -> List[ContentPattern]:
         """Detect if file is a hub file (central documentation)."""
+        return self.detect_filename_hub(file_path) + self.detect_content_hub(content)
+    
+    def detect_filename_hub(self, file_path: str) -> List[ContentPattern]:
+        """Hub detection from the file name alone."""
         patterns = []
         
         # Check file name patterns
@@ -464,6 +456,12 @@ class CrossReferenceDetector:
                 metadata={"hub_type": "filename_based"}
             ))
         
+        return patterns
+    
+    def detect_content_hub(self, content: str) -> List[ContentPattern]:
+        """Hub detection from content indicators."""
+        patterns = []
+        
         # Check content patterns
         hub_indicators = [
             "mandatory reading",
@@ -487,10 +485,73 @@ class CrossReferenceDetector:
         return patterns
 
 
+def read_file_content(path: Path, encoding: Optional[str], relative_path: str) -> Tuple[Optional[str], Optional[str]]:
+    """Read a text file with its detected encoding, falling back to UTF-8 then Latin-1.
+    
+    Returns (content, encoding_used), or (None, None) if the file is gone or unreadable.
+    """
+    if not path.is_file():
+        return None, None
+    
+    candidates = [encoding or 'utf-8']
+    if candidates[0].lower() != 'utf-8':
+        candidates.append('utf-8')
+    candidates.append('latin-1')  # Rarely fails but might produce mojibake
+    
+    for candidate in candidates:
+        try:
+            content = path.read_text(encoding=candidate)
+        except (UnicodeDecodeError, LookupError) as e:
+            logger.warning(
+                "Encoding error while reading file",
+                file=relative_path,
+                encoding=candidate,
+                error=str(e),
+            )
+            continue
+        except OSError as e:
+            logger.error("Failed to read file", file=relative_path, error=str(e))
+            return None, None
+        
+        if candidate == 'latin-1' and candidates[0] != 'latin-1':
+            logger.warning("Read file with Latin-1 as last resort", file=relative_path)
+        return content, candidate
+    
+    logger.error("Failed to read file with any encoding", file=relative_path)
+    return None, None
+
+
+# Per-process analyzer used by pool workers (created on first use in each process)
+_worker_analyzer: Optional["ContentAnalyzer"] = None
+
+
+def _analyze_work_items(items: List[AnalysisWorkItem]) -> List[AnalysisResult]:
+    """Process-pool entry point: read and analyze a chunk of files."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = ContentAnalyzer(max_workers=1)
+    return _worker_analyzer.analyze_work_items(items)
+
+
 class ContentAnalyzer:
-    """Main content analysis engine."""
+    """Main content analysis engine.
     
-    def __init__(self):
+    Project analysis runs in a process pool: work items carry only paths and
+    metadata, workers read and analyze the files, and results stream back as
+    each chunk completes. Small jobs run in a worker thread instead, which
+    avoids pool start-up while still keeping the event loop free.
+    
+    With use_cache, files whose content hash is already in the analysis cache
+    skip reading and parsing entirely; only path-derived parts are rebuilt.
+    """
+    
+    # Below this many files a process pool costs more than it saves
+    PARALLEL_THRESHOLD = 64
+    
+    # Bump when the shape of _cache_payload changes (part of every cache key)
+    CACHE_PAYLOAD_VERSION = "2"
+    
+    def __init__(self, max_workers: Optional[int] = None, use_cache: bool = False):
         self.language_analyzers = {
             'python': PythonAnalyzer(),
             'javascript': JavaScriptAnalyzer(),
@@ -501,6 +562,14 @@ class ContentAnalyzer:
         self.crossref_detector = CrossReferenceDetector()
         self.settings = get_settings()
         
+        self.max_workers = max_workers or self.settings.analysis_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        
+        # Opened lazily so importing/constructing never touches the cache file
+        self.use_cache = use_cache
+        self._cache: Optional[AnalysisCache] = None
+        self._cache_checked = False
+        
     def analyze_file(self, file_path: str, content: str, language: Optional[str] = None) -> AnalysisResult:
         """Analyze a single file's content."""
         logger.debug("Analyzing file content", file=file_path, language=language)
@@ -515,21 +584,18 @@ class ContentAnalyzer:
             analyzer = self._get_analyzer(language)
             
             if analyzer:
-                # Extract imports and dependencies
-                result.imports = analyzer.analyze_imports(content, file_path)
-                result.exports = analyzer.analyze_exports(content)
-                result.dependencies = analyzer.analyze_dependencies(content)
+                # Extract imports, exports, dependencies and symbols in one parse
+                analysis = analyzer.analyze(content, file_path)
+                result.imports = analysis.imports
+                result.exports = analysis.exports
+                result.dependencies = analysis.dependencies
+                result.symbols = analysis.symbols
             
             # Detect cross-reference patterns
             result.patterns.extend(self.crossref_detector.detect_crossref_headers(content))
             result.patterns.extend(self.crossref_detector.detect_hub_files(content, file_path))
             
-            # Generate cross-references from imports
-            result.cross_references = self._generate_cross_references(result.imports, file_path)
-            
-            # Identify hub file candidates
-            if any(p.pattern_type == "hub_file" for p in result.patterns):
-                result.hub_file_candidates.append(file_path)
+            self._add_path_derived(result)
             
             logger.debug(
                 "File analysis complete",
@@ -545,6 +611,15 @@ class ContentAnalyzer:
         
         return result
     
+    def _add_path_derived(self, result: AnalysisResult) -> None:
+        """Fill the parts of a result that depend on the file path, not just content."""
+        # Generate cross-references from imports
+        result.cross_references = self._generate_cross_references(result.imports, result.file_path)
+        
+        # Identify hub file candidates
+        if any(p.pattern_type == "hub_file" for p in result.patterns):
+            result.hub_file_candidates.append(result.file_path)
+    
     def _get_analyzer(self, language: Optional[str]) -> Optional[LanguageAnalyzer]:
         """Get appropriate language analyzer."""
         if not language:
@@ -564,6 +639,73 @@ class ContentAnalyzer:
         mapped_language = language_mapping.get(language.lower(), language.lower())
         return self.language_analyzers.get(mapped_language)
     
+    # Analysis cache
+    
+    def _get_cache(self) -> Optional[AnalysisCache]:
+        if self.use_cache and self._cache is None and not self._cache_checked:
+            self._cache_checked = True
+            self._cache = AnalysisCache.from_settings(self.settings)
+            if self._cache is not None:
+                self._cache.purge_stale_versions(self.get_analyzer_versions())
+        return self._cache
+    
+    def _analyzer_identity(self, language: Optional[str]) -> Tuple[str, str]:
+        """(analyzer name, version string) that produced a language's cached output."""
+        analyzer = self._get_analyzer(language)
+        name = type(analyzer).__name__ if analyzer else "NoLanguageAnalyzer"
+        analyzer_version = analyzer.version if analyzer else "1"
+        return name, (
+            f"{name}:{analyzer_version}+crossref:{self.crossref_detector.version}"
+            f"+payload:{self.CACHE_PAYLOAD_VERSION}"
+        )
+    
+    def get_analyzer_versions(self) -> Dict[str, str]:
+        """Current version string of every analyzer that can populate the cache."""
+        versions = dict(self._analyzer_identity(language) for language in self.language_analyzers)
+        versions.update([self._analyzer_identity(None)])
+        return versions
+    
+    def _cache_key(self, content_hash: str, language: Optional[str]) -> Tuple[CacheKey, str]:
+        analyzer_name, analyzer_version = self._analyzer_identity(language)
+        return (content_hash, (language or "").lower(), analyzer_version), analyzer_name
+    
+    @staticmethod
+    def _cache_payload(result: AnalysisResult) -> Tuple[Any, ...]:
+        """The content-derived part of a result."""
+        content_patterns = [p for p in result.patterns if p.metadata.get("hub_type") != "filename_based"]
+        return (result.imports, result.exports, result.dependencies, result.symbols, content_patterns)
+    
+    def _result_from_cache(self, item: AnalysisWorkItem, payload: Tuple[Any, ...]) -> Optional[AnalysisResult]:
+        """Rebuild a full result from a cached payload plus the file's path.
+        
+        Returns None for a payload of unexpected shape, which is then
+        treated as a cache miss.
+        """
+        _, relative_path, encoding, language = item
+        try:
+            imports, exports, dependencies, symbols, content_patterns = payload
+            
+            # Same pattern order as analyze_file: headers, filename hub, content hub
+            result = AnalysisResult(
+                file_path=relative_path,
+                imports=imports,
+                exports=exports,
+                dependencies=dependencies,
+                symbols=symbols,
+                language=language,
+                encoding=encoding,
+            )
+            result.patterns = (
+                [p for p in content_patterns if p.pattern_type != "hub_file"]
+                + self.crossref_detector.detect_filename_hub(relative_path)
+                + [p for p in content_patterns if p.pattern_type == "hub_file"]
+            )
+        except (TypeError, ValueError, AttributeError) as e:
+            logger.warning("Ignoring malformed analysis cache entry", file_path=relative_path, error=str(e))
+            return None
+        self._add_path_derived(result)
+        return result
+    
     def _generate_cross_references(self, imports: List[ImportInfo], source_file: str) -> List[CrossReference]:
         """Generate cross-references from import information."""
         cross_refs = []
@@ -592,8 +734,165 @@ class ContentAnalyzer:
         
         return cross_refs
     
-    async def analyze_project_files(self, project_id: int) -> Dict[str, AnalysisResult]:
-        """Analyze all files in a project."""
+    def analyze_work_item(self, item: AnalysisWorkItem) -> Optional[AnalysisResult]:
+        """Read and analyze one file; None if it could not be read."""
+        path, relative_path, encoding, language = item
+        content, resolved_encoding = read_file_content(Path(path), encoding, relative_path)
+        if content is None:
+            logger.warning("Skipping file due to read error", file=relative_path)
+            return None
+        
+        result = self.analyze_file(relative_path, content, language)
+        # Record the encoding that worked
+        result.encoding = resolved_encoding
+        return result
+    
+    def analyze_work_items(self, items: List[AnalysisWorkItem]) -> List[AnalysisResult]:
+        """Analyze a chunk of work items in the current process."""
+        results = []
+        for item in items:
+            try:
+                result = self.analyze_work_item(item)
+            except Exception as e:
+                logger.error("Error analyzing file", file=item[1], error=str(e))
+                continue
+            if result is not None:
+                results.append(result)
+        return results
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Lazily start the analysis process pool."""
+        if self._executor is None:
+            # spawn: forking a process that runs an event loop and watcher threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=configure_worker_logging,
+            )
+            logger.info("Started content analysis process pool", workers=self.max_workers)
+        return self._executor
+    
+    def shutdown(self) -> None:
+        """Stop the analysis process pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    async def iter_analysis_results(
+        self,
+        items: Iterable[AnalysisWorkItem],
+        chunk_size: Optional[int] = None,
+    ) -> AsyncIterator[AnalysisResult]:
+        """Analyze files in parallel, yielding results as they complete (in no particular order)."""
+        items = list(items)
+        if not items:
+            return
+        
+        if self.max_workers <= 1 or len(items) < self.PARALLEL_THRESHOLD:
+            chunk_size = chunk_size or self.PARALLEL_THRESHOLD
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start:start + chunk_size]
+                for result in await asyncio.to_thread(self.analyze_work_items, chunk):
+                    yield result
+            return
+        
+        # Several chunks per worker keeps all cores busy to the end while
+        # amortising per-task IPC
+        chunk_size = chunk_size or max(1, min(64, len(items) // (self.max_workers * 4)))
+        chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+        
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        pending = {
+            loop.run_in_executor(executor, _analyze_work_items, chunk): chunk
+            for chunk in chunks
+        }
+        
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    chunk = pending.pop(future)
+                    try:
+                        results = future.result()
+                    except BrokenProcessPool as e:
+                        logger.warning("Analysis worker died, analyzing chunk in-process", error=str(e))
+                        self._executor = None
+                        results = await asyncio.to_thread(self.analyze_work_items, chunk)
+                    for result in results:
+                        yield result
+        finally:
+            for future in pending:
+                future.cancel()
+    
+    async def analyze_files(
+        self,
+        items: List[AnalysisWorkItem],
+        content_hashes: Optional[Dict[str, Optional[str]]] = None,
+    ) -> Dict[str, AnalysisResult]:
+        """Analyze work items, reusing cached analyses for known content hashes.
+        
+        content_hashes maps relative paths to content hashes; files without a
+        hash are always analyzed. Results keep the order of items.
+        """
+        results: Dict[str, AnalysisResult] = {}
+        cache = self._get_cache() if content_hashes else None
+        keys: Dict[str, Tuple[CacheKey, str]] = {}
+        pending = items
+        
+        if cache is not None:
+            for item in items:
+                content_hash = content_hashes.get(item[1])
+                if content_hash:
+                    keys[item[1]] = self._cache_key(content_hash, item[3])
+            cached = await asyncio.to_thread(cache.get_many, [key for key, _ in keys.values()])
+            
+            pending = []
+            for item in items:
+                entry = keys.get(item[1])
+                payload = cached.get(entry[0]) if entry else None
+                result = self._result_from_cache(item, payload) if payload is not None else None
+                if result is not None:
+                    results[item[1]] = result
+                else:
+                    pending.append(item)
+            
+            logger.info("Analysis cache lookup", cached=len(results), to_analyze=len(pending))
+        
+        total_files = len(items)
+        new_entries = []
+        async for result in self.iter_analysis_results(pending):
+            results[result.file_path] = result
+            
+            entry = keys.get(result.file_path)
+            if entry is not None:
+                new_entries.append((entry[0], entry[1], self._cache_payload(result)))
+            
+            # Log progress
+            processed = len(results)
+            if processed % 100 == 0 or processed == total_files:
+                logger.info(
+                    "Analysis progress",
+                    processed=processed,
+                    total=total_files,
+                    percent=round((processed / total_files) * 100, 1)
+                )
+        
+        if cache is not None and new_entries:
+            await asyncio.to_thread(cache.put_many, new_entries)
+        
+        # Results arrive in completion order; keep the stable file order callers expect
+        return {item[1]: results[item[1]] for item in items if item[1] in results}
+    
+    async def analyze_project_files(
+        self,
+        project_id: int,
+        relative_paths: Optional[List[str]] = None,
+    ) -> Dict[str, AnalysisResult]:
+        """Analyze all files in a project, or only the given relative paths.
+        
+        Paths that are missing, deleted or not text files are left out of the result.
+        """
         logger.info("Starting project content analysis", project_id=project_id)
         
         results = {}
@@ -601,94 +900,24 @@ class ContentAnalyzer:
         try:
             async with get_db_session() as session:
                 # Get all text files from the project
-                files = await file_repo.get_text_files_by_project(session, project_id)
-                
-                total_files = len(files)
-                logger.info("Analyzing project files", project_id=project_id, file_count=total_files)
-                
-                for i, file_record in enumerate(files, 1):
-                    content = None
-                    resolved_encoding = file_record.encoding
-                    try:
-                        # Read file content
-                        file_path = Path(file_record.path)
-                        if file_path.exists() and file_path.is_file():
-                            try:
-                                content = file_path.read_text(encoding=resolved_encoding or 'utf-8')
-                            except UnicodeDecodeError as ude:
-                                logger.warning(
-                                    "Encoding error with detected encoding", 
-                                    file=file_record.relative_path, 
-                                    detected_encoding=resolved_encoding,
-                                    error=str(ude)
-                                )
-                                # If detected encoding failed and it wasn't utf-8, try utf-8
-                                if resolved_encoding and resolved_encoding.lower() != 'utf-8':
-                                    logger.info("Retrying with UTF-8 encoding", file=file_record.relative_path)
-                                    try:
-                                        content = file_path.read_text(encoding='utf-8')
-                                        resolved_encoding = 'utf-8'
-                                    except UnicodeDecodeError as ude_utf8:
-                                        logger.error(
-                                            "Encoding error even with UTF-8", 
-                                            file=file_record.relative_path, 
-                                            error=str(ude_utf8)
-                                        )
-                                        # As a last resort, try 'latin-1' which rarely fails but might produce mojibake
-                                        try:
-                                            content = file_path.read_text(encoding='latin-1')
-                                            resolved_encoding = 'latin-1'
-                                            logger.warning("Read file with Latin-1 as last resort", file=file_record.relative_path)
-                                        except Exception as e_latin1:
-                                            logger.error("Failed to read file with any encoding", file=file_record.relative_path, error=str(e_latin1))
-                                            continue # Skip this file
-                                else:
-                                    # If detected was already utf-8 or None, and it failed, try latin-1
-                                    logger.info("Retrying with Latin-1 encoding", file=file_record.relative_path)
-                                    try:
-                                        content = file_path.read_text(encoding='latin-1')
-                                        resolved_encoding = 'latin-1'
-                                        logger.warning("Read file with Latin-1 as last resort", file=file_record.relative_path)
-                                    except Exception as e_latin1:
-                                        logger.error("Failed to read file with any encoding", file=file_record.relative_path, error=str(e_latin1))
-                                        continue # Skip this file
-
-                            if content is not None:
-                                # Analyze content
-                                result = self.analyze_file(
-                                    file_record.relative_path,
-                                    content,
-                                    file_record.language
-                                )
-                                # Update AnalysisResult with the encoding that worked
-                                result.encoding = resolved_encoding 
-                                results[file_record.relative_path] = result
-                            else:
-                                logger.warning("Skipping file due to read error", file=file_record.relative_path)
-                        
-                        # Log progress
-                        if i % 100 == 0 or i == total_files:
-                            logger.info(
-                                "Analysis progress",
-                                project_id=project_id,
-                                processed=i,
-                                total=total_files,
-                                percent=round((i / total_files) * 100, 1)
-                            )
-                    
-                    except Exception as e:
-                        logger.error(
-                            "Error analyzing file",
-                            project_id=project_id,
-                            file=file_record.relative_path,
-                            error=str(e)
-                        )
-                
-                logger.info(
-                    "Project content analysis complete",
-                    project_id=project_id,
-                    analyzed_files=len(results)
+                files = await file_repo.get_text_files_by_project(
+                    session, project_id, relative_paths=relative_paths
                 )
+                items = [
+                    (file_record.path, file_record.relative_path, file_record.encoding, file_record.language)
+                    for file_record in files
+                ]
+                content_hashes = {file_record.relative_path: file_record.content_hash for file_record in files}
+            
+            logger.info("Analyzing project files", project_id=project_id, file_count=len(items))
+            
+            results = await self.analyze_files(items, content_hashes)
+            
+            logger.info(
+                "Project content analysis complete",
+                project_id=project_id,
+                analyzed_files=len(results)
+            )
         
         except Exception as e:
             logger.error("Project analysis failed", project_id=project_id, error=str(e))
@@ -708,4 +937,7 @@ async def analyze_file_content(file_path: str, content: str, language: Optional[
 async def analyze_project_content(project_id: int) -> Dict[str, AnalysisResult]:
     """Analyze all files in a project."""
     analyzer = ContentAnalyzer()
-    return await analyzer.analyze_project_files(project_id) 
\ No newline at end of file
+    try:
+        return await analyzer.analyze_project_files(project_id)
+    finally:
+        analyzer.shutdown() 
\ No newline at end of file
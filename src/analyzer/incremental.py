@@ -0,0 +1,577 @@
+"""Incremental Relationship Analysis
+
+Keeps the relationship state of an analyzed project so that a set of changed
+files can be folded in without re-running detection over the whole project.
+Raw relationships are stored per detector and per owner (the source file, or
+the file pair for similarity detectors), next to reverse indexes from import
+targets, dependencies and exports back to files. On a change only the
+relationships with an endpoint in a changed file are recomputed, plus the
+import relationships whose resolution flips because a file appeared or
+disappeared. The dependency graph metrics (hubs, depth map, clusters, cycles)
+are then repaired around the edges that actually changed.
+"""
+
+import heapq
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import structlog
+
+from .content_analyzer import AnalysisResult
+from .relationship_detector import (
+    DependencyGraph,
+    DependencyGraphBuilder,
+    FileRelationship,
+    ModuleIndex,
+    RelationshipDetector,
+)
+
+logger = structlog.get_logger(__name__)
+
+RelationshipKey = Tuple[str, str]
+
+# Detector phases in the order RelationshipDetector.detect_relationships runs
+# them, so merged relationships come out the same as a full detection
+SOURCE_PHASES = ("import", "hub_link", "explicit_crossref")
+PAIR_PHASES = ("semantic_similarity", "shared_dependencies")
+PHASES = ("import", "hub_link", "semantic_similarity", "shared_dependencies", "explicit_crossref")
+
+
+class _ComponentIndex:
+    """Undirected connected components, recomputed only where edges change."""
+
+    def __init__(self):
+        self.adj: Dict[str, Counter] = defaultdict(Counter)
+        self.component_of: Dict[str, int] = {}
+        self.components: Dict[int, Set[str]] = {}
+        self._next_id = 0
+
+    def add_edge(self, source: str, target: str) -> None:
+        self.adj[source][target] += 1
+        if source != target:
+            self.adj[target][source] += 1
+
+    def remove_edge(self, source: str, target: str) -> None:
+        for a, b in ((source, target), (target, source)):
+            neighbors = self.adj.get(a)
+            if neighbors is None:
+                continue
+            neighbors[b] -= 1
+            if neighbors[b] <= 0:
+                del neighbors[b]
+            if not neighbors:
+                del self.adj[a]
+            if source == target:
+                break
+
+    def rebuild(self, touched: Iterable[str]) -> Tuple[Set[int], List[int]]:
+        """Recompute the components around touched nodes.
+
+        Returns the ids of the components that were replaced and of the ones
+        that replaced them.
+        """
+        removed: Set[int] = set()
+        seeds: Set[str] = set()
+
+        def drop(component_id: int) -> None:
+            removed.add(component_id)
+            for node in self.components.pop(component_id):
+                self.component_of.pop(node, None)
+                seeds.add(node)
+
+        for node in touched:
+            seeds.add(node)
+            component_id = self.component_of.get(node)
+            if component_id in self.components:
+                drop(component_id)
+
+        created = []
+        assigned: Set[str] = set()
+        for seed in list(seeds):
+            if seed in assigned or seed not in self.adj:
+                continue
+
+            component = set()
+            stack = [seed]
+            while stack:
+                node = stack.pop()
+                if node in component:
+                    continue
+                component.add(node)
+                # A new edge can join an untouched component into this one
+                other = self.component_of.get(node)
+                if other in self.components:
+                    drop(other)
+                stack.extend(n for n in self.adj[node] if n not in component)
+
+            component_id = self._next_id
+            self._next_id += 1
+            self.components[component_id] = component
+            for node in component:
+                self.component_of[node] = component_id
+            assigned |= component
+            created.append(component_id)
+
+        return removed, created
+
+
+class IncrementalDependencyGraph:
+    """Dependency graph maintained under edge insertions and removals.
+
+    Produces the same hubs, depth map and clusters as
+    DependencyGraphBuilder.build_graph over the same relationships; cycles are
+    searched only in the import/cross-reference components that changed.
+    """
+
+    def __init__(self, graph_builder: DependencyGraphBuilder):
+        self.graph_builder = graph_builder
+
+        self.edges: Dict[RelationshipKey, FileRelationship] = {}
+        self.node_refs: Counter = Counter()
+        self.in_degree: Counter = Counter()
+        self.hub_files: Set[str] = set()
+        self._hub_eligible: Set[str] = set()  # In-degree of at least 3
+
+        # Depth adjacency (bidirectional relationships count both ways)
+        self.out_edges: Dict[str, Counter] = defaultdict(Counter)
+        self.in_edges: Dict[str, Counter] = defaultdict(Counter)
+        self.depth_map: Dict[str, int] = {}
+
+        self.strong = _ComponentIndex()
+        self.cycle_graph = _ComponentIndex()
+        self.cycle_out: Dict[str, Counter] = defaultdict(Counter)
+        self.cycles_by_component: Dict[int, List[List[str]]] = {}
+
+    def apply(self, removed: List[FileRelationship], added: List[FileRelationship]) -> None:
+        """Fold a batch of edge changes into the graph metrics."""
+        depth_removed: Set[str] = set()
+        depth_added: List[Tuple[str, str]] = []
+        strong_touched: Set[str] = set()
+        cycle_touched: Set[str] = set()
+
+        for rel in removed:
+            self._remove_edge(rel, depth_removed, strong_touched, cycle_touched)
+        for rel in added:
+            self._add_edge(rel, depth_added, strong_touched, cycle_touched)
+
+        old_hubs = self.hub_files
+        self.hub_files = self._compute_hubs()
+
+        self._update_depths(depth_removed, depth_added, old_hubs)
+        self.strong.rebuild(strong_touched)
+        self._update_cycles(cycle_touched)
+
+    def _depth_pairs(self, rel: FileRelationship) -> List[Tuple[str, str]]:
+        pairs = [(rel.source_file, rel.target_file)]
+        if rel.bidirectional:
+            pairs.append((rel.target_file, rel.source_file))
+        return pairs
+
+    def _add_edge(self, rel, depth_added, strong_touched, cycle_touched) -> None:
+        self.edges[(rel.source_file, rel.target_file)] = rel
+        self.node_refs[rel.source_file] += 1
+        self.node_refs[rel.target_file] += 1
+        self._change_in_degree(rel.target_file, 1)
+
+        for source, target in self._depth_pairs(rel):
+            self.out_edges[source][target] += 1
+            self.in_edges[target][source] += 1
+            depth_added.append((source, target))
+
+        if self.graph_builder._is_cluster_edge(rel):
+            self.strong.add_edge(rel.source_file, rel.target_file)
+            strong_touched.update((rel.source_file, rel.target_file))
+
+        if self.graph_builder._is_cycle_edge(rel):
+            self.cycle_graph.add_edge(rel.source_file, rel.target_file)
+            self.cycle_out[rel.source_file][rel.target_file] += 1
+            cycle_touched.update((rel.source_file, rel.target_file))
+
+    def _remove_edge(self, rel, depth_removed, strong_touched, cycle_touched) -> None:
+        del self.edges[(rel.source_file, rel.target_file)]
+        for node in (rel.source_file, rel.target_file):
+            self.node_refs[node] -= 1
+            if self.node_refs[node] <= 0:
+                del self.node_refs[node]
+        self._change_in_degree(rel.target_file, -1)
+
+        for source, target in self._depth_pairs(rel):
+            self._decrement(self.out_edges, source, target)
+            self._decrement(self.in_edges, target, source)
+            depth_removed.add(target)
+
+        if self.graph_builder._is_cluster_edge(rel):
+            self.strong.remove_edge(rel.source_file, rel.target_file)
+            strong_touched.update((rel.source_file, rel.target_file))
+
+        if self.graph_builder._is_cycle_edge(rel):
+            self.cycle_graph.remove_edge(rel.source_file, rel.target_file)
+            self._decrement(self.cycle_out, rel.source_file, rel.target_file)
+            cycle_touched.update((rel.source_file, rel.target_file))
+
+    @staticmethod
+    def _decrement(adjacency: Dict[str, Counter], a: str, b: str) -> None:
+        neighbors = adjacency[a]
+        neighbors[b] -= 1
+        if neighbors[b] <= 0:
+            del neighbors[b]
+        if not neighbors:
+            del adjacency[a]
+
+    def _change_in_degree(self, node: str, delta: int) -> None:
+        self.in_degree[node] += delta
+        degree = self.in_degree[node]
+        if degree <= 0:
+            del self.in_degree[node]
+        if degree >= 3:
+            self._hub_eligible.add(node)
+        else:
+            self._hub_eligible.discard(node)
+
+    def _compute_hubs(self) -> Set[str]:
+        if not self.in_degree:
+            return set()
+        threshold = self.graph_builder._hub_threshold(len(self.edges), len(self.in_degree))
+        return {node for node in self._hub_eligible if self.in_degree[node] >= threshold}
+
+    def _update_depths(
+        self,
+        removed_targets: Set[str],
+        added_edges: List[Tuple[str, str]],
+        old_hubs: Set[str],
+    ) -> None:
+        """Repair the multi-source BFS distances from hub files."""
+        depth_map = self.depth_map
+        hubs = self.hub_files
+
+        # 1. Drop distances that lost every shortest-path parent, in depth
+        #    order so parents are settled before their children are checked
+        heap = [
+            (depth_map[node], node)
+            for node in removed_targets | (old_hubs - hubs)
+            if node in depth_map
+        ]
+        heapq.heapify(heap)
+        invalid = set()
+        while heap:
+            depth, node = heapq.heappop(heap)
+            if node in invalid or depth_map.get(node) != depth or node in hubs:
+                continue
+            if depth > 0 and any(
+                depth_map.get(parent) == depth - 1 for parent in self.in_edges.get(node, ())
+            ):
+                continue
+            invalid.add(node)
+            del depth_map[node]
+            for child in self.out_edges.get(node, ()):
+                if depth_map.get(child) == depth + 1:
+                    heapq.heappush(heap, (depth + 1, child))
+
+        # 2. Propagate from new hubs, new edges and the boundary of dropped nodes
+        heap = [(0, hub) for hub in hubs if depth_map.get(hub) != 0]
+        for node in invalid:
+            parents = [depth_map[p] for p in self.in_edges.get(node, ()) if p in depth_map]
+            if parents:
+                heap.append((min(parents) + 1, node))
+        for source, target in added_edges:
+            if source in depth_map and depth_map[source] + 1 < depth_map.get(target, float("inf")):
+                heap.append((depth_map[source] + 1, target))
+        heapq.heapify(heap)
+
+        while heap:
+            depth, node = heapq.heappop(heap)
+            if depth_map.get(node, float("inf")) <= depth:
+                continue
+            depth_map[node] = depth
+            for child in self.out_edges.get(node, ()):
+                if depth + 1 < depth_map.get(child, float("inf")):
+                    heapq.heappush(heap, (depth + 1, child))
+
+    def _update_cycles(self, touched: Set[str]) -> None:
+        removed, created = self.cycle_graph.rebuild(touched)
+        for component_id in removed:
+            self.cycles_by_component.pop(component_id, None)
+        for component_id in created:
+            nodes = sorted(self.cycle_graph.components[component_id])
+            adj = {node: list(self.cycle_out.get(node, ())) for node in nodes}
+            cycles = self.graph_builder._find_cycles(adj, nodes)
+            if cycles:
+                self.cycles_by_component[component_id] = cycles
+
+    def to_graph(self) -> DependencyGraph:
+        """Snapshot as a DependencyGraph."""
+        return DependencyGraph(
+            nodes=set(self.node_refs),
+            edges=list(self.edges.values()),
+            hub_files=sorted(self.hub_files),
+            cycles=[cycle for cycles in self.cycles_by_component.values() for cycle in cycles],
+            depth_map=dict(self.depth_map),
+            clusters=[
+                list(component) for component in self.strong.components.values()
+                if len(component) > 1  # Only meaningful clusters
+            ],
+        )
+
+
+class IncrementalRelationshipIndex:
+    """Relationship state of one project, updated per changed file."""
+
+    def __init__(self, detector: RelationshipDetector, graph_builder: DependencyGraphBuilder):
+        self.detector = detector
+        self.graph = IncrementalDependencyGraph(graph_builder)
+
+        self.results: Dict[str, AnalysisResult] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+
+        # Raw (unmerged) relationships per key and detector phase
+        self._raw: Dict[RelationshipKey, Dict[str, List[FileRelationship]]] = {}
+        self._source_keys: Dict[str, Dict[str, Set[RelationshipKey]]] = {
+            phase: defaultdict(set) for phase in SOURCE_PHASES
+        }
+        self._pair_keys: Dict[str, Dict[str, Set[RelationshipKey]]] = {
+            phase: defaultdict(set) for phase in PAIR_PHASES
+        }
+        self._dirty: Set[RelationshipKey] = set()
+
+        # Similarity pairs left out by the detector's per-file cap, and the
+        # files whose similarity pairs changed since the cap was last applied
+        self._semantic_capped: Set[RelationshipKey] = set()
+        self._semantic_touched: Set[str] = set()
+
+        # Reverse indexes; _import_index maps module index keys to the files
+        # whose imports are resolved through them
+        self.modules = ModuleIndex()
+        self._import_index: Dict[str, Set[str]] = defaultdict(set)
+        self._dependency_index: Dict[str, Set[str]] = defaultdict(set)
+        self._export_index: Dict[str, Set[str]] = defaultdict(set)
+        self._hub_counts: Counter = Counter()
+
+    @property
+    def relationships(self) -> List[FileRelationship]:
+        return list(self.graph.edges.values())
+
+    def apply(self, changes: Dict[str, Optional[AnalysisResult]]) -> Dict[str, int]:
+        """Fold changed files (None for removed ones) into the relationships and graph."""
+        changed = set(changes)
+        hubs_before = set(self._hub_counts)
+        # Files appearing or disappearing change what their module keys resolve to
+        moved_keys = {
+            key
+            for path, result in changes.items()
+            if (path in self.results) != (result is not None)
+            for key in ModuleIndex.keys_for(path)
+        }
+
+        # Swap the changed files' analyses in the reverse indexes
+        for path, result in changes.items():
+            old = self.results.get(path)
+            if old is not None:
+                self._unindex(path, old)
+            if result is None:
+                if old is not None:
+                    self.modules.remove(path)
+                self.results.pop(path, None)
+                self._order.pop(path, None)
+            else:
+                if path not in self.results:
+                    self.modules.add(path)
+                    self._order[path] = self._next_order
+                    self._next_order += 1
+                self.results[path] = result
+                self._index(path, result)
+
+        present = [path for path in changes if path in self.results]
+        for path in changed:
+            self._drop_file(path)
+
+        # Re-resolve every import that is looked up through one of those keys
+        import_sources = set()
+        for key in moved_keys:
+            import_sources |= self._import_index.get(key, set())
+        import_sources -= changed
+        for path in import_sources:
+            self._drop_source("import", path)
+            self._add_all("import", self.detector._import_relationships_for(path, self.results[path], self.modules))
+
+        # Every file links to every hub, so a new or removed hub touches all files
+        hub_files = list(self._hub_counts)
+        hub_sources = set(self.results) - changed if set(hub_files) != hubs_before else set()
+        for path in hub_sources:
+            self._drop_source("hub_link", path)
+            self._add_all("hub_link", self.detector._hub_relationships_for(path, self.results[path], hub_files))
+
+        done: Set[str] = set()
+        for path in present:
+            result = self.results[path]
+            self._add_all("import", self.detector._import_relationships_for(path, result, self.modules))
+            self._add_all("hub_link", self.detector._hub_relationships_for(path, result, hub_files))
+            self._add_all("explicit_crossref", self.detector._crossref_relationships_for(path, result))
+
+            partners = set()
+            for dependency in result.dependencies:
+                partners |= self._dependency_index[dependency]
+
+            # Same candidates as the full detector: files sharing an export or a dependency
+            if result.language:
+                similar = set(partners)
+                for export in result.exports:
+                    similar |= self._export_index[export]
+                for other in similar:
+                    if other != path and other not in done and self.results[other].language == result.language:
+                        self._add_pair("semantic_similarity", path, other, self.detector._semantic_relationship)
+
+            for other in partners:
+                if other != path and other not in done:
+                    self._add_pair("shared_dependencies", path, other, self.detector._shared_dependency_relationship)
+            done.add(path)
+
+        self._apply_semantic_cap()
+        removed, added = self._merge_dirty()
+        self.graph.apply(removed, added)
+
+        stats = {
+            "changed_files": len(changed),
+            "import_sources_rechecked": len(import_sources),
+            "hub_sources_recomputed": len(hub_sources),
+            "relationships_recomputed": len(removed) + len(added),
+            "relationships": len(self.graph.edges),
+        }
+        logger.info("Incremental relationship update", **stats)
+        return stats
+
+    def _index(self, path: str, result: AnalysisResult) -> None:
+        self._hub_counts.update(result.hub_file_candidates)
+        for export in result.exports:
+            self._export_index[export].add(path)
+        for dependency in result.dependencies:
+            self._dependency_index[dependency].add(path)
+        for key in self._import_keys(path, result):
+            self._import_index[key].add(path)
+
+    def _unindex(self, path: str, result: AnalysisResult) -> None:
+        for hub_file in result.hub_file_candidates:
+            self._decrement_count(self._hub_counts, hub_file)
+        for export in result.exports:
+            self._discard(self._export_index, export, path)
+        for dependency in result.dependencies:
+            self._discard(self._dependency_index, dependency, path)
+        for key in self._import_keys(path, result):
+            self._discard(self._import_index, key, path)
+
+    @staticmethod
+    def _import_keys(path: str, result: AnalysisResult) -> Set[str]:
+        return {
+            key
+            for cross_ref in result.cross_references
+            if cross_ref.reference_type in ["import", "from_import"]
+            for key in ModuleIndex.lookup_keys(cross_ref.target_file, path)
+        }
+
+    @staticmethod
+    def _decrement_count(counts: Counter, key: str) -> None:
+        counts[key] -= 1
+        if counts[key] <= 0:
+            del counts[key]
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[str]], key: str, path: str) -> None:
+        paths = index.get(key)
+        if paths is not None:
+            paths.discard(path)
+            if not paths:
+                del index[key]
+
+    def _drop_file(self, path: str) -> None:
+        for phase in SOURCE_PHASES:
+            self._drop_source(phase, path)
+        for phase in PAIR_PHASES:
+            for key in self._pair_keys[phase].pop(path, set()):
+                other = key[1] if key[0] == path else key[0]
+                self._discard(self._pair_keys[phase], other, key)
+                self._drop_raw(key, phase)
+
+    def _drop_source(self, phase: str, path: str) -> None:
+        for key in self._source_keys[phase].pop(path, set()):
+            self._drop_raw(key, phase)
+
+    def _drop_raw(self, key: RelationshipKey, phase: str) -> None:
+        phases = self._raw.get(key)
+        if phases is not None and phases.pop(phase, None) is not None:
+            self._dirty.add(key)
+            if phase == "semantic_similarity":
+                self._semantic_capped.discard(key)
+                self._semantic_touched.update(key)
+            if not phases:
+                del self._raw[key]
+
+    def _add(self, phase: str, rel: FileRelationship) -> RelationshipKey:
+        key = (rel.source_file, rel.target_file)
+        self._raw.setdefault(key, {}).setdefault(phase, []).append(rel)
+        self._dirty.add(key)
+        if phase == "semantic_similarity":
+            self._semantic_touched.update(key)
+        return key
+
+    def _add_all(self, phase: str, relationships: List[FileRelationship]) -> None:
+        for rel in relationships:
+            key = self._add(phase, rel)
+            self._source_keys[phase][rel.source_file].add(key)
+
+    def _add_pair(self, phase: str, path: str, other: str, detect) -> None:
+        # Orient the pair by project order, as the full detectors do
+        first, second = sorted((path, other), key=self._order.__getitem__)
+        rel = detect(first, second, self.results[first], self.results[second])
+        if rel:
+            key = self._add(phase, rel)
+            self._pair_keys[phase][first].add(key)
+            self._pair_keys[phase][second].add(key)
+
+    def _apply_semantic_cap(self) -> None:
+        """Re-evaluate the per-file similarity cap around files whose pairs changed."""
+        touched, self._semantic_touched = self._semantic_touched, set()
+        top_k = self.detector.semantic_top_k
+        if top_k <= 0:
+            return
+
+        pair_keys = self._pair_keys["semantic_similarity"]
+        top: Dict[str, Set[RelationshipKey]] = {}
+
+        def top_of(path: str) -> Set[RelationshipKey]:
+            if path not in top:
+                top[path] = set(sorted(pair_keys.get(path, ()), key=self._semantic_rank)[:top_k])
+            return top[path]
+
+        for path in touched:
+            for key in pair_keys.get(path, ()):
+                capped = key not in top_of(key[0]) and key not in top_of(key[1])
+                if capped != (key in self._semantic_capped):
+                    if capped:
+                        self._semantic_capped.add(key)
+                    else:
+                        self._semantic_capped.discard(key)
+                    self._dirty.add(key)
+
+    def _semantic_rank(self, key: RelationshipKey) -> Tuple[float, int, int]:
+        # Strongest first; ties in detection order, as the full detector ranks them
+        strength = self._raw[key]["semantic_similarity"][0].strength
+        return (-strength, self._order[key[0]], self._order[key[1]])
+
+    def _merge_dirty(self) -> Tuple[List[FileRelationship], List[FileRelationship]]:
+        """Re-merge the relationships of dirty keys; returns (removed, added) edges."""
+        removed, added = [], []
+        for key in sorted(self._dirty):
+            old = self.graph.edges.get(key)
+            if old is not None:
+                removed.append(old)
+
+            phases = self._raw.get(key) or {}
+            group = [
+                rel for phase in PHASES for rel in phases.get(phase, ())
+                if phase != "semantic_similarity" or key not in self._semantic_capped
+            ]
+            if group:
+                added.append(self.detector._merge_group(key[0], key[1], group))
+
+        self._dirty.clear()
+        return removed, added
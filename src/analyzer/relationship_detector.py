@@ -5,10 +5,10 @@ building comprehensive dependency graphs and cross-reference networks.
 """
 
 import asyncio
+import posixpath
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple, Any
 
 import structlog
@@ -16,8 +16,15 @@ from src.analyzer.content_analyzer import AnalysisResult, CrossReference, Conten
 from src.database.operations import get_db_session, file_repo, project_repo
 from src.utils.config import get_settings
 
+try:
+    import numpy as np
+except ImportError:  # Optional (ai extra); only the vectorized similarity scoring needs it
+    np = None
+
 logger = structlog.get_logger(__name__)
 
+SemanticFeatures = Tuple[Set[str], Set[str], Set[str]]  # exports, dependencies, pattern types
+
 
 @dataclass
 class FileRelationship:
@@ -54,6 +61,93 @@ class CrossReferenceRecommendation:
     priority: str = "medium"  # low, medium, high, critical
 
 
+class ModuleIndex:
+    """Inverted index from the names an import can use to the project files.
+
+    Every file is registered under its relative path (with and without
+    extension, and as its directory for package ``__init__`` / ``index``
+    files), under each dotted suffix of its module path and under its stem.
+    An import is resolved by looking up its candidate keys in priority order,
+    so resolution costs a few dictionary lookups instead of a project scan.
+    """
+
+    PACKAGE_STEMS = ("__init__", "index")
+
+    def __init__(self, file_paths: Optional[List[str]] = None):
+        self._files: Dict[str, Set[str]] = defaultdict(set)
+        for file_path in file_paths or []:
+            self.add(file_path)
+
+    @classmethod
+    def keys_for(cls, file_path: str) -> List[str]:
+        """Index keys a file is registered under."""
+        path = file_path.replace("\\", "/")
+        base, _ = posixpath.splitext(path)
+        stem = posixpath.basename(base)
+        module_parts = base.split("/")
+        keys = {f"path:{path}", f"path:{base}", f"stem:{stem}"}
+        if stem in cls.PACKAGE_STEMS and len(module_parts) > 1:
+            module_parts = module_parts[:-1]
+            keys.add(f"path:{'/'.join(module_parts)}")
+        for start in range(len(module_parts)):
+            keys.add(f"mod:{'.'.join(module_parts[start:])}")
+        return sorted(keys)
+
+    @staticmethod
+    def lookup_keys(import_path: str, source_file: Optional[str] = None) -> List[str]:
+        """Keys an import is resolved by, most specific first."""
+        import_path = import_path.replace("\\", "/")
+        if import_path.startswith("."):
+            # Relative to the importing file (JS/TS style ./x and ../x)
+            if source_file is None or not import_path.startswith(("./", "../")):
+                return []
+            target = posixpath.normpath(posixpath.join(posixpath.dirname(source_file), import_path))
+            return [] if target.startswith("..") else [f"path:{target}"]
+
+        keys = [f"path:{posixpath.normpath(import_path)}"]
+        if "/" not in import_path:
+            # Dotted module path; from-imports end in the imported name
+            parts = import_path.split(".")
+            keys.extend(f"mod:{'.'.join(parts[:end])}" for end in range(len(parts), 0, -1))
+        keys.append(f"stem:{import_path.rsplit('/', 1)[-1]}")
+        return keys
+
+    def add(self, file_path: str) -> None:
+        for key in self.keys_for(file_path):
+            self._files[key].add(file_path)
+
+    def remove(self, file_path: str) -> None:
+        for key in self.keys_for(file_path):
+            files = self._files.get(key)
+            if files is not None:
+                files.discard(file_path)
+                if not files:
+                    del self._files[key]
+
+    def resolve(self, import_path: str, source_file: Optional[str] = None) -> Optional[str]:
+        """The project file an import refers to, or None for external imports."""
+        for key in self.lookup_keys(import_path, source_file):
+            candidates = self._files.get(key)
+            if not candidates:
+                continue
+            candidates = [f for f in candidates if f != source_file]
+            if candidates:
+                # Ambiguous names resolve to the file nearest the importer
+                return min(candidates, key=lambda f: (-self._shared_dirs(f, source_file), f.count("/"), f))
+        return None
+
+    @staticmethod
+    def _shared_dirs(file_path: str, source_file: Optional[str]) -> int:
+        if not source_file:
+            return 0
+        shared = 0
+        for a, b in zip(file_path.split("/")[:-1], source_file.split("/")[:-1]):
+            if a != b:
+                break
+            shared += 1
+        return shared
+
+
 class RelationshipDetector:
     """Detects and analyzes relationships between files."""
     
@@ -77,6 +171,10 @@ class RelationshipDetector:
             "medium": 0.6,
             "low": 0.4,
         }
+        
+        # Semantic similarity: per-file cap and scoring implementation
+        self.semantic_top_k = self.settings.semantic_top_k
+        self.semantic_vectorized = self.settings.semantic_vectorized and np is not None
     
     def detect_relationships(self, analysis_results: Dict[str, AnalysisResult]) -> List[FileRelationship]:
         """Detect relationships between files based on analysis results."""
@@ -108,37 +206,57 @@ class RelationshipDetector:
     def _detect_import_relationships(self, analysis_results: Dict[str, AnalysisResult]) -> List[FileRelationship]:
         """Detect relationships from import statements."""
         relationships = []
+        modules = ModuleIndex(list(analysis_results))
         
         for file_path, result in list(analysis_results.items()):
-            for cross_ref in result.cross_references:
-                # Calculate relationship strength based on import type
-                strength = self.scoring_weights.get(cross_ref.reference_type, 0.5)
-                
-                # Adjust for relative vs absolute imports
-                if cross_ref.reference_type in ["import", "from_import"]:
-                    # Check if target file exists in the project
-                    target_exists = self._resolve_import_target(cross_ref.target_file, analysis_results)
-                    if target_exists:
-                        strength = self.scoring_weights["direct_import"]
-                        confidence = cross_ref.confidence
-                    else:
-                        strength = 0.3  # External dependency
-                        confidence = 0.5
-                else:
+            relationships.extend(self._import_relationships_for(file_path, result, modules))
+        
+        return relationships
+    
+    def _import_relationships_for(
+        self,
+        file_path: str,
+        result: AnalysisResult,
+        modules: ModuleIndex
+    ) -> List[FileRelationship]:
+        """Import relationships originating from one file."""
+        relationships = []
+        
+        for cross_ref in result.cross_references:
+            # Calculate relationship strength based on import type
+            strength = self.scoring_weights.get(cross_ref.reference_type, 0.5)
+            
+            target_file = cross_ref.target_file
+            
+            # Adjust for relative vs absolute imports
+            if cross_ref.reference_type in ["import", "from_import"]:
+                # Point the relationship at the project file the import names
+                resolved = self._resolve_import_target(cross_ref.target_file, modules, file_path)
+                if resolved is not None:
+                    target_file = resolved
+                if resolved is not None or cross_ref.target_file.startswith('.'):
+                    # Unresolved relative imports are still assumed internal
+                    strength = self.scoring_weights["direct_import"]
                     confidence = cross_ref.confidence
-                
-                relationships.append(FileRelationship(
-                    source_file=file_path,
-                    target_file=cross_ref.target_file,
-                    relationship_type="import",
-                    strength=strength,
-                    confidence=confidence,
-                    evidence=[f"Line {cross_ref.line_number}: {cross_ref.context}"],
-                    metadata={
-                        "import_type": cross_ref.reference_type,
-                        "line_number": cross_ref.line_number,
-                    }
-                ))
+                else:
+                    strength = 0.3  # External dependency
+                    confidence = 0.5
+            else:
+                confidence = cross_ref.confidence
+            
+            relationships.append(FileRelationship(
+                source_file=file_path,
+                target_file=target_file,
+                relationship_type="import",
+                strength=strength,
+                confidence=confidence,
+                evidence=[f"Line {cross_ref.line_number}: {cross_ref.context}"],
+                metadata={
+                    "import_type": cross_ref.reference_type,
+                    "import_path": cross_ref.target_file,
+                    "line_number": cross_ref.line_number,
+                }
+            ))
         
         return relationships
     
@@ -147,42 +265,64 @@ class RelationshipDetector:
         relationships = []
         
         # Identify hub files
+        hub_files = self._collect_hub_files(analysis_results)
+        
+        # Create relationships from all files to hub files
+        for file_path, result in list(analysis_results.items()):
+            relationships.extend(self._hub_relationships_for(file_path, result, hub_files))
+        
+        return relationships
+    
+    def _collect_hub_files(self, analysis_results: Dict[str, AnalysisResult]) -> List[str]:
+        """Hub file candidates reported by any file."""
         hub_files = []
         for file_path, result in list(analysis_results.items()):
             if result.hub_file_candidates:
                 hub_files.extend(result.hub_file_candidates)
         
-        hub_files = list(set(hub_files))  # Remove duplicates
+        return list(set(hub_files))  # Remove duplicates
+    
+    def _hub_relationships_for(
+        self,
+        file_path: str,
+        result: AnalysisResult,
+        hub_files: List[str]
+    ) -> List[FileRelationship]:
+        """Hub relationships from one file to every other hub file."""
+        relationships = []
         
-        # Create relationships from all files to hub files
-        for file_path, result in list(analysis_results.items()):
-            for hub_file in hub_files:
-                if file_path != hub_file:
-                    # Check if there's already a reference to the hub
-                    has_reference = any(
-                        pattern.pattern_type in ["cross_ref_header", "hub_file_reference"]
-                        and hub_file in pattern.content
-                        for pattern in result.patterns
-                    )
-                    
-                    strength = 0.8 if has_reference else 0.6
-                    confidence = 0.9 if has_reference else 0.7
-                    
-                    relationships.append(FileRelationship(
-                        source_file=file_path,
-                        target_file=hub_file,
-                        relationship_type="hub_link",
-                        strength=strength,
-                        confidence=confidence,
-                        bidirectional=True,
-                        evidence=[f"Hub file relationship with {hub_file}"],
-                        metadata={"hub_file": True, "has_explicit_reference": has_reference}
-                    ))
+        for hub_file in hub_files:
+            if file_path != hub_file:
+                # Check if there's already a reference to the hub
+                has_reference = any(
+                    pattern.pattern_type in ["cross_ref_header", "hub_file_reference"]
+                    and hub_file in pattern.content
+                    for pattern in result.patterns
+                )
+                
+                strength = 0.8 if has_reference else 0.6
+                confidence = 0.9 if has_reference else 0.7
+                
+                relationships.append(FileRelationship(
+                    source_file=file_path,
+                    target_file=hub_file,
+                    relationship_type="hub_link",
+                    strength=strength,
+                    confidence=confidence,
+                    bidirectional=True,
+                    evidence=[f"Hub file relationship with {hub_file}"],
+                    metadata={"hub_file": True, "has_explicit_reference": has_reference}
+                ))
         
         return relationships
     
     def _detect_semantic_relationships(self, analysis_results: Dict[str, AnalysisResult]) -> List[FileRelationship]:
-        """Detect semantic similarity relationships."""
+        """Detect semantic similarity relationships.
+        
+        Only pairs sharing an export or a dependency are scored. Shared
+        patterns alone add at most 0.3, below the 0.4 threshold, so no other
+        pair can qualify.
+        """
         relationships = []
         
         # Group files by language and type
@@ -193,28 +333,155 @@ class RelationshipDetector:
         
         # Find semantic relationships within language groups
         for language, files in language_groups.items():
-            for i, file1 in enumerate(files):
-                for file2 in files[i+1:]:
-                    result1 = analysis_results[file1]
-                    result2 = analysis_results[file2]
-                    
-                    # Calculate semantic similarity
-                    similarity = self._calculate_semantic_similarity(result1, result2)
-                    
-                    if similarity > 0.4:  # Threshold for meaningful similarity
-                        relationships.append(FileRelationship(
-                            source_file=file1,
-                            target_file=file2,
-                            relationship_type="semantic_similarity",
-                            strength=similarity,
-                            confidence=0.7,
-                            bidirectional=True,
-                            evidence=[f"Semantic similarity: {similarity:.2f}"],
-                            metadata={"similarity_score": similarity, "language": language}
-                        ))
+            features = [self._semantic_features(analysis_results[file_path]) for file_path in files]
+            if self.semantic_vectorized:
+                scored = self._vectorized_similarities(features)
+            else:
+                scored = (
+                    (i, j, self._feature_similarity(features[i], features[j]))
+                    for i, j in self._semantic_candidates(features)
+                )
+            
+            group = []
+            for i, j, similarity in scored:
+                relationship = self._similarity_relationship(files[i], files[j], similarity, language)
+                if relationship:
+                    group.append(relationship)
+            relationships.extend(self._cap_semantic_relationships(group))
         
         return relationships
     
+    @staticmethod
+    def _semantic_features(result: AnalysisResult) -> SemanticFeatures:
+        return (
+            set(result.exports),
+            set(result.dependencies),
+            set(p.pattern_type for p in result.patterns),
+        )
+    
+    @staticmethod
+    def _semantic_candidates(features: List[SemanticFeatures]) -> List[Tuple[int, int]]:
+        """Index pairs (i < j) that share an export or a dependency, in order."""
+        postings = defaultdict(list)
+        for index, (exports, dependencies, _) in enumerate(features):
+            for export in exports:
+                postings[("export", export)].append(index)
+            for dependency in dependencies:
+                postings[("dependency", dependency)].append(index)
+        
+        pairs = set()
+        for indices in postings.values():
+            for position, first in enumerate(indices):
+                for second in indices[position + 1:]:
+                    pairs.add((first, second))
+        return sorted(pairs)
+    
+    def _vectorized_similarities(self, features: List[SemanticFeatures]) -> List[Tuple[int, int, float]]:
+        """Candidate pairs and their similarity, one numpy pass per file.
+        
+        Shared export and dependency counts for all later files come from
+        bincounts over the file's posting lists (a row of the sparse
+        co-occurrence matrix); the Jaccard terms are then evaluated with the
+        same operations, in the same order, as _feature_similarity.
+        """
+        count = len(features)
+        postings = ({}, {})
+        for index, feature_sets in enumerate(features):
+            for family in (0, 1):
+                for item in feature_sets[family]:
+                    postings[family].setdefault(item, []).append(index)
+        postings = tuple(
+            {item: np.array(indices, dtype=np.int64) for item, indices in family.items()}
+            for family in postings
+        )
+        
+        pattern_types = {t: i for i, t in enumerate(sorted(set().union(*(f[2] for f in features))))}
+        pattern_matrix = np.zeros((count, len(pattern_types)), dtype=bool)
+        for index, feature_sets in enumerate(features):
+            pattern_matrix[index, [pattern_types[t] for t in feature_sets[2]]] = True
+        sizes = np.array([[len(f[0]), len(f[1]), len(f[2])] for f in features], dtype=np.int64).reshape(count, 3)
+        
+        scored = []
+        for index, feature_sets in enumerate(features):
+            shared = []
+            for family in (0, 1):
+                lists = [postings[family][item] for item in feature_sets[family]]
+                shared.append(
+                    np.bincount(np.concatenate(lists), minlength=count) if lists
+                    else np.zeros(count, dtype=np.int64)
+                )
+            candidates = np.nonzero(shared[0][index + 1:] + shared[1][index + 1:])[0] + index + 1
+            if not len(candidates):
+                continue
+            
+            intersections = (
+                shared[0][candidates],
+                shared[1][candidates],
+                (pattern_matrix[candidates] & pattern_matrix[index]).sum(axis=1),
+            )
+            similarity = np.zeros(len(candidates))
+            for family, weight in enumerate((0.3, 0.4, 0.3)):
+                unions = sizes[index, family] + sizes[candidates, family] - intersections[family]
+                jaccard = np.divide(
+                    intersections[family], unions,
+                    out=np.zeros(len(candidates)), where=unions > 0
+                )
+                similarity = similarity + jaccard * weight
+            similarity = np.minimum(similarity, 1.0)
+            
+            for other, value in zip(candidates.tolist(), similarity.tolist()):
+                scored.append((index, other, value))
+        return scored
+    
+    def _cap_semantic_relationships(self, relationships: List[FileRelationship]) -> List[FileRelationship]:
+        """Keep a relationship if it is among the top-k of either of its files."""
+        if self.semantic_top_k <= 0:
+            return relationships
+        
+        by_file = defaultdict(list)
+        for position, rel in enumerate(relationships):
+            by_file[rel.source_file].append(position)
+            by_file[rel.target_file].append(position)
+        
+        kept = set()
+        for positions in by_file.values():
+            # Ties go to the earlier pair, as in detection order
+            kept.update(sorted(positions, key=lambda p: (-relationships[p].strength, p))[:self.semantic_top_k])
+        return [rel for position, rel in enumerate(relationships) if position in kept]
+    
+    def _semantic_relationship(
+        self,
+        file1: str,
+        file2: str,
+        result1: AnalysisResult,
+        result2: AnalysisResult
+    ) -> Optional[FileRelationship]:
+        """Semantic similarity relationship for one pair of same-language files."""
+        # Calculate semantic similarity
+        similarity = self._calculate_semantic_similarity(result1, result2)
+        return self._similarity_relationship(file1, file2, similarity, result1.language)
+    
+    def _similarity_relationship(
+        self,
+        file1: str,
+        file2: str,
+        similarity: float,
+        language: Optional[str]
+    ) -> Optional[FileRelationship]:
+        if similarity <= 0.4:  # Threshold for meaningful similarity
+            return None
+        
+        return FileRelationship(
+            source_file=file1,
+            target_file=file2,
+            relationship_type="semantic_similarity",
+            strength=similarity,
+            confidence=0.7,
+            bidirectional=True,
+            evidence=[f"Semantic similarity: {similarity:.2f}"],
+            metadata={"similarity_score": similarity, "language": language}
+        )
+    
     def _detect_shared_dependency_relationships(self, analysis_results: Dict[str, AnalysisResult]) -> List[FileRelationship]:
         """Detect relationships based on shared dependencies."""
         relationships = []
@@ -225,102 +492,114 @@ class RelationshipDetector:
             for dependency in result.dependencies:
                 dependency_map[dependency].append(file_path)
         
-        # Find files with shared dependencies
+        # Find files with shared dependencies (each pair once, however many it shares)
+        seen_pairs = set()
         for dependency, files in dependency_map.items():
             if len(files) > 1:
                 for i, file1 in enumerate(files):
                     for file2 in files[i+1:]:
-                        # Calculate shared dependency strength
-                        result1 = analysis_results[file1]
-                        result2 = analysis_results[file2]
+                        if (file1, file2) in seen_pairs:
+                            continue
+                        seen_pairs.add((file1, file2))
                         
-                        shared_deps = set(result1.dependencies) & set(result2.dependencies)
-                        total_deps = set(result1.dependencies) | set(result2.dependencies)
-                        
-                        if total_deps:
-                            strength = len(shared_deps) / len(total_deps)
-                            
-                            if strength > 0.3:  # Meaningful shared dependency
-                                relationships.append(FileRelationship(
-                                    source_file=file1,
-                                    target_file=file2,
-                                    relationship_type="shared_dependencies",
-                                    strength=strength * self.scoring_weights["shared_dependencies"],
-                                    confidence=0.6,
-                                    bidirectional=True,
-                                    evidence=[f"Shared dependencies: {', '.join(shared_deps)}"],
-                                    metadata={
-                                        "shared_dependencies": list(shared_deps),
-                                        "dependency_overlap": strength
-                                    }
-                                ))
+                        relationship = self._shared_dependency_relationship(
+                            file1, file2, analysis_results[file1], analysis_results[file2]
+                        )
+                        if relationship:
+                            relationships.append(relationship)
         
         return relationships
     
+    def _shared_dependency_relationship(
+        self,
+        file1: str,
+        file2: str,
+        result1: AnalysisResult,
+        result2: AnalysisResult
+    ) -> Optional[FileRelationship]:
+        """Shared dependency relationship for one pair of files."""
+        # Calculate shared dependency strength
+        shared_deps = set(result1.dependencies) & set(result2.dependencies)
+        total_deps = set(result1.dependencies) | set(result2.dependencies)
+        
+        if not total_deps:
+            return None
+        
+        strength = len(shared_deps) / len(total_deps)
+        if strength <= 0.3:  # Meaningful shared dependency
+            return None
+        
+        shared_deps = sorted(shared_deps)
+        return FileRelationship(
+            source_file=file1,
+            target_file=file2,
+            relationship_type="shared_dependencies",
+            strength=strength * self.scoring_weights["shared_dependencies"],
+            confidence=0.6,
+            bidirectional=True,
+            evidence=[f"Shared dependencies: {', '.join(shared_deps)}"],
+            metadata={
+                "shared_dependencies": shared_deps,
+                "dependency_overlap": strength
+            }
+        )
+    
     def _detect_crossref_pattern_relationships(self, analysis_results: Dict[str, AnalysisResult]) -> List[FileRelationship]:
         """Detect relationships from existing cross-reference patterns."""
         relationships = []
         
         for file_path, result in list(analysis_results.items()):
-            for pattern in result.patterns:
-                if pattern.pattern_type in ["cross_ref_header", "warning_crossref"]:
-                    # Extract referenced files from pattern metadata
-                    referenced_files = pattern.metadata.get("referenced_files", [])
-                    
-                    for ref_file in referenced_files:
-                        relationships.append(FileRelationship(
-                            source_file=file_path,
-                            target_file=ref_file,
-                            relationship_type="explicit_crossref",
-                            strength=0.9,
-                            confidence=pattern.confidence,
-                            evidence=[f"Line {pattern.line_number}: {pattern.content[:100]}..."],
-                            metadata={
-                                "pattern_type": pattern.pattern_type,
-                                "line_number": pattern.line_number,
-                            }
-                        ))
+            relationships.extend(self._crossref_relationships_for(file_path, result))
         
         return relationships
     
-    def _resolve_import_target(self, import_path: str, analysis_results: Dict[str, AnalysisResult]) -> bool:
-        """Check if an import target exists in the project."""
-        # Simple resolution for relative imports
-        if import_path.startswith('.'):
-            return True  # Assume relative imports are internal
+    def _crossref_relationships_for(self, file_path: str, result: AnalysisResult) -> List[FileRelationship]:
+        """Explicit cross-reference relationships declared by one file."""
+        relationships = []
         
-        # Check if any file matches the import
-        for file_path in analysis_results.keys():
-            file_stem = Path(file_path).stem
-            if import_path == file_stem or import_path.endswith(f"/{file_stem}"):
-                return True
+        for pattern in result.patterns:
+            if pattern.pattern_type in ["cross_ref_header", "warning_crossref"]:
+                # Extract referenced files from pattern metadata
+                referenced_files = pattern.metadata.get("referenced_files", [])
+                
+                for ref_file in referenced_files:
+                    relationships.append(FileRelationship(
+                        source_file=file_path,
+                        target_file=ref_file,
+                        relationship_type="explicit_crossref",
+                        strength=0.9,
+                        confidence=pattern.confidence,
+                        evidence=[f"Line {pattern.line_number}: {pattern.content[:100]}..."],
+                        metadata={
+                            "pattern_type": pattern.pattern_type,
+                            "line_number": pattern.line_number,
+                        }
+                    ))
         
-        return False
+        return relationships
+    
+    def _resolve_import_target(
+        self,
+        import_path: str,
+        modules: ModuleIndex,
+        source_file: Optional[str] = None
+    ) -> Optional[str]:
+        """The project file an import refers to, if any."""
+        return modules.resolve(import_path, source_file)
     
     def _calculate_semantic_similarity(self, result1: AnalysisResult, result2: AnalysisResult) -> float:
         """Calculate semantic similarity between two files."""
+        return self._feature_similarity(self._semantic_features(result1), self._semantic_features(result2))
+    
+    @staticmethod
+    def _feature_similarity(features1: SemanticFeatures, features2: SemanticFeatures) -> float:
         similarity = 0.0
         
-        # Shared exports
-        exports1 = set(result1.exports)
-        exports2 = set(result2.exports)
-        if exports1 or exports2:
-            export_similarity = len(exports1 & exports2) / len(exports1 | exports2) if (exports1 | exports2) else 0
-            similarity += export_similarity * 0.3
-        
-        # Shared dependencies
-        deps1 = set(result1.dependencies)
-        deps2 = set(result2.dependencies)
-        if deps1 or deps2:
-            dep_similarity = len(deps1 & deps2) / len(deps1 | deps2) if (deps1 | deps2) else 0
-            similarity += dep_similarity * 0.4
-        
-        # Shared patterns
-        patterns1 = set(p.pattern_type for p in result1.patterns)
-        patterns2 = set(p.pattern_type for p in result2.patterns)
-        if patterns1 or patterns2:
-            pattern_similarity = len(patterns1 & patterns2) / len(patterns1 | patterns2) if (patterns1 | patterns2) else 0
-            similarity += pattern_similarity * 0.3
+        # Shared exports (0.3), dependencies (0.4) and patterns (0.3)
+        for set1, set2, weight in zip(features1, features2, (0.3, 0.4, 0.3)):
+            union = set1 | set2
+            if union:
+                similarity += len(set1 & set2) / len(union) * weight
         
         return min(similarity, 1.0)
     
@@ -333,34 +612,37 @@ class RelationshipDetector:
             key = (rel.source_file, rel.target_file)
             relationship_groups[key].append(rel)
         
-        merged = []
-        for (source, target), group in relationship_groups.items():
-            if len(group) == 1:
-                merged.append(group[0])
-            else:
-                # Merge multiple relationships
-                merged_rel = FileRelationship(
-                    source_file=source,
-                    target_file=target,
-                    relationship_type=group[0].relationship_type,  # Use first type
-                    strength=max(rel.strength for rel in group),  # Use max strength
-                    confidence=max(rel.confidence for rel in group),  # Use max confidence
-                    bidirectional=any(rel.bidirectional for rel in group),
-                    evidence=[],
-                    metadata={}
-                )
-                
-                # Combine evidence
-                for rel in group:
-                    merged_rel.evidence.extend(rel.evidence)
-                    merged_rel.metadata.update(rel.metadata)
-                
-                # Add merged type info
-                merged_rel.metadata["merged_types"] = [rel.relationship_type for rel in group]
-                
-                merged.append(merged_rel)
+        return [
+            self._merge_group(source, target, group)
+            for (source, target), group in relationship_groups.items()
+        ]
+    
+    def _merge_group(self, source: str, target: str, group: List[FileRelationship]) -> FileRelationship:
+        """Merge the relationships found for one source-target pair."""
+        if len(group) == 1:
+            return group[0]
+        
+        # Merge multiple relationships
+        merged_rel = FileRelationship(
+            source_file=source,
+            target_file=target,
+            relationship_type=group[0].relationship_type,  # Use first type
+            strength=max(rel.strength for rel in group),  # Use max strength
+            confidence=max(rel.confidence for rel in group),  # Use max confidence
+            bidirectional=any(rel.bidirectional for rel in group),
+            evidence=[],
+            metadata={}
+        )
         
-        return merged
+        # Combine evidence
+        for rel in group:
+            merged_rel.evidence.extend(rel.evidence)
+            merged_rel.metadata.update(rel.metadata)
+        
+        # Add merged type info
+        merged_rel.metadata["merged_types"] = [rel.relationship_type for rel in group]
+        
+        return merged_rel
 
 
 class DependencyGraphBuilder:
@@ -390,13 +672,8 @@ class DependencyGraphBuilder:
         
         # Hub files have significantly more incoming connections
         if in_degree:
-            avg_in_degree = sum(in_degree.values()) / len(in_degree)
-            threshold = avg_in_degree * 2  # 2x average
-            
-            graph.hub_files = [
-                file for file, degree in in_degree.items()
-                if degree >= threshold and degree >= 3  # At least 3 connections
-            ]
+            threshold = self._hub_threshold(sum(in_degree.values()), len(in_degree))
+            graph.hub_files = [file for file, degree in in_degree.items() if degree >= threshold]
         
         # Detect cycles
         graph.cycles = self._detect_cycles(relationships)
@@ -418,15 +695,27 @@ class DependencyGraphBuilder:
         
         return graph
     
+    @staticmethod
+    def _hub_threshold(total_in_degree: int, target_count: int) -> float:
+        """Minimum in-degree for a hub: 2x the average, and at least 3 connections."""
+        return max((total_in_degree / target_count) * 2, 3)
+    
+    @staticmethod
+    def _is_cycle_edge(rel: FileRelationship) -> bool:
+        return rel.relationship_type in ["import", "explicit_crossref"]
+    
     def _detect_cycles(self, relationships: List[FileRelationship]) -> List[List[str]]:
         """Detect cycles in the dependency graph."""
         # Build adjacency list
         adj = defaultdict(list)
         for rel in relationships:
-            if rel.relationship_type in ["import", "explicit_crossref"]:
+            if self._is_cycle_edge(rel):
                 adj[rel.source_file].append(rel.target_file)
         
-        # DFS to detect cycles
+        return self._find_cycles(adj, list(adj))
+    
+    def _find_cycles(self, adj: Dict[str, List[str]], start_nodes: List[str]) -> List[List[str]]:
+        """DFS from each unvisited start node, recording back edges as cycles."""
         cycles = []
         visited = set()
         rec_stack = set()
@@ -446,13 +735,13 @@ class DependencyGraphBuilder:
             rec_stack.add(node)
             path.append(node)
             
-            for neighbor in adj[node]:
+            for neighbor in adj.get(node, ()):
                 dfs(neighbor)
             
             rec_stack.remove(node)
             path.pop()
         
-        for node in list(adj):  # Iterate over a copy to prevent dictionary size change
+        for node in start_nodes:
             if node not in visited:
                 dfs(node)
         
@@ -492,15 +781,15 @@ class DependencyGraphBuilder:
     
     def _detect_clusters(self, relationships: List[FileRelationship]) -> List[List[str]]:
         """Detect clusters of strongly connected files."""
-        # Build adjacency list with bidirectional connections
+        # Build an undirected adjacency list so clusters are true connected
+        # components, independent of the order nodes are visited in
         adj = defaultdict(set)
         all_nodes = set()
         
         for rel in relationships:
-            if rel.strength > 0.6:  # Only strong relationships
+            if self._is_cluster_edge(rel):
                 adj[rel.source_file].add(rel.target_file)
-                if rel.bidirectional:
-                    adj[rel.target_file].add(rel.source_file)
+                adj[rel.target_file].add(rel.source_file)
                 all_nodes.add(rel.source_file)
                 all_nodes.add(rel.target_file)
         
@@ -524,6 +813,10 @@ class DependencyGraphBuilder:
                     clusters.append(cluster)
         
         return clusters
+    
+    @staticmethod
+    def _is_cluster_edge(rel: FileRelationship) -> bool:
+        return rel.strength > 0.6  # Only strong relationships
 
 
 class CrossReferenceRecommender:
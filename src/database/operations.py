@@ -3,12 +3,13 @@
 CRUD operations and repository pattern for all database models.
 """
 
+import os
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 from uuid import uuid4
 
 import structlog
-from sqlalchemy import and_, func, or_, text, select, update, delete
+from sqlalchemy import and_, func, literal, or_, text, select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, joinedload
 
@@ -184,6 +185,140 @@ class FileRepository(BaseRepository):
         )
         return result.scalar_one_or_none()
     
+    async def get_by_paths(
+        self,
+        session: AsyncSession,
+        project_id: int,
+        relative_paths: Iterable[str],
+        chunk_size: int = 500
+    ) -> Dict[str, File]:
+        """Get files by relative path with one IN query per chunk.
+        
+        Where a path has both a live and a deleted row, the live row wins.
+        """
+        relative_paths = list(dict.fromkeys(relative_paths))
+        files: Dict[str, File] = {}
+        for start in range(0, len(relative_paths), chunk_size):
+            result = await session.execute(
+                select(File)
+                .where(and_(
+                    File.project_id == project_id,
+                    File.relative_path.in_(relative_paths[start:start + chunk_size])
+                ))
+                .execution_options(populate_existing=True)
+            )
+            for file_obj in result.scalars():
+                current = files.get(file_obj.relative_path)
+                if current is None or current.status == FileStatus.DELETED:
+                    files[file_obj.relative_path] = file_obj
+        return files
+    
+    async def bulk_create(self, session: AsyncSession, file_data: List[Dict[str, Any]]) -> int:
+        """Insert many files with a single flush."""
+        if not file_data:
+            return 0
+        session.add_all([File(**data) for data in file_data])
+        await session.flush()
+        return len(file_data)
+    
+    async def bulk_update(self, session: AsyncSession, updates: List[Tuple[File, Dict[str, Any]]]) -> int:
+        """Apply field updates to already-loaded files with a single flush."""
+        if not updates:
+            return 0
+        for file_obj, values in updates:
+            for key, value in values.items():
+                if hasattr(file_obj, key):
+                    setattr(file_obj, key, value)
+        await session.flush()
+        return len(updates)
+    
+    def _under_prefix(self, project_id: int, prefix: str):
+        """Condition matching files of a project below a relative directory ("" = whole project)."""
+        prefix = prefix.rstrip(os.sep)
+        if not prefix:
+            return File.project_id == project_id
+        return and_(
+            File.project_id == project_id,
+            File.relative_path.startswith(prefix + os.sep, autoescape=True),
+        )
+    
+    async def get_files_under_prefix(
+        self,
+        session: AsyncSession,
+        project_id: int,
+        prefix: str,
+        include_deleted: bool = True
+    ) -> List[File]:
+        """Get all files below a relative directory in one query."""
+        conditions = [self._under_prefix(project_id, prefix)]
+        if not include_deleted:
+            conditions.append(File.status != FileStatus.DELETED)
+        result = await session.execute(
+            select(File)
+            .where(and_(*conditions))
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
+    
+    async def rename_prefix(
+        self,
+        session: AsyncSession,
+        project_id: int,
+        old_prefix: str,
+        new_prefix: str,
+        root_path: str
+    ) -> int:
+        """Re-home every live file below old_prefix to new_prefix with a single UPDATE.
+        
+        Stale rows already recorded below new_prefix are marked deleted first so
+        the renamed rows do not collide with them. Returns the number of renamed rows.
+        """
+        old_dir = old_prefix.rstrip(os.sep) + os.sep
+        new_dir = new_prefix.rstrip(os.sep) + os.sep
+        new_abs_dir = os.path.join(root_path, new_dir)
+        
+        await self.mark_deleted_under_prefix(session, project_id, new_prefix)
+        
+        suffix = func.substr(File.relative_path, len(old_dir) + 1)
+        result = await session.execute(
+            update(File)
+            .where(and_(
+                self._under_prefix(project_id, old_prefix),
+                File.status != FileStatus.DELETED
+            ))
+            .values(
+                relative_path=literal(new_dir) + suffix,
+                path=literal(new_abs_dir) + suffix,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
+    
+    async def mark_deleted_under_prefix(self, session: AsyncSession, project_id: int, prefix: str) -> int:
+        """Mark every live file below a relative directory deleted with a single UPDATE."""
+        result = await session.execute(
+            update(File)
+            .where(and_(
+                self._under_prefix(project_id, prefix),
+                File.status != FileStatus.DELETED
+            ))
+            .values(status=FileStatus.DELETED)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
+    
+    async def mark_deleted(self, session: AsyncSession, file_ids: List[int]) -> int:
+        """Mark files deleted by ID with a single UPDATE."""
+        if not file_ids:
+            return 0
+        result = await session.execute(
+            update(File)
+            .where(File.id.in_(file_ids))
+            .values(status=FileStatus.DELETED)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
+    
     async def get_by_hash(self, session: AsyncSession, content_hash: str) -> List[File]:
         """Get files by content hash (for detecting duplicates)."""
         result = await session.execute(
@@ -278,9 +413,13 @@ class FileRepository(BaseRepository):
         self,
         session: AsyncSession,
         project_id: int,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        relative_paths: Optional[Iterable[str]] = None
     ) -> List[File]:
-        """Get all text-based files for a project (suitable for content analysis)."""
+        """Get all text-based files for a project (suitable for content analysis).
+        
+        relative_paths restricts the result to those files.
+        """
         text_file_types = [
             "code", "config", "docs", "markup", "style", "template", "test"
         ]
@@ -301,6 +440,8 @@ class FileRepository(BaseRepository):
                 File.extension.in_([ext[1:] for ext in text_extensions])  # Remove leading dot
             )
         ]
+        if relative_paths is not None:
+            conditions.append(File.relative_path.in_(list(relative_paths)))
         
         query = select(File).where(and_(*conditions)).order_by(File.relative_path)
         
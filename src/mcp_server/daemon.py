@@ -0,0 +1,194 @@
+"""Background Analysis Daemon
+
+Daemon mode for the MCP server: registered projects are scanned and analyzed
+once in the background and then kept warm by their file monitor. Every change
+the monitor applies wakes the project's refresh task, which brings the shared
+analysis snapshot up to date incrementally. Tool calls read the latest
+snapshot without waiting and report how stale it is; callers that need
+current results can wait for freshness instead.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import structlog
+
+from src.mcp_server.snapshots import ProjectSnapshot, ProjectSnapshotStore
+from src.scanner import UniversalScanner
+from src.utils.config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class WarmProject:
+    """A project kept analyzed in the background."""
+    root_path: str
+    scanner: UniversalScanner
+    task: Optional[asyncio.Task] = None
+    on_change: Optional[Callable] = None
+    wake: asyncio.Event = field(default_factory=asyncio.Event)
+    updated: asyncio.Event = field(default_factory=asyncio.Event)
+    force_rescan: bool = False
+    refreshing: bool = False
+    runs: int = 0
+    last_error: Optional[str] = None
+    registered_at: float = field(default_factory=time.time)
+
+
+class AnalysisDaemon:
+    """Keeps registered projects' analysis snapshots warm."""
+
+    def __init__(self, store: ProjectSnapshotStore, wait_timeout: Optional[float] = None):
+        self.store = store
+        self.wait_timeout = (
+            wait_timeout if wait_timeout is not None
+            else get_settings().daemon_wait_timeout_seconds
+        )
+        self._projects: Dict[str, WarmProject] = {}
+        self._lock = asyncio.Lock()
+
+    async def register(self, project_path: str, project_name: Optional[str] = None) -> WarmProject:
+        """Start keeping a project warm; returns immediately while it is built."""
+        root = str(Path(project_path).resolve())
+        async with self._lock:
+            project = self._projects.get(root)
+            if project is not None:
+                return project
+
+            scanner = await self.store.get_scanner(root, project_name, enable_monitoring=True)
+            if scanner.monitor is None:
+                logger.warning("Project has no file monitor, refreshing periodically", root_path=root)
+
+            project = WarmProject(root_path=root, scanner=scanner)
+            project.on_change = lambda _data: project.wake.set()
+            scanner.add_callback("file_change", project.on_change)
+            project.task = asyncio.create_task(self._keep_warm(project))
+            self._projects[root] = project
+
+            logger.info("Registered project for background analysis", root_path=root)
+            return project
+
+    async def read(
+        self,
+        project_path: str,
+        project_name: Optional[str] = None,
+        wait: bool = False,
+        refresh: bool = False,
+    ) -> Tuple[Optional[ProjectSnapshot], Dict[str, Any]]:
+        """Latest snapshot (None while warming up) and its freshness status.
+
+        With ``wait`` the call waits, up to the configured timeout, until
+        every change seen so far is analyzed. ``refresh`` requests a rescan
+        and waits for it.
+        """
+        project = await self.register(project_path, project_name)
+
+        if refresh:
+            # A refresh already under way started before this request
+            min_runs = project.runs + (2 if project.refreshing else 1)
+            project.force_rescan = True
+            project.wake.set()
+            await self.wait_until_fresh(project, min_runs=min_runs)
+        elif wait:
+            await self.wait_until_fresh(project)
+
+        return self.store.peek(project.root_path), self.get_status(project)
+
+    async def wait_until_fresh(
+        self,
+        project: WarmProject,
+        timeout: Optional[float] = None,
+        min_runs: int = 0,
+    ) -> bool:
+        """Wait until the project's snapshot covers every known change."""
+        deadline = time.monotonic() + (self.wait_timeout if timeout is None else timeout)
+        while project.runs < min_runs or not self.is_fresh(project):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            snapshot = self.store.peek(project.root_path)
+            if snapshot is not None and not project.refreshing and not self.store.is_current(snapshot, project.scanner):
+                # Changes are already in the database (or the snapshot expired)
+                project.wake.set()
+
+            updated = project.updated
+            try:
+                await asyncio.wait_for(updated.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def is_fresh(self, project: WarmProject) -> bool:
+        snapshot = self.store.peek(project.root_path)
+        return (
+            snapshot is not None
+            and not project.refreshing
+            and self._pending_changes(project) == 0
+            and self.store.is_current(snapshot, project.scanner)
+        )
+
+    async def _keep_warm(self, project: WarmProject) -> None:
+        while True:
+            project.refreshing = True
+            force_rescan, project.force_rescan = project.force_rescan, False
+            try:
+                await self.store.get(project.root_path, refresh=force_rescan)
+                project.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                project.last_error = str(e)
+                logger.error("Background analysis failed", root_path=project.root_path, error=str(e))
+            finally:
+                project.refreshing = False
+                project.runs += 1
+                project.updated.set()
+                project.updated = asyncio.Event()
+
+            # Unmonitored projects (and failed builds) are retried on the refresh interval
+            try:
+                await asyncio.wait_for(project.wake.wait(), timeout=self.store.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+            project.wake.clear()
+
+    @staticmethod
+    def _pending_changes(project: WarmProject) -> int:
+        monitor = project.scanner.monitor
+        return monitor.change_buffer.pending_count if monitor is not None else 0
+
+    def get_status(self, project: WarmProject) -> Dict[str, Any]:
+        """Freshness of a project's snapshot, for tool responses."""
+        snapshot = self.store.peek(project.root_path)
+        fresh = self.is_fresh(project)
+        return {
+            "root_path": project.root_path,
+            "state": "warming" if snapshot is None else ("fresh" if fresh else "stale"),
+            "fresh": fresh,
+            "refreshing": project.refreshing,
+            "pending_changes": self._pending_changes(project),
+            "generations_behind": (
+                project.scanner.scan_generation - snapshot.scan_generation if snapshot is not None else None
+            ),
+            "analysis_age_seconds": time.time() - snapshot.built_at if snapshot is not None else None,
+            "monitored": project.scanner.monitor is not None,
+            "last_error": project.last_error,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {root: self.get_status(project) for root, project in self._projects.items()}
+
+    async def stop(self) -> None:
+        """Stop all refresh tasks; scanners are left to the orchestrator."""
+        async with self._lock:
+            projects, self._projects = list(self._projects.values()), {}
+        for project in projects:
+            project.scanner.remove_callback("file_change", project.on_change)
+            if project.task is not None:
+                project.task.cancel()
+        await asyncio.gather(*(p.task for p in projects if p.task is not None), return_exceptions=True)
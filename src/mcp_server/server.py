@@ -9,7 +9,7 @@ import asyncio
 import json
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -26,12 +26,18 @@ from mcp.types import (
 from mcp.server.models import InitializationOptions
 import structlog
 
+# Shared src modules log through structlog at import time (here and in spawned
+# analysis workers, which re-import this module); keep that off the stdio transport
+structlog.configure(logger_factory=structlog.PrintLoggerFactory(file=sys.stderr))
+
 from src.analyzer import universal_analyzer, analyze_project, quick_file_analysis
 from src.scanner import orchestrator
 from src.database.connection import init_db, close_db
 from src.database.models import Base
 from src.database.connection import db_manager
 from src.utils.config import get_settings
+from src.mcp_server.snapshots import ProjectSnapshot, ProjectSnapshotStore
+from src.mcp_server.daemon import AnalysisDaemon
 
 logger = structlog.get_logger(__name__)
 
@@ -41,6 +47,12 @@ app = Server("universal-crossref")
 # Global state
 _initialized = False
 
+# One analysis per project root, shared by all project tools
+snapshot_store = ProjectSnapshotStore(orchestrator, universal_analyzer)
+
+# Background analysis of registered projects (DAEMON_MODE)
+analysis_daemon = AnalysisDaemon(snapshot_store) if get_settings().daemon_mode else None
+
 async def initialize_server():
     """Initialize the cross-reference server"""
     global _initialized
@@ -58,12 +70,42 @@ async def initialize_server():
             await conn.run_sync(Base.metadata.create_all)
         
         _initialized = True
+        
+        if analysis_daemon is not None:
+            for project_path in get_settings().daemon_projects:
+                await analysis_daemon.register(project_path)
         logger.info("✅ Universal Cross-Reference MCP Server initialized successfully")
         
     except Exception as e:
         logger.error("❌ Failed to initialize server", error=str(e))
         raise
 
+async def get_project_snapshot(
+    arguments: Dict[str, Any], project_name: Optional[str] = None
+) -> Tuple[Optional[ProjectSnapshot], str]:
+    """Snapshot for a project tool call and a freshness note for its response."""
+    project_path = arguments["project_path"]
+    refresh = arguments.get("refresh", False)
+    
+    if analysis_daemon is None:
+        return await snapshot_store.get(project_path, project_name, refresh=refresh), ""
+    
+    snapshot, status = await analysis_daemon.read(
+        project_path, project_name, wait=arguments.get("wait_for_fresh", False), refresh=refresh
+    )
+    if snapshot is None:
+        note = f"⏳ {project_path} is still being analyzed in the background."
+        if status["last_error"]:
+            note += f" Last attempt failed: {status['last_error']}"
+        return None, note + " Call again later or pass `wait_for_fresh`."
+    if status["fresh"]:
+        return snapshot, f"\n---\n🟢 Analysis is up to date ({status['analysis_age_seconds']:.0f}s old)\n"
+    return snapshot, (
+        f"\n---\n🟡 Analysis may be stale: {status['pending_changes']} pending file change(s), "
+        f"{status['generations_behind']} unanalyzed change batch(es), "
+        f"{status['analysis_age_seconds']:.0f}s old. Pass `wait_for_fresh` for current results.\n"
+    )
+
 @app.list_resources()
 async def list_resources() -> List[Resource]:
     """List available cross-reference resources"""
@@ -119,6 +161,11 @@ Analyze relationships and dependencies between files.
 - **Parameters**: `project_path` (string)
 - **Returns**: Dependency graph, cycles, clusters, and relationship types
 
+### `register_project`
+Keep a project scanned and analyzed in the background (requires `DAEMON_MODE=true`).
+- **Parameters**: `project_path` (string), `project_name` (optional string)
+- **Returns**: Background analysis state; project tools then answer from the warm analysis with a freshness note, and accept `wait_for_fresh` to wait for pending changes
+
 ## 🚀 Quick Start
 
 1. **Analyze a single file**: Use `analyze_file` with just the file path
@@ -211,6 +258,14 @@ async def list_tools() -> List[Tool]:
                     "project_name": {
                         "type": "string",
                         "description": "Name for the project (optional, uses directory name if not provided)"
+                    },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Rescan the project instead of reusing a recent analysis (optional)"
+                    },
+                    "wait_for_fresh": {
+                        "type": "boolean",
+                        "description": "In daemon mode, wait until recent changes are analyzed (optional)"
                     }
                 },
                 "required": ["project_path"]
@@ -225,6 +280,14 @@ async def list_tools() -> List[Tool]:
                     "project_path": {
                         "type": "string",
                         "description": "Path to the project directory"
+                    },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Rescan the project instead of reusing a recent analysis (optional)"
+                    },
+                    "wait_for_fresh": {
+                        "type": "boolean",
+                        "description": "In daemon mode, wait until recent changes are analyzed (optional)"
                     }
                 },
                 "required": ["project_path"]
@@ -239,6 +302,14 @@ async def list_tools() -> List[Tool]:
                     "project_path": {
                         "type": "string",
                         "description": "Path to the project directory"
+                    },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Rescan the project instead of reusing a recent analysis (optional)"
+                    },
+                    "wait_for_fresh": {
+                        "type": "boolean",
+                        "description": "In daemon mode, wait until recent changes are analyzed (optional)"
                     }
                 },
                 "required": ["project_path"]
@@ -253,6 +324,32 @@ async def list_tools() -> List[Tool]:
                     "project_path": {
                         "type": "string",
                         "description": "Path to the project directory"
+                    },
+                    "refresh": {
+                        "type": "boolean",
+                        "description": "Rescan the project instead of reusing a recent analysis (optional)"
+                    },
+                    "wait_for_fresh": {
+                        "type": "boolean",
+                        "description": "In daemon mode, wait until recent changes are analyzed (optional)"
+                    }
+                },
+                "required": ["project_path"]
+            }
+        ),
+        Tool(
+            name="register_project",
+            description="Keep a project scanned and analyzed in the background (daemon mode)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "project_path": {
+                        "type": "string",
+                        "description": "Path to the project directory"
+                    },
+                    "project_name": {
+                        "type": "string",
+                        "description": "Name for the project (optional, uses directory name if not provided)"
                     }
                 },
                 "required": ["project_path"]
@@ -349,47 +446,28 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
             
             # Perform project analysis
             try:
-                # Set up scanner
-                scanner_config = {
-                    "include_patterns": ["*.py", "*.js", "*.jsx", "*.ts", "*.tsx", "*.md", "*.txt"],
-                    "exclude_patterns": ["__pycache__/", "node_modules/", "dist/", "build/", ".git/"]
-                }
-                
-                scanner = await orchestrator.add_project(
-                    project_name=project_name,
-                    root_path=Path(project_path),
-                    enable_monitoring=False,
-                    enable_performance_management=False,
-                    config=scanner_config
-                )
-                
-                # Scan project
-                await scanner.initialize()
-                stats = await scanner.scan_project()
-                project_id = scanner.project_id
-                
-                # Analyze content
-                analysis_results = await universal_analyzer.content_analyzer.analyze_project_files(project_id)
-                
-                # Detect relationships
-                relationships, dependency_graph, recommendations = await universal_analyzer.relationship_analyzer.analyze_project_relationships(
-                    project_id, analysis_results
-                )
-                
-                # Detect patterns
-                pattern_report = universal_analyzer.pattern_detector.detect_all_patterns(analysis_results)
+                snapshot, freshness = await get_project_snapshot(arguments, project_name)
+                if snapshot is None:
+                    return [TextContent(type="text", text=freshness)]
+                stats = snapshot.scan_stats
+                analysis_results = snapshot.content_results
+                relationships = snapshot.relationships
+                dependency_graph = snapshot.dependency_graph
+                recommendations = snapshot.recommendations
+                pattern_report = snapshot.pattern_report
                 
                 # Format comprehensive report
                 response = f"""# 🔗 Project Analysis: {project_name}
 
 ## 📊 Project Overview
-- **Files Scanned**: {stats.files_processed}
+- **Files Scanned**: {stats.files_processed if stats else len(snapshot.content_hashes)}
 - **Files Analyzed**: {len(analysis_results)}
 - **Total Imports**: {sum(len(r.imports) for r in analysis_results.values())}
 - **Total Exports**: {sum(len(r.exports) for r in analysis_results.values())}
 - **Relationships**: {len(relationships)}
 - **Hub Files**: {len(dependency_graph.hub_files)}
 - **Quality Score**: {pattern_report.quality_score:.2f}
+- **Analysis Built In**: {snapshot.build_seconds:.2f}s (refreshes: {snapshot.refreshes})
 
 ## 🏛️ Hub Files Detected
 """
@@ -430,10 +508,7 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
                 else:
                     response += "No recommendations generated.\n"
                 
-                # Cleanup
-                await scanner.cleanup()
-                
-                return [TextContent(type="text", text=response)]
+                return [TextContent(type="text", text=response + freshness)]
                 
             except Exception as e:
                 return [TextContent(type="text", text=f"❌ Analysis failed: {str(e)}")]
@@ -445,28 +520,11 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
                 return [TextContent(type="text", text=f"❌ Project path not found: {project_path}")]
             
             try:
-                # Quick project setup for recommendations
-                scanner_config = {
-                    "include_patterns": ["*.py", "*.js", "*.jsx", "*.ts", "*.tsx", "*.md", "*.txt"],
-                    "exclude_patterns": ["__pycache__/", "node_modules/", "dist/", "build/", ".git/"]
-                }
-                
-                scanner = await orchestrator.add_project(
-                    project_name=f"recommendations_{Path(project_path).name}",
-                    root_path=Path(project_path),
-                    enable_monitoring=False,
-                    enable_performance_management=False,
-                    config=scanner_config
-                )
-                
-                await scanner.initialize()
-                await scanner.scan_project()
-                
-                analysis_results = await universal_analyzer.content_analyzer.analyze_project_files(scanner.project_id)
-                relationships, dependency_graph, recommendations = await universal_analyzer.relationship_analyzer.analyze_project_relationships(
-                    scanner.project_id, analysis_results
-                )
-                
+                snapshot, freshness = await get_project_snapshot(arguments, arguments.get("project_name"))
+                if snapshot is None:
+                    return [TextContent(type="text", text=freshness)]
+                recommendations = snapshot.recommendations
+
                 response = f"# 💡 Cross-Reference Recommendations\n\n"
                 
                 if recommendations:
@@ -490,8 +548,7 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
                 else:
                     response += "No recommendations generated. Project may already have good cross-reference coverage.\n"
                 
-                await scanner.cleanup()
-                return [TextContent(type="text", text=response)]
+                return [TextContent(type="text", text=response + freshness)]
                 
             except Exception as e:
                 return [TextContent(type="text", text=f"❌ Recommendation generation failed: {str(e)}")]
@@ -503,27 +560,13 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
                 return [TextContent(type="text", text=f"❌ Project path not found: {project_path}")]
             
             try:
-                scanner_config = {
-                    "include_patterns": ["*.py", "*.js", "*.jsx", "*.ts", "*.tsx", "*.md", "*.txt"],
-                    "exclude_patterns": ["__pycache__/", "node_modules/", "dist/", "build/", ".git/"]
-                }
-                
-                scanner = await orchestrator.add_project(
-                    project_name=f"hubdetect_{Path(project_path).name}",
-                    root_path=Path(project_path),
-                    enable_monitoring=False,
-                    enable_performance_management=False,
-                    config=scanner_config
-                )
-                
-                await scanner.initialize()
-                await scanner.scan_project()
-                
-                analysis_results = await universal_analyzer.content_analyzer.analyze_project_files(scanner.project_id)
-                relationships, dependency_graph, _ = await universal_analyzer.relationship_analyzer.analyze_project_relationships(
-                    scanner.project_id, analysis_results
-                )
-                
+                snapshot, freshness = await get_project_snapshot(arguments, arguments.get("project_name"))
+                if snapshot is None:
+                    return [TextContent(type="text", text=freshness)]
+                analysis_results = snapshot.content_results
+                relationships = snapshot.relationships
+                dependency_graph = snapshot.dependency_graph
+
                 response = f"# 🏛️ Hub Files Analysis\n\n"
                 
                 if dependency_graph.hub_files:
@@ -553,8 +596,7 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
                 else:
                     response += "No hub files detected. Consider creating central documentation files.\n"
                 
-                await scanner.cleanup()
-                return [TextContent(type="text", text=response)]
+                return [TextContent(type="text", text=response + freshness)]
                 
             except Exception as e:
                 return [TextContent(type="text", text=f"❌ Hub file detection failed: {str(e)}")]
@@ -566,27 +608,12 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
                 return [TextContent(type="text", text=f"❌ Project path not found: {project_path}")]
             
             try:
-                scanner_config = {
-                    "include_patterns": ["*.py", "*.js", "*.jsx", "*.ts", "*.tsx", "*.md", "*.txt"],
-                    "exclude_patterns": ["__pycache__/", "node_modules/", "dist/", "build/", ".git/"]
-                }
-                
-                scanner = await orchestrator.add_project(
-                    project_name=f"relationships_{Path(project_path).name}",
-                    root_path=Path(project_path),
-                    enable_monitoring=False,
-                    enable_performance_management=False,
-                    config=scanner_config
-                )
-                
-                await scanner.initialize()
-                await scanner.scan_project()
-                
-                analysis_results = await universal_analyzer.content_analyzer.analyze_project_files(scanner.project_id)
-                relationships, dependency_graph, _ = await universal_analyzer.relationship_analyzer.analyze_project_relationships(
-                    scanner.project_id, analysis_results
-                )
-                
+                snapshot, freshness = await get_project_snapshot(arguments, arguments.get("project_name"))
+                if snapshot is None:
+                    return [TextContent(type="text", text=freshness)]
+                relationships = snapshot.relationships
+                dependency_graph = snapshot.dependency_graph
+
                 response = f"# 🔗 Relationship Analysis\n\n"
                 response += f"## 📊 Graph Overview\n"
                 response += f"- **Nodes**: {len(dependency_graph.nodes)}\n"
@@ -620,12 +647,28 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
                 else:
                     response += f"\n## 📁 No Strong Clusters\nFiles are well-distributed without tight clustering.\n"
                 
-                await scanner.cleanup()
-                return [TextContent(type="text", text=response)]
+                return [TextContent(type="text", text=response + freshness)]
                 
             except Exception as e:
                 return [TextContent(type="text", text=f"❌ Relationship analysis failed: {str(e)}")]
         
+        elif name == "register_project":
+            project_path = arguments["project_path"]
+            
+            if not Path(project_path).exists():
+                return [TextContent(type="text", text=f"❌ Project path not found: {project_path}")]
+            if analysis_daemon is None:
+                return [TextContent(type="text", text="❌ Background analysis is disabled (set DAEMON_MODE=true)")]
+            
+            project = await analysis_daemon.register(project_path, arguments.get("project_name"))
+            status = analysis_daemon.get_status(project)
+            response = f"# 🔄 Background Analysis: {project.scanner.project_name}\n\n"
+            response += f"- **Root**: {status['root_path']}\n"
+            response += f"- **State**: {status['state']}\n"
+            response += f"- **File Monitor**: {'active' if status['monitored'] else 'unavailable (periodic refresh)'}\n"
+            response += f"- **Pending Changes**: {status['pending_changes']}\n"
+            return [TextContent(type="text", text=response)]
+        
         else:
             return [TextContent(type="text", text=f"❌ Unknown tool: {name}")]
     
@@ -636,6 +679,8 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
 async def cleanup():
     """Cleanup server resources"""
     try:
+        if analysis_daemon is not None:
+            await analysis_daemon.stop()
         await orchestrator.cleanup_all()
         await close_db()
         logger.info("🧹 Server cleanup completed")
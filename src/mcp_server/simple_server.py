@@ -10,7 +10,6 @@ import re
 from datetime import datetime, timedelta
 import time # For watchdog
 import threading # For watchdog
-from watchdog.observers import Observer # For watchdog
 from watchdog.events import FileSystemEventHandler # For watchdog
 import fcntl
 import tempfile
@@ -34,13 +33,24 @@ except ImportError:
 
 # Async processing imports (Phase 5)
 import asyncio
-import aiofiles
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from collections import deque, OrderedDict
+import hashlib
+import heapq
+import multiprocessing
+import sqlite3
+import stat
 import uuid
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+# Shared src modules log through structlog; keep that output off the stdio transport
+import structlog
+structlog.configure(logger_factory=structlog.PrintLoggerFactory(file=sys.stderr))
+
+from src.utils.watch_service import watch_service
+
 # Initialize the MCP server
 mcp = FastMCP("universal-crossref")
 
@@ -48,9 +58,7 @@ mcp = FastMCP("universal-crossref")
 projects = {}
 current_project = None
 
-# Async task tracking system (Phase 5)
-active_tasks = {}
-task_executor = ThreadPoolExecutor(max_workers=2)
+# Async task tracking system (Phase 5): see PDFTaskStore / PDFJobScheduler
 
 # --- Phase 1: Critical Infrastructure Fixes ---
 
@@ -519,30 +527,484 @@ hub_update_queue = HubUpdateQueue(batch_window=10.0, max_retries=3)
 transaction_logger = TransactionLogger("crossref_operations.log")
 hub_update_queue.set_logger(transaction_logger)
 
+class PDFTaskCancelled(Exception):
+    """Raised inside a running extraction when its task has been cancelled."""
+
 class PDFExtractionTask:
-    def __init__(self, task_id: str, pdf_path: str, params: dict):
+    def __init__(self, task_id: str, pdf_path: str, params: dict, priority: int = 0):
         self.task_id = task_id
         self.pdf_path = pdf_path
         self.params = params
-        self.status = "starting"
+        self.priority = priority
+        self.status = "queued"
         self.progress = 0.0
         self.result = None
         self.error = None
-        self.start_time = datetime.now()
-        
+        self.start_time = datetime.now()  # Submission time
+        self.run_start_time = None
+        self.end_time = None
+        self.cancel_requested = False
+        self.store = None  # Set by PDFTaskStore when the task is persisted
+        self.saved_at = 0.0  # time.monotonic() of the last write to the store
+
+    def _persist(self, coalesce=False):
+        if self.store is not None:
+            self.store.save(self, coalesce=coalesce)
+
     def update_status(self, status: str, progress: float = None):
+        # Progress ticks within a stage are throttled; stage changes always persist
+        coalesce = status == self.status
         self.status = status
         if progress is not None:
             self.progress = progress
-            
+        self._persist(coalesce=coalesce)
+
     def complete(self, result: dict):
         self.status = "completed"
         self.progress = 100.0
         self.result = result
-        
+        self.end_time = datetime.now()
+        self._persist()
+
     def fail(self, error: str):
         self.status = "failed"
         self.error = error
+        self.end_time = datetime.now()
+        self._persist()
+
+    def cancel(self):
+        self.status = "cancelled"
+        self.error = "Task cancelled"
+        self.end_time = datetime.now()
+        self._persist()
+
+    def is_finished(self) -> bool:
+        return self.status in ("completed", "failed", "cancelled")
+
+    def raise_if_cancelled(self):
+        """Checkpoint used by the extraction pipeline between stages."""
+        if self.cancel_requested:
+            raise PDFTaskCancelled(self.task_id)
+
+    def to_row(self) -> tuple:
+        return (
+            self.task_id, self.pdf_path, json.dumps(self.params), self.priority,
+            self.status, self.progress,
+            json.dumps(self.result) if self.result is not None else None,
+            self.error, int(self.cancel_requested),
+            self.start_time.isoformat(),
+            self.run_start_time.isoformat() if self.run_start_time else None,
+            self.end_time.isoformat() if self.end_time else None
+        )
+
+    @classmethod
+    def from_row(cls, row) -> "PDFExtractionTask":
+        (task_id, pdf_path, params, priority, status, progress, result, error,
+         cancel_requested, start_time, run_start_time, end_time) = row
+        task = cls(task_id, pdf_path, json.loads(params), priority)
+        task.status = status
+        task.progress = progress
+        task.result = json.loads(result) if result else None
+        task.error = error
+        task.cancel_requested = bool(cancel_requested)
+        task.start_time = datetime.fromisoformat(start_time)
+        task.run_start_time = datetime.fromisoformat(run_start_time) if run_start_time else None
+        task.end_time = datetime.fromisoformat(end_time) if end_time else None
+        return task
+
+class PDFTaskStore:
+    """SQLite-backed PDF task store with a small LRU front cache.
+
+    Every task lives in the ``pdf_tasks`` table; only running tasks (pinned,
+    bounded by the scheduler's worker count) and the most recently used
+    ``cache_size`` tasks are kept in memory. Finished tasks expire after
+    ``ttl_seconds`` whether or not their status was ever checked.
+    """
+
+    COLUMNS = ("task_id, pdf_path, params, priority, status, progress, result, error, "
+               "cancel_requested, start_time, run_start_time, end_time")
+
+    def __init__(self, db_path=None, cache_size=128, ttl_seconds=86400, eviction_interval=60.0,
+                 progress_interval=1.0):
+        self.db_path = str(
+            Path(db_path).expanduser() if db_path
+            else Path.home() / ".cache" / "universal-crossref" / "crossref_tasks.db"
+        )
+        self.cache_size = max(1, int(cache_size))
+        self.ttl_seconds = float(ttl_seconds)
+        self.eviction_interval = eviction_interval
+        self.progress_interval = float(progress_interval)
+        self.lock = threading.RLock()
+        self.cache = OrderedDict()
+        self.pinned = {}
+        self.last_eviction = 0.0
+        self._conn = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The database connection, opened (and the schema created) on first use."""
+        with self.lock:
+            if self._conn is None:
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS pdf_tasks (
+                        task_id TEXT PRIMARY KEY,
+                        pdf_path TEXT NOT NULL,
+                        params TEXT NOT NULL,
+                        priority INTEGER NOT NULL DEFAULT 0,
+                        status TEXT NOT NULL,
+                        progress REAL NOT NULL DEFAULT 0,
+                        result TEXT,
+                        error TEXT,
+                        cancel_requested INTEGER NOT NULL DEFAULT 0,
+                        start_time TEXT NOT NULL,
+                        run_start_time TEXT,
+                        end_time TEXT
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_pdf_tasks_status ON pdf_tasks (status, end_time)")
+                conn.commit()
+                self._conn = conn
+            return self._conn
+
+    def _remember(self, task):
+        # Caller holds self.lock
+        task.store = self
+        self.cache[task.task_id] = task
+        self.cache.move_to_end(task.task_id)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def save(self, task: PDFExtractionTask, coalesce=False):
+        """Insert or update a task row.
+
+        With ``coalesce`` (progress within one stage) the write is skipped when
+        the task was saved less than ``progress_interval`` seconds ago; the
+        live object still carries the latest progress.
+        """
+        now = time.monotonic()
+        with self.lock:
+            if coalesce and now - task.saved_at < self.progress_interval:
+                if task.task_id not in self.pinned:
+                    self._remember(task)
+                return
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO pdf_tasks ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                task.to_row()
+            )
+            self.conn.commit()
+            task.saved_at = now
+            if task.task_id not in self.pinned:
+                self._remember(task)
+
+    def get(self, task_id: str):
+        """Return the live task object, loading it from SQLite on a cache miss."""
+        with self.lock:
+            task = self.pinned.get(task_id)
+            if task is not None:
+                return task
+            task = self.cache.get(task_id)
+            if task is not None:
+                self.cache.move_to_end(task_id)
+                return task
+            row = self.conn.execute(
+                f"SELECT {self.COLUMNS} FROM pdf_tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            task = PDFExtractionTask.from_row(row)
+            self._remember(task)
+            return task
+
+    def pin(self, task: PDFExtractionTask):
+        """Keep a running task in memory so progress updates hit one object."""
+        with self.lock:
+            task.store = self
+            self.pinned[task.task_id] = task
+            self.cache.pop(task.task_id, None)
+
+    def unpin(self, task_id: str):
+        with self.lock:
+            task = self.pinned.pop(task_id, None)
+            if task is not None:
+                self._remember(task)
+
+    def delete(self, task_id: str):
+        with self.lock:
+            self.conn.execute("DELETE FROM pdf_tasks WHERE task_id = ?", (task_id,))
+            self.conn.commit()
+            self.cache.pop(task_id, None)
+            self.pinned.pop(task_id, None)
+
+    def list_tasks(self, limit=100) -> list:
+        """Most relevant tasks first: unfinished by priority, then recently finished."""
+        self.evict_expired()
+        with self.lock:
+            rows = self.conn.execute(
+                f"""SELECT task_id FROM pdf_tasks
+                    ORDER BY status IN ('completed', 'failed', 'cancelled'), priority DESC, start_time
+                    LIMIT ?""",
+                (int(limit),)
+            ).fetchall()
+        return [task for task in (self.get(row[0]) for row in rows) if task is not None]
+
+    def count(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM pdf_tasks").fetchone()[0]
+
+    def unfinished_tasks(self) -> list:
+        """Tasks that were queued or running, in original dispatch order."""
+        with self.lock:
+            rows = self.conn.execute(
+                f"""SELECT {self.COLUMNS} FROM pdf_tasks
+                    WHERE status NOT IN ('completed', 'failed', 'cancelled')
+                    ORDER BY priority DESC, start_time"""
+            ).fetchall()
+        return [PDFExtractionTask.from_row(row) for row in rows]
+
+    def evict_expired(self, force=False) -> int:
+        """Drop finished tasks older than the TTL. Throttled unless forced."""
+        now = time.time()
+        if not force and now - self.last_eviction < self.eviction_interval:
+            return 0
+        cutoff = (datetime.now() - timedelta(seconds=self.ttl_seconds)).isoformat()
+        with self.lock:
+            self.last_eviction = now
+            expired = [row[0] for row in self.conn.execute(
+                """SELECT task_id FROM pdf_tasks
+                   WHERE status IN ('completed', 'failed', 'cancelled') AND end_time < ?""",
+                (cutoff,)
+            )]
+            if expired:
+                self.conn.execute(
+                    """DELETE FROM pdf_tasks
+                       WHERE status IN ('completed', 'failed', 'cancelled') AND end_time < ?""",
+                    (cutoff,)
+                )
+                self.conn.commit()
+                for task_id in expired:
+                    self.cache.pop(task_id, None)
+        return len(expired)
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            by_status = dict(self.conn.execute(
+                "SELECT status, COUNT(*) FROM pdf_tasks GROUP BY status"
+            ).fetchall())
+            return {
+                "db_path": self.db_path,
+                "stored_tasks": sum(by_status.values()),
+                "by_status": by_status,
+                "cached_tasks": len(self.cache),
+                "pinned_tasks": len(self.pinned),
+                "cache_size": self.cache_size,
+                "ttl_seconds": self.ttl_seconds
+            }
+
+class PDFJobScheduler:
+    """Bounded priority scheduler for async PDF extraction jobs.
+
+    Jobs wait in a bounded heap ordered by priority (higher first) and submission
+    order. A fixed number of dispatcher threads each run one job at a time in its
+    own event loop, and CPU-bound text extraction is offloaded to a process pool
+    of the same size.
+    """
+
+    def __init__(self, store, max_workers=2, max_queue_size=50):
+        self.store = store
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue_size = max(1, int(max_queue_size))
+        self.condition = threading.Condition()
+        self.queue = []  # heap of (-priority, sequence, task_id)
+        self.sequence = 0
+        self.running = {}
+        self.dispatchers = []
+        self.process_pool = None
+        self.shutting_down = False
+        self.completed_durations = deque(maxlen=100)  # (finished_at, seconds)
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "rejected": 0}
+
+    def get_process_pool(self):
+        """Lazily create the process pool used for CPU-bound extraction."""
+        with self.condition:
+            if self.process_pool is None:
+                # spawn: forking from a dispatcher thread while watcher threads run is unsafe
+                self.process_pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self.process_pool
+
+    def _ensure_dispatchers(self):
+        # Caller holds self.condition
+        self.dispatchers = [t for t in self.dispatchers if t.is_alive()]
+        while len(self.dispatchers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._dispatch_loop,
+                name=f"pdf-job-worker-{len(self.dispatchers) + 1}",
+                daemon=True
+            )
+            self.dispatchers.append(worker)
+            worker.start()
+
+    def submit(self, task: PDFExtractionTask, enforce_limit=True) -> bool:
+        """Queue a task. Returns False if the queue is full."""
+        with self.condition:
+            if enforce_limit and len(self.queue) >= self.max_queue_size:
+                self.counters["rejected"] += 1
+                return False
+            self.sequence += 1
+            heapq.heappush(self.queue, (-task.priority, self.sequence, task.task_id))
+            self.store.save(task)
+            self.counters["submitted"] += 1
+            self._ensure_dispatchers()
+            self.condition.notify()
+            return True
+
+    def resume_pending(self) -> int:
+        """Re-queue tasks left queued or running by a previous server process."""
+        resumed = 0
+        for task in self.store.unfinished_tasks():
+            if task.cancel_requested:
+                task.store = self.store
+                task.cancel()
+                continue
+            task.update_status("queued", 0.0)
+            task.run_start_time = None
+            self.submit(task, enforce_limit=False)
+            resumed += 1
+        self.store.evict_expired(force=True)
+        return resumed
+
+    def cancel(self, task_id: str) -> bool:
+        """Cancel a queued task immediately or flag a running one to stop at its next checkpoint."""
+        with self.condition:
+            task = self.store.get(task_id)
+            if task is None or task.is_finished():
+                return False
+            for index, entry in enumerate(self.queue):
+                if entry[2] == task_id:
+                    self.queue.pop(index)
+                    heapq.heapify(self.queue)
+                    task.cancel()
+                    self.counters["cancelled"] += 1
+                    return True
+            task.cancel_requested = True
+            task.update_status("cancelling")
+            return True
+
+    def _dispatch_loop(self):
+        while True:
+            with self.condition:
+                while not self.queue and not self.shutting_down:
+                    self.condition.wait()
+                if self.shutting_down:
+                    return
+                _, _, task_id = heapq.heappop(self.queue)
+                task = self.store.get(task_id)
+                if task is None or task.is_finished():
+                    continue
+                self.store.pin(task)
+                task.run_start_time = datetime.now()
+                task.update_status("starting", 0.0)
+                self.running[task_id] = task
+
+            try:
+                asyncio.run(process_pdf_async(task_id, task.pdf_path, task.params))
+            except Exception as e:
+                if not task.is_finished():
+                    task.fail(f"PDF extraction failed: {str(e)}")
+            finally:
+                with self.condition:
+                    self.running.pop(task_id, None)
+                    if not task.is_finished():
+                        task.fail("PDF extraction ended without a result")
+                    self.store.unpin(task_id)
+                    self.counters[task.status] = self.counters.get(task.status, 0) + 1
+                    if task.status == "completed" and task.run_start_time:
+                        duration = (task.end_time - task.run_start_time).total_seconds()
+                        self.completed_durations.append((time.time(), duration))
+                self.store.evict_expired()
+
+    def queue_position(self, task_id: str):
+        """1-based position of a queued task in dispatch order, or None if not queued."""
+        with self.condition:
+            for position, entry in enumerate(sorted(self.queue), 1):
+                if entry[2] == task_id:
+                    return position
+        return None
+
+    def average_job_seconds(self):
+        with self.condition:
+            if not self.completed_durations:
+                return None
+            return sum(d for _, d in self.completed_durations) / len(self.completed_durations)
+
+    def estimate_eta_seconds(self, task: PDFExtractionTask):
+        """Rough seconds until the task finishes, based on recent job durations."""
+        if task.is_finished():
+            return 0.0
+        average = self.average_job_seconds()
+        if task.task_id in self.running and task.run_start_time:
+            elapsed = (datetime.now() - task.run_start_time).total_seconds()
+            if task.progress > 5:
+                return round(max(0.0, elapsed * (100.0 - task.progress) / task.progress), 1)
+            if average is not None:
+                return round(max(0.0, average - elapsed), 1)
+            return None
+        position = self.queue_position(task.task_id)
+        if position is None or average is None:
+            return None
+        jobs_ahead = position - 1 + len(self.running)
+        return round((jobs_ahead / self.max_workers) * average + average, 1)
+
+    def get_throughput(self) -> dict:
+        with self.condition:
+            cutoff = time.time() - 3600
+            recent = [d for finished, d in self.completed_durations if finished >= cutoff]
+            counters = dict(self.counters)
+        average = sum(recent) / len(recent) if recent else None
+        return {
+            "jobs_last_hour": len(recent),
+            "jobs_per_minute": round(len(recent) / 60.0, 3),
+            "average_job_seconds": round(average, 2) if average is not None else None,
+            **counters
+        }
+
+    def get_status(self) -> dict:
+        with self.condition:
+            status = {
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "queued": len(self.queue),
+                "running": len(self.running),
+                "process_pool_active": self.process_pool is not None
+            }
+        status["throughput"] = self.get_throughput()
+        status["task_store"] = self.store.get_stats()
+        return status
+
+    def shutdown(self):
+        with self.condition:
+            self.shutting_down = True
+            self.condition.notify_all()
+            pool, self.process_pool = self.process_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+pdf_task_store = PDFTaskStore(
+    db_path=os.environ.get("CROSSREF_TASK_DB"),
+    cache_size=int(os.environ.get("CROSSREF_TASK_CACHE_SIZE", "128")),
+    ttl_seconds=float(os.environ.get("CROSSREF_TASK_TTL_SECONDS", "86400"))
+)
+pdf_job_scheduler = PDFJobScheduler(
+    pdf_task_store,
+    max_workers=int(os.environ.get("CROSSREF_PDF_WORKERS", "2")),
+    max_queue_size=int(os.environ.get("CROSSREF_PDF_QUEUE_SIZE", "50"))
+)
 
 # --- Core Cross-Reference Functions (defined before use) ---
 
@@ -837,12 +1299,249 @@ def implement_crossref_methodology(project_path: str, hub_file_name: str = "SYST
         return {"error": f"Failed to implement cross-reference methodology: {str(e)}"}
 
 # --- Watchdog Implementation ---
-active_observers = {}
+active_watchers = {}  # project_path -> CrossRefEventHandler registered with the shared watch service
 
-class CrossRefEventHandler(FileSystemEventHandler):
+class MarkdownPathIndex:
+    """In-memory set of a watched project's markdown files (relative paths).
+    
+    Seeded with one tree walk when the watcher starts and then kept current by
+    the watcher's create/delete/move events in O(1) per event. Insertion order is
+    preserved so related-file suggestions stay stable.
+    """
+    
     def __init__(self, project_path: Path, hub_file_name: str):
-        self.project_path = project_path
+        self.project_path = Path(project_path)
+        self.hub_file_name = hub_file_name
+        self.paths = {}  # relative path -> None (ordered set)
+        self.lock = threading.Lock()
+    
+    def _is_indexed_name(self, name: str) -> bool:
+        return name.endswith('.md') and name != self.hub_file_name
+    
+    def seed(self) -> int:
+        """Walk the project once and replace the index contents."""
+        paths = {}
+        root = str(self.project_path)
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel_dir = os.path.relpath(dirpath, root)
+            for name in filenames:
+                if self._is_indexed_name(name):
+                    paths[name if rel_dir == '.' else os.path.join(rel_dir, name)] = None
+        with self.lock:
+            self.paths = paths
+            return len(paths)
+    
+    def add(self, relative_path: str):
+        if self._is_indexed_name(Path(relative_path).name):
+            with self.lock:
+                self.paths[relative_path] = None
+    
+    def discard(self, relative_path: str):
+        with self.lock:
+            self.paths.pop(relative_path, None)
+    
+    def move(self, src_relative_path: str, dest_relative_path: str):
+        self.discard(src_relative_path)
+        self.add(dest_relative_path)
+    
+    def related(self, exclude: str, limit: int = 2) -> list:
+        """Return up to ``limit`` indexed files other than ``exclude``."""
+        related = []
+        with self.lock:
+            for path in self.paths:
+                if path != exclude:
+                    related.append(path)
+                    if len(related) >= limit:
+                        break
+        return related
+    
+    def all_paths(self) -> list:
+        with self.lock:
+            return list(self.paths)
+    
+    def __len__(self):
+        return len(self.paths)
+
+class WatcherEventQueue:
+    """Bounded, coalescing queue between watchdog emitter threads and worker threads.
+    
+    Watchdog callbacks only record (handler, kind, path) here. Records for the
+    same path are merged (create+modify+modify -> one create, create+delete ->
+    nothing) and processed by a small worker pool once the path has been quiet
+    for ``settle_seconds``. When the queue is full, new paths are not queued;
+    their directories are remembered and rescanned against the handler's
+    markdown index instead.
+    """
+    
+    MAX_RESCAN_DIRS = 256
+    
+    def __init__(self, max_pending=10000, workers=2, settle_seconds=0.3):
+        self.max_pending = max(1, int(max_pending))
+        self.worker_count = max(1, int(workers))
+        self.settle_seconds = settle_seconds
+        self.condition = threading.Condition()
+        self.pending = OrderedDict()  # (handler id, path) -> record; least recently touched first
+        self.in_flight = set()
+        self.rescans = {}  # handler id -> (handler, set of relative dirs or None for whole tree)
+        self.workers = []
+        self.stats = {"enqueued": 0, "coalesced": 0, "processed": 0, "overflows": 0, "rescans": 0, "errors": 0}
+    
+    def _ensure_workers(self):
+        # Caller holds self.condition
+        self.workers = [t for t in self.workers if t.is_alive()]
+        while len(self.workers) < self.worker_count:
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"crossref-watch-worker-{len(self.workers) + 1}",
+                daemon=True
+            )
+            self.workers.append(worker)
+            worker.start()
+    
+    def _record_overflow(self, handler, *paths):
+        # Caller holds self.condition
+        self.stats["overflows"] += 1
+        _, dirs = self.rescans.get(id(handler), (handler, set()))
+        if dirs is not None:
+            for path in paths:
+                dirs.add(os.path.dirname(path))
+            if len(dirs) > self.MAX_RESCAN_DIRS:
+                dirs = None  # Too scattered: rescan the whole tree
+        self.rescans[id(handler)] = (handler, dirs)
+    
+    def _put(self, handler, record) -> bool:
+        # Caller holds self.condition
+        key = (id(handler), record["path"])
+        if key not in self.pending and len(self.pending) >= self.max_pending:
+            self._record_overflow(handler, record["path"], record.get("src_path") or record["path"])
+            return False
+        self.pending[key] = record
+        self.pending.move_to_end(key)
+        return True
+    
+    def enqueue(self, handler, kind, path, src_path=None):
+        """Record an event for later processing. ``path`` is relative to the handler's project."""
+        now = time.monotonic()
+        with self.condition:
+            self.stats["enqueued"] += 1
+            key = (id(handler), path)
+            existing = self.pending.get(key)
+            
+            if kind == "modified":
+                # Only used to delay processing of a pending record until writes settle
+                if existing is not None:
+                    existing["last_seen"] = now
+                    self.pending.move_to_end(key)
+                    self.stats["coalesced"] += 1
+                return
+            
+            if kind == "moved":
+                previous = self.pending.pop((id(handler), src_path), None)
+                if previous is not None:
+                    self.stats["coalesced"] += 1
+                    if previous["kind"] == "created":
+                        kind, src_path = "created", None
+                    elif previous["kind"] == "moved":
+                        src_path = previous["src_path"]
+            elif existing is not None:
+                self.stats["coalesced"] += 1
+                if kind == "deleted" and existing["kind"] == "created":
+                    # Created and deleted before we got to it: nothing to do
+                    del self.pending[key]
+                    return
+                if kind == "deleted" and existing["kind"] == "moved":
+                    # Moved here, then deleted: the original file is gone
+                    del self.pending[key]
+                    path = existing["src_path"]
+                elif kind == "created" and existing["kind"] == "moved":
+                    kind, src_path = "moved", existing["src_path"]
+            
+            record = {"handler": handler, "kind": kind, "path": path, "src_path": src_path, "last_seen": now}
+            if self._put(handler, record):
+                self._ensure_workers()
+                self.condition.notify()
+    
+    def _next_record(self):
+        """Pop the oldest settled record not being processed. Caller holds self.condition."""
+        now = time.monotonic()
+        wait = None
+        for key, record in self.pending.items():
+            if (key[0], record["path"]) in self.in_flight:
+                continue
+            remaining = record["last_seen"] + self.settle_seconds - now
+            if remaining <= 0:
+                del self.pending[key]
+                return record, None
+            wait = remaining
+            break  # Records are ordered by last touch; later ones are not settled either
+        return None, wait
+    
+    def _worker_loop(self):
+        while True:
+            with self.condition:
+                while True:
+                    record, wait = self._next_record()
+                    if record is not None:
+                        break
+                    if not self.pending and self.rescans:
+                        handler_id, (handler, dirs) = next(iter(self.rescans.items()))
+                        del self.rescans[handler_id]
+                        record = {"handler": handler, "kind": "rescan", "path": None, "dirs": dirs}
+                        break
+                    self.condition.wait(timeout=wait)
+                handler = record["handler"]
+                in_flight_key = (id(handler), record["path"])
+                self.in_flight.add(in_flight_key)
+            
+            try:
+                if handler.active:
+                    if record["kind"] == "rescan":
+                        handler.rescan(record["dirs"])
+                    else:
+                        handler.process_event(record["kind"], record["path"], record.get("src_path"))
+                with self.condition:
+                    self.stats["rescans" if record["kind"] == "rescan" else "processed"] += 1
+            except Exception as e:
+                with self.condition:
+                    self.stats["errors"] += 1
+                transaction_logger.log_operation('watch_event', record.get("path"), handler.hub_file_name, 'failed', str(e))
+            finally:
+                with self.condition:
+                    self.in_flight.discard(in_flight_key)
+                    self.condition.notify_all()
+    
+    def drop_handler(self, handler):
+        """Forget queued work for a handler whose watcher was stopped."""
+        with self.condition:
+            for key in [key for key in self.pending if key[0] == id(handler)]:
+                del self.pending[key]
+            self.rescans.pop(id(handler), None)
+    
+    def get_status(self) -> dict:
+        with self.condition:
+            return {
+                "pending_events": len(self.pending),
+                "in_flight": len(self.in_flight),
+                "pending_rescans": len(self.rescans),
+                "max_pending": self.max_pending,
+                "workers": len([t for t in self.workers if t.is_alive()]),
+                "settle_seconds": self.settle_seconds,
+                **self.stats
+            }
+
+watcher_event_queue = WatcherEventQueue(
+    max_pending=int(os.environ.get("CROSSREF_WATCH_QUEUE_SIZE", "10000")),
+    workers=int(os.environ.get("CROSSREF_WATCH_WORKERS", "2"))
+)
+
+class CrossRefEventHandler(FileSystemEventHandler):
+    def __init__(self, project_path: Path, hub_file_name: str, event_queue: WatcherEventQueue = None):
+        # Event paths arrive absolute; a relative root would make every one unmatched
+        self.project_path = Path(project_path).resolve()
         self.hub_file_name = hub_file_name
+        self.md_index = MarkdownPathIndex(self.project_path, hub_file_name)
+        self.event_queue = event_queue or watcher_event_queue
+        self.active = True
 
     def _is_relevant_md_file(self, file_path_str: str) -> bool:
         return file_path_str.endswith('.md') and not file_path_str.endswith(self.hub_file_name)
@@ -883,12 +1582,89 @@ class CrossRefEventHandler(FileSystemEventHandler):
         except Exception as e:
             return {"valid": False, "reason": f"read_error: {str(e)}"}
 
+    def _relative(self, path_str: str):
+        try:
+            return str(Path(path_str).relative_to(self.project_path))
+        except ValueError:
+            return None
+
+    # Watchdog callbacks run on the emitter thread: only record the event
+
     def on_created(self, event):
         if event.is_directory or not self._is_relevant_md_file(event.src_path):
             return
-        
-        file_path = Path(event.src_path)
-        relative_path = str(file_path.relative_to(self.project_path))
+        relative_path = self._relative(event.src_path)
+        if relative_path is not None:
+            self.event_queue.enqueue(self, "created", relative_path)
+
+    def on_modified(self, event):
+        if event.is_directory or not self._is_relevant_md_file(event.src_path):
+            return
+        relative_path = self._relative(event.src_path)
+        if relative_path is not None:
+            self.event_queue.enqueue(self, "modified", relative_path)
+
+    def on_deleted(self, event):
+        if event.is_directory or not self._is_relevant_md_file(event.src_path):
+            return
+        relative_path = self._relative(event.src_path)
+        if relative_path is not None:
+            self.event_queue.enqueue(self, "deleted", relative_path)
+
+    def on_moved(self, event):
+        if event.is_directory:
+            return
+        relative_src_path = self._relative(event.src_path)
+        relative_dest_path = self._relative(event.dest_path)
+        if relative_src_path is None or relative_dest_path is None:
+            return
+        if self._is_relevant_md_file(event.src_path) or self._is_relevant_md_file(event.dest_path):
+            self.event_queue.enqueue(self, "moved", relative_dest_path, src_path=relative_src_path)
+
+    # Event processing runs on the watcher worker pool
+
+    def process_event(self, kind: str, relative_path: str, relative_src_path: str = None):
+        if kind == "created":
+            self._process_created(relative_path)
+        elif kind == "deleted":
+            self._process_deleted(relative_path)
+        elif kind == "moved":
+            self._process_moved(relative_src_path, relative_path)
+
+    def rescan(self, relative_dirs=None):
+        """Reconcile the markdown index with disk after dropped events.
+        
+        ``relative_dirs`` limits the rescan to those directories (recursively);
+        None rescans the whole project.
+        """
+        roots = [""] if relative_dirs is None else sorted(relative_dirs)
+        on_disk = set()
+        for rel_root in roots:
+            base = self.project_path / rel_root
+            for dirpath, dirnames, filenames in os.walk(str(base)):
+                for name in filenames:
+                    full_path = os.path.join(dirpath, name)
+                    if self._is_relevant_md_file(full_path):
+                        on_disk.add(os.path.relpath(full_path, str(self.project_path)))
+        
+        def in_scope(rel_path):
+            return any(rel_root in ("", ".") or rel_path.startswith(rel_root + os.sep) for rel_root in roots)
+        
+        indexed = {rel for rel in self.md_index.all_paths() if in_scope(rel)}
+        for rel_path in sorted(on_disk - indexed):
+            self._process_created(rel_path)
+        for rel_path in sorted(indexed - on_disk):
+            self._process_deleted(rel_path)
+        transaction_logger.log_operation(
+            'watch_rescan', str(self.project_path), self.hub_file_name, 'success',
+            metadata={'dirs': roots, 'added': len(on_disk - indexed), 'removed': len(indexed - on_disk)}
+        )
+
+    def _process_created(self, relative_path: str):
+        file_path = self.project_path / relative_path
+        if not file_path.exists():
+            return
+        self.md_index.add(relative_path)
         
         print(f"🔍 Auto-watcher detected new file: {relative_path}")
         
@@ -936,14 +1712,8 @@ class CrossRefEventHandler(FileSystemEventHandler):
         )
         transaction_logger.log_operation('queue_update', relative_path, self.hub_file_name, 'queued')
 
-    def on_deleted(self, event):
-        if event.is_directory or not self._is_relevant_md_file(event.src_path):
-            if Path(event.src_path).name == self.hub_file_name:
-                pass
-            return
-        
-        deleted_file_path = Path(event.src_path)
-        relative_path = str(deleted_file_path.relative_to(self.project_path))
+    def _process_deleted(self, relative_path: str):
+        self.md_index.discard(relative_path)
         
         # Queue hub update for removal (batched operation)
         hub_update_queue.queue_hub_update(str(self.project_path / self.hub_file_name), 'remove', relative_path)
@@ -956,17 +1726,12 @@ class CrossRefEventHandler(FileSystemEventHandler):
             'queued'
         )
 
-    def on_moved(self, event):
-        if event.is_directory:
-            return
-        
-        src_is_relevant = self._is_relevant_md_file(event.src_path)
-        dest_is_relevant = self._is_relevant_md_file(event.dest_path)
+    def _process_moved(self, relative_src_path: str, relative_dest_path: str):
+        src_is_relevant = self._is_relevant_md_file(relative_src_path)
+        dest_is_relevant = self._is_relevant_md_file(relative_dest_path)
 
-        src_path_obj = Path(event.src_path)
-        dest_path_obj = Path(event.dest_path)
-        relative_src_path = str(src_path_obj.relative_to(self.project_path))
-        relative_dest_path = str(dest_path_obj.relative_to(self.project_path))
+        dest_path_obj = self.project_path / relative_dest_path
+        self.md_index.move(relative_src_path, relative_dest_path)
 
         # Handle source file removal
         if src_is_relevant:
@@ -974,11 +1739,10 @@ class CrossRefEventHandler(FileSystemEventHandler):
         
         # Handle destination file addition
         if dest_is_relevant:
-            all_md_in_project = [str(p.relative_to(self.project_path)) for p in self.project_path.rglob("*.md") 
-                                   if p.name != self.hub_file_name and p != dest_path_obj and not p.is_dir()]
+            related_files = self.md_index.related(exclude=relative_dest_path, limit=2)
             
             # Add header immediately (fast operation)
-            add_crossref_header(str(dest_path_obj), self.hub_file_name, all_md_in_project[:2])
+            add_crossref_header(str(dest_path_obj), self.hub_file_name, related_files)
 
             # Queue hub update (batched operation)
             hub_update_queue.queue_hub_update(str(self.project_path / self.hub_file_name), 'add', relative_dest_path)
@@ -1000,7 +1764,7 @@ def start_auto_crossref_watcher(project_path: str, hub_file_name: str = "SYSTEM.
         if not project_path_obj.exists() or not project_path_obj.is_dir():
             return {"error": f"Project path not found or not a directory: {project_path}"}
 
-        if project_path in active_observers:
+        if project_path in active_watchers:
             return {"warning": f"Watcher already active for project: {project_path}"}
 
         if current_project != project_path_obj.name or project_path_obj.name not in projects:
@@ -1008,9 +1772,13 @@ def start_auto_crossref_watcher(project_path: str, hub_file_name: str = "SYSTEM.
             if scan_result.get("error"):
                  return {"error": f"Initial project scan failed: {scan_result['error']}. Cannot start watcher."}
 
+        # Seed the handler's markdown index with the only full tree walk
+        event_handler = CrossRefEventHandler(project_path_obj, hub_file_name)
+        event_handler.md_index.seed()
+
         hub_file_abs_path = project_path_obj / hub_file_name
         if not hub_file_abs_path.exists():
-            related_md_files = [str(p.relative_to(project_path_obj)) for p in project_path_obj.rglob("*.md") if p.name != hub_file_name and not p.is_dir()]
+            related_md_files = event_handler.md_index.all_paths()
             create_hub_result = create_hub_file(
                 file_path=str(hub_file_abs_path), 
                 title=f"{project_path_obj.name} System Hub", 
@@ -1020,19 +1788,17 @@ def start_auto_crossref_watcher(project_path: str, hub_file_name: str = "SYSTEM.
             if create_hub_result.get("error"):
                 return {"error": f"Failed to create initial hub file {hub_file_name}: {create_hub_result['error']}"}
 
-        event_handler = CrossRefEventHandler(project_path_obj, hub_file_name)
-        observer = Observer()
-        observer.schedule(event_handler, str(project_path_obj), recursive=True)
-        
-        observer_thread = threading.Thread(target=observer.start, daemon=True)
-        observer_thread.start()
+        # One process-wide observer serves every watcher; overlapping trees share a watch
+        watch_service.schedule(event_handler, str(event_handler.project_path), recursive=True)
         
-        active_observers[project_path] = observer
+        active_watchers[project_path] = event_handler
         return {
             "success": True, 
             "project_path": project_path, 
             "status": "Watcher started",
-            "hub_file": hub_file_name
+            "hub_file": hub_file_name,
+            "indexed_md_files": len(event_handler.md_index),
+            "watch_service": watch_service.get_status()
         }
 
     except Exception as e:
@@ -1042,10 +1808,11 @@ def start_auto_crossref_watcher(project_path: str, hub_file_name: str = "SYSTEM.
 def stop_auto_crossref_watcher(project_path: str) -> dict:
     """Stop automatic cross-reference monitoring for a project."""
     try:
-        if project_path in active_observers:
-            observer = active_observers.pop(project_path)
-            observer.stop()
-            observer.join()
+        if project_path in active_watchers:
+            handler = active_watchers.pop(project_path)
+            watch_service.unschedule(handler, str(handler.project_path))
+            handler.active = False
+            handler.event_queue.drop_handler(handler)
             return {"success": True, "project_path": project_path, "status": "Watcher stopped"}
         else:
             return {"warning": f"No active watcher found for project: {project_path}"}
@@ -1206,14 +1973,16 @@ def get_tool_documentation() -> dict:
                 "description": "Scan a project directory for files and provide basic analysis statistics",
                 "parameters": {
                     "project_path": {"required": True, "type": "string", "description": "Path to the project directory"},
-                    "project_name": {"required": False, "type": "string", "description": "Name for the project (defaults to directory name)"}
+                    "project_name": {"required": False, "type": "string", "description": "Name for the project (defaults to directory name)"},
+                    "wait_for_fresh": {"required": False, "type": "boolean", "description": "Daemon mode: wait until pending file changes are indexed"}
                 },
                 "returns": {
                     "project_name": "Project identifier",
                     "files_found": "Total number of relevant files",
                     "languages": "Programming languages detected",
                     "total_lines": "Total lines of code/documentation",
-                    "sample_files": "List of example files found"
+                    "sample_files": "List of example files found",
+                    "freshness": "Daemon mode: background index state, pending changes and time since last update"
                 },
                 "use_cases": ["Initial project assessment", "Understanding project structure", "Prerequisites for other tools"],
                 "example": "scan_project('/path/to/project', 'MyProject')"
@@ -1222,7 +1991,8 @@ def get_tool_documentation() -> dict:
             "get_crossref_recommendations": {
                 "description": "Get recommendations for improving cross-reference coverage in a project",
                 "parameters": {
-                    "project_name": {"required": False, "type": "string", "description": "Project name (uses current project if not specified)"}
+                    "project_name": {"required": False, "type": "string", "description": "Project name (uses current project if not specified)"},
+                    "wait_for_fresh": {"required": False, "type": "boolean", "description": "Daemon mode: wait until pending file changes are indexed"}
                 },
                 "returns": {
                     "recommendations": "List of suggested improvements with priority levels",
@@ -1358,7 +2128,8 @@ def get_tool_documentation() -> dict:
             "verify_project_sync": {
                 "description": "🔍 **NEW**: Verify that all markdown files are properly cross-referenced and synchronized with the hub file",
                 "parameters": {
-                    "project_path": {"required": True, "type": "string", "description": "Path to the project directory to verify"}
+                    "project_path": {"required": True, "type": "string", "description": "Path to the project directory to verify"},
+                    "max_workers": {"required": False, "type": "integer", "description": "Threads used to probe changed files' headers in parallel (default: CROSSREF_VERIFY_WORKERS or 8; 1 = serial)"}
                 },
                 "returns": {
                     "success": "Boolean indicating verification completion",
@@ -1369,6 +2140,9 @@ def get_tool_documentation() -> dict:
                     "extra_in_hub": "List of files referenced in hub but not found on disk",
                     "missing_headers": "Files without proper cross-reference headers",
                     "incorrect_headers": "Files with malformed cross-reference headers",
+                    "header_bytes_read": "Bytes read while probing headers (only changed files are probed)",
+                    "files_per_second": "Verification throughput over all tracked files",
+                    "manifest": "Manifest refresh statistics (files probed/unchanged/removed, hub re-parse, probe throughput); manifests are kept in CROSSREF_MANIFEST_DIR (default ~/.cache/universal-crossref/manifests), never in the project",
                     "recommendations": "Specific actions needed to fix identified issues"
                 },
                 "use_cases": [
@@ -1520,7 +2294,8 @@ def get_tool_documentation() -> dict:
                     "max_chunks": {"required": False, "type": "integer", "description": "Maximum number of chunks to create (default: 20)"},
                     "extraction_strategy": {"required": False, "type": "string", "description": "Extraction strategy (default: 'auto')"},
                     "create_hub": {"required": False, "type": "boolean", "description": "Create hub file if true (default: True)"},
-                    "hub_file_name": {"required": False, "type": "string", "description": "Name of hub file to use (default: SYSTEM.md)"}
+                    "hub_file_name": {"required": False, "type": "string", "description": "Name of hub file to use (default: SYSTEM.md)"},
+                    "incremental": {"required": False, "type": "boolean", "description": "Skip rewriting files whose content is unchanged apart from timestamps (default: True)"}
                 },
                 "returns": {
                     "success": "Boolean indicating success",
@@ -1528,6 +2303,8 @@ def get_tool_documentation() -> dict:
                     "output_directory": "Path to output directory",
                     "chunks_created": "Number of chunks created",
                     "files_generated": "List of generated file paths",
+                    "files_written": "Number of files actually written this run",
+                    "files_skipped_unchanged": "Number of files left untouched because their content did not change (incremental mode)",
                     "hub_file": "Path to created hub file",
                     "extraction_quality": "Extraction quality score (0-1)",
                     "extraction_strategy": "Used extraction strategy (PyPDF2, pdfplumber, OCR)",
@@ -1583,12 +2360,17 @@ def get_tool_documentation() -> dict:
                     "pdf_path": {"required": True, "type": "string", "description": "Path to the PDF file to extract"},
                     "output_dir": {"required": False, "type": "string", "description": "Output directory for extracted files (defaults to same as PDF location)"},
                     "max_chunks": {"required": False, "type": "integer", "description": "Maximum number of chunks to create (default: 50)"},
-                    "create_hub": {"required": False, "type": "boolean", "description": "Create hub file with universal cross-reference methodology (default: True)"}
+                    "create_hub": {"required": False, "type": "boolean", "description": "Create hub file with universal cross-reference methodology (default: True)"},
+                    "hub_file_name": {"required": False, "type": "string", "description": "Hub file referenced by chapter headers (default: SYSTEM.md)"},
+                    "priority": {"required": False, "type": "integer", "description": "Scheduling priority, higher values run first (default: 0)"},
+                    "incremental": {"required": False, "type": "boolean", "description": "Skip rewriting files whose content is unchanged apart from timestamps (default: True)"}
                 },
                 "returns": {
-                    "success": "Boolean indicating successful task start",
+                    "success": "Boolean indicating successful task start (False when the job queue is full)",
                     "task_id": "Unique identifier for tracking the extraction task",
-                    "status": "Task status ('started')",
+                    "status": "Task status ('queued')",
+                    "queue_position": "1-based position in the job queue",
+                    "eta_seconds": "Estimated seconds until completion (None until a job has completed)",
                     "pdf_path": "Path to the PDF being processed",
                     "estimated_time": "Estimated processing time based on file size",
                     "instructions": "How to monitor progress using check_pdf_extraction_status",
@@ -1617,7 +2399,8 @@ def get_tool_documentation() -> dict:
                     "🏠 Creates comprehensive hub file with genre-appropriate navigation",
                     "⚡ Ideal for any book type - system automatically adapts its analysis approach",
                     "📊 Provides detailed progress updates and final content analysis",
-                    "🛡️ Handles timeouts and large files gracefully"
+                    "🛡️ Handles timeouts and large files gracefully",
+                    "🚦 Bounded job queue with CROSSREF_PDF_WORKERS worker processes (default 2) and CROSSREF_PDF_QUEUE_SIZE slots (default 50)"
                 ]
             },
 
@@ -1633,10 +2416,17 @@ def get_tool_documentation() -> dict:
                     "pdf_path": "Path to the PDF being processed",
                     "start_time": "When the task started",
                     "elapsed_time": "How long the task has been running",
+                    "priority": "Scheduling priority of the task",
+                    "queue_position": "Position in the job queue (None once running)",
+                    "eta_seconds": "Estimated seconds until completion",
+                    "throughput": "Scheduler throughput (jobs per minute, average job duration, outcome counters)",
                     "result": "Complete extraction results including content analysis (only when status is 'completed')",
-                    "error": "Error details (only when status is 'failed')"
+                    "error": "Error details (only when status is 'failed' or 'cancelled')"
                 },
                 "status_meanings": {
+                    "queued": "Waiting in the job queue for a free worker",
+                    "cancelling": "Cancellation requested, task stops at its next checkpoint",
+                    "cancelled": "Task was cancelled before completion",
                     "starting_extraction": "Initializing task and validating inputs",
                     "extracting_text": "Running multiple extraction strategies (PyPDF2, pdfplumber, OCR)",
                     "analyzing_content": "Detecting genre and analyzing content structure with AI",
@@ -1657,21 +2447,43 @@ def get_tool_documentation() -> dict:
                 ]
             },
 
+            "cancel_pdf_extraction_task": {
+                "description": "Cancel a queued or running asynchronous PDF extraction task",
+                "parameters": {
+                    "task_id": {"required": True, "type": "string", "description": "Task ID returned by extract_pdf_to_markdown_async"}
+                },
+                "returns": {
+                    "success": "Boolean indicating the cancellation was accepted",
+                    "task_id": "The task identifier",
+                    "status": "'cancelled' for queued tasks, 'cancelling' for running tasks",
+                    "message": "Description of the cancellation outcome"
+                },
+                "use_cases": ["Dropping extractions queued by mistake", "Freeing a worker for a more urgent PDF"],
+                "example": "cancel_pdf_extraction_task('abc123-def456-789')",
+                "notes": [
+                    "⏹️ Queued tasks are removed from the queue immediately",
+                    "🔄 Running tasks stop at the next stage boundary; files already written are kept"
+                ]
+            },
+
             "list_pdf_extraction_tasks": {
                 "description": "List all currently active PDF extraction tasks with their status and content analysis progress",
                 "parameters": {
-                    "random_string": {"required": True, "type": "string", "description": "Dummy parameter (use any string)"}
+                    "limit": {"required": False, "type": "integer", "description": "Maximum number of tasks to return (default: 100)"}
                 },
                 "returns": {
                     "success": "Boolean indicating successful listing",
-                    "active_tasks": "Number of currently running tasks",
-                    "tasks": "Array of task objects with id, status, progress, pdf_path, start_time, and detected_genre"
+                    "stored_tasks": "Total number of tasks held in the persistent task store",
+                    "active_tasks": "Number of tracked tasks (queued, running or awaiting status check)",
+                    "tasks": "Array of task objects with id, status, progress, priority, pdf_path, start_time, queue_position and eta_seconds",
+                    "scheduler": "Scheduler status: workers, queue depth, running jobs and throughput"
                 },
                 "use_cases": ["Monitoring multiple concurrent extractions", "Checking system load", "Debugging extraction queue", "Managing batch PDF processing"],
-                "example": "list_pdf_extraction_tasks('show_tasks')",
+                "example": "list_pdf_extraction_tasks(20)",
                 "notes": [
-                    "📋 Only shows currently running or pending tasks",
-                    "🗑️ Completed and failed tasks are automatically removed from the list",
+                    "📋 Queued and running tasks are listed first, then finished tasks awaiting a status check",
+                    "🗑️ Finished tasks are removed once their status is checked, or after CROSSREF_TASK_TTL_SECONDS (default 24h)",
+                    "💾 Tasks persist in CROSSREF_TASK_DB (default ~/.cache/universal-crossref/crossref_tasks.db); queued jobs resume after a restart",
                     "🔄 Useful for managing multiple concurrent PDF extractions",
                     "📊 Shows progress and genre detection status for each task"
                 ]
@@ -1854,9 +2666,275 @@ def analyze_file(file_path: str) -> dict:
     except Exception as e:
         return {"error": f"Analysis failed: {str(e)}"}
 
+# Daemon mode: registered projects are indexed in the background and kept current
+# by the shared watch service, so scan_project answers without walking the tree
+DAEMON_MODE = os.environ.get("CROSSREF_DAEMON_MODE", "").lower() in ("1", "true", "yes")
+DAEMON_WAIT_SECONDS = float(os.environ.get("CROSSREF_DAEMON_WAIT_SECONDS", "30"))
+SCAN_FILE_SUFFIXES = {".py", ".js", ".jsx", ".ts", ".tsx", ".md", ".txt", ".json"}
+SCAN_IGNORE_DIRS = {".git", "__pycache__", "node_modules", "dist", "build", ".venv", "venv"}
+
+class WarmProjectIndex(FileSystemEventHandler):
+    """Background-maintained file index for one project (daemon mode).
+    
+    Built by one tree walk on a worker thread, then kept current by watch
+    service events: the emitter thread only marks paths dirty and the worker
+    re-reads each dirty path once it has been quiet for ``settle_seconds``.
+    Readers never block on the walk and can wait until no change is pending.
+    """
+    
+    def __init__(self, project_path: Path, project_name: str, settle_seconds: float = 0.3):
+        # Event paths arrive absolute; a relative root would make every one unmatched
+        self.project_path = Path(project_path).resolve()
+        self.project_name = project_name
+        self.settle_seconds = settle_seconds
+        self.files = {}  # relative path -> {"language": ..., "lines": ...}
+        self.dirty = {}  # relative path -> monotonic time of its last event
+        self.rescan_dirs = set()  # relative dirs created, moved or deleted as a whole
+        self.processing = False
+        self.state = "warming"
+        self.error = None
+        self.updates_applied = 0
+        self.updated_at = None
+        self.active = True
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name=f"crossref-warm-{project_name}", daemon=True)
+    
+    def start(self):
+        # Watch before walking so changes made during the walk are not missed
+        watch_service.schedule(self, str(self.project_path), recursive=True)
+        self.thread.start()
+    
+    def stop(self):
+        watch_service.unschedule(self, str(self.project_path))
+        with self.condition:
+            self.active = False
+            self.condition.notify_all()
+    
+    def _relative(self, path_str: str):
+        try:
+            relative_path = str(Path(path_str).relative_to(self.project_path))
+        except ValueError:
+            return None
+        if any(part in SCAN_IGNORE_DIRS for part in Path(relative_path).parts):
+            return None
+        return relative_path
+    
+    # Watchdog callbacks run on the emitter thread: only record the path
+    
+    def on_any_event(self, event):
+        if event.event_type not in ("created", "modified", "deleted", "moved"):
+            return
+        paths = [os.fsdecode(event.src_path)]
+        if event.event_type == "moved":
+            paths.append(os.fsdecode(event.dest_path))
+        now = time.monotonic()
+        with self.condition:
+            for path in paths:
+                relative_path = self._relative(path)
+                if relative_path is None:
+                    continue
+                if event.is_directory:
+                    if event.event_type != "modified":
+                        self.rescan_dirs.add(relative_path)
+                elif Path(relative_path).suffix in SCAN_FILE_SUFFIXES:
+                    self.dirty[relative_path] = now
+            self.condition.notify_all()
+    
+    # Index maintenance runs on the index's worker thread
+    
+    def _file_entry(self, relative_path: str):
+        file_path = self.project_path / relative_path
+        if not file_path.is_file():
+            return None
+        try:
+            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                lines = sum(1 for _ in f)
+        except OSError:
+            lines = 0
+        return {"language": _detect_language(file_path), "lines": lines}
+    
+    def _walk(self, relative_dir: str = "") -> dict:
+        files = {}
+        root = str(self.project_path)
+        for dirpath, dirnames, filenames in os.walk(os.path.join(root, relative_dir)):
+            dirnames[:] = [d for d in dirnames if d not in SCAN_IGNORE_DIRS]
+            rel_dir = os.path.relpath(dirpath, root)
+            for name in filenames:
+                if os.path.splitext(name)[1] in SCAN_FILE_SUFFIXES:
+                    relative_path = name if rel_dir == "." else os.path.join(rel_dir, name)
+                    entry = self._file_entry(relative_path)
+                    if entry is not None:
+                        files[relative_path] = entry
+        return files
+    
+    def _take_settled(self):
+        """Pop dirty paths that have settled. Caller holds self.condition."""
+        now = time.monotonic()
+        settled = [path for path, last_seen in self.dirty.items() if now - last_seen >= self.settle_seconds]
+        for path in settled:
+            del self.dirty[path]
+        dirs, self.rescan_dirs = self.rescan_dirs, set()
+        wait = None
+        if self.dirty:
+            wait = max(0.0, self.settle_seconds - (now - min(self.dirty.values())))
+        return settled, dirs, wait
+    
+    def _run(self):
+        try:
+            files = self._walk()
+        except Exception as e:
+            with self.condition:
+                self.state, self.error = "error", str(e)
+                self.condition.notify_all()
+            transaction_logger.log_operation('warm_index', str(self.project_path), None, 'failed', str(e))
+            return
+        
+        with self.condition:
+            self.files = files
+            self.state = "ready"
+            self.updated_at = time.time()
+            self.condition.notify_all()
+        transaction_logger.log_operation(
+            'warm_index', str(self.project_path), None, 'success', metadata={'files': len(files)}
+        )
+        
+        while True:
+            with self.condition:
+                while True:
+                    if not self.active:
+                        return
+                    paths, dirs, wait = self._take_settled()
+                    if paths or dirs:
+                        self.processing = True
+                        break
+                    self.condition.wait(timeout=wait)
+            
+            try:
+                rescanned = {relative_dir: self._walk(relative_dir) for relative_dir in dirs}
+                entries = {path: self._file_entry(path) for path in paths}
+            except Exception as e:
+                rescanned, entries = {}, {}
+                transaction_logger.log_operation('warm_index', str(self.project_path), None, 'failed', str(e))
+            
+            with self.condition:
+                for relative_dir, present in rescanned.items():
+                    prefix = relative_dir + os.sep
+                    for path in [p for p in self.files if p.startswith(prefix) and p not in present]:
+                        del self.files[path]
+                    self.files.update(present)
+                for path, entry in entries.items():
+                    if entry is None:
+                        self.files.pop(path, None)
+                    else:
+                        self.files[path] = entry
+                self.processing = False
+                self.updates_applied += 1
+                self.updated_at = time.time()
+                self.condition.notify_all()
+    
+    def _is_fresh(self) -> bool:
+        # Caller holds self.condition
+        return self.state == "ready" and not self.dirty and not self.rescan_dirs and not self.processing
+    
+    def wait_until_fresh(self, timeout: float = None) -> bool:
+        """Block until every change seen so far is indexed (or timeout)."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.state == "error" or self._is_fresh(), timeout)
+            return self._is_fresh()
+    
+    def freshness(self) -> dict:
+        with self.condition:
+            fresh = self._is_fresh()
+            return {
+                "state": self.state if self.state != "ready" else ("fresh" if fresh else "stale"),
+                "fresh": fresh,
+                "pending_changes": len(self.dirty) + len(self.rescan_dirs) + (1 if self.processing else 0),
+                "updates_applied": self.updates_applied,
+                "last_update": datetime.fromtimestamp(self.updated_at).isoformat() if self.updated_at else None,
+                "seconds_since_update": round(time.time() - self.updated_at, 3) if self.updated_at else None,
+                "error": self.error
+            }
+    
+    def project_info(self):
+        """The index as a ``projects`` entry, or None until the first walk finishes."""
+        with self.condition:
+            if self.state != "ready":
+                return None
+            entries = list(self.files.items())
+        languages = {}
+        total_lines = 0
+        for _, entry in entries:
+            languages[entry["language"]] = languages.get(entry["language"], 0) + 1
+            total_lines += entry["lines"]
+        return {
+            "path": str(self.project_path),
+            "files": [str(self.project_path / path) for path, _ in entries],
+            "stats": {
+                "total_files": len(entries),
+                "languages": languages,
+                "total_lines": total_lines
+            }
+        }
+
+warm_projects = {}  # project name -> WarmProjectIndex (daemon mode)
+warm_projects_lock = threading.Lock()
+
+def register_warm_project(project_path, project_name: str = None) -> WarmProjectIndex:
+    """Start (or reuse) the background index for a project."""
+    project_path_obj = Path(project_path).resolve()
+    project_name = project_name or project_path_obj.name
+    with warm_projects_lock:
+        index = warm_projects.get(project_name)
+        if index is not None and index.project_path != project_path_obj:
+            index.stop()
+            index = None
+        if index is None:
+            index = WarmProjectIndex(project_path_obj, project_name)
+            index.start()
+            warm_projects[project_name] = index
+    return index
+
+def _scan_project_warm(project_path_obj: Path, project_name: str, wait_for_fresh: bool = False) -> dict:
+    """scan_project in daemon mode: answer from the project's background index."""
+    global current_project
+    index = register_warm_project(project_path_obj, project_name)
+    if wait_for_fresh:
+        index.wait_until_fresh(DAEMON_WAIT_SECONDS)
+    
+    info = index.project_info()
+    freshness = index.freshness()
+    if freshness["state"] == "error":
+        return {"error": f"Background indexing failed: {freshness['error']}"}
+    if info is None:
+        return {
+            "project_name": project_name,
+            "project_path": str(project_path_obj),
+            "freshness": freshness,
+            "summary": f"{project_name} is being indexed in the background; call again or pass wait_for_fresh=True"
+        }
+    
+    current_project = project_name
+    projects[project_name] = info
+    stats = info["stats"]
+    return {
+        "project_name": project_name,
+        "project_path": str(project_path_obj),
+        "files_found": stats["total_files"],
+        "languages": stats["languages"],
+        "total_lines": stats["total_lines"],
+        "sample_files": info["files"][:10],
+        "freshness": freshness,
+        "summary": f"Scanned {project_name}: {stats['total_files']} files, {len(stats['languages'])} languages"
+    }
+
 @mcp.tool()
-def scan_project(project_path: str, project_name: str = None) -> dict:
-    """Scan a project directory for files and basic analysis."""
+def scan_project(project_path: str, project_name: str = None, wait_for_fresh: bool = False) -> dict:
+    """Scan a project directory for files and basic analysis.
+    
+    In daemon mode (CROSSREF_DAEMON_MODE) the project is indexed in the
+    background and kept current; results carry a freshness indicator and
+    ``wait_for_fresh`` waits for pending changes to be indexed.
+    """
     try:
         project_path_obj = Path(project_path)
         if not project_path_obj.exists():
@@ -1865,6 +2943,9 @@ def scan_project(project_path: str, project_name: str = None) -> dict:
         if not project_name:
             project_name = project_path_obj.name
         
+        if DAEMON_MODE:
+            return _scan_project_warm(project_path_obj, project_name, wait_for_fresh)
+        
         # Find relevant files
         file_patterns = ["*.py", "*.js", "*.jsx", "*.ts", "*.tsx", "*.md", "*.txt", "*.json"]
         files_found = []
@@ -1924,12 +3005,23 @@ def scan_project(project_path: str, project_name: str = None) -> dict:
         return {"error": f"Project scan failed: {str(e)}"}
 
 @mcp.tool()
-def get_crossref_recommendations(project_name: str = None) -> dict:
+def get_crossref_recommendations(project_name: str = None, wait_for_fresh: bool = False) -> dict:
     """Get recommendations for improving cross-reference coverage in a project."""
     try:
         if not project_name:
             project_name = current_project
         
+        # Daemon mode: use the project's current file list rather than the last scan
+        freshness = None
+        warm_index = warm_projects.get(project_name) if project_name else None
+        if warm_index is not None:
+            if wait_for_fresh:
+                warm_index.wait_until_fresh(DAEMON_WAIT_SECONDS)
+            info = warm_index.project_info()
+            if info is not None:
+                projects[project_name] = info
+            freshness = warm_index.freshness()
+        
         if not project_name or project_name not in projects:
             return {"error": "No project specified or project not found. Run scan_project first."}
         
@@ -1968,11 +3060,14 @@ def get_crossref_recommendations(project_name: str = None) -> dict:
                 "reasoning": f"Found {len(md_files)} documentation files for {len(code_files)} code files"
             })
         
-        return {
+        result = {
             "project": project_name,
             "recommendations": recommendations,
             "summary": f"Generated {len(recommendations)} recommendations for {project_name}"
         }
+        if freshness is not None:
+            result["freshness"] = freshness
+        return result
         
     except Exception as e:
         return {"error": f"Recommendation generation failed: {str(e)}"}
@@ -2180,32 +3275,241 @@ def generate_chunk_filenames(pdf_name: str, chunks: list) -> list:
     
     return filenames
 
-# --- End PDF Extraction Engine ---
-
-# --- Async PDF Extraction Engine (Phase 5) ---
+def chapter_filename(pdf_path: Path, index: int) -> str:
+    """Filename used for the index-th (1-based) extracted chapter of a PDF."""
+    return f"{pdf_path.stem.lower().replace(' ', '').replace('-', '').replace('_', '')}_chapter_{index:02d}.md"
 
-async def extract_pdf_text_async(pdf_path: Path, task: PDFExtractionTask) -> dict:
-    """Async version of PDF text extraction with progress tracking"""
-    try:
-        task.update_status("starting_extraction", 5)
-        await asyncio.sleep(0)  # Yield control
+def render_chapter_documents(pdf_path: Path, chunks: list, smart_cross_refs: dict, hub_file_name: str,
+                             quality_score: float, strategy_used: str) -> list:
+    """Render every chapter to (filename, content) pairs without touching the disk."""
+    documents = []
+    updated = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    for i, chunk in enumerate(chunks, 1):
+        filename = chapter_filename(pdf_path, i)
         
-        # Use thread pool for CPU-intensive operations
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(task_executor, extract_pdf_text, pdf_path)
+        # Get smart cross-references for this chapter
+        related_files = smart_cross_refs.get(filename, [])
         
-        task.update_status("text_extracted", 15)
-        await asyncio.sleep(0)  # Yield control
+        # Cross-reference header points at the hub file first
+        cross_ref_header = f"""---
+MANDATORY READING: You HAVE TO read {hub_file_name} first, then this file.
+Cross-reference: {hub_file_name}
+Related files: {related_files}
+Chapter: {i} of {len(chunks)}
+Last updated: {updated}
+---
+
+"""
+        
+        chapter_content = f"""# {chunk['title']}
+
+**Extracted from PDF**: {pdf_path.name}
+**Chunk**: {i} of {len(chunks)}
+**Words**: ~{chunk['word_count']:,}
+**Quality Score**: {quality_score:.2f}
+**Extraction Strategy**: {strategy_used}
+
+---
+
+{chunk['content']}
+"""
+        documents.append((filename, cross_ref_header + chapter_content))
+    
+    return documents
+
+def render_pdf_hub_content(pdf_path: Path, chunks: list, smart_cross_refs: dict, page_count: int,
+                           quality_score: float, strategy_used: str) -> str:
+    """Render the hub/index file for an extracted PDF."""
+    hub_content = f"""# {pdf_path.stem} - Complete Cross-Referenced Knowledge Base
+
+**Source**: {pdf_path.name}  
+**Extracted**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
+**Total Pages**: {page_count}  
+**Quality Score**: {quality_score:.2f}/1.0  
+**Extraction Strategy**: {strategy_used}  
+**Chapters**: {len(chunks)}
+
+## 📚 Reading Guide
+
+This knowledge base uses **intelligent content-aware cross-referencing** that analyzes:
+- **Conceptual relationships** between chapters
+- **Thematic connections** and shared ideas  
+- **Learning progression** from foundational to advanced concepts
+- **Semantic similarity** between topics
+
+### 🎯 Suggested Reading Path
+
+"""
+    
+    # Add chapters with word counts and smart navigation
+    for i, chunk in enumerate(chunks, 1):
+        filename = chapter_filename(pdf_path, i)
+        related_count = len(smart_cross_refs.get(filename, []))
+        preview = chunk['content'][:200].replace('\n', ' ')
+        
+        hub_content += f"""
+#### Chapter {i}: [{chunk['title']}]({filename})
+- **Words**: ~{chunk['word_count']:,}
+- **Related chapters**: {related_count} intelligent connections
+- **Preview**: {preview}...
+
+"""
+    
+    hub_content += f"""
+## 📊 Content Analysis Summary
+
+- **Total chapters**: {len(chunks)}
+- **Total words**: ~{sum(chunk['word_count'] for chunk in chunks):,}
+- **Average chapter length**: ~{sum(chunk['word_count'] for chunk in chunks) // len(chunks):,} words
+- **Cross-reference density**: {sum(len(refs) for refs in smart_cross_refs.values())} intelligent connections
+
+## 🔗 Cross-Reference Methodology
+
+This extraction uses **content-aware cross-referencing** that goes beyond simple sequential linking:
+
+1. **Concept Extraction**: Identifies key philosophical, scientific, and metaphysical concepts
+2. **Thematic Analysis**: Groups chapters by shared themes and ideas
+3. **Semantic Similarity**: Calculates meaningful relationships between content
+4. **Learning Progression**: Suggests optimal reading sequences based on concept dependencies
+
+Each chapter's "Related files" are selected based on actual content analysis, not just proximity!
+
+---
+*Generated by Universal Cross-Reference MCP Server with Content-Aware PDF Analysis*
+"""
+    
+    return hub_content
+
+# Read once at import: os.umask can only be queried by setting it, which races with writer threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _write_file_atomic(file_path: Path, content: str):
+    """Write content to a temp file in the same directory and rename it into place."""
+    fd, temp_path = tempfile.mkstemp(dir=str(file_path.parent), prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            # mkstemp creates the file 0600; give it the mode a plain open() would
+            try:
+                mode = stat.S_IMODE(os.stat(file_path).st_mode)
+            except FileNotFoundError:
+                mode = 0o666 & ~_UMASK
+            os.fchmod(f.fileno(), mode)
+            f.write(content)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+def _fsync_directory(directory: Path):
+    """Flush directory entries (the renames) to disk; a no-op where unsupported."""
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+# Header lines that change on every run and must not count as a content change
+VOLATILE_HEADER_PREFIXES = ("Last updated:", "**Extracted**:")
+
+def _stable_content_hash(content: str) -> str:
+    """Hash document content with volatile header lines (timestamps) removed."""
+    stable_lines = [line for line in content.split('\n') if not line.startswith(VOLATILE_HEADER_PREFIXES)]
+    return hashlib.sha256('\n'.join(stable_lines).encode('utf-8')).hexdigest()
+
+def _write_if_changed(file_path: Path, content: str) -> bool:
+    """Atomically write content unless the file on disk only differs in volatile fields."""
+    try:
+        existing_size = file_path.stat().st_size
+    except OSError:
+        existing_size = None
+    # Volatile fields are fixed-width, so a size mismatch always means a real change
+    if existing_size is not None and existing_size == len(content.encode('utf-8')):
+        try:
+            existing = file_path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            existing = None
+        if existing is not None and _stable_content_hash(existing) == _stable_content_hash(content):
+            return False
+    _write_file_atomic(file_path, content)
+    return True
+
+CHAPTER_WRITE_WORKERS = int(os.environ.get("CROSSREF_WRITE_WORKERS", "8"))
+
+def write_documents_batch(output_dir: Path, documents: list, max_workers: int = None,
+                          progress_callback=None, incremental: bool = False) -> dict:
+    """Write (filename, content) pairs concurrently through a bounded thread pool.
+    
+    Each file is replaced atomically (temp file + rename) and the directory is
+    fsynced once after the whole batch instead of syncing every file. With
+    ``incremental`` set, files whose content only differs from the rendered
+    document in volatile header fields are left untouched.
+    
+    Returns ``{"paths": [...], "written": [...], "skipped": [...]}`` with paths in
+    the same order as ``documents``.
+    """
+    output_dir = Path(output_dir)
+    if not documents:
+        return {"paths": [], "written": [], "skipped": []}
+    
+    workers = max(1, min(max_workers or CHAPTER_WRITE_WORKERS, len(documents)))
+    paths = [output_dir / filename for filename, _ in documents]
+    write = _write_if_changed if incremental else lambda path, content: _write_file_atomic(path, content) or True
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chapter-writer") as pool:
+        futures = {pool.submit(write, path, content): path for path, (_, content) in zip(paths, documents)}
+        changed = {}
+        for done_count, future in enumerate(as_completed(futures), 1):
+            changed[futures[future]] = future.result()
+            if progress_callback:
+                progress_callback(done_count, len(futures))
+    
+    written = [str(path) for path in paths if changed[path]]
+    if written:
+        _fsync_directory(output_dir)
+    return {
+        "paths": [str(path) for path in paths],
+        "written": written,
+        "skipped": [str(path) for path in paths if not changed[path]]
+    }
+
+# --- End PDF Extraction Engine ---
+
+# --- Async PDF Extraction Engine (Phase 5) ---
+
+async def extract_pdf_text_async(pdf_path: Path, task: PDFExtractionTask) -> dict:
+    """Async version of PDF text extraction with progress tracking"""
+    try:
+        task.update_status("starting_extraction", 5)
+        await asyncio.sleep(0)  # Yield control
+        
+        # Use the scheduler's process pool for CPU-intensive operations
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(pdf_job_scheduler.get_process_pool(), extract_pdf_text, pdf_path)
+        task.raise_if_cancelled()
+        
+        task.update_status("text_extracted", 15)
+        await asyncio.sleep(0)  # Yield control
         
         return result
         
+    except PDFTaskCancelled:
+        raise
     except Exception as e:
         task.fail(f"Async text extraction failed: {str(e)}")
         return {"success": False, "error": str(e)}
 
 async def process_pdf_async(task_id: str, pdf_path: str, params: dict) -> dict:
     """Process PDF extraction asynchronously with content-aware cross-referencing"""
-    task = active_tasks.get(task_id)
+    task = pdf_task_store.get(task_id)
     if not task:
         return {"error": "Task not found", "success": False}
     
@@ -2233,6 +3537,7 @@ async def process_pdf_async(task_id: str, pdf_path: str, params: dict) -> dict:
         
         task.update_status("text_extracted", 25)
         await asyncio.sleep(0)
+        task.raise_if_cancelled()
         
         # Set output directory
         output_dir = params.get("output_dir")
@@ -2257,6 +3562,7 @@ async def process_pdf_async(task_id: str, pdf_path: str, params: dict) -> dict:
         chunks = chunk_result["chunks"]
         task.update_status("content_chunked", 45)
         await asyncio.sleep(0)
+        task.raise_if_cancelled()
         
         # **Enhanced content analysis for intelligent cross-referencing**
         task.update_status("analyzing_content", 55)
@@ -2264,134 +3570,38 @@ async def process_pdf_async(task_id: str, pdf_path: str, params: dict) -> dict:
         # Prepare content for analysis (filename -> content mapping)
         content_map = {}
         for i, chunk in enumerate(chunks, 1):
-            filename = f"{pdf_path_obj.stem.lower().replace(' ', '').replace('-', '').replace('_', '')}_chapter_{i:02d}.md"
-            content_map[filename] = chunk["content"]
+            content_map[chapter_filename(pdf_path_obj, i)] = chunk["content"]
         
         # Generate intelligent cross-references
         smart_cross_refs = analyze_pdf_content_for_crossref_universal(content_map, pdf_path_obj.name)
         
         task.update_status("cross_references_generated", 65)
         await asyncio.sleep(0)
+        task.raise_if_cancelled()
         
-        # Create individual chapter files with smart cross-references
+        # Render all chapter files (and the hub) and write them as one atomic batch
         task.update_status("creating_files", 75)
-        created_files = []
         # FIX: Use proper hub file name from parameters (matches sync version)
         hub_file_name = params.get("hub_file_name", "SYSTEM.md")
-        
-        for i, chunk in enumerate(chunks, 1):
-            filename = f"{pdf_path_obj.stem.lower().replace(' ', '').replace('-', '').replace('_', '')}_chapter_{i:02d}.md"
-            file_path = output_dir / filename
-            
-            # Get smart cross-references for this chapter
-            related_files = smart_cross_refs.get(filename, [])
-            
-            # FIX: Create proper cross-reference header that references SYSTEM.md (matches sync exactly)
-            cross_ref_header = f"""---
-MANDATORY READING: You HAVE TO read {hub_file_name} first, then this file.
-Cross-reference: {hub_file_name}
-Related files: {related_files}
-Chapter: {i} of {len(chunks)}
-Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
----
-
-"""
-            
-            # Create chapter content (match sync version exactly)
-            chapter_content = f"""# {chunk['title']}
-
-**Extracted from PDF**: {pdf_path_obj.name}
-**Chunk**: {i} of {len(chunks)}
-**Words**: ~{chunk['word_count']:,}
-**Quality Score**: {quality_score:.2f}
-**Extraction Strategy**: {strategy_used}
-
----
-
-{chunk['content']}
-"""
-            
-            # Write the file asynchronously
-            async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-                await f.write(cross_ref_header + chapter_content)
-            
-            created_files.append(str(file_path))
-            
-            # Update progress for each file
-            file_progress = 75 + ((i / len(chunks)) * 15)
-            task.update_status(f"created_file_{i}", file_progress)
-            await asyncio.sleep(0)  # Yield control
+        documents = render_chapter_documents(pdf_path_obj, chunks, smart_cross_refs, hub_file_name,
+                                             quality_score, strategy_used)
         
         # Create hub/index file if requested - FIX: Only create if not using existing SYSTEM.md
         create_hub = params.get("create_hub", True)
         if create_hub and hub_file_name != "SYSTEM.md":
-            task.update_status("creating_hub", 90)
-            hub_path = output_dir / hub_file_name
-            
-            # Generate hub content with content analysis (match sync version)
-            hub_content = f"""# {pdf_path_obj.stem} - Complete Cross-Referenced Knowledge Base
-
-**Source**: {pdf_path_obj.name}  
-**Extracted**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
-**Total Pages**: {page_count}  
-**Quality Score**: {quality_score:.2f}/1.0  
-**Extraction Strategy**: {strategy_used}  
-**Chapters**: {len(chunks)}
-
-## 📚 Reading Guide
-
-This knowledge base uses **intelligent content-aware cross-referencing** that analyzes:
-- **Conceptual relationships** between chapters
-- **Thematic connections** and shared ideas  
-- **Learning progression** from foundational to advanced concepts
-- **Semantic similarity** between topics
-
-### 🎯 Suggested Reading Path
-
-"""
-            
-            # Add chapters with word counts and smart navigation
-            for i, chunk in enumerate(chunks, 1):
-                filename = f"{pdf_path_obj.stem.lower().replace(' ', '').replace('-', '').replace('_', '')}_chapter_{i:02d}.md"
-                related_count = len(smart_cross_refs.get(filename, []))
-                
-                hub_content += f"""
-#### Chapter {i}: [{chunk['title']}]({filename})
-- **Words**: ~{chunk['word_count']:,}
-- **Related chapters**: {related_count} intelligent connections
-- **Preview**: {chunk['content'][:200].replace('\n', ' ')}...
-
-"""
-            
-            hub_content += f"""
-## 📊 Content Analysis Summary
-
-- **Total chapters**: {len(chunks)}
-- **Total words**: ~{sum(chunk['word_count'] for chunk in chunks):,}
-- **Average chapter length**: ~{sum(chunk['word_count'] for chunk in chunks) // len(chunks):,} words
-- **Cross-reference density**: {sum(len(refs) for refs in smart_cross_refs.values())} intelligent connections
-
-## 🔗 Cross-Reference Methodology
-
-This extraction uses **content-aware cross-referencing** that goes beyond simple sequential linking:
-
-1. **Concept Extraction**: Identifies key philosophical, scientific, and metaphysical concepts
-2. **Thematic Analysis**: Groups chapters by shared themes and ideas
-3. **Semantic Similarity**: Calculates meaningful relationships between content
-4. **Learning Progression**: Suggests optimal reading sequences based on concept dependencies
-
-Each chapter's "Related files" are selected based on actual content analysis, not just proximity!
-
----
-*Generated by Universal Cross-Reference MCP Server with Content-Aware PDF Analysis*
-"""
-            
-            async with aiofiles.open(hub_path, 'w', encoding='utf-8') as f:
-                await f.write(hub_content)
-            
-            created_files.append(str(hub_path))
+            hub_content = render_pdf_hub_content(pdf_path_obj, chunks, smart_cross_refs, page_count,
+                                                 quality_score, strategy_used)
+            documents.append((hub_file_name, hub_content))
         
-        await asyncio.sleep(0)
+        def report_write_progress(done, total):
+            task.update_status("creating_files", 75 + (done / total) * 20)
+        
+        write_result = await asyncio.to_thread(
+            write_documents_batch, output_dir, documents, None, report_write_progress,
+            params.get("incremental", True)
+        )
+        created_files = write_result["paths"]
+        task.raise_if_cancelled()
         
         total_files = len(created_files)
         total_words = sum(chunk['word_count'] for chunk in chunks)
@@ -2400,6 +3610,8 @@ Each chapter's "Related files" are selected based on actual content analysis, no
             "success": True,
             "message": f"Successfully extracted PDF to {total_files} cross-referenced markdown files",
             "files_created": created_files,
+            "files_written": len(write_result["written"]),
+            "files_skipped_unchanged": len(write_result["skipped"]),
             "output_directory": str(output_dir),
             "total_chapters": len(chunks),
             "total_words": total_words,
@@ -2413,6 +3625,9 @@ Each chapter's "Related files" are selected based on actual content analysis, no
         task.complete(result)
         return result
         
+    except PDFTaskCancelled:
+        task.cancel()
+        return {"error": "PDF extraction cancelled", "success": False, "cancelled": True}
     except Exception as e:
         error_msg = f"PDF extraction failed: {str(e)}"
         task.fail(error_msg)
@@ -2424,9 +3639,11 @@ def extract_pdf_to_markdown_async(
     output_dir: str = None,
     max_chunks: int = 50,
     create_hub: bool = True,
-    hub_file_name: str = "SYSTEM.md"
+    hub_file_name: str = "SYSTEM.md",
+    priority: int = 0,
+    incremental: bool = True
 ) -> dict:
-    """Start async PDF extraction to cross-referenced markdown files"""
+    """Queue async PDF extraction to cross-referenced markdown files (higher priority runs first)"""
     try:
         task_id = str(uuid.uuid4())
         
@@ -2435,27 +3652,34 @@ def extract_pdf_to_markdown_async(
             "output_dir": output_dir,
             "max_chunks": max_chunks,
             "create_hub": create_hub,
-            "hub_file_name": hub_file_name
+            "hub_file_name": hub_file_name,
+            "incremental": incremental
         }
         
-        # Create task
-        task = PDFExtractionTask(task_id, pdf_path, params)
-        active_tasks[task_id] = task
-        
-        # Start async processing
-        asyncio.create_task(process_pdf_async(task_id, pdf_path, params))
+        # Create task and hand it to the scheduler (admission control)
+        task = PDFExtractionTask(task_id, pdf_path, params, priority=priority)
+        if not pdf_job_scheduler.submit(task):
+            return {
+                "error": f"PDF extraction queue is full ({pdf_job_scheduler.max_queue_size} jobs waiting), try again later",
+                "success": False,
+                "scheduler": pdf_job_scheduler.get_status()
+            }
         
         return {
             "success": True,
             "task_id": task_id,
-            "message": f"PDF extraction started for {Path(pdf_path).name}",
+            "message": f"PDF extraction queued for {Path(pdf_path).name}",
             "status": "queued",
+            "priority": priority,
+            "queue_position": pdf_job_scheduler.queue_position(task_id),
+            "eta_seconds": pdf_job_scheduler.estimate_eta_seconds(task),
             "parameters": {
                 "pdf_path": pdf_path,
                 "output_dir": output_dir,
                 "max_chunks": max_chunks,
                 "create_hub": create_hub,
-                "hub_file_name": hub_file_name
+                "hub_file_name": hub_file_name,
+                "incremental": incremental
             }
         }
         
@@ -2464,9 +3688,9 @@ def extract_pdf_to_markdown_async(
 
 @mcp.tool()
 def check_pdf_extraction_status(task_id: str) -> dict:
-    """Check the status of an ongoing PDF extraction task"""
+    """Check the status, queue position and ETA of a PDF extraction task"""
     try:
-        task = active_tasks.get(task_id)
+        task = pdf_task_store.get(task_id)
         if not task:
             return {"error": f"Task {task_id} not found"}
         
@@ -2474,19 +3698,23 @@ def check_pdf_extraction_status(task_id: str) -> dict:
             "task_id": task_id,
             "status": task.status,
             "progress": task.progress,
+            "priority": task.priority,
             "pdf_path": task.pdf_path,
             "start_time": task.start_time.strftime('%Y-%m-%d %H:%M:%S'),
-            "elapsed_time": str(datetime.now() - task.start_time)
+            "elapsed_time": str(datetime.now() - task.start_time),
+            "queue_position": pdf_job_scheduler.queue_position(task_id),
+            "eta_seconds": pdf_job_scheduler.estimate_eta_seconds(task),
+            "throughput": pdf_job_scheduler.get_throughput()
         }
         
         if task.status == "completed" and task.result:
             result["result"] = task.result
             # Clean up completed task after returning result
-            del active_tasks[task_id]
-        elif task.status == "failed" and task.error:
+            pdf_task_store.delete(task_id)
+        elif task.status in ("failed", "cancelled") and task.error:
             result["error"] = task.error
-            # Clean up failed task
-            del active_tasks[task_id]
+            # Clean up failed or cancelled task
+            pdf_task_store.delete(task_id)
         
         return result
         
@@ -2494,23 +3722,51 @@ def check_pdf_extraction_status(task_id: str) -> dict:
         return {"error": f"Failed to check status: {str(e)}"}
 
 @mcp.tool()
-def list_pdf_extraction_tasks() -> dict:
-    """List all active PDF extraction tasks"""
+def cancel_pdf_extraction_task(task_id: str) -> dict:
+    """Cancel a queued or running PDF extraction task"""
+    try:
+        task = pdf_task_store.get(task_id)
+        if not task:
+            return {"error": f"Task {task_id} not found"}
+        
+        if not pdf_job_scheduler.cancel(task_id):
+            return {"error": f"Task {task_id} already finished with status '{task.status}'", "success": False}
+        
+        return {
+            "success": True,
+            "task_id": task_id,
+            "status": task.status,
+            "message": "Task cancelled" if task.status == "cancelled" else "Cancellation requested, task stops at its next checkpoint"
+        }
+        
+    except Exception as e:
+        return {"error": f"Failed to cancel task: {str(e)}"}
+
+@mcp.tool()
+def list_pdf_extraction_tasks(limit: int = 100) -> dict:
+    """List all PDF extraction tasks with queue position, ETA and scheduler throughput"""
     try:
         tasks = []
-        for task_id, task in active_tasks.items():
+        for task in pdf_task_store.list_tasks(limit=limit):
+            task_id = task.task_id
             tasks.append({
                 "task_id": task_id,
                 "status": task.status,
                 "progress": task.progress,
+                "priority": task.priority,
                 "pdf_path": task.pdf_path,
-                "start_time": task.start_time.strftime('%Y-%m-%d %H:%M:%S')
+                "start_time": task.start_time.strftime('%Y-%m-%d %H:%M:%S'),
+                "queue_position": pdf_job_scheduler.queue_position(task_id),
+                "eta_seconds": pdf_job_scheduler.estimate_eta_seconds(task)
             })
+        tasks.sort(key=lambda t: (t["queue_position"] is not None, t["queue_position"] or 0))
         
         return {
             "success": True,
             "active_tasks": len(tasks),
-            "tasks": tasks
+            "stored_tasks": pdf_task_store.count(),
+            "tasks": tasks,
+            "scheduler": pdf_job_scheduler.get_status()
         }
         
     except Exception as e:
@@ -2522,7 +3778,7 @@ def list_pdf_extraction_tasks() -> dict:
 @mcp.tool()
 def extract_pdf_to_markdown(pdf_path: str, output_dir: str = None, max_chunks: int = 20, 
                            create_hub: bool = True, extraction_strategy: str = "auto", 
-                           hub_file_name: str = "SYSTEM.md") -> dict:
+                           hub_file_name: str = "SYSTEM.md", incremental: bool = True) -> dict:
     """Extract PDF content to cross-referenced markdown files with intelligent cross-referencing"""
     try:
         pdf_path = Path(pdf_path)
@@ -2567,123 +3823,27 @@ def extract_pdf_to_markdown(pdf_path: str, output_dir: str = None, max_chunks: i
         # Prepare content for analysis (filename -> content mapping)
         content_map = {}
         for i, chunk in enumerate(chunks, 1):
-            filename = f"{pdf_path.stem.lower().replace(' ', '').replace('-', '').replace('_', '')}_chapter_{i:02d}.md"
-            content_map[filename] = chunk["content"]
+            content_map[chapter_filename(pdf_path, i)] = chunk["content"]
         
         # Generate intelligent cross-references
         smart_cross_refs = analyze_pdf_content_for_crossref_universal(content_map, pdf_path.name)
         
         print(f"🎯 Generated intelligent cross-references for {len(smart_cross_refs)} chapters")
         
-        # Create individual chapter files with smart cross-references
-        created_files = []
-        
-        for i, chunk in enumerate(chunks, 1):
-            filename = f"{pdf_path.stem.lower().replace(' ', '').replace('-', '').replace('_', '')}_chapter_{i:02d}.md"
-            file_path = output_dir / filename
-            
-            # Get smart cross-references for this chapter
-            related_files = smart_cross_refs.get(filename, [])
-            
-            # FIX: Create proper cross-reference header that references SYSTEM.md
-            cross_ref_header = f"""---
-MANDATORY READING: You HAVE TO read {hub_file_name} first, then this file.
-Cross-reference: {hub_file_name}
-Related files: {related_files}
-Chapter: {i} of {len(chunks)}
-Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
----
-
-"""
-            
-            # Create chapter content
-            chapter_content = f"""# {chunk['title']}
-
-**Extracted from PDF**: {pdf_path.name}
-**Chunk**: {i} of {len(chunks)}
-**Words**: ~{chunk['word_count']:,}
-**Quality Score**: {quality_score:.2f}
-**Extraction Strategy**: {strategy_used}
-
----
-
-{chunk['content']}
-"""
-            
-            # Write the file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(cross_ref_header + chapter_content)
-            
-            created_files.append(str(file_path))
-            print(f"📄 Created: {filename} with {len(related_files)} intelligent cross-references")
+        # Render all chapter files (and the hub) and write them as one atomic batch
+        documents = render_chapter_documents(pdf_path, chunks, smart_cross_refs, hub_file_name,
+                                             quality_score, strategy_used)
         
         # Create hub/index file if requested - FIX: Only create if not using existing SYSTEM.md
         if create_hub and hub_file_name != "SYSTEM.md":
-            hub_path = output_dir / hub_file_name
-            
-            # Generate hub content with content analysis
-            hub_content = f"""# {pdf_path.stem} - Complete Cross-Referenced Knowledge Base
-
-**Source**: {pdf_path.name}  
-**Extracted**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
-**Total Pages**: {page_count}  
-**Quality Score**: {quality_score:.2f}/1.0  
-**Extraction Strategy**: {strategy_used}  
-**Chapters**: {len(chunks)}
-
-## 📚 Reading Guide
-
-This knowledge base uses **intelligent content-aware cross-referencing** that analyzes:
-- **Conceptual relationships** between chapters
-- **Thematic connections** and shared ideas  
-- **Learning progression** from foundational to advanced concepts
-- **Semantic similarity** between topics
-
-### 🎯 Suggested Reading Path
-
-"""
-            
-            # Add chapters with word counts and smart navigation
-            for i, chunk in enumerate(chunks, 1):
-                filename = f"{pdf_path.stem.lower().replace(' ', '').replace('-', '').replace('_', '')}_chapter_{i:02d}.md"
-                related_count = len(smart_cross_refs.get(filename, []))
-                
-                hub_content += f"""
-#### Chapter {i}: [{chunk['title']}]({filename})
-- **Words**: ~{chunk['word_count']:,}
-- **Related chapters**: {related_count} intelligent connections
-- **Preview**: {chunk['content'][:200].replace('\n', ' ')}...
-
-"""
-            
-            hub_content += f"""
-## 📊 Content Analysis Summary
-
-- **Total chapters**: {len(chunks)}
-- **Total words**: ~{sum(chunk['word_count'] for chunk in chunks):,}
-- **Average chapter length**: ~{sum(chunk['word_count'] for chunk in chunks) // len(chunks):,} words
-- **Cross-reference density**: {sum(len(refs) for refs in smart_cross_refs.values())} intelligent connections
-
-## 🔗 Cross-Reference Methodology
-
-This extraction uses **content-aware cross-referencing** that goes beyond simple sequential linking:
-
-1. **Concept Extraction**: Identifies key philosophical, scientific, and metaphysical concepts
-2. **Thematic Analysis**: Groups chapters by shared themes and ideas
-3. **Semantic Similarity**: Calculates meaningful relationships between content
-4. **Learning Progression**: Suggests optimal reading sequences based on concept dependencies
-
-Each chapter's "Related files" are selected based on actual content analysis, not just proximity!
-
----
-*Generated by Universal Cross-Reference MCP Server with Content-Aware PDF Analysis*
-"""
-            
-            with open(hub_path, 'w', encoding='utf-8') as f:
-                f.write(hub_content)
-            
-            created_files.append(str(hub_path))
-            print(f"🏠 Created hub file: {hub_file_name}")
+            hub_content = render_pdf_hub_content(pdf_path, chunks, smart_cross_refs, page_count,
+                                                 quality_score, strategy_used)
+            documents.append((hub_file_name, hub_content))
+        
+        write_result = write_documents_batch(output_dir, documents, incremental=incremental)
+        created_files = write_result["paths"]
+        print(f"📄 Wrote {len(write_result['written'])} files in {output_dir}, "
+              f"{len(write_result['skipped'])} unchanged")
         
         total_files = len(created_files)
         total_words = sum(chunk['word_count'] for chunk in chunks)
@@ -2692,6 +3852,8 @@ Each chapter's "Related files" are selected based on actual content analysis, no
             "success": True,
             "message": f"Successfully extracted PDF to {total_files} cross-referenced markdown files",
             "files_created": created_files,
+            "files_written": len(write_result["written"]),
+            "files_skipped_unchanged": len(write_result["skipped"]),
             "output_directory": str(output_dir),
             "total_chapters": len(chunks),
             "total_words": total_words,
@@ -3254,73 +4416,292 @@ def analyze_pdf_content_for_crossref_universal(chunks: Dict[str, str], pdf_title
 
 # --- Phase 1: Verification and Repair Tools ---
 
+HEADER_PROBE_INITIAL_BYTES = 1024
+HEADER_PROBE_MAX_BYTES = 256 * 1024
+HEADER_START = b'---\nMANDATORY READING:'
+
+def probe_crossref_header(file_path, hub_file_name="SYSTEM.md",
+                          initial_bytes=HEADER_PROBE_INITIAL_BYTES, max_bytes=HEADER_PROBE_MAX_BYTES) -> dict:
+    """Read just enough of a markdown file to classify its cross-reference header.
+    
+    Starts with a small prefix and doubles it until the closing ``---`` is found
+    (or ``max_bytes`` is reached), so I/O scales with header size, not file size.
+    
+    Returns a small record: ``status`` is one of "ok", "missing", "wrong_hub" or
+    "incorrect"; ``cross_reference`` is the hub named in the header (if any) and
+    ``bytes_read`` is how much of the file was read.
+    """
+    record = {"status": "missing", "cross_reference": None, "bytes_read": 0}
+    try:
+        with open(file_path, 'rb') as f:
+            prefix = f.read(initial_bytes)
+            record["bytes_read"] = len(prefix)
+            text = prefix.replace(b'\r\n', b'\n')
+            if not text.startswith(HEADER_START):
+                return record
+            
+            header_end = text.find(b'---\n', 4)
+            size = len(prefix)
+            while header_end == -1 and size < max_bytes:
+                more = f.read(min(size, max_bytes - size))
+                if not more:
+                    break
+                prefix += more
+                size = len(prefix)
+                text = prefix.replace(b'\r\n', b'\n')
+                header_end = text.find(b'---\n', 4)
+            record["bytes_read"] = size
+        
+        if header_end == -1:
+            # Malformed header: no closing marker
+            record["status"] = "incorrect"
+            return record
+        
+        header_content = text[4:header_end].decode('utf-8')
+        for line in header_content.split('\n'):
+            if line.startswith('Cross-reference:'):
+                record["cross_reference"] = line[len('Cross-reference:'):].strip()
+                break
+        
+        if f'Cross-reference: {hub_file_name}' in header_content:
+            record["status"] = "ok"
+        elif 'Cross-reference:' in header_content:
+            record["status"] = "wrong_hub"
+        else:
+            record["status"] = "incorrect"
+        return record
+    except (OSError, UnicodeDecodeError):
+        record["status"] = "missing"
+        return record
+
+# A list item in the hub's reading section: "1. [file](file)", "12. [...", "- [..." or "* [..."
+HUB_ENTRY_PATTERN = re.compile(r'(?:\d+\.|[-*]) \[')
+
+def parse_hub_mandatory_reading(hub_file_path) -> list:
+    """Return the file entries listed in a hub's mandatory reading section."""
+    hub_files = []
+    with open(hub_file_path, 'r', encoding='utf-8') as f:
+        in_mandatory_section = False
+        for line in f:
+            line = line.rstrip('\n')
+            if '## 📚 Mandatory Reading Order' in line or '## Mandatory Reading' in line:
+                in_mandatory_section = True
+                continue
+            elif in_mandatory_section and line.startswith('## '):
+                break
+            elif in_mandatory_section and HUB_ENTRY_PATTERN.match(line):
+                match = re.search(r'\[([^\]]+)\]', line)
+                if match:
+                    hub_files.append(match.group(1))
+    return hub_files
+
+class VerificationManifest:
+    """Persisted stat manifest used to make repeated project verification incremental.
+    
+    Tracks path, mtime_ns, size and probed header status of every markdown file,
+    plus the hub's own stat and parsed mandatory-reading entries. A refresh walks
+    the tree with stat calls only and re-probes just the files whose stat changed;
+    the hub is re-parsed only when its own stat changed.
+    
+    Manifests live outside the project tree, one per (project, hub) pair, in
+    ``manifest_path`` if given, else in CROSSREF_MANIFEST_DIR (default
+    ~/.cache/universal-crossref/manifests).
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, project_path, hub_file_name="SYSTEM.md", manifest_path=None):
+        self.project_path = Path(project_path).resolve()
+        self.hub_file_name = hub_file_name
+        if manifest_path is None:
+            manifest_dir = os.environ.get("CROSSREF_MANIFEST_DIR")
+            manifest_dir = (
+                Path(manifest_dir).expanduser() if manifest_dir
+                else Path.home() / ".cache" / "universal-crossref" / "manifests"
+            )
+            key = hashlib.sha256(f"{self.project_path}\0{hub_file_name}".encode('utf-8')).hexdigest()
+            manifest_path = manifest_dir / f"{key}.json"
+        self.manifest_path = Path(manifest_path).expanduser()
+        self.lock = threading.Lock()
+        self.files = {}  # relative path -> {"mtime_ns", "size", "status", "cross_reference"}
+        self.hub = {"mtime_ns": None, "size": None, "files": []}
+        self.last_refresh = None
+        self.last_refresh_stats = {}
+        self.load()
+    
+    def load(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if (data.get("version") == self.VERSION and data.get("hub_file_name") == self.hub_file_name
+                    and data.get("project_path") == str(self.project_path)):
+                self.files = data.get("files", {})
+                self.hub = data.get("hub", self.hub)
+        except (OSError, ValueError):
+            pass
+    
+    def save(self):
+        data = {
+            "version": self.VERSION,
+            "project_path": str(self.project_path),
+            "hub_file_name": self.hub_file_name,
+            "files": self.files,
+            "hub": self.hub
+        }
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            _write_file_atomic(self.manifest_path, json.dumps(data, separators=(',', ':')))
+        except OSError as e:
+            print(f"Failed to save verification manifest: {e}", file=sys.stderr)
+    
+    def _walk(self):
+        """Yield (relative path, stat) for every markdown file except hub files."""
+        pending = [(str(self.project_path), "")]
+        while pending:
+            directory, rel_prefix = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append((entry.path, rel_prefix + entry.name + os.sep))
+                            elif entry.name.endswith('.md') and entry.name != self.hub_file_name:
+                                yield rel_prefix + entry.name, entry.stat()
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+    
+    def _probe_files(self, rel_paths: list, max_workers: int = 1) -> dict:
+        """Probe headers, fanning out over a bounded thread pool when max_workers > 1.
+        
+        Results are merged in input order, so the outcome does not depend on
+        which probe finishes first.
+        """
+        probe = lambda rel: probe_crossref_header(self.project_path / rel, self.hub_file_name)
+        if max_workers <= 1 or len(rel_paths) < 2:
+            return {rel: probe(rel) for rel in rel_paths}
+        workers = min(max_workers, len(rel_paths))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="header-probe") as pool:
+            return dict(zip(rel_paths, pool.map(probe, rel_paths)))
+    
+    def refresh(self, max_workers: int = 1) -> dict:
+        """Bring the manifest up to date with the tree and return refresh statistics."""
+        with self.lock:
+            started = time.perf_counter()
+            seen = {}
+            to_probe = []
+            for rel, st in self._walk():
+                seen[rel] = st
+                entry = self.files.get(rel)
+                if entry is None or entry["mtime_ns"] != st.st_mtime_ns or entry["size"] != st.st_size:
+                    to_probe.append(rel)
+            
+            to_probe.sort()
+            probe_started = time.perf_counter()
+            probes = self._probe_files(to_probe, max_workers)
+            probe_seconds = time.perf_counter() - probe_started
+            bytes_read = 0
+            for rel in to_probe:
+                st = seen[rel]
+                probe = probes[rel]
+                bytes_read += probe["bytes_read"]
+                self.files[rel] = {
+                    "mtime_ns": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "status": probe["status"],
+                    "cross_reference": probe["cross_reference"]
+                }
+            
+            removed = [rel for rel in self.files if rel not in seen]
+            for rel in removed:
+                del self.files[rel]
+            
+            # Re-parse the hub only if its own stat changed
+            hub_path = self.project_path / self.hub_file_name
+            hub_reparsed = False
+            try:
+                hub_st = hub_path.stat()
+                hub_stat = (hub_st.st_mtime_ns, hub_st.st_size)
+            except OSError:
+                hub_stat = (None, None)
+            if hub_stat != (self.hub.get("mtime_ns"), self.hub.get("size")):
+                hub_reparsed = True
+                hub_files = parse_hub_mandatory_reading(hub_path) if hub_stat[0] is not None else []
+                self.hub = {"mtime_ns": hub_stat[0], "size": hub_stat[1], "files": hub_files}
+            
+            if to_probe or removed or hub_reparsed:
+                self.save()
+            
+            elapsed = time.perf_counter() - started
+            self.last_refresh = datetime.now()
+            self.last_refresh_stats = {
+                "max_workers": max_workers,
+                "files_probed": len(to_probe),
+                "files_unchanged": len(seen) - len(to_probe),
+                "files_removed": len(removed),
+                "hub_reparsed": hub_reparsed,
+                "header_bytes_read": bytes_read,
+                "probe_files_per_second": round(len(to_probe) / probe_seconds, 1) if to_probe and probe_seconds > 0 else None,
+                "files_per_second": round(len(seen) / elapsed, 1) if elapsed > 0 else None,
+                "elapsed_ms": round(elapsed * 1000, 2)
+            }
+            return dict(self.last_refresh_stats)
+    
+    def hub_membership(self) -> set:
+        return set(self.hub.get("files", []))
+    
+    def get_status(self) -> dict:
+        with self.lock:
+            return {
+                "manifest_path": str(self.manifest_path),
+                "tracked_files": len(self.files),
+                "hub_entries": len(self.hub.get("files", [])),
+                "last_refresh": self.last_refresh.isoformat() if self.last_refresh else None,
+                "last_refresh_stats": dict(self.last_refresh_stats)
+            }
+
+verification_manifests = {}
+verification_manifests_lock = threading.Lock()
+
+def get_verification_manifest(project_path, hub_file_name="SYSTEM.md") -> VerificationManifest:
+    """Return the cached manifest for a project, loading it from disk on first use."""
+    key = (str(Path(project_path).resolve()), hub_file_name)
+    with verification_manifests_lock:
+        manifest = verification_manifests.get(key)
+        if manifest is None:
+            manifest = VerificationManifest(project_path, hub_file_name)
+            verification_manifests[key] = manifest
+        return manifest
+
+VERIFY_MAX_WORKERS = int(os.environ.get("CROSSREF_VERIFY_WORKERS", "8"))
+
 @mcp.tool()
-def verify_project_sync(project_path: str) -> dict:
-    """Verify that all markdown files are properly cross-referenced and in hub."""
+def verify_project_sync(project_path: str, max_workers: int = None) -> dict:
+    """Verify that all markdown files are properly cross-referenced and in hub.
+    
+    Changed files are header-probed in parallel on up to max_workers threads
+    (default CROSSREF_VERIFY_WORKERS); use 1 for serial verification.
+    """
     try:
         project_path_obj = Path(project_path)
         hub_file_path = project_path_obj / "SYSTEM.md"
         
-        # Find all markdown files
-        all_md_files = []
-        for md_file in project_path_obj.rglob("*.md"):
-            if md_file.name != "SYSTEM.md" and not md_file.is_dir():
-                relative_path = str(md_file.relative_to(project_path_obj))
-                all_md_files.append(relative_path)
+        # Bring the stat manifest up to date; only changed files are re-probed
+        manifest = get_verification_manifest(project_path_obj, "SYSTEM.md")
+        refresh_stats = manifest.refresh(max(1, max_workers or VERIFY_MAX_WORKERS))
         
-        # Check hub file mandatory reading section
-        hub_files = []
-        if hub_file_path.exists():
-            with open(hub_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Extract files from mandatory reading section
-                lines = content.split('\n')
-                in_mandatory_section = False
-                for line in lines:
-                    if '## 📚 Mandatory Reading Order' in line or '## Mandatory Reading' in line:
-                        in_mandatory_section = True
-                        continue
-                    elif in_mandatory_section and line.startswith('## '):
-                        break
-                    elif in_mandatory_section and (line.startswith('1. [') or line.startswith('- [')):
-                        match = re.search(r'\[([^\]]+)\]', line)
-                        if match:
-                            hub_files.append(match.group(1))
+        with manifest.lock:
+            all_md_files = sorted(manifest.files)
+            hub_files = list(manifest.hub.get("files", []))
+            header_status = {rel: entry["status"] for rel, entry in manifest.files.items()}
         
         # Enhanced header checking with detailed validation
-        missing_headers = []
-        incorrect_headers = []
-        wrong_hub_reference = []
-        
-        for md_file_rel in all_md_files:
-            md_file_abs = project_path_obj / md_file_rel
-            try:
-                with open(md_file_abs, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Check if file has any header
-                if not content.startswith('---\nMANDATORY READING:'):
-                    missing_headers.append(md_file_rel)
-                else:
-                    # Check if header references correct hub file
-                    header_end = content.find('---\n', 4)
-                    if header_end != -1:
-                        header_content = content[4:header_end]
-                        
-                        if 'Cross-reference: SYSTEM.md' in header_content:
-                            # Header is correct
-                            pass
-                        elif 'Cross-reference:' in header_content:
-                            # Header exists but wrong hub reference
-                            wrong_hub_reference.append(md_file_rel)
-                        else:
-                            # Header missing cross-reference field
-                            incorrect_headers.append(md_file_rel)
-                    else:
-                        # Malformed header
-                        incorrect_headers.append(md_file_rel)
-            except Exception:
-                missing_headers.append(md_file_rel)
+        missing_headers = [rel for rel in all_md_files if header_status[rel] == "missing"]
+        # Malformed header or missing cross-reference field
+        incorrect_headers = [rel for rel in all_md_files if header_status[rel] == "incorrect"]
+        # Header exists but wrong hub reference
+        wrong_hub_reference = [rel for rel in all_md_files if header_status[rel] == "wrong_hub"]
         
         # Compare lists
         missing_from_hub = set(all_md_files) - set(hub_files)
@@ -3350,11 +4731,14 @@ def verify_project_sync(project_path: str) -> dict:
             "sync_status": sync_status,
             "total_md_files": len(all_md_files),
             "files_in_hub": len(hub_files),
-            "missing_from_hub": list(missing_from_hub),
-            "extra_in_hub": list(extra_in_hub),
+            "missing_from_hub": sorted(missing_from_hub),
+            "extra_in_hub": sorted(extra_in_hub),
             "missing_headers": missing_headers,
             "incorrect_headers": incorrect_headers,
             "wrong_hub_reference": wrong_hub_reference,
+            "header_bytes_read": refresh_stats["header_bytes_read"],
+            "files_per_second": refresh_stats["files_per_second"],
+            "manifest": refresh_stats,
             "recommendations": [
                 f"Add {len(missing_from_hub)} files to hub mandatory reading" if missing_from_hub else None,
                 f"Remove {len(extra_in_hub)} obsolete entries from hub" if extra_in_hub else None,
@@ -3567,7 +4951,8 @@ def get_system_status(project_path: str = None) -> dict:
                 'sync_status': verification.get('sync_status', 'unknown'),
                 'total_files': verification.get('total_md_files', 0),
                 'files_in_hub': verification.get('files_in_hub', 0),
-                'issues_found': len(verification.get('missing_from_hub', [])) + len(verification.get('missing_headers', []))
+                'issues_found': len(verification.get('missing_from_hub', [])) + len(verification.get('missing_headers', [])),
+                'manifest': get_verification_manifest(project_path, "SYSTEM.md").get_status()
             }
         
         # Determine overall system health
@@ -3584,7 +4969,10 @@ def get_system_status(project_path: str = None) -> dict:
             "failed_operations_count": len(failed_ops),
             "queue_status": queue_status,
             "project_status": project_status,
-            "active_watchers": len(active_observers),
+            "active_watchers": len(active_watchers),
+            "warm_projects": {name: index.freshness() for name, index in list(warm_projects.items())},
+            "watch_service": watch_service.get_status(),
+            "watcher_event_queue": watcher_event_queue.get_status(),
             "last_check": datetime.now().isoformat()
         }
         
@@ -3639,10 +5027,11 @@ def get_operation_logs(hours: int = 24, operation_type: str = None, status: str
 def stop_auto_crossref_watcher(project_path: str) -> dict:
     """Stop automatic cross-reference monitoring for a project."""
     try:
-        if project_path in active_observers:
-            observer = active_observers.pop(project_path)
-            observer.stop()
-            observer.join()
+        if project_path in active_watchers:
+            handler = active_watchers.pop(project_path)
+            watch_service.unschedule(handler, str(handler.project_path))
+            handler.active = False
+            handler.event_queue.drop_handler(handler)
             return {"success": True, "project_path": project_path, "status": "Watcher stopped"}
         else:
             return {"warning": f"No active watcher found for project: {project_path}"}
@@ -3650,5 +5039,13 @@ def stop_auto_crossref_watcher(project_path: str) -> dict:
         return {"error": f"Failed to stop watcher: {str(e)}"}
 
 if __name__ == "__main__":
+    # Pick up PDF extractions interrupted by a previous shutdown
+    resumed = pdf_job_scheduler.resume_pending()
+    if resumed:
+        print(f"Resumed {resumed} queued PDF extraction task(s)", file=sys.stderr)
+    # Start indexing daemon-mode projects before the first tool call arrives
+    if DAEMON_MODE:
+        for warm_path in filter(None, os.environ.get("CROSSREF_DAEMON_PROJECTS", "").split(os.pathsep)):
+            register_warm_project(warm_path)
     # Run the server using stdio transport
     mcp.run(transport="stdio") 
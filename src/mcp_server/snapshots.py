@@ -0,0 +1,262 @@
+"""Shared Project Analysis Snapshots
+
+One analysis snapshot per project root, shared by every server tool, so that
+asking several questions about the same repository runs the scan and the
+analysis pipeline once. A snapshot is served as long as the project's scan
+generation is unchanged and, for projects without a file monitor, it was
+verified within the refresh interval. Otherwise the project is rescanned
+and, when any content hash changed, brought up to date by an incremental
+analysis of just the changed files. Changes are detected by content hash,
+or by size and modification time for files the scanner does not hash.
+"""
+
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from src.analyzer import AnalysisPipeline, AnalysisReport, UniversalAnalyzer
+from src.database.operations import file_repo, get_db_session
+from src.scanner import ScannerOrchestrator, ScannerStats, UniversalScanner
+from src.utils.config import get_settings
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_SCANNER_CONFIG = {
+    "include_patterns": ["*.py", "*.js", "*.jsx", "*.ts", "*.tsx", "*.md", "*.txt"],
+    "exclude_patterns": ["__pycache__/", "node_modules/", "dist/", "build/", ".git/"]
+}
+
+
+def file_fingerprint(file_record) -> str:
+    """A value that changes whenever the file's content does.
+
+    The scanner only hashes some file types (tests and build files are
+    analyzed but stored without a hash), so those fall back to size and
+    modification time.
+    """
+    if file_record.content_hash:
+        return file_record.content_hash
+    return f"stat:{file_record.size_bytes}:{file_record.file_modified_at}"
+
+
+@dataclass
+class ProjectSnapshot:
+    """Analysis results for one project root at one scan generation."""
+    root_path: str
+    project_name: str
+    project_id: int
+    report: AnalysisReport
+    content_hashes: Dict[str, Optional[str]]
+    scan_generation: int
+    scan_stats: Optional[ScannerStats] = None
+    built_at: float = field(default_factory=time.time)
+    checked_at: float = field(default_factory=time.monotonic)
+    build_seconds: float = 0.0
+    refreshes: int = 0
+
+    @property
+    def content_results(self):
+        return self.report.content_results
+
+    @property
+    def relationships(self):
+        return self.report.relationships
+
+    @property
+    def dependency_graph(self):
+        return self.report.dependency_graph
+
+    @property
+    def recommendations(self):
+        return self.report.recommendations
+
+    @property
+    def pattern_report(self):
+        return self.report.pattern_report
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "root_path": self.root_path,
+            "project_name": self.project_name,
+            "project_id": self.project_id,
+            "files": len(self.content_hashes),
+            "scan_generation": self.scan_generation,
+            "built_at": self.built_at,
+            "seconds_since_check": time.monotonic() - self.checked_at,
+            "build_seconds": self.build_seconds,
+            "refreshes": self.refreshes,
+        }
+
+
+class ProjectSnapshotStore:
+    """Per-root analysis snapshots, refreshed incrementally."""
+
+    def __init__(
+        self,
+        orchestrator: ScannerOrchestrator,
+        analyzer: Optional[UniversalAnalyzer] = None,
+        refresh_interval: Optional[float] = None,
+        scanner_config: Optional[Dict] = None,
+    ):
+        self.orchestrator = orchestrator
+        self.pipeline = AnalysisPipeline(analyzer)
+        self.refresh_interval = (
+            refresh_interval if refresh_interval is not None
+            else get_settings().analysis_snapshot_refresh_seconds
+        )
+        self.scanner_config = scanner_config or DEFAULT_SCANNER_CONFIG
+        self._snapshots: Dict[str, ProjectSnapshot] = {}
+        self._project_names: Dict[str, str] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(
+        self,
+        project_path: str,
+        project_name: Optional[str] = None,
+        refresh: bool = False,
+    ) -> ProjectSnapshot:
+        """Current snapshot for a project root, building or refreshing it as needed."""
+        root = str(Path(project_path).resolve())
+        lock = self._locks.setdefault(root, asyncio.Lock())
+        async with lock:
+            snapshot = self._snapshots.get(root)
+            scanner = await self.get_scanner(root, project_name)
+
+            if snapshot is not None and not refresh and self.is_current(snapshot, scanner):
+                self.hits += 1
+                return snapshot
+
+            self.misses += 1
+            return await self._refresh(root, scanner, snapshot, force_rescan=refresh)
+
+    def is_current(self, snapshot: ProjectSnapshot, scanner: UniversalScanner) -> bool:
+        """Whether a snapshot can be served without looking at the files."""
+        if snapshot.scan_generation != scanner.scan_generation:
+            return False
+        # A running monitor bumps the generation on every change it applies
+        if scanner.monitor is not None:
+            return True
+        return time.monotonic() - snapshot.checked_at < self.refresh_interval
+
+    def peek(self, project_path: str) -> Optional[ProjectSnapshot]:
+        """The last snapshot for a root, without checking or refreshing it."""
+        return self._snapshots.get(str(Path(project_path).resolve()))
+
+    def invalidate(self, project_path: Optional[str] = None) -> None:
+        """Drop one root's snapshot (or all), forcing a rebuild on next use."""
+        if project_path is None:
+            for snapshot in self._snapshots.values():
+                self.pipeline.reset(snapshot.project_id)
+            self._snapshots.clear()
+            return
+        snapshot = self._snapshots.pop(str(Path(project_path).resolve()), None)
+        if snapshot is not None:
+            self.pipeline.reset(snapshot.project_id)
+
+    async def get_scanner(
+        self,
+        root: str,
+        project_name: Optional[str] = None,
+        enable_monitoring: bool = False,
+    ) -> UniversalScanner:
+        """The one scanner registered for a root, whatever tool asked first."""
+        name = self._project_names.get(root)
+        if name is None:
+            name = project_name or Path(root).name
+            existing = await self.orchestrator.get_project(name)
+            if existing is not None and str(existing.root_path) != root:
+                # Same directory name elsewhere on disk
+                name = f"{name}_{hashlib.sha256(root.encode()).hexdigest()[:8]}"
+            self._project_names[root] = name
+
+        scanner = await self.orchestrator.add_project(
+            project_name=name,
+            root_path=Path(root),
+            enable_monitoring=enable_monitoring,
+            enable_performance_management=False,
+            config=self.scanner_config,
+        )
+        if not scanner.is_running:
+            await scanner.initialize()
+        return scanner
+
+    async def _refresh(
+        self,
+        root: str,
+        scanner: UniversalScanner,
+        snapshot: Optional[ProjectSnapshot],
+        force_rescan: bool = False,
+    ) -> ProjectSnapshot:
+        started = time.monotonic()
+        stats = None
+
+        # Changes already applied by a monitor only need the hash comparison
+        if force_rescan or snapshot is None or snapshot.scan_generation == scanner.scan_generation:
+            if scanner.monitor is not None:
+                await scanner.trigger_incremental_scan()
+            else:
+                stats = await scanner.scan_project()
+
+        generation = scanner.scan_generation
+        content_hashes = await self._content_hashes(scanner.project_id)
+
+        if snapshot is not None and content_hashes == snapshot.content_hashes:
+            snapshot.scan_generation = generation
+            snapshot.checked_at = time.monotonic()
+            if stats is not None:
+                snapshot.scan_stats = stats
+            logger.info("Analysis snapshot still current", root_path=root, files=len(content_hashes))
+            return snapshot
+
+        if snapshot is None:
+            # Any pipeline state left for this project predates the snapshot
+            self.pipeline.reset(scanner.project_id)
+            changed: List[str] = []
+        else:
+            changed = [
+                path for path in content_hashes.keys() | snapshot.content_hashes.keys()
+                if content_hashes.get(path) != snapshot.content_hashes.get(path)
+            ]
+
+        report = await self.pipeline.incremental_analysis(scanner.project_id, changed)
+        refreshed = ProjectSnapshot(
+            root_path=root,
+            project_name=scanner.project_name,
+            project_id=scanner.project_id,
+            report=report,
+            content_hashes=content_hashes,
+            scan_generation=generation,
+            scan_stats=stats or (snapshot.scan_stats if snapshot else None),
+            build_seconds=time.monotonic() - started,
+            refreshes=(snapshot.refreshes + 1) if snapshot else 0,
+        )
+        self._snapshots[root] = refreshed
+        logger.info(
+            "Analysis snapshot updated",
+            root_path=root,
+            files=len(content_hashes),
+            changed_files=len(changed) if snapshot else len(content_hashes),
+            seconds=round(refreshed.build_seconds, 3),
+        )
+        return refreshed
+
+    @staticmethod
+    async def _content_hashes(project_id: int) -> Dict[str, Optional[str]]:
+        async with get_db_session() as session:
+            files = await file_repo.get_text_files_by_project(session, project_id)
+            return {file_record.relative_path: file_fingerprint(file_record) for file_record in files}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "snapshots": {root: snapshot.get_info() for root, snapshot in self._snapshots.items()},
+            "hits": self.hits,
+            "misses": self.misses,
+            "refresh_interval": self.refresh_interval,
+        }
@@ -4,6 +4,7 @@ High-performance async file scanning engine optimized for large codebases.
 """
 
 import asyncio
+import time
 from pathlib import Path
 from typing import Dict, List, Optional, Callable, Any
 
@@ -12,8 +13,10 @@ import structlog
 from .file_scanner import AsyncFileScanner, FileInfo, scan_project_files, ScannerStats
 from .file_monitor import FileMonitor, MonitorManager, monitor_manager, FileChangeEvent
 from .performance import ScannerPerformanceManager, ResourceUsage, PerformanceMetrics
+from .scheduler import FairShareScheduler, ProjectTicket
 from src.database.operations import get_or_create_project, get_project_summary
 from src.utils.config import get_settings, get_project_config
+from src.utils.watch_service import watch_service
 
 logger = structlog.get_logger(__name__)
 
@@ -24,6 +27,8 @@ __all__ = [
     "FileMonitor",
     "MonitorManager",
     "ScannerPerformanceManager",
+    "FairShareScheduler",
+    "ProjectTicket",
     "FileInfo",
     "FileChangeEvent",
     "ResourceUsage",
@@ -44,6 +49,7 @@ class UniversalScanner:
         config: Optional[Dict] = None,
         enable_monitoring: bool = True,
         enable_performance_management: bool = True,
+        schedule_weight: float = 1.0,
     ):
         self.project_name = project_name
         self.root_path = Path(root_path).resolve()
@@ -70,6 +76,15 @@ class UniversalScanner:
         self.enable_monitoring = enable_monitoring
         self.enable_performance_management = enable_performance_management
         
+        # Multi-project scheduling inputs and the ticket of the last scheduled scan
+        self.schedule_weight = schedule_weight
+        self.size_hint: Optional[int] = None
+        self.last_change_at: Optional[float] = None
+        self.schedule_ticket: Optional[ProjectTicket] = None
+        
+        # Bumped whenever scanned file data in the database may have changed
+        self.scan_generation = 0
+        
         logger.info(
             "Initialized universal scanner",
             project_name=project_name,
@@ -78,6 +93,10 @@ class UniversalScanner:
             enable_performance_management=enable_performance_management,
         )
     
+    @property
+    def is_running(self) -> bool:
+        return self._running
+    
     def add_callback(self, event_type: str, callback: Callable) -> None:
         """Add event callback."""
         if event_type in self._callbacks:
@@ -113,6 +132,7 @@ class UniversalScanner:
             # Get or create project
             project = await get_or_create_project(self.project_name, str(self.root_path))
             self.project_id = project.id
+            self.size_hint = project.total_files or None
             
             # Initialize scanner
             self.scanner = AsyncFileScanner(self.project_id, self.root_path, self.config)
@@ -122,6 +142,7 @@ class UniversalScanner:
                 self.performance_manager = ScannerPerformanceManager(self.settings)
                 self.performance_manager.add_callback(self._handle_performance_event)
                 await self.performance_manager.start()
+                self.scanner.performance_manager = self.performance_manager
             
             # Initialize monitor
             if self.enable_monitoring:
@@ -156,13 +177,17 @@ class UniversalScanner:
         self.scanner = None
         self._running = False
     
-    async def scan_project(self) -> ScannerStats:
-        """Perform full project scan."""
+    async def scan_project(self, schedule_ticket: Optional[ProjectTicket] = None) -> ScannerStats:
+        """Perform full project scan, optionally under a shared scheduler ticket."""
         if not self._running or not self.scanner:
             raise RuntimeError("Scanner not initialized")
         
         logger.info("Starting full project scan", project_id=self.project_id)
         
+        if schedule_ticket is not None:
+            self.schedule_ticket = schedule_ticket
+        self.scanner.schedule_ticket = schedule_ticket
+        
         try:
             # Use performance-managed scanning if available
             if self.performance_manager:
@@ -170,6 +195,8 @@ class UniversalScanner:
             else:
                 stats = await self.scanner.scan_project(self._handle_scan_batch)
             
+            self.size_hint = stats.files_discovered
+            self.scan_generation += 1
             self._emit_event("scan_complete", stats)
             logger.info("Project scan completed", stats=stats.to_dict())
             return stats
@@ -178,29 +205,20 @@ class UniversalScanner:
             logger.error("Project scan failed", error=str(e))
             self._emit_event("error", {"type": "scan_error", "error": str(e)})
             raise
+        finally:
+            if self.scanner:
+                self.scanner.schedule_ticket = None
     
     async def _scan_with_performance_management(self) -> ScannerStats:
         """Scan with performance management integration."""
         if not self.performance_manager or not self.scanner:
             raise RuntimeError("Performance manager or scanner not available")
         
+        # The scanner acquires worker slots around the real hashing/encoding
+        # and batch-save work and waits on the limiter while paused; the batch
+        # callback only has to save and report
         async def performance_aware_batch_callback(file_batch: List[FileInfo]) -> None:
-            """Process file batch with performance monitoring."""
-            for file_info in file_batch:
-                try:
-                    # Acquire worker slot
-                    await self.performance_manager.acquire_worker()
-                    
-                    # Process file (this would be done by the scanner normally)
-                    # Here we just record the metrics
-                    self.performance_manager.release_worker(file_info.size, False)
-                    
-                except Exception as e:
-                    # Record error
-                    self.performance_manager.release_worker(file_info.size, True)
-                    logger.error("Error processing file", file=file_info.relative_path, error=str(e))
-            
-            # Save batch to database (done by scanner)
+            """Save file batch and report performance."""
             await self.scanner._save_file_batch(file_batch)
             
             # Emit progress event
@@ -224,6 +242,8 @@ class UniversalScanner:
     
     async def _handle_file_changes(self, changes: List[FileChangeEvent]) -> None:
         """Handle file change events."""
+        self.last_change_at = time.monotonic()
+        self.scan_generation += 1
         self._emit_event("file_change", {
             "change_count": len(changes),
             "changes": [
@@ -244,13 +264,15 @@ class UniversalScanner:
             "data": data,
         })
     
-    async def trigger_incremental_scan(self) -> None:
+    async def trigger_incremental_scan(self) -> Optional[Dict[str, int]]:
         """Trigger incremental scan of changed files."""
         if not self.monitor:
             logger.warning("File monitor not available for incremental scan")
-            return
+            return None
         
-        await self.monitor.trigger_full_scan()
+        stats = await self.monitor.trigger_incremental_scan()
+        self.scan_generation += 1
+        return stats
     
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive scanner statistics."""
@@ -259,6 +281,7 @@ class UniversalScanner:
             "project_name": self.project_name,
             "root_path": str(self.root_path),
             "running": self._running,
+            "scan_generation": self.scan_generation,
             "components": {
                 "scanner": bool(self.scanner),
                 "monitor": bool(self.monitor),
@@ -269,6 +292,7 @@ class UniversalScanner:
         # Add monitor stats
         if self.monitor:
             stats["monitor"] = self.monitor.get_stats()
+            stats["watch_service"] = watch_service.get_status()
         
         # Add performance stats
         if self.performance_manager:
@@ -278,6 +302,10 @@ class UniversalScanner:
         if self.scanner:
             stats["scanner"] = self.scanner.stats.to_dict()
         
+        # Add multi-project scheduling progress
+        if self.schedule_ticket:
+            stats["schedule"] = self.schedule_ticket.get_progress()
+        
         return stats
 
 
@@ -287,6 +315,7 @@ class ScannerOrchestrator:
     def __init__(self):
         self._scanners: Dict[str, UniversalScanner] = {}
         self._lock = asyncio.Lock()
+        self._scheduler: Optional[FairShareScheduler] = None
         
     async def add_project(
         self,
@@ -295,6 +324,7 @@ class ScannerOrchestrator:
         config: Optional[Dict] = None,
         enable_monitoring: bool = True,
         enable_performance_management: bool = True,
+        schedule_weight: float = 1.0,
     ) -> UniversalScanner:
         """Add a new project for scanning."""
         async with self._lock:
@@ -308,6 +338,7 @@ class ScannerOrchestrator:
                 config,
                 enable_monitoring,
                 enable_performance_management,
+                schedule_weight,
             )
             
             await scanner.initialize()
@@ -332,20 +363,43 @@ class ScannerOrchestrator:
         """Get a project scanner by name."""
         return self._scanners.get(project_name)
     
-    async def scan_all_projects(self) -> Dict[str, ScannerStats]:
-        """Scan all registered projects."""
-        results = {}
+    async def scan_all_projects(self, max_concurrent_projects: Optional[int] = None) -> Dict[str, ScannerStats]:
+        """Scan all registered projects concurrently under one fair-share budget."""
+        settings = get_settings()
+        scheduler = FairShareScheduler(
+            total_slots=settings.scan_global_workers,
+            max_active_projects=max_concurrent_projects or settings.max_concurrent_project_scans,
+        )
+        self._scheduler = scheduler
+        
+        # Register everything up front so admission order sees every project
+        scanners = list(self._scanners.items())
+        tickets = [
+            scheduler.register(
+                project_name,
+                weight=scanner.schedule_weight,
+                size_hint=scanner.size_hint,
+                last_change=scanner.last_change_at,
+            )
+            for project_name, scanner in scanners
+        ]
         
-        for project_name, scanner in self._scanners.items():
+        async def run(project_name: str, scanner: UniversalScanner, ticket: ProjectTicket) -> Optional[ScannerStats]:
             try:
+                await scheduler.admit(ticket)
                 logger.info("Scanning project", project_name=project_name)
-                stats = await scanner.scan_project()
-                results[project_name] = stats
+                return await scanner.scan_project(schedule_ticket=ticket)
             except Exception as e:
                 logger.error("Failed to scan project", project_name=project_name, error=str(e))
-                results[project_name] = None
+                return None
+            finally:
+                scheduler.finish(ticket)
         
-        return results
+        outcomes = await asyncio.gather(*(
+            run(project_name, scanner, ticket)
+            for (project_name, scanner), ticket in zip(scanners, tickets)
+        ))
+        return {project_name: stats for (project_name, _), stats in zip(scanners, outcomes)}
     
     async def cleanup_all(self) -> None:
         """Cleanup all project scanners."""
@@ -357,7 +411,7 @@ class ScannerOrchestrator:
             logger.info("Cleaned up all project scanners")
     
     def get_all_stats(self) -> Dict[str, Dict[str, Any]]:
-        """Get statistics for all projects."""
+        """Get statistics for all projects (including scheduling progress)."""
         return {
             project_name: scanner.get_stats()
             for project_name, scanner in self._scanners.items()
@@ -4,12 +4,16 @@ File system monitoring for real-time change detection and incremental scanning.
 """
 
 import asyncio
+import heapq
+import itertools
+import os
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Callable, Any
+from typing import Dict, List, Optional, Set, Callable, Any, Tuple
 
 import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
 from watchdog.events import (
     FileSystemEventHandler,
     FileSystemEvent,
@@ -22,12 +26,12 @@ from watchdog.events import (
     DirModifiedEvent,
     DirMovedEvent,
 )
-from watchdog.observers import Observer
 
-from src.database.models import FileStatus
+from src.database.models import File, FileStatus
 from src.database.operations import file_repo, project_repo, get_db_session
 from src.scanner.file_scanner import AsyncFileScanner, FileInfo
 from src.utils.config import get_settings, get_project_config
+from src.utils.watch_service import watch_service
 
 logger = structlog.get_logger(__name__)
 
@@ -54,55 +58,119 @@ class FileChangeEvent:
 
 
 class ChangeBuffer:
-    """Buffer file changes to avoid excessive processing."""
+    """Buffer file changes to avoid excessive processing.
     
-    def __init__(self, buffer_time: float = 2.0, max_size: int = 1000):
+    Pending paths sit in a min-heap keyed by ready time, so collecting expired
+    changes costs O(expired) rather than O(pending). Re-adding a path pushes a
+    fresh heap entry; the superseded entry is dropped lazily when it surfaces.
+    Changes due within batch_window of the earliest one are collected with it,
+    so the burst of events from one operation (rm -rf, mv) lands in one batch.
+    Reaching max_size requests an immediate flush of everything pending.
+    """
+    
+    def __init__(self, buffer_time: float = 2.0, max_size: int = 1000, batch_window: Optional[float] = None):
         self.buffer_time = buffer_time  # seconds to wait before processing
         self.max_size = max_size
+        self.batch_window = min(0.5, buffer_time / 4) if batch_window is None else batch_window
         self._changes: Dict[Path, FileChangeEvent] = {}
-        self._last_change_time: Dict[Path, float] = {}
+        self._ready_at: Dict[Path, float] = {}
+        self._heap: List[Tuple[float, int, Path]] = []
+        self._sequence = itertools.count()
+        self._flush_requested = False
+        self._wakeup = asyncio.Event()
         self._lock = asyncio.Lock()
+        
+        # Statistics
+        self.forced_flushes = 0
     
     async def add_change(self, event: FileChangeEvent) -> None:
         """Add a change event to the buffer."""
         async with self._lock:
-            current_time = time.time()
+            ready_at = time.monotonic() + self.buffer_time
+            was_empty = not self._changes
             
             # Update the change (later events override earlier ones for same file)
             self._changes[event.file_path] = event
-            self._last_change_time[event.file_path] = current_time
+            self._ready_at[event.file_path] = ready_at
+            heapq.heappush(self._heap, (ready_at, next(self._sequence), event.file_path))
+            
+            # Rebuild once superseded entries dominate the heap
+            if len(self._heap) > 2 * len(self._changes) + 64:
+                self._heap = [
+                    (when, next(self._sequence), path) for path, when in self._ready_at.items()
+                ]
+                heapq.heapify(self._heap)
             
             # If buffer is getting too large, force a flush
-            if len(self._changes) >= self.max_size:
+            if len(self._changes) >= self.max_size and not self._flush_requested:
                 logger.warning("Change buffer at capacity, forcing flush", size=len(self._changes))
+                self._flush_requested = True
+                self.forced_flushes += 1
+                self._wakeup.set()
+            elif was_empty:
+                # The waiter may be sleeping with no deadline
+                self._wakeup.set()
     
     async def get_ready_changes(self) -> List[FileChangeEvent]:
         """Get changes that are ready to be processed."""
         async with self._lock:
-            current_time = time.time()
-            ready_changes = []
-            paths_to_remove = []
+            if self._flush_requested:
+                return self._take_all()
             
-            for path, last_change_time in self._last_change_time.items():
-                if current_time - last_change_time >= self.buffer_time:
-                    if path in self._changes:
-                        ready_changes.append(self._changes[path])
-                        paths_to_remove.append(path)
+            cutoff = time.monotonic()
+            if self._heap and self._heap[0][0] <= cutoff:
+                cutoff += self.batch_window
             
-            # Remove processed changes
-            for path in paths_to_remove:
-                self._changes.pop(path, None)
-                self._last_change_time.pop(path, None)
+            ready_changes = []
+            while self._heap and self._heap[0][0] <= cutoff:
+                ready_at, _, path = heapq.heappop(self._heap)
+                if self._ready_at.get(path) != ready_at:
+                    continue  # Superseded by a later event for the same path
+                del self._ready_at[path]
+                ready_changes.append(self._changes.pop(path))
             
             return ready_changes
     
     async def flush_all(self) -> List[FileChangeEvent]:
         """Get all buffered changes immediately."""
         async with self._lock:
-            changes = list(self._changes.values())
-            self._changes.clear()
-            self._last_change_time.clear()
-            return changes
+            return self._take_all()
+    
+    def _take_all(self) -> List[FileChangeEvent]:
+        # Caller holds self._lock
+        changes = list(self._changes.values())
+        self._changes.clear()
+        self._ready_at.clear()
+        self._heap.clear()
+        self._flush_requested = False
+        return changes
+    
+    def next_ready_in(self) -> Optional[float]:
+        """Seconds until the earliest pending change is ready (None if nothing is pending)."""
+        if self._flush_requested:
+            return 0.0
+        while self._heap and self._ready_at.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time.monotonic())
+    
+    async def wait_ready(self, max_wait: Optional[float] = None) -> None:
+        """Sleep until a change is ready, a flush is forced, wake() is called or max_wait elapses."""
+        self._wakeup.clear()
+        delay = self.next_ready_in()
+        if delay == 0.0:
+            return
+        if max_wait is not None:
+            delay = max_wait if delay is None else min(delay, max_wait)
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+    
+    def wake(self) -> None:
+        """Interrupt a pending wait_ready() call."""
+        self._wakeup.set()
     
     @property
     def pending_count(self) -> int:
@@ -111,27 +179,37 @@ class ChangeBuffer:
 
 
 class AsyncFileSystemEventHandler(FileSystemEventHandler):
-    """Async file system event handler."""
+    """Async file system event handler.
+    
+    Watchdog calls these methods on the shared observer thread, so events are
+    handed to the monitor's event loop rather than scheduled directly.
+    """
     
     def __init__(self, monitor: "FileMonitor"):
         super().__init__()
         self.monitor = monitor
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def _submit(self, event_type: str, event: FileSystemEvent) -> None:
+        if self.loop is None or self.loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self.monitor._handle_event(event_type, event), self.loop)
         
     def on_created(self, event: FileCreatedEvent) -> None:
         """Handle file/directory creation."""
-        asyncio.create_task(self.monitor._handle_event("created", event))
+        self._submit("created", event)
     
     def on_modified(self, event: FileModifiedEvent) -> None:
         """Handle file/directory modification."""
-        asyncio.create_task(self.monitor._handle_event("modified", event))
+        self._submit("modified", event)
     
     def on_deleted(self, event: FileDeletedEvent) -> None:
         """Handle file/directory deletion."""
-        asyncio.create_task(self.monitor._handle_event("deleted", event))
+        self._submit("deleted", event)
     
     def on_moved(self, event: FileMovedEvent) -> None:
         """Handle file/directory move."""
-        asyncio.create_task(self.monitor._handle_event("moved", event))
+        self._submit("moved", event)
 
 
 class FileMonitor:
@@ -143,6 +221,7 @@ class FileMonitor:
         root_path: Path,
         change_callback: Optional[Callable[[List[FileChangeEvent]], None]] = None,
         config: Optional[Dict] = None,
+        buffer_time: Optional[float] = None,
     ):
         self.project_id = project_id
         self.root_path = Path(root_path).resolve()
@@ -152,10 +231,12 @@ class FileMonitor:
         
         # Initialize components
         self.scanner = AsyncFileScanner(project_id, root_path, config)
-        self.change_buffer = ChangeBuffer(buffer_time=2.0)
+        self.change_buffer = ChangeBuffer(
+            buffer_time=self.settings.monitor_debounce_seconds if buffer_time is None else buffer_time,
+            max_size=self.settings.monitor_buffer_max_size,
+        )
         
-        # Watchdog setup
-        self.observer = Observer()
+        # Watchdog setup (events come from the process-wide watch service)
         self.event_handler = AsyncFileSystemEventHandler(self)
         
         # State
@@ -165,6 +246,10 @@ class FileMonitor:
         # Statistics
         self.events_received = 0
         self.changes_processed = 0
+        self.batches_processed = 0
+        self.directory_changes_processed = 0
+        self.rows_renamed = 0
+        self.rows_marked_deleted = 0
         self.last_scan_time: Optional[datetime] = None
         
         logger.info(
@@ -182,13 +267,9 @@ class FileMonitor:
         logger.info("Starting file monitor", project_id=self.project_id)
         
         try:
-            # Start watchdog observer
-            self.observer.schedule(
-                self.event_handler,
-                str(self.root_path),
-                recursive=True
-            )
-            self.observer.start()
+            # Register with the shared watchdog observer
+            self.event_handler.loop = asyncio.get_running_loop()
+            watch_service.schedule(self.event_handler, str(self.root_path), recursive=True)
             
             self._running = True
             
@@ -209,11 +290,10 @@ class FileMonitor:
         logger.info("Stopping file monitor", project_id=self.project_id)
         
         self._running = False
+        self.change_buffer.wake()
         
-        # Stop watchdog observer
-        if self.observer.is_alive():
-            self.observer.stop()
-            self.observer.join()
+        # Release our registration with the shared watchdog observer
+        watch_service.unschedule(self.event_handler, str(self.root_path))
         
         # Process any remaining changes
         remaining_changes = await self.change_buffer.flush_all()
@@ -227,23 +307,36 @@ class FileMonitor:
         self.events_received += 1
         
         try:
-            file_path = Path(event.src_path)
+            src_path = Path(event.src_path)
+            dest_path = Path(event.dest_path) if getattr(event, "dest_path", None) else None
             
-            # Skip if not within our root path
-            if not self._is_within_root(file_path):
+            # Directory modifications carry no information beyond their children's events
+            if event.is_directory and event_type == "modified":
                 return
             
-            # Skip if should be excluded
-            if not self.scanner._should_include_file(file_path) and not event.is_directory:
-                return
+            # Moves across our root boundary become a create or a delete
+            old_path = None
+            file_path = src_path
+            if event_type == "moved" and dest_path is not None:
+                src_inside = self._is_within_root(src_path)
+                dest_inside = self._is_within_root(dest_path)
+                if src_inside and dest_inside:
+                    file_path, old_path = dest_path, src_path
+                elif dest_inside:
+                    event_type, file_path = "created", dest_path
+                else:
+                    event_type = "deleted"
             
-            if not self.scanner._should_include_directory(file_path) and event.is_directory:
+            # Skip if not within our root path
+            if not self._is_within_root(file_path) or file_path == self.root_path:
                 return
             
-            # Create change event
-            old_path = None
-            if hasattr(event, 'dest_path'):
-                old_path = Path(event.dest_path)
+            # Skip if should be excluded
+            if not self._should_track(file_path, event.is_directory):
+                if old_path is None or not self._should_track(old_path, event.is_directory):
+                    return
+                # Moved somewhere we do not track: the old location is gone
+                event_type, file_path, old_path = "deleted", old_path, None
             
             change_event = FileChangeEvent(
                 event_type=event_type,
@@ -258,6 +351,21 @@ class FileMonitor:
         except Exception as e:
             logger.error("Error handling file event", event=event, error=str(e))
     
+    def _should_track(self, path: Path, is_directory: bool) -> bool:
+        """Apply the scanner's include/exclude rules, tolerating paths that no longer exist."""
+        if is_directory:
+            return self.scanner._should_include_directory(path)
+        if path.exists():
+            return self.scanner._should_include_file(path)
+        
+        # Deleted or moved-away file: only the path patterns can be checked
+        relative_path = str(path.relative_to(self.root_path))
+        if self.scanner.exclude_spec.match_file(relative_path):
+            return False
+        if self.scanner.include_spec.patterns:
+            return self.scanner.include_spec.match_file(relative_path)
+        return True
+    
     def _is_within_root(self, path: Path) -> bool:
         """Check if path is within the monitored root path."""
         try:
@@ -266,25 +374,36 @@ class FileMonitor:
         except ValueError:
             return False
     
+    def _relative(self, path: Path) -> str:
+        """Relative path string as stored in the database."""
+        return str(path.relative_to(self.root_path))
+    
+    @staticmethod
+    def _is_below(path: Optional[Path], directory: Path) -> bool:
+        """Check whether path lies strictly below directory."""
+        return path is not None and path != directory and path.is_relative_to(directory)
+    
     async def _process_changes_loop(self) -> None:
         """Background loop to process buffered changes."""
         while self._running:
             try:
+                # Sleep until the earliest buffered change is due (or a flush is forced)
+                await self.change_buffer.wait_ready()
+                if not self._running:
+                    break
+                
                 # Get ready changes
                 changes = await self.change_buffer.get_ready_changes()
                 
                 if changes:
                     await self._process_changes(changes)
                 
-                # Check every second
-                await asyncio.sleep(1.0)
-                
             except Exception as e:
                 logger.error("Error in change processing loop", error=str(e))
                 await asyncio.sleep(5.0)  # Wait longer on error
     
     async def _process_changes(self, changes: List[FileChangeEvent]) -> None:
-        """Process a batch of file changes."""
+        """Process a batch of file changes in a single database transaction."""
         if not changes:
             return
         
@@ -292,39 +411,47 @@ class FileMonitor:
             logger.info("Processing file changes", count=len(changes))
             
             try:
-                # Group changes by type
-                created_files = []
-                modified_files = []
-                deleted_files = []
-                moved_files = []
+                # Directory changes are applied as whole-subtree operations first
+                directory_changes, file_changes = self._plan_directory_changes(
+                    sorted(
+                        (change for change in changes if change.is_directory),
+                        key=lambda change: change.timestamp,
+                    ),
+                    [change for change in changes if not change.is_directory],
+                )
                 
-                for change in changes:
-                    if change.is_directory:
-                        continue  # Skip directory changes for now
-                    
-                    if change.event_type == "created":
-                        created_files.append(change.file_path)
-                    elif change.event_type == "modified":
-                        modified_files.append(change.file_path)
+                # Group changes by type (relative paths as stored in the database)
+                upserted_files: Dict[str, Path] = {}
+                deleted_files: List[str] = []
+                moved_files: List[Tuple[str, str]] = []
+                
+                for change in file_changes:
+                    if change.event_type in ("created", "modified"):
+                        upserted_files[self._relative(change.file_path)] = change.file_path
                     elif change.event_type == "deleted":
-                        deleted_files.append(change.file_path)
+                        deleted_files.append(self._relative(change.file_path))
                     elif change.event_type == "moved":
-                        moved_files.append((change.old_path, change.file_path))
+                        new_relative = self._relative(change.file_path)
+                        upserted_files.pop(new_relative, None)
+                        moved_files.append((self._relative(change.old_path), new_relative))
                 
-                # Process each type of change
-                if created_files:
-                    await self._process_created_files(created_files)
+                # Hash and classify files before opening the transaction
+                file_infos = await self._analyze_paths(
+                    list(upserted_files.values())
+                    + [self.root_path / new_relative for _, new_relative in moved_files]
+                )
                 
-                if modified_files:
-                    await self._process_modified_files(modified_files)
-                
-                if deleted_files:
-                    await self._process_deleted_files(deleted_files)
-                
-                if moved_files:
-                    await self._process_moved_files(moved_files)
+                async with get_db_session() as session:
+                    for change in directory_changes:
+                        await self._apply_directory_change(session, change)
+                    
+                    if file_changes:
+                        await self._apply_file_changes(
+                            session, list(upserted_files), deleted_files, moved_files, file_infos
+                        )
                 
                 self.changes_processed += len(changes)
+                self.batches_processed += 1
                 self.last_scan_time = datetime.now()
                 
                 # Call user callback if provided
@@ -337,126 +464,246 @@ class FileMonitor:
             except Exception as e:
                 logger.error("Error processing changes", error=str(e))
     
-    async def _process_created_files(self, file_paths: List[Path]) -> None:
-        """Process newly created files."""
-        logger.debug("Processing created files", count=len(file_paths))
+    def _plan_directory_changes(
+        self,
+        directory_changes: List[FileChangeEvent],
+        file_changes: List[FileChangeEvent],
+    ) -> Tuple[List[FileChangeEvent], List[FileChangeEvent]]:
+        """Pick the directory operations to apply and drop the file events they cover.
         
-        for file_path in file_paths:
-            try:
-                if not file_path.exists():
-                    continue
-                
-                # Analyze the new file
-                file_info = await self.scanner._analyze_file(file_path)
-                if file_info:
-                    # Save to database
-                    await self._save_file_info(file_info)
-                    
-            except Exception as e:
-                logger.error("Error processing created file", file=str(file_path), error=str(e))
+        Returns the directory changes to apply and the remaining file changes.
+        """
+        planned = []
+        for change in directory_changes:
+            # Nested directories reported alongside a moved/deleted parent are already covered
+            if change.event_type in ("moved", "deleted") and any(
+                parent.event_type == change.event_type
+                and self._is_below(change.file_path, parent.file_path)
+                for parent in directory_changes
+            ):
+                continue
+            
+            if change.event_type == "moved" and change.old_path is not None:
+                # The emitter also reports every child as moved; the bulk rename covers them
+                file_changes = [
+                    fc for fc in file_changes
+                    if not (
+                        fc.event_type == "moved"
+                        and self._is_below(fc.old_path, change.old_path)
+                        and self._is_below(fc.file_path, change.file_path)
+                    )
+                ]
+            elif change.event_type == "deleted" and not change.file_path.exists():
+                file_changes = [
+                    fc for fc in file_changes
+                    if not (fc.event_type == "deleted" and self._is_below(fc.file_path, change.file_path))
+                ]
+            else:
+                # Created, or deleted and recreated: the subtree diff covers everything below
+                file_changes = [
+                    fc for fc in file_changes
+                    if not self._is_below(fc.file_path, change.file_path)
+                ]
+            planned.append(change)
+        
+        return planned, file_changes
+    
+    async def _apply_directory_change(self, session: AsyncSession, change: FileChangeEvent) -> None:
+        """Apply one planned directory change within the batch transaction."""
+        if change.event_type == "moved" and change.old_path is not None:
+            # Re-home all rows of a moved directory with one bulk rename
+            renamed = await file_repo.rename_prefix(
+                session,
+                self.project_id,
+                self._relative(change.old_path),
+                self._relative(change.file_path),
+                str(self.root_path),
+            )
+            self.rows_renamed += renamed
+            logger.info("Directory moved", old=str(change.old_path), new=str(change.file_path), files=renamed)
+        elif change.event_type == "deleted" and not change.file_path.exists():
+            # Mark all rows below a removed directory deleted with one bulk update
+            deleted = await file_repo.mark_deleted_under_prefix(
+                session, self.project_id, self._relative(change.file_path)
+            )
+            self.rows_marked_deleted += deleted
+            logger.info("Directory deleted", directory=str(change.file_path), files=deleted)
+        else:
+            await self._reconcile_subtree(session, change.file_path)
+        self.directory_changes_processed += 1
+    
+    async def _analyze_paths(self, file_paths: List[Path]) -> Dict[str, FileInfo]:
+        """Analyze files concurrently (bounded by the scanner semaphore), keyed by relative path."""
+        file_paths = [path for path in file_paths if path.exists()]
+        results = await asyncio.gather(*(self.scanner._analyze_file(path) for path in file_paths))
+        return {info.relative_path: info for info in results if info}
     
-    async def _process_modified_files(self, file_paths: List[Path]) -> None:
-        """Process modified files."""
-        logger.debug("Processing modified files", count=len(file_paths))
+    async def _apply_file_changes(
+        self,
+        session: AsyncSession,
+        upserted_files: List[str],
+        deleted_files: List[str],
+        moved_files: List[Tuple[str, str]],
+        file_infos: Dict[str, FileInfo],
+    ) -> None:
+        """Apply grouped file changes with one lookup query and bulk writes."""
+        lookup = set(upserted_files) | set(deleted_files)
+        for old_relative, new_relative in moved_files:
+            lookup.update((old_relative, new_relative))
+        existing = await file_repo.get_by_paths(session, self.project_id, lookup)
         
-        async with get_db_session() as session:
-            for file_path in file_paths:
-                try:
-                    if not file_path.exists():
-                        continue
-                    
-                    # Get existing file record
-                    relative_path = str(file_path.relative_to(self.root_path))
-                    existing_file = await file_repo.get_by_path(
-                        session, self.project_id, relative_path
-                    )
-                    
-                    if existing_file:
-                        # Re-analyze the file
-                        file_info = await self.scanner._analyze_file(file_path)
-                        if file_info:
-                            # Update existing record
-                            await file_repo.update(
-                                session,
-                                existing_file.id,
-                                **file_info.to_dict()
-                            )
-                    else:
-                        # File wasn't in database, treat as created
-                        file_info = await self.scanner._analyze_file(file_path)
-                        if file_info:
-                            await self._save_file_info(file_info)
-                    
-                except Exception as e:
-                    logger.error("Error processing modified file", file=str(file_path), error=str(e))
+        new_files: List[Dict[str, Any]] = []
+        updates: List[Tuple[File, Dict[str, Any]]] = []
+        deleted_ids: List[int] = []
+        upserts = list(upserted_files)
+        
+        for old_relative, new_relative in moved_files:
+            row = existing.get(old_relative)
+            file_info = file_infos.get(new_relative)
+            if row is None or row.status == FileStatus.DELETED:
+                # Never recorded at the old location: treat as created
+                upserts.append(new_relative)
+                continue
+            if file_info is None:
+                # Moved to an excluded or vanished location
+                deleted_ids.append(row.id)
+                continue
+            stale = existing.get(new_relative)
+            if stale is not None and stale.id != row.id and stale.status != FileStatus.DELETED:
+                deleted_ids.append(stale.id)
+            updates.append((row, file_info.to_dict()))
+        
+        for relative_path in upserts:
+            file_info = file_infos.get(relative_path)
+            if file_info is None:
+                continue
+            row = existing.get(relative_path)
+            if row is not None:
+                updates.append((row, file_info.to_dict()))
+            else:
+                file_data = file_info.to_dict()
+                file_data["project_id"] = self.project_id
+                new_files.append(file_data)
+        
+        for relative_path in deleted_files:
+            row = existing.get(relative_path)
+            if row is not None and row.status != FileStatus.DELETED:
+                deleted_ids.append(row.id)
+        
+        await file_repo.bulk_update(session, updates)
+        await file_repo.bulk_create(session, new_files)
+        deleted = await file_repo.mark_deleted(session, deleted_ids)
+        self.rows_marked_deleted += deleted
+        
+        logger.debug(
+            "Applied file changes",
+            created=len(new_files),
+            updated=len(updates),
+            deleted=deleted,
+        )
     
-    async def _process_deleted_files(self, file_paths: List[Path]) -> None:
-        """Process deleted files."""
-        logger.debug("Processing deleted files", count=len(file_paths))
+    def _walk_subtree(self, directory: Path) -> Dict[str, os.stat_result]:
+        """Stat every included file below directory, keyed by relative path."""
+        found: Dict[str, os.stat_result] = {}
+        if not directory.is_dir() or not self.scanner._should_include_directory(directory):
+            return found
         
-        async with get_db_session() as session:
-            for file_path in file_paths:
-                try:
-                    relative_path = str(file_path.relative_to(self.root_path))
-                    existing_file = await file_repo.get_by_path(
-                        session, self.project_id, relative_path
-                    )
-                    
-                    if existing_file:
-                        # Mark as deleted rather than removing from database
-                        await file_repo.update(
-                            session,
-                            existing_file.id,
-                            status=FileStatus.DELETED
-                        )
-                    
-                except Exception as e:
-                    logger.error("Error processing deleted file", file=str(file_path), error=str(e))
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        entry_path = Path(entry.path)
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if self.scanner._should_include_directory(entry_path):
+                                    stack.append(entry_path)
+                            elif entry.is_file() and self.scanner._should_include_file(entry_path):
+                                found[self._relative(entry_path)] = entry.stat()
+                        except OSError:
+                            continue
+            except OSError as e:
+                logger.warning("Cannot scan directory", path=str(current), error=str(e))
+        return found
     
-    async def _process_moved_files(self, moved_files: List[tuple[Path, Path]]) -> None:
-        """Process moved/renamed files."""
-        logger.debug("Processing moved files", count=len(moved_files))
+    async def reconcile_subtree(self, directory: Path) -> Dict[str, int]:
+        """Diff a directory subtree on disk against the rows stored under its prefix.
         
+        New files are analyzed and recorded (reviving rows previously marked
+        deleted), files whose size or mtime changed are re-analyzed, and rows
+        with no file on disk are marked deleted, all in one transaction.
+        """
         async with get_db_session() as session:
-            for old_path, new_path in moved_files:
-                try:
-                    old_relative = str(old_path.relative_to(self.root_path))
-                    existing_file = await file_repo.get_by_path(
-                        session, self.project_id, old_relative
-                    )
-                    
-                    if existing_file:
-                        if new_path.exists():
-                            # Re-analyze file at new location
-                            file_info = await self.scanner._analyze_file(new_path)
-                            if file_info:
-                                # Update existing record with new path info
-                                await file_repo.update(
-                                    session,
-                                    existing_file.id,
-                                    **file_info.to_dict()
-                                )
-                        else:
-                            # File moved outside our scope, mark as deleted
-                            await file_repo.update(
-                                session,
-                                existing_file.id,
-                                status=FileStatus.DELETED
-                            )
-                    
-                except Exception as e:
-                    logger.error("Error processing moved file", old=str(old_path), new=str(new_path), error=str(e))
+            return await self._reconcile_subtree(session, directory)
     
-    async def _save_file_info(self, file_info: FileInfo) -> None:
-        """Save file info to database."""
-        try:
-            async with get_db_session() as session:
+    async def _reconcile_subtree(self, session: AsyncSession, directory: Path) -> Dict[str, int]:
+        on_disk = await asyncio.to_thread(self._walk_subtree, directory)
+        prefix = self._relative(directory) if directory != self.root_path else ""
+        
+        rows = await file_repo.get_files_under_prefix(session, self.project_id, prefix)
+        existing = {}
+        for row in rows:
+            # Prefer the live row if a stale deleted duplicate exists
+            current = existing.get(row.relative_path)
+            if current is None or current.status == FileStatus.DELETED:
+                existing[row.relative_path] = row
+        
+        missing_ids = [
+            row.id for relative_path, row in existing.items()
+            if relative_path not in on_disk and row.status != FileStatus.DELETED
+        ]
+        changed = [
+            relative_path for relative_path, stat in on_disk.items()
+            if not (
+                relative_path in existing
+                and existing[relative_path].status != FileStatus.DELETED
+                and existing[relative_path].size_bytes == stat.st_size
+                and existing[relative_path].file_modified_at == datetime.fromtimestamp(stat.st_mtime)
+            )
+        ]
+        file_infos = await self._analyze_paths([self.root_path / relative_path for relative_path in changed])
+        
+        new_files = []
+        updates = []
+        for relative_path, file_info in file_infos.items():
+            row = existing.get(relative_path)
+            if row is None:
                 file_data = file_info.to_dict()
                 file_data["project_id"] = self.project_id
-                await file_repo.create(session, **file_data)
-                
-        except Exception as e:
-            logger.error("Failed to save file info", file=file_info.relative_path, error=str(e))
+                new_files.append(file_data)
+            else:
+                updates.append((row, file_info.to_dict()))
+        
+        await file_repo.bulk_update(session, updates)
+        await file_repo.bulk_create(session, new_files)
+        stats = {
+            "scanned": len(on_disk),
+            "created": len(new_files),
+            "updated": len(updates),
+            "deleted": await file_repo.mark_deleted(session, missing_ids),
+        }
+        
+        self.rows_marked_deleted += stats["deleted"]
+        logger.info("Reconciled subtree", directory=str(directory), **stats)
+        return stats
+    
+    async def trigger_incremental_scan(self) -> Dict[str, int]:
+        """Apply pending changes, then diff the whole tree against the database.
+        
+        Only new, changed (by size or mtime) and vanished files touch the
+        database, unlike trigger_full_scan which re-analyzes every file.
+        """
+        logger.info("Triggering incremental scan", project_id=self.project_id)
+        
+        pending_changes = await self.change_buffer.flush_all()
+        if pending_changes:
+            await self._process_changes(pending_changes)
+        
+        async with self._processing_lock:
+            stats = await self.reconcile_subtree(self.root_path)
+            self.last_scan_time = datetime.now()
+        return stats
     
     async def trigger_full_scan(self) -> None:
         """Trigger a full project scan."""
@@ -476,7 +723,13 @@ class FileMonitor:
             "running": self._running,
             "events_received": self.events_received,
             "changes_processed": self.changes_processed,
+            "batches_processed": self.batches_processed,
+            "directory_changes_processed": self.directory_changes_processed,
+            "rows_renamed": self.rows_renamed,
+            "rows_marked_deleted": self.rows_marked_deleted,
             "pending_changes": self.change_buffer.pending_count,
+            "buffer_time": self.change_buffer.buffer_time,
+            "forced_flushes": self.change_buffer.forced_flushes,
             "last_scan_time": self.last_scan_time.isoformat() if self.last_scan_time else None,
         }
 
@@ -533,6 +786,10 @@ class MonitorManager:
             
             logger.info("Stopped all file monitors")
     
+    def get_watch_stats(self) -> Dict[str, Any]:
+        """Get shared watch service statistics (watches, inotify watches, threads)."""
+        return watch_service.get_status()
+    
     def get_all_stats(self) -> Dict[int, Dict[str, Any]]:
         """Get statistics for all monitors."""
         return {
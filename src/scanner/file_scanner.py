@@ -4,13 +4,14 @@ High-performance async file scanning and monitoring for large codebases.
 """
 
 import asyncio
+import contextlib
 import hashlib
 import mimetypes
 import os
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import AsyncGenerator, Dict, List, Optional, Set, Tuple, Any
+from typing import TYPE_CHECKING, AsyncGenerator, Dict, List, Optional, Set, Tuple, Any
 
 import aiofiles
 import structlog
@@ -22,6 +23,10 @@ from src.database.models import FileStatus, ProjectStatus
 from src.database.operations import file_repo, project_repo, get_db_session
 from src.utils.config import get_settings, get_project_config
 
+if TYPE_CHECKING:
+    from .performance import ScannerPerformanceManager
+    from .scheduler import ProjectTicket
+
 logger = structlog.get_logger(__name__)
 
 
@@ -306,7 +311,13 @@ class ScannerStats:
 class AsyncFileScanner:
     """High-performance async file scanner."""
     
-    def __init__(self, project_id: int, root_path: Path, config: Optional[Dict] = None):
+    def __init__(
+        self,
+        project_id: int,
+        root_path: Path,
+        config: Optional[Dict] = None,
+        performance_manager: Optional["ScannerPerformanceManager"] = None,
+    ):
         self.project_id = project_id
         self.root_path = Path(root_path).resolve()
         self.config = config or get_project_config().get_scanning_config()
@@ -332,7 +343,18 @@ class AsyncFileScanner:
         # State
         self._running = False
         self._paused = False
+        self._resumed = asyncio.Event()
+        self._resumed.set()
         self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._flush_lock = asyncio.Lock()
+        
+        # When set, the performance manager's adaptive limiter replaces the
+        # fixed semaphore for hashing/encoding and also gates batch saves
+        self.performance_manager = performance_manager
+        
+        # Set by the orchestrator when several projects share one global
+        # worker budget; preemption happens at batch boundaries
+        self.schedule_ticket: Optional["ProjectTicket"] = None
         
         logger.info(
             "Initialized async file scanner",
@@ -408,45 +430,63 @@ class AsyncFileScanner:
     
     async def _analyze_file(self, file_path: Path) -> Optional[FileInfo]:
         """Analyze a single file and extract metadata."""
-        async with self._semaphore:
-            try:
-                # Basic file info
-                stat = file_path.stat()
-                file_info = FileInfo(
-                    path=file_path,
-                    root_path=self.root_path,
-                    size=stat.st_size,
-                    modified_time=datetime.fromtimestamp(stat.st_mtime),
-                    created_time=datetime.fromtimestamp(stat.st_ctime),
-                )
-                
-                # Classify file
-                file_type, language = self.classifier.classify_file(file_path)
-                file_info.file_type = file_type
-                file_info.language = language
-                
-                # Detect MIME type
-                mime_type, _ = mimetypes.guess_type(str(file_path))
-                file_info.mime_type = mime_type
-                
-                # For text files, get encoding and hash
-                if file_type in ["code", "config", "docs", "markup", "style", "template"]:
-                    # Calculate hash for content comparison
-                    file_info.content_hash = await self._calculate_file_hash(file_path)
-                    
-                    # Detect encoding for text files
-                    file_info.encoding = await self._detect_encoding(file_path)
-                
-                self.stats.files_processed += 1
-                self.stats.bytes_processed += stat.st_size
-                
-                return file_info
+        if self.performance_manager is None:
+            async with self._semaphore, self._budget_slot():
+                return await self._analyze_file_unbounded(file_path)
+        
+        started_at = await self.performance_manager.acquire_worker()
+        file_info = None
+        try:
+            async with self._budget_slot():
+                file_info = await self._analyze_file_unbounded(file_path)
+        finally:
+            self.performance_manager.release_worker(
+                file_info.size if file_info else 0,
+                error=file_info is None,
+                started_at=started_at,
+            )
+        return file_info
+    
+    async def _analyze_file_unbounded(self, file_path: Path) -> Optional[FileInfo]:
+        """Hash, classify and detect encoding for one file (caller bounds concurrency)."""
+        try:
+            # Basic file info
+            stat = file_path.stat()
+            file_info = FileInfo(
+                path=file_path,
+                root_path=self.root_path,
+                size=stat.st_size,
+                modified_time=datetime.fromtimestamp(stat.st_mtime),
+                created_time=datetime.fromtimestamp(stat.st_ctime),
+            )
+            
+            # Classify file
+            file_type, language = self.classifier.classify_file(file_path)
+            file_info.file_type = file_type
+            file_info.language = language
+            
+            # Detect MIME type
+            mime_type, _ = mimetypes.guess_type(str(file_path))
+            file_info.mime_type = mime_type
+            
+            # For text files, get encoding and hash
+            if file_type in ["code", "config", "docs", "markup", "style", "template"]:
+                # Calculate hash for content comparison
+                file_info.content_hash = await self._calculate_file_hash(file_path)
                 
-            except Exception as e:
-                self.stats.files_errored += 1
-                self.stats.errors.append(f"{file_path}: {str(e)}")
-                logger.error("Error analyzing file", file=str(file_path), error=str(e))
-                return None
+                # Detect encoding for text files
+                file_info.encoding = await self._detect_encoding(file_path)
+            
+            self.stats.files_processed += 1
+            self.stats.bytes_processed += stat.st_size
+            
+            return file_info
+            
+        except Exception as e:
+            self.stats.files_errored += 1
+            self.stats.errors.append(f"{file_path}: {str(e)}")
+            logger.error("Error analyzing file", file=str(file_path), error=str(e))
+            return None
     
     async def _discover_files(self, start_path: Optional[Path] = None) -> AsyncGenerator[Path, None]:
         """Discover files recursively with depth limits."""
@@ -521,40 +561,7 @@ class AsyncFileScanner:
             async with get_db_session() as session:
                 await project_repo.update(session, self.project_id, status=ProjectStatus.SCANNING)
             
-            batch = []
-            
-            async for file_path in self._discover_files():
-                if not self._running:
-                    break
-                
-                # Analyze file
-                file_info = await self._analyze_file(file_path)
-                if file_info:
-                    batch.append(file_info)
-                
-                # Process batch when full
-                if len(batch) >= self.batch_size:
-                    if batch_callback:
-                        await batch_callback(batch)
-                    else:
-                        await self._save_file_batch(batch)
-                    batch = []
-                
-                # Log progress periodically
-                if self.stats.files_processed % 1000 == 0:
-                    logger.info(
-                        "Scan progress",
-                        files_processed=self.stats.files_processed,
-                        files_per_second=self.stats.files_per_second,
-                        elapsed_time=self.stats.elapsed_time,
-                    )
-            
-            # Process remaining files in batch
-            if batch:
-                if batch_callback:
-                    await batch_callback(batch)
-                else:
-                    await self._save_file_batch(batch)
+            await self._run_pipeline(batch_callback)
             
             # Update project status
             async with get_db_session() as session:
@@ -578,29 +585,133 @@ class AsyncFileScanner:
         
         return self.stats
     
+    async def _run_pipeline(self, batch_callback: Optional[callable]) -> None:
+        """Discover -> analyze -> save, with each stage bounded.
+        
+        Discovery feeds a bounded queue, so it blocks as soon as analysis
+        workers fall behind (or are throttled by the performance manager) and
+        stops entirely while the scan is paused.
+        """
+        if self.performance_manager is not None:
+            worker_count = self.performance_manager.concurrency_manager.max_workers
+        else:
+            worker_count = self.max_concurrent
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=worker_count * 2)
+        batch: List[FileInfo] = []
+        failures: List[BaseException] = []
+        
+        async def collect(file_info: FileInfo) -> None:
+            nonlocal batch
+            batch.append(file_info)
+            if len(batch) >= self.batch_size:
+                full_batch, batch = batch, []
+                await self._flush_batch(full_batch, batch_callback)
+            
+            # Log progress periodically
+            if self.stats.files_processed % 1000 == 0:
+                logger.info(
+                    "Scan progress",
+                    files_processed=self.stats.files_processed,
+                    files_per_second=self.stats.files_per_second,
+                    elapsed_time=self.stats.elapsed_time,
+                )
+        
+        async def analysis_worker() -> None:
+            while True:
+                file_path = await queue.get()
+                if file_path is None:
+                    return
+                if failures:
+                    continue  # Drain so discovery never blocks on a dead pipeline
+                try:
+                    file_info = await self._analyze_file(file_path)
+                    if file_info:
+                        await collect(file_info)
+                except Exception as e:
+                    failures.append(e)
+                    self._running = False
+        
+        workers = [asyncio.create_task(analysis_worker()) for _ in range(worker_count)]
+        try:
+            try:
+                async for file_path in self._discover_files():
+                    if not self._running:
+                        break
+                    # The generator stays suspended here while paused
+                    await self._wait_if_paused()
+                    await queue.put(file_path)
+            finally:
+                for _ in workers:
+                    await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        
+        if failures:
+            raise failures[0]
+        
+        # Process remaining files in batch
+        if batch:
+            await self._flush_batch(batch, batch_callback)
+    
+    async def _flush_batch(self, file_batch: List[FileInfo], batch_callback: Optional[callable]) -> None:
+        """Hand a batch to the callback (or save it), one batch at a time."""
+        async with self._flush_lock:
+            started_at = None
+            if self.performance_manager is not None:
+                started_at = await self.performance_manager.acquire_worker()
+            try:
+                async with self._budget_slot():
+                    if batch_callback:
+                        await batch_callback(file_batch)
+                    else:
+                        await self._save_file_batch(file_batch)
+            finally:
+                if started_at is not None:
+                    self.performance_manager.release_worker()
+        
+        if self.schedule_ticket is not None:
+            await self.schedule_ticket.checkpoint(self.stats.files_processed)
+    
+    def _budget_slot(self):
+        """Slot from the shared multi-project budget (no-op when unscheduled)."""
+        if self.schedule_ticket is None:
+            return contextlib.nullcontext()
+        return self.schedule_ticket.slot()
+    
+    async def _wait_if_paused(self) -> None:
+        """Block discovery while paused by the caller or by resource limits."""
+        if not self._resumed.is_set():
+            await self._resumed.wait()
+        if self.performance_manager is not None:
+            await self.performance_manager.wait_until_resumed()
+    
     async def _save_file_batch(self, file_batch: List[FileInfo]) -> None:
         """Save a batch of files to database."""
         try:
             async with get_db_session() as session:
+                existing = await file_repo.get_by_paths(
+                    session, self.project_id, [f.relative_path for f in file_batch]
+                )
+                
+                updates = []
+                new_files = []
                 for file_info in file_batch:
-                    # Check if file already exists
-                    existing_file = await file_repo.get_by_path(
-                        session, self.project_id, file_info.relative_path
-                    )
-                    
+                    existing_file = existing.get(file_info.relative_path)
                     if existing_file:
                         # Update existing file if hash changed
                         if existing_file.content_hash != file_info.content_hash:
-                            await file_repo.update(
-                                session,
-                                existing_file.id,
-                                **file_info.to_dict()
-                            )
+                            updates.append((existing_file, file_info.to_dict()))
                     else:
                         # Create new file record
                         file_data = file_info.to_dict()
                         file_data["project_id"] = self.project_id
-                        await file_repo.create(session, **file_data)
+                        new_files.append(file_data)
+                
+                await file_repo.bulk_update(session, updates)
+                await file_repo.bulk_create(session, new_files)
                         
         except Exception as e:
             logger.error("Failed to save file batch", error=str(e))
@@ -610,16 +721,19 @@ class AsyncFileScanner:
         """Stop the scanner."""
         logger.info("Stopping file scanner", project_id=self.project_id)
         self._running = False
+        self._resumed.set()  # Release a paused discovery so it can observe the stop
     
     def pause(self) -> None:
         """Pause the scanner."""
         logger.info("Pausing file scanner", project_id=self.project_id)
         self._paused = True
+        self._resumed.clear()
     
     def resume(self) -> None:
         """Resume the scanner."""
         logger.info("Resuming file scanner", project_id=self.project_id)
         self._paused = False
+        self._resumed.set()
 
 
 # Convenience function for quick scanning
@@ -4,12 +4,14 @@ System resource monitoring and performance optimization for file scanning.
 """
 
 import asyncio
+import os
 import psutil
 import resource
 import time
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Callable, Any
+from typing import Deque, Dict, List, Optional, Callable, Any
 
 import structlog
 
@@ -43,19 +45,50 @@ class PerformanceMetrics:
     error_rate: float
 
 
+_USAGE_FIELDS = (
+    "cpu_percent",
+    "memory_mb",
+    "memory_percent",
+    "disk_io_read_mb",
+    "disk_io_write_mb",
+    "open_files",
+    "active_threads",
+)
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
 class ResourceMonitor:
-    """Monitors system resource usage."""
+    """Monitors system resource usage.
     
-    def __init__(self, sample_interval: float = 5.0):
+    Sampling avoids psutil's per-descriptor work: open files are counted from
+    the length of /proc/self/fd and RSS is read from /proc/self/statm (with
+    psutil fallbacks elsewhere). Samples live in a bounded deque, and the
+    rolling peak/average over `window_minutes` are maintained incrementally.
+    """
+    
+    def __init__(self, sample_interval: float = 5.0, max_samples: int = 1000, window_minutes: int = 10):
         self.sample_interval = sample_interval
+        self.window_minutes = window_minutes
         self._running = False
-        self._samples: List[ResourceUsage] = []
-        self._max_samples = 1000  # Keep last 1000 samples
+        self._samples: Deque[ResourceUsage] = deque(maxlen=max_samples)
         self._callbacks: List[Callable[[ResourceUsage], None]] = []
         
+        # Rolling window aggregates: running field sums plus a deque of
+        # samples with non-increasing memory_mb whose head is the peak
+        self._window: Deque[ResourceUsage] = deque()
+        self._window_sums = [0.0] * len(_USAGE_FIELDS)
+        self._window_peaks: Deque[ResourceUsage] = deque()
+        
         # Baseline measurements
         self._process = psutil.Process()
         self._initial_io = self._get_io_counters()
+        self._total_memory = psutil.virtual_memory().total
+        self._fd_dir = "/proc/self/fd" if os.path.isdir("/proc/self/fd") else None
+        self._statm_path = "/proc/self/statm" if os.path.exists("/proc/self/statm") else None
         
     def add_callback(self, callback: Callable[[ResourceUsage], None]) -> None:
         """Add a callback to be called when new resource data is available."""
@@ -69,9 +102,31 @@ class ResourceMonitor:
                 "read_bytes": io_counters.read_bytes,
                 "write_bytes": io_counters.write_bytes,
             }
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
+        except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
             return {"read_bytes": 0, "write_bytes": 0}
     
+    def _count_open_fds(self) -> int:
+        """Count open descriptors without resolving them."""
+        if self._fd_dir is not None:
+            try:
+                return len(os.listdir(self._fd_dir))
+            except OSError:
+                pass
+        try:
+            return self._process.num_fds()
+        except (AttributeError, psutil.Error):
+            return 0
+    
+    def _read_rss_bytes(self) -> int:
+        """Resident set size, read straight from /proc/self/statm when available."""
+        if self._statm_path is not None:
+            try:
+                with open(self._statm_path, "rb") as f:
+                    return int(f.read().split()[1]) * _PAGE_SIZE
+            except (OSError, ValueError, IndexError):
+                pass
+        return self._process.memory_info().rss
+    
     async def start(self) -> None:
         """Start resource monitoring."""
         if self._running:
@@ -95,9 +150,7 @@ class ResourceMonitor:
                 usage = await self._collect_usage()
                 
                 # Store sample
-                self._samples.append(usage)
-                if len(self._samples) > self._max_samples:
-                    self._samples.pop(0)
+                self._record_sample(usage)
                 
                 # Notify callbacks
                 for callback in self._callbacks:
@@ -112,13 +165,39 @@ class ResourceMonitor:
                 logger.error("Error in resource monitoring loop", error=str(e))
                 await asyncio.sleep(self.sample_interval)
     
+    def _record_sample(self, usage: ResourceUsage) -> None:
+        """Append a sample and update the rolling aggregates."""
+        self._samples.append(usage)
+        
+        self._window.append(usage)
+        for index, field in enumerate(_USAGE_FIELDS):
+            self._window_sums[index] += getattr(usage, field)
+        while self._window_peaks and self._window_peaks[-1].memory_mb <= usage.memory_mb:
+            self._window_peaks.pop()
+        self._window_peaks.append(usage)
+        
+        self._evict_window(usage.timestamp - timedelta(minutes=self.window_minutes))
+    
+    def _evict_window(self, cutoff: datetime) -> None:
+        """Drop window samples older than cutoff (or beyond the sample cap)."""
+        while self._window and (
+            self._window[0].timestamp < cutoff or len(self._window) > self._samples.maxlen
+        ):
+            old = self._window.popleft()
+            for index, field in enumerate(_USAGE_FIELDS):
+                self._window_sums[index] -= getattr(old, field)
+            if self._window_peaks and self._window_peaks[0] is old:
+                self._window_peaks.popleft()
+        if not self._window:
+            self._window_sums = [0.0] * len(_USAGE_FIELDS)
+    
     async def _collect_usage(self) -> ResourceUsage:
         """Collect current resource usage."""
         # CPU and memory
         cpu_percent = self._process.cpu_percent()
-        memory_info = self._process.memory_info()
-        memory_mb = memory_info.rss / (1024 * 1024)
-        memory_percent = self._process.memory_percent()
+        rss_bytes = self._read_rss_bytes()
+        memory_mb = rss_bytes / (1024 * 1024)
+        memory_percent = rss_bytes / self._total_memory * 100 if self._total_memory else 0.0
         
         # IO counters
         current_io = self._get_io_counters()
@@ -126,7 +205,7 @@ class ResourceMonitor:
         disk_write_mb = (current_io["write_bytes"] - self._initial_io["write_bytes"]) / (1024 * 1024)
         
         # Process info
-        open_files = len(self._process.open_files())
+        open_files = self._count_open_fds()
         active_threads = self._process.num_threads()
         
         return ResourceUsage(
@@ -140,6 +219,10 @@ class ResourceMonitor:
             active_threads=active_threads,
         )
     
+    def get_latest_usage(self) -> Optional[ResourceUsage]:
+        """Get the most recent sample."""
+        return self._samples[-1] if self._samples else None
+    
     def get_recent_usage(self, minutes: int = 10) -> List[ResourceUsage]:
         """Get resource usage from the last N minutes."""
         cutoff = datetime.now() - timedelta(minutes=minutes)
@@ -147,6 +230,12 @@ class ResourceMonitor:
     
     def get_peak_usage(self, minutes: int = 10) -> ResourceUsage:
         """Get peak resource usage from the last N minutes."""
+        if minutes == self.window_minutes:
+            self._evict_window(datetime.now() - timedelta(minutes=minutes))
+            if self._window_peaks:
+                return self._window_peaks[0]
+            return self._samples[-1] if self._samples else None
+        
         recent = self.get_recent_usage(minutes)
         if not recent:
             return self._samples[-1] if self._samples else None
@@ -156,6 +245,16 @@ class ResourceMonitor:
     
     def get_average_usage(self, minutes: int = 10) -> Optional[ResourceUsage]:
         """Get average resource usage from the last N minutes."""
+        if minutes == self.window_minutes:
+            self._evict_window(datetime.now() - timedelta(minutes=minutes))
+            if not self._window:
+                return None
+            count = len(self._window)
+            averages = dict(zip(_USAGE_FIELDS, (total / count for total in self._window_sums)))
+            averages["open_files"] = int(averages["open_files"])
+            averages["active_threads"] = int(averages["active_threads"])
+            return ResourceUsage(timestamp=self._window[-1].timestamp, **averages)
+        
         recent = self.get_recent_usage(minutes)
         if not recent:
             return None
@@ -189,6 +288,8 @@ class PerformanceTracker:
         self.files_processed = 0
         self.bytes_processed = 0
         self.errors_count = 0
+        self.latency_samples = 0
+        self.total_latency = 0.0
         self._file_sizes: List[int] = []
         
     def start(self) -> None:
@@ -197,16 +298,22 @@ class PerformanceTracker:
         self.files_processed = 0
         self.bytes_processed = 0
         self.errors_count = 0
+        self.latency_samples = 0
+        self.total_latency = 0.0
         self._file_sizes.clear()
     
-    def record_file(self, size_bytes: int, error: bool = False) -> None:
-        """Record a processed file."""
+    def record_file(self, size_bytes: int, error: bool = False, latency: Optional[float] = None) -> None:
+        """Record a processed file (latency = seconds spent holding a worker slot)."""
         self.files_processed += 1
         self.bytes_processed += size_bytes
         self._file_sizes.append(size_bytes)
         
         if error:
             self.errors_count += 1
+        
+        if latency is not None:
+            self.latency_samples += 1
+            self.total_latency += latency
     
     def get_metrics(self) -> PerformanceMetrics:
         """Get current performance metrics."""
@@ -231,11 +338,13 @@ class PerformanceTracker:
 class ResourceLimiter:
     """Enforces resource limits and emergency stops."""
     
-    def __init__(self, settings=None):
+    def __init__(self, settings=None, resource_monitor: Optional[ResourceMonitor] = None):
         self.settings = settings or get_settings()
-        self._resource_monitor = ResourceMonitor()
+        self._resource_monitor = resource_monitor or ResourceMonitor()
         self._emergency_triggered = False
         self._paused = False
+        self._resumed = asyncio.Event()
+        self._resumed.set()
         self._callbacks: List[Callable[[str, Dict], None]] = []
         
         # Add callback to monitor for limits
@@ -269,12 +378,17 @@ class ResourceLimiter:
                 "limit_mb": self.settings.memory_limit_mb
             })
         
-        # Check CPU limits
+        # Check CPU limits (resume with hysteresis once load has dropped)
         if usage.cpu_percent > self.settings.cpu_usage_limit and self.settings.auto_pause_on_high_load:
             self._trigger_pause("cpu_limit", {
                 "current_percent": usage.cpu_percent,
                 "limit_percent": self.settings.cpu_usage_limit
             })
+        elif self._paused and usage.cpu_percent <= self.settings.cpu_usage_limit * 0.8:
+            self._trigger_resume("cpu_recovered", {
+                "current_percent": usage.cpu_percent,
+                "limit_percent": self.settings.cpu_usage_limit
+            })
     
     def _trigger_emergency(self, reason: str, details: Dict) -> None:
         """Trigger emergency stop."""
@@ -282,6 +396,7 @@ class ResourceLimiter:
             return
         
         self._emergency_triggered = True
+        self._resumed.set()  # Wake paused waiters so they observe the emergency
         logger.error("Emergency stop triggered", reason=reason, details=details)
         
         for callback in self._callbacks:
@@ -306,6 +421,7 @@ class ResourceLimiter:
             return
         
         self._paused = True
+        self._resumed.clear()
         logger.warning("Scanning paused due to resource limits", reason=reason, details=details)
         
         for callback in self._callbacks:
@@ -314,6 +430,26 @@ class ResourceLimiter:
             except Exception as e:
                 logger.error("Error in pause callback", error=str(e))
     
+    def _trigger_resume(self, reason: str, details: Dict) -> None:
+        """Resume after a pause."""
+        self.reset_pause()
+        
+        for callback in self._callbacks:
+            try:
+                callback("resume", {"reason": reason, "details": details})
+            except Exception as e:
+                logger.error("Error in resume callback", error=str(e))
+    
+    async def wait_until_resumed(self, timeout: Optional[float] = None) -> bool:
+        """Wait while paused. Returns False if still paused after timeout."""
+        if not self._paused:
+            return True
+        try:
+            await asyncio.wait_for(self._resumed.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
     def is_emergency_triggered(self) -> bool:
         """Check if emergency stop is triggered."""
         return self._emergency_triggered
@@ -325,88 +461,331 @@ class ResourceLimiter:
     def reset_pause(self) -> None:
         """Reset pause state."""
         self._paused = False
+        self._resumed.set()
         logger.info("Scanning pause reset")
     
     def get_current_usage(self) -> Optional[ResourceUsage]:
         """Get current resource usage."""
-        samples = self._resource_monitor._samples
-        return samples[-1] if samples else None
+        return self._resource_monitor.get_latest_usage()
 
 
-class ConcurrencyManager:
-    """Manages concurrent operations with adaptive scaling."""
+class ResizableLimiter:
+    """Async concurrency limiter whose limit can change while permits are held.
+    
+    Shrinking never revokes held permits: holders above the new limit finish
+    normally and waiters are only admitted once in_use drops below the limit.
+    Growing admits waiters immediately. Waiters are served in FIFO order.
+    """
+    
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        self._limit = limit
+        self._in_use = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.saturated = False  # Set whenever an acquire had to wait
+    
+    @property
+    def limit(self) -> int:
+        return self._limit
+    
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+    
+    @property
+    def waiting(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+    
+    def locked(self) -> bool:
+        """True if an acquire() would have to wait."""
+        return self._in_use >= self._limit or bool(self._waiters)
     
-    def __init__(self, initial_workers: int = 4, max_workers: int = 16):
-        self.initial_workers = initial_workers
-        self.max_workers = max_workers
-        self.current_workers = initial_workers
-        
-        self._semaphore = asyncio.Semaphore(initial_workers)
-        self._performance_tracker = PerformanceTracker()
-        self._last_adjustment = time.time()
-        self._adjustment_interval = 30.0  # seconds
-        
     async def acquire(self) -> None:
-        """Acquire a worker slot."""
-        await self._semaphore.acquire()
+        """Acquire a permit, waiting while the limiter is at its limit."""
+        if not self.locked():
+            self._in_use += 1
+            return
+        
+        self.saturated = True
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # A permit was granted just as we were cancelled; hand it on
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
     
     def release(self) -> None:
-        """Release a worker slot."""
-        self._semaphore.release()
+        """Return a permit."""
+        if self._in_use <= 0:
+            raise RuntimeError("ResizableLimiter released too many times")
+        self._in_use -= 1
+        self._wake()
+    
+    def resize(self, limit: int) -> None:
+        """Change the limit; held permits are unaffected."""
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        self._limit = limit
+        self._wake()
+    
+    def _wake(self) -> None:
+        while self._waiters and self._in_use < self._limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_use += 1
+            waiter.set_result(True)
+    
+    async def __aenter__(self) -> "ResizableLimiter":
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+
+class AIMDController:
+    """Additive-increase / multiplicative-decrease tuning of a ResizableLimiter.
+    
+    Every adjustment window it compares the window's throughput (files/s and
+    bytes/s from the PerformanceTracker) and mean slot latency with the
+    previous window and with the lowest latency seen:
+    
+    - decrease (limit * decrease_factor) on resource pressure, a high error
+      rate, or when extra workers are only queueing on a saturated resource:
+      after a limit increase throughput stayed flat (within half the limit
+      increase) while latency grew by more (Little's law), or latency has
+      inflated beyond latency_tolerance x the lowest latency seen without a
+      throughput gain;
+    - increase (+increase_step) when the limiter was saturated (an acquire
+      had to wait) and neither condition holds;
+    - hold otherwise.
+    
+    The window after a decrease is discarded: holders above the new limit are
+    still draining, so its latency describes the old limit.
+    """
+    
+    def __init__(
+        self,
+        limiter: ResizableLimiter,
+        tracker: PerformanceTracker,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        interval: float = 2.0,
+        increase_step: int = 1,
+        decrease_factor: float = 0.7,
+        latency_tolerance: float = 2.0,
+        min_gain: float = 0.1,
+        max_error_rate: float = 0.1,
+        min_samples: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limiter = limiter
+        self.tracker = tracker
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.interval = interval
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.min_gain = min_gain
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self._clock = clock
+        
+        # Window state
+        self._window_start = clock()
+        self._snapshot = self._take_snapshot()
+        self._base_latency: Optional[float] = None
+        self._previous: Optional[tuple] = None  # (limit, files/s, bytes/s, latency)
+        self._settling = False
+        
+        # Statistics
+        self.adjustments = {"increase": 0, "decrease": 0, "hold": 0}
+        self.last_window: Dict[str, Any] = {}
+    
+    def _take_snapshot(self) -> tuple:
+        tracker = self.tracker
+        return (
+            tracker.files_processed,
+            tracker.bytes_processed,
+            tracker.errors_count,
+            tracker.latency_samples,
+            tracker.total_latency,
+        )
     
-    async def adjust_concurrency(self, resource_usage: ResourceUsage) -> None:
-        """Adjust concurrency based on performance and resource usage."""
-        now = time.time()
-        if now - self._last_adjustment < self._adjustment_interval:
-            return
-        
-        self._last_adjustment = now
-        metrics = self._performance_tracker.get_metrics()
+    def maybe_adjust(self, resource_usage: Optional[ResourceUsage] = None) -> Optional[str]:
+        """Adjust if the current window has elapsed. Returns the decision taken, if any."""
+        if self._clock() - self._window_start < self.interval:
+            return None
+        return self.adjust(resource_usage)
+    
+    def adjust(self, resource_usage: Optional[ResourceUsage] = None) -> Optional[str]:
+        """Close the current window and resize the limiter."""
+        now = self._clock()
+        elapsed = now - self._window_start
+        snapshot = self._take_snapshot()
+        files, size, errors, latency_samples, total_latency = (
+            current - previous for current, previous in zip(snapshot, self._snapshot)
+        )
         
-        # Decide whether to scale up or down
-        should_scale_up = (
-            resource_usage.cpu_percent < 70 and
-            resource_usage.memory_percent < 80 and
-            metrics.error_rate < 0.05 and
-            self.current_workers < self.max_workers
+        pressure = resource_usage is not None and (
+            resource_usage.cpu_percent > 90 or resource_usage.memory_percent > 90
         )
+        if files < self.min_samples and not pressure:
+            return None  # Not enough evidence yet; keep accumulating
+        
+        self._window_start = now
+        self._snapshot = snapshot
+        saturated, self.limiter.saturated = self.limiter.saturated, self.limiter.locked()
+        if self._settling and not pressure:
+            self._settling = False
+            self._previous = None
+            return None
+        
+        files_per_second = files / elapsed if elapsed > 0 else 0.0
+        bytes_per_second = size / elapsed if elapsed > 0 else 0.0
+        error_rate = errors / files if files else 0.0
+        latency = total_latency / latency_samples if latency_samples else None
         
-        should_scale_down = (
-            resource_usage.cpu_percent > 90 or
-            resource_usage.memory_percent > 90 or
-            metrics.error_rate > 0.1 or
-            metrics.files_per_second < 1.0
-        ) and self.current_workers > 1
-        
-        if should_scale_up:
-            self._scale_up()
-        elif should_scale_down:
-            self._scale_down()
-    
-    def _scale_up(self) -> None:
-        """Increase concurrency."""
-        old_workers = self.current_workers
-        self.current_workers = min(self.current_workers + 1, self.max_workers)
-        
-        if self.current_workers > old_workers:
-            # Release additional permits
-            self._semaphore._value += (self.current_workers - old_workers)
-            logger.info("Scaled up concurrency", old=old_workers, new=self.current_workers)
-    
-    def _scale_down(self) -> None:
-        """Decrease concurrency."""
-        old_workers = self.current_workers
-        self.current_workers = max(self.current_workers - 1, 1)
-        
-        if self.current_workers < old_workers:
-            # This is tricky - we can't easily remove permits from a semaphore
-            # Instead, we'll create a new semaphore with the right number
-            current_value = self._semaphore._value
-            used_permits = old_workers - current_value
-            new_permits = max(0, self.current_workers - used_permits)
+        if latency is not None:
+            if self._base_latency is None or latency < self._base_latency:
+                self._base_latency = latency
+            else:
+                # Drift upwards slowly so a changed workload can re-baseline
+                self._base_latency *= 1.005
+        
+        old_limit = self.limiter.limit
+        gain = None
+        queueing = False
+        if self._previous is not None:
+            previous_limit, previous_fps, previous_bps, previous_latency = self._previous
+            gains = []
+            if previous_fps > 0:
+                gains.append(files_per_second / previous_fps - 1)
+            if previous_bps > 0:
+                gains.append(bytes_per_second / previous_bps - 1)
+            gain = max(gains) if gains else None
             
-            self._semaphore = asyncio.Semaphore(new_permits)
-            logger.info("Scaled down concurrency", old=old_workers, new=self.current_workers)
+            scale = old_limit / previous_limit - 1
+            if scale > 0 and gain is not None and latency is not None and previous_latency:
+                # Flat throughput with rising latency; a stall (throughput
+                # dropping along with the latency spike) is not queueing
+                queueing = (
+                    abs(gain) < scale / 2
+                    and latency / previous_latency - 1 > scale / 2
+                    and latency > self._base_latency * (1 + self.min_gain)
+                )
+        
+        latency_inflated = (
+            latency is not None
+            and self._base_latency is not None
+            and latency > self._base_latency * self.latency_tolerance
+            and (gain is None or gain < self.min_gain)
+        )
+        
+        if pressure or error_rate > self.max_error_rate or queueing or latency_inflated:
+            decision = "decrease"
+            new_limit = max(self.min_limit, min(old_limit - 1, int(old_limit * self.decrease_factor)))
+            self._settling = new_limit < old_limit
+        elif saturated:
+            decision = "increase"
+            new_limit = min(self.max_limit, old_limit + self.increase_step)
+        else:
+            decision = "hold"
+            new_limit = old_limit
+        
+        self._previous = (old_limit, files_per_second, bytes_per_second, latency)
+        
+        if new_limit == old_limit:
+            decision = "hold"
+        else:
+            self.limiter.resize(max(1, new_limit))
+            logger.info(
+                "Adjusted concurrency",
+                decision=decision,
+                old=old_limit,
+                new=new_limit,
+                files_per_second=round(files_per_second, 1),
+                latency_ms=round(latency * 1000, 1) if latency is not None else None,
+            )
+        
+        self.adjustments[decision] += 1
+        self.last_window = {
+            "files_per_second": files_per_second,
+            "bytes_per_second": bytes_per_second,
+            "error_rate": error_rate,
+            "mean_latency": latency,
+            "base_latency": self._base_latency,
+            "decision": decision,
+            "limit": self.limiter.limit,
+        }
+        return decision
+
+
+class ConcurrencyManager:
+    """Manages concurrent operations with adaptive (AIMD) scaling."""
+    
+    def __init__(
+        self,
+        initial_workers: int = 4,
+        max_workers: int = 16,
+        min_workers: int = 1,
+        adjustment_interval: float = 2.0,
+    ):
+        self.initial_workers = initial_workers
+        self.max_workers = max_workers
+        
+        self._limiter = ResizableLimiter(initial_workers)
+        self._performance_tracker = PerformanceTracker()
+        self._performance_tracker.start()
+        self._controller = AIMDController(
+            self._limiter,
+            self._performance_tracker,
+            min_limit=min_workers,
+            max_limit=max_workers,
+            interval=adjustment_interval,
+        )
+        self._last_usage: Optional[ResourceUsage] = None
+    
+    @property
+    def current_workers(self) -> int:
+        return self._limiter.limit
+    
+    @property
+    def active_workers(self) -> int:
+        return self._limiter.in_use
+    
+    async def acquire(self) -> float:
+        """Acquire a worker slot. Returns the grant time to pass back to release()."""
+        await self._limiter.acquire()
+        return time.monotonic()
+    
+    def release(
+        self,
+        started_at: Optional[float] = None,
+        size_bytes: int = 0,
+        error: bool = False,
+    ) -> None:
+        """Release a worker slot, recording the file and slot latency if given."""
+        self._limiter.release()
+        if started_at is not None:
+            self._performance_tracker.record_file(size_bytes, error, time.monotonic() - started_at)
+            self._controller.maybe_adjust(self._last_usage)
+    
+    async def adjust_concurrency(self, resource_usage: ResourceUsage) -> None:
+        """Feed a resource sample to the controller (adjusts once per window)."""
+        self._last_usage = resource_usage
+        self._controller.maybe_adjust(resource_usage)
     
     def record_file_processed(self, size_bytes: int, error: bool = False) -> None:
         """Record a processed file for performance tracking."""
@@ -415,17 +794,28 @@ class ConcurrencyManager:
     def get_performance_metrics(self) -> PerformanceMetrics:
         """Get current performance metrics."""
         return self._performance_tracker.get_metrics()
+    
+    def get_controller_stats(self) -> Dict[str, Any]:
+        """Get AIMD controller state."""
+        return {
+            "limit": self._limiter.limit,
+            "in_use": self._limiter.in_use,
+            "waiting": self._limiter.waiting,
+            "adjustments": dict(self._controller.adjustments),
+            "last_window": self._controller.last_window,
+        }
 
 
 class ScannerPerformanceManager:
     """Comprehensive performance management for file scanner."""
     
-    def __init__(self, settings=None):
+    def __init__(self, settings=None, pause_timeout: float = 60.0):
         self.settings = settings or get_settings()
+        self.pause_timeout = pause_timeout
         
         # Components
         self.resource_monitor = ResourceMonitor()
-        self.resource_limiter = ResourceLimiter(settings)
+        self.resource_limiter = ResourceLimiter(settings, self.resource_monitor)
         self.concurrency_manager = ConcurrencyManager(
             initial_workers=self.settings.max_concurrent_workers,
             max_workers=self.settings.max_concurrent_workers * 2
@@ -481,24 +871,27 @@ class ScannerPerformanceManager:
         if self._running:
             asyncio.create_task(self.concurrency_manager.adjust_concurrency(usage))
     
-    async def acquire_worker(self) -> None:
-        """Acquire a worker slot with resource checking."""
+    async def wait_until_resumed(self) -> None:
+        """Block while scanning is paused (woken by the limiter, no polling)."""
         if self.resource_limiter.is_emergency_triggered():
             raise RuntimeError("Emergency stop triggered - cannot acquire worker")
         
-        if self.resource_limiter.is_paused():
-            # Wait for unpause or timeout
-            for _ in range(60):  # Wait up to 60 seconds
-                if not self.resource_limiter.is_paused():
-                    break
-                await asyncio.sleep(1)
-            else:
-                raise RuntimeError("Scanner paused due to resource limits")
+        if not await self.resource_limiter.wait_until_resumed(self.pause_timeout):
+            raise RuntimeError("Scanner paused due to resource limits")
         
-        await self.concurrency_manager.acquire()
+        if self.resource_limiter.is_emergency_triggered():
+            raise RuntimeError("Emergency stop triggered - cannot acquire worker")
     
-    def release_worker(self, file_size: int = 0, error: bool = False) -> None:
+    async def acquire_worker(self) -> float:
+        """Acquire a worker slot with resource checking. Returns the grant time for release_worker()."""
+        await self.wait_until_resumed()
+        return await self.concurrency_manager.acquire()
+    
+    def release_worker(self, file_size: int = 0, error: bool = False, started_at: Optional[float] = None) -> None:
         """Release a worker slot and record metrics."""
+        if started_at is not None:
+            self.concurrency_manager.release(started_at, file_size, error)
+            return
         self.concurrency_manager.release()
         if file_size > 0:
             self.concurrency_manager.record_file_processed(file_size, error)
@@ -518,6 +911,8 @@ class ScannerPerformanceManager:
             "concurrency": {
                 "current_workers": self.concurrency_manager.current_workers,
                 "max_workers": self.concurrency_manager.max_workers,
+                "active_workers": self.concurrency_manager.active_workers,
+                "controller": self.concurrency_manager.get_controller_stats(),
             },
             "limits": {
                 "emergency_triggered": self.resource_limiter.is_emergency_triggered(),
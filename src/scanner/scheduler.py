@@ -0,0 +1,332 @@
+"""Fair-Share Multi-Project Scan Scheduler
+
+Runs several project scans concurrently under one global worker budget.
+Each project holds a ticket; at most `max_active_projects` tickets are active
+at once and worker slots are handed out across active tickets by stride
+scheduling, so each gets a share proportional to its effective weight.
+Small and recently changed projects are admitted first, and a running
+project can be preempted at a batch boundary when a waiting project has a
+better claim.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class ProjectTicket:
+    """One project's claim on the shared scan budget."""
+
+    PENDING = "pending"
+    ACTIVE = "active"
+    DONE = "done"
+
+    def __init__(
+        self,
+        scheduler: "FairShareScheduler",
+        name: str,
+        weight: float = 1.0,
+        size_hint: Optional[int] = None,
+        last_change: Optional[float] = None,
+    ):
+        if weight <= 0:
+            raise ValueError("weight must be > 0")
+        self.scheduler = scheduler
+        self.name = name
+        self.weight = weight
+        self.size_hint = size_hint
+        self.last_change = last_change
+
+        self.state = self.PENDING
+        self.vtime = 0.0
+        self.files_done = 0
+        self.batches = 0
+        self.batches_since_admit = 0
+        self.slots_held = 0
+        self.slots_granted = 0
+        self.preemptions = 0
+        self.queued_at = scheduler.clock()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.wait_time = 0.0
+
+        self._admitted: Optional[asyncio.Future] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def acquire(self) -> None:
+        """Acquire one worker slot from the global budget."""
+        await self.scheduler._acquire(self)
+
+    def release(self) -> None:
+        """Return a worker slot."""
+        self.scheduler._release(self)
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one worker slot for the duration of the block."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def checkpoint(self, files_done: Optional[int] = None) -> None:
+        """Batch boundary: record progress and yield if preempted."""
+        if files_done is not None:
+            self.files_done = files_done
+        await self.scheduler._checkpoint(self)
+
+    def get_progress(self) -> Dict[str, Any]:
+        """Per-project scheduling progress."""
+        return {
+            "state": self.state,
+            "weight": self.weight,
+            "effective_weight": self.scheduler.effective_weight(self),
+            "size_hint": self.size_hint,
+            "files_done": self.files_done,
+            "percent_complete": (
+                min(100.0, 100.0 * self.files_done / self.size_hint) if self.size_hint else None
+            ),
+            "batches": self.batches,
+            "slots_held": self.slots_held,
+            "slots_granted": self.slots_granted,
+            "preemptions": self.preemptions,
+            "wait_time": self.wait_time,
+        }
+
+
+class FairShareScheduler:
+    """Weighted fair sharing of a global worker budget across project scans."""
+
+    def __init__(
+        self,
+        total_slots: int,
+        max_active_projects: int = 3,
+        min_batches_before_preempt: int = 2,
+        default_size_hint: int = 5000,
+        recent_change_window: float = 300.0,
+        recent_change_boost: float = 2.0,
+        aging_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if total_slots < 1:
+            raise ValueError("total_slots must be >= 1")
+        if max_active_projects < 1:
+            raise ValueError("max_active_projects must be >= 1")
+        self.total_slots = total_slots
+        self.max_active_projects = max_active_projects
+        self.min_batches_before_preempt = min_batches_before_preempt
+        self.default_size_hint = default_size_hint
+        self.recent_change_window = recent_change_window
+        self.recent_change_boost = recent_change_boost
+        self.aging_seconds = aging_seconds
+        self.clock = clock
+
+        self._in_use = 0
+        self._tickets: Dict[str, ProjectTicket] = {}
+        self._active: List[ProjectTicket] = []
+        self._pending: List[ProjectTicket] = []
+
+    def register(
+        self,
+        name: str,
+        weight: float = 1.0,
+        size_hint: Optional[int] = None,
+        last_change: Optional[float] = None,
+    ) -> ProjectTicket:
+        """Register a project; it competes for admission until finished."""
+        if name in self._tickets and self._tickets[name].state != ProjectTicket.DONE:
+            raise ValueError(f"Project already scheduled: {name}")
+        ticket = ProjectTicket(self, name, weight, size_hint, last_change)
+        self._tickets[name] = ticket
+        self._pending.append(ticket)
+        return ticket
+
+    # Priorities
+
+    def effective_weight(self, ticket: ProjectTicket) -> float:
+        """Base weight, boosted for recently changed projects."""
+        if (
+            ticket.last_change is not None
+            and self.clock() - ticket.last_change <= self.recent_change_window
+        ):
+            return ticket.weight * self.recent_change_boost
+        return ticket.weight
+
+    def _score(self, ticket: ProjectTicket) -> float:
+        """Lower runs first: weighted remaining work, discounted while waiting."""
+        size = ticket.size_hint if ticket.size_hint is not None else self.default_size_hint
+        remaining = max(size - ticket.files_done, 1)
+        score = remaining / self.effective_weight(ticket)
+        if ticket.state == ProjectTicket.PENDING and self.aging_seconds > 0:
+            score /= 1.0 + (self.clock() - ticket.queued_at) / self.aging_seconds
+        return score
+
+    def _best_pending(self) -> Optional[ProjectTicket]:
+        if not self._pending:
+            return None
+        return min(self._pending, key=self._score)
+
+    # Admission and preemption
+
+    async def admit(self, ticket: ProjectTicket) -> None:
+        """Wait until the ticket is one of the active projects."""
+        if ticket.state == ProjectTicket.ACTIVE:
+            return
+        loop = asyncio.get_running_loop()
+        ticket._admitted = loop.create_future()
+        self._admit_next()
+        try:
+            await ticket._admitted
+        except asyncio.CancelledError:
+            if ticket.state == ProjectTicket.ACTIVE:
+                self.finish(ticket)
+            raise
+        finally:
+            ticket._admitted = None
+
+    def _admit_next(self) -> None:
+        """Fill free active seats with the best-scoring waiting tickets."""
+        while len(self._active) < self.max_active_projects:
+            candidates = [t for t in self._pending if t._admitted is not None]
+            if not candidates:
+                return
+            ticket = min(candidates, key=self._score)
+            self._activate(ticket)
+
+    def _activate(self, ticket: ProjectTicket) -> None:
+        now = self.clock()
+        self._pending.remove(ticket)
+        self._active.append(ticket)
+        ticket.state = ProjectTicket.ACTIVE
+        ticket.batches_since_admit = 0
+        ticket.wait_time += now - ticket.queued_at
+        if ticket.started_at is None:
+            ticket.started_at = now
+        # Start from the current virtual time so a (re)admitted project gets its
+        # fair share from now on rather than a burst to make up for lost time
+        others = [t.vtime for t in self._active if t is not ticket]
+        if others:
+            ticket.vtime = max(ticket.vtime, min(others))
+        if ticket._admitted is not None and not ticket._admitted.done():
+            ticket._admitted.set_result(None)
+        logger.debug("Project admitted to scan scheduler", project=ticket.name)
+        self._dispatch()
+
+    def _deactivate(self, ticket: ProjectTicket, state: str) -> None:
+        self._active.remove(ticket)
+        ticket.state = state
+        ticket.queued_at = self.clock()
+        if state == ProjectTicket.PENDING:
+            self._pending.append(ticket)
+
+    async def _checkpoint(self, ticket: ProjectTicket) -> None:
+        ticket.batches += 1
+        ticket.batches_since_admit += 1
+        if ticket.state != ProjectTicket.ACTIVE:
+            return
+        if ticket.batches_since_admit < self.min_batches_before_preempt:
+            return
+
+        waiting = [t for t in self._pending if t._admitted is not None]
+        if not waiting or len(self._active) < self.max_active_projects:
+            return
+        challenger = min(waiting, key=self._score)
+        if self._score(challenger) >= self._score(ticket):
+            return
+
+        # Preempt: in-flight slots finish normally, new ones wait for re-admission
+        ticket.preemptions += 1
+        logger.info(
+            "Preempting project scan at batch boundary",
+            project=ticket.name,
+            in_favour_of=challenger.name,
+        )
+        self._deactivate(ticket, ProjectTicket.PENDING)
+        await self.admit(ticket)
+
+    def finish(self, ticket: ProjectTicket) -> None:
+        """Mark a project done and hand its seat to the next one."""
+        if ticket.state == ProjectTicket.ACTIVE:
+            self._deactivate(ticket, ProjectTicket.DONE)
+        elif ticket in self._pending:
+            self._pending.remove(ticket)
+            ticket.state = ProjectTicket.DONE
+        ticket.finished_at = self.clock()
+        for waiter in ticket._waiters:
+            if not waiter.done():
+                waiter.cancel()
+        ticket._waiters.clear()
+        self._admit_next()
+        self._dispatch()
+
+    # Slot sharing (stride scheduling over active tickets)
+
+    async def _acquire(self, ticket: ProjectTicket) -> None:
+        if ticket.state == ProjectTicket.DONE:
+            raise RuntimeError(f"Project scan already finished: {ticket.name}")
+        if (
+            ticket.state == ProjectTicket.ACTIVE
+            and self._in_use < self.total_slots
+            and not any(t._waiters for t in self._active)
+        ):
+            self._grant(ticket)
+            return
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        ticket._waiters.append(waiter)
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted concurrently with cancellation: give the slot back
+                self._release(ticket)
+            else:
+                with contextlib.suppress(ValueError):
+                    ticket._waiters.remove(waiter)
+            raise
+
+    def _grant(self, ticket: ProjectTicket) -> None:
+        self._in_use += 1
+        ticket.slots_held += 1
+        ticket.slots_granted += 1
+        ticket.vtime += 1.0 / self.effective_weight(ticket)
+
+    def _release(self, ticket: ProjectTicket) -> None:
+        if ticket.slots_held <= 0:
+            raise RuntimeError("release() called more times than acquire()")
+        ticket.slots_held -= 1
+        self._in_use -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to the active ticket with the lowest virtual time."""
+        while self._in_use < self.total_slots:
+            ready = [t for t in self._active if t._waiters]
+            if not ready:
+                return
+            ticket = min(ready, key=lambda t: t.vtime)
+            waiter = ticket._waiters.popleft()
+            if waiter.done():
+                continue
+            self._grant(ticket)
+            waiter.set_result(None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Budget usage and per-project progress."""
+        return {
+            "total_slots": self.total_slots,
+            "slots_in_use": self._in_use,
+            "max_active_projects": self.max_active_projects,
+            "active": [t.name for t in self._active],
+            "pending": [t.name for t in self._pending],
+            "projects": {name: t.get_progress() for name, t in self._tickets.items()},
+        }
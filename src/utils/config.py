@@ -40,6 +40,15 @@ class Settings(BaseSettings):
     # MCP Server Configuration
     mcp_server_host: str = Field(default="localhost", description="MCP server host")
     mcp_server_port: int = Field(default=8765, description="MCP server port")
+    daemon_mode: bool = Field(
+        default=False, description="Keep registered projects scanned and analyzed in the background"
+    )
+    daemon_projects: List[str] = Field(
+        default=[], description="Project roots registered with the background analysis at startup"
+    )
+    daemon_wait_timeout_seconds: float = Field(
+        default=30.0, description="Longest a tool call waits for fresh analysis when asked to"
+    )
     
     # Logging Configuration
     log_level: str = Field(default="INFO", description="Logging level")
@@ -50,6 +59,36 @@ class Settings(BaseSettings):
     max_file_size_mb: int = Field(default=10, description="Maximum file size to analyze in MB")
     max_concurrent_workers: int = Field(default=4, description="Maximum concurrent worker threads")
     scan_batch_size: int = Field(default=100, description="Batch size for file processing")
+    monitor_debounce_seconds: float = Field(
+        default=2.0, description="Quiet period before a changed file is processed (sub-second allowed)"
+    )
+    monitor_buffer_max_size: int = Field(
+        default=1000, description="Pending changes that force an immediate flush"
+    )
+    scan_global_workers: int = Field(
+        default=8, description="Worker slots shared by all concurrently scanning projects"
+    )
+    max_concurrent_project_scans: int = Field(
+        default=3, description="Projects scanned at the same time by scan_all_projects"
+    )
+    analysis_workers: int = Field(
+        default=0, description="Processes for content analysis (0 = one per CPU)"
+    )
+    analysis_cache_enabled: bool = Field(default=True, description="Reuse analyses of unchanged file contents")
+    analysis_cache_path: Optional[str] = Field(
+        default=None, description="Analysis cache file (default ~/.cache/universal-crossref/analysis_cache.db)"
+    )
+    analysis_cache_max_mb: int = Field(default=256, description="Analysis cache size budget in MB")
+    semantic_top_k: int = Field(
+        default=20, description="Semantic similarity relationships kept per file (0 = no cap)"
+    )
+    semantic_vectorized: bool = Field(
+        default=False, description="Score semantic similarity with numpy sparse Jaccard (needs the ai extra)"
+    )
+    analysis_snapshot_refresh_seconds: float = Field(
+        default=30.0,
+        description="How long server tools reuse a project's analysis before rescanning it (unmonitored projects)"
+    )
     
     # Performance Limits
     memory_limit_mb: int = Field(default=1024, description="Memory limit in MB")
@@ -130,6 +169,9 @@ class Settings(BaseSettings):
             "auto_pause_on_high_load": self.auto_pause_on_high_load,
             "max_concurrent_workers": self.max_concurrent_workers,
             "scan_batch_size": self.scan_batch_size,
+            "scan_global_workers": self.scan_global_workers,
+            "max_concurrent_project_scans": self.max_concurrent_project_scans,
+            "analysis_workers": self.analysis_workers,
         }
 
 
@@ -0,0 +1,230 @@
+"""Shared File System Watch Service
+
+One process-wide watchdog observer that multiplexes every watcher in the
+process. Handlers register interest in a root path; the service keeps a
+minimal set of scheduled watches (a recursive watch on a parent covers all
+registrations below it), reference-counts registrations and dispatches each
+event to the handlers whose root contains it.
+"""
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import structlog
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+
+logger = structlog.get_logger(__name__)
+
+
+def _contains(root: str, path: str, recursive: bool = True) -> bool:
+    """Check whether path lies within root."""
+    if path == root:
+        return True
+    if recursive:
+        return path.startswith(root.rstrip(os.sep) + os.sep)
+    return os.path.dirname(path) == root
+
+
+def count_inotify_watches() -> Optional[int]:
+    """Count inotify watches held by this process (Linux only, else None)."""
+    fd_dir = "/proc/self/fd"
+    if not os.path.isdir(fd_dir):
+        return None
+    total = 0
+    try:
+        for fd in os.listdir(fd_dir):
+            try:
+                if os.readlink(os.path.join(fd_dir, fd)) != "anon_inode:inotify":
+                    continue
+                with open(f"/proc/self/fdinfo/{fd}", "r") as f:
+                    total += sum(1 for line in f if line.startswith("inotify wd:"))
+            except OSError:
+                continue
+    except OSError:
+        return None
+    return total
+
+
+class _Registration:
+    """A handler's interest in one root path."""
+
+    def __init__(self, handler: FileSystemEventHandler, root: str, recursive: bool):
+        self.handler = handler
+        self.root = root
+        self.recursive = recursive
+        self.refcount = 1
+
+
+class _RootDispatcher(FileSystemEventHandler):
+    """Watchdog handler attached to one scheduled watch; fans events out."""
+
+    def __init__(self, service: "WatchService", root: str):
+        super().__init__()
+        self.service = service
+        self.root = root
+
+    def dispatch(self, event: FileSystemEvent) -> None:
+        self.service._dispatch(event)
+
+
+class WatchService:
+    """Process-wide watchdog observer with per-root dispatch."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._observer: Optional[Observer] = None
+        self._registrations: Dict[Tuple[int, str], _Registration] = {}
+        self._watches: Dict[str, Tuple[Any, bool]] = {}  # root -> (ObservedWatch, recursive)
+        self.events_dispatched = 0
+
+    def _ensure_observer(self) -> Observer:
+        # Caller holds self._lock
+        if self._observer is None or not self._observer.is_alive():
+            self._observer = Observer()
+            self._observer.daemon = True
+            self._observer.start()
+            self._watches.clear()
+        return self._observer
+
+    def _desired_watches(self) -> Dict[str, bool]:
+        """Minimal set of roots covering every registration."""
+        roots: Dict[str, bool] = {}
+        for registration in self._registrations.values():
+            recursive = roots.get(registration.root, False) or registration.recursive
+            roots[registration.root] = recursive
+
+        desired = {}
+        for root, recursive in roots.items():
+            covered = any(
+                other != root and other_recursive and _contains(other, root)
+                for other, other_recursive in roots.items()
+            )
+            if not covered:
+                desired[root] = recursive
+        return desired
+
+    def _reconcile(self) -> None:
+        # Caller holds self._lock
+        desired = self._desired_watches()
+        if desired:
+            observer = self._ensure_observer()
+        else:
+            observer = self._observer
+
+        # Schedule new (or upgraded) watches before dropping covered ones so no
+        # events are missed in between
+        for root, recursive in desired.items():
+            current = self._watches.get(root)
+            if current is not None and current[1] == recursive:
+                continue
+            watch = observer.schedule(_RootDispatcher(self, root), root, recursive=recursive)
+            if current is not None:
+                observer.unschedule(current[0])
+            self._watches[root] = (watch, recursive)
+            logger.debug("Scheduled shared watch", root=root, recursive=recursive)
+
+        for root in [root for root in self._watches if root not in desired]:
+            watch, _ = self._watches.pop(root)
+            if observer is not None:
+                try:
+                    observer.unschedule(watch)
+                except KeyError:
+                    pass
+            logger.debug("Unscheduled shared watch", root=root)
+
+    def schedule(self, handler: FileSystemEventHandler, path: str, recursive: bool = True) -> str:
+        """Register a handler for events under path. Returns the normalised root."""
+        root = os.path.abspath(str(path))
+        with self._lock:
+            key = (id(handler), root)
+            registration = self._registrations.get(key)
+            if registration is not None:
+                registration.refcount += 1
+                registration.recursive = registration.recursive or recursive
+                return root
+            self._registrations[key] = _Registration(handler, root, recursive)
+            try:
+                self._reconcile()
+            except Exception:
+                del self._registrations[key]
+                raise
+        logger.info("Registered watch handler", root=root, watches=len(self._watches))
+        return root
+
+    def unschedule(self, handler: FileSystemEventHandler, path: str) -> bool:
+        """Drop one reference to a handler registration. Returns False if unknown."""
+        root = os.path.abspath(str(path))
+        with self._lock:
+            key = (id(handler), root)
+            registration = self._registrations.get(key)
+            if registration is None:
+                return False
+            registration.refcount -= 1
+            if registration.refcount <= 0:
+                del self._registrations[key]
+                self._reconcile()
+        return True
+
+    def _dispatch(self, event: FileSystemEvent) -> None:
+        paths = [os.fsdecode(event.src_path)]
+        dest_path = getattr(event, "dest_path", None)
+        if dest_path:
+            paths.append(os.fsdecode(dest_path))
+
+        with self._lock:
+            targets = [
+                registration.handler
+                for registration in self._registrations.values()
+                if any(_contains(registration.root, path, registration.recursive) for path in paths)
+            ]
+            self.events_dispatched += 1
+
+        for handler in targets:
+            try:
+                handler.dispatch(event)
+            except Exception as e:
+                logger.error("Watch handler failed", handler=type(handler).__name__, error=str(e))
+
+    def shutdown(self) -> None:
+        """Stop the shared observer and forget all registrations."""
+        with self._lock:
+            observer, self._observer = self._observer, None
+            self._registrations.clear()
+            self._watches.clear()
+        if observer is not None and observer.is_alive():
+            observer.stop()
+            observer.join()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Watch, handler and thread counts for status output."""
+        with self._lock:
+            observer = self._observer
+            alive = observer is not None and observer.is_alive()
+            emitters = len(observer.emitters) if alive else 0
+            roots: List[Dict[str, Any]] = [
+                {
+                    "root": root,
+                    "recursive": recursive,
+                    "handlers": sum(
+                        1 for registration in self._registrations.values()
+                        if _contains(root, registration.root, recursive)
+                    ),
+                }
+                for root, (_, recursive) in sorted(self._watches.items())
+            ]
+            return {
+                "observer_running": alive,
+                "scheduled_watches": len(self._watches),
+                "registrations": len(self._registrations),
+                "roots": roots,
+                "observer_threads": (1 + emitters) if alive else 0,
+                "process_threads": threading.active_count(),
+                "inotify_watches": count_inotify_watches(),
+                "events_dispatched": self.events_dispatched,
+            }
+
+
+# Global watch service instance
+watch_service = WatchService()
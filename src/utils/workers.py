@@ -0,0 +1,15 @@
+"""Worker Process Helpers
+
+Helpers for process pools. Kept free of heavy imports: a pool initializer is
+unpickled (and its module imported) before anything else runs in a spawned
+worker, so it can configure the process before other modules log at import.
+"""
+
+import sys
+
+import structlog
+
+
+def configure_worker_logging() -> None:
+    """Pool initializer: send worker logs to stderr (stdout may carry a stdio protocol)."""
+    structlog.configure(logger_factory=structlog.PrintLoggerFactory(file=sys.stderr))
@@ -0,0 +1,164 @@
+"""Tests for the persistent analysis cache."""
+
+import hashlib
+
+import pytest
+
+from src.analyzer.analysis_cache import AnalysisCache
+from src.analyzer.content_analyzer import ContentAnalyzer, PythonAnalyzer
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = AnalysisCache(tmp_path / "analysis_cache.db")
+    yield cache
+    cache.close()
+
+
+def make_analyzer(cache: AnalysisCache) -> ContentAnalyzer:
+    analyzer = ContentAnalyzer(max_workers=1, use_cache=True)
+    analyzer._cache = cache
+    analyzer._cache_checked = True
+    return analyzer
+
+
+def write_files(root, files):
+    items, hashes = [], {}
+    for name, (content, language) in files.items():
+        path = root / name
+        path.write_text(content, encoding="utf-8")
+        items.append((str(path), name, "utf-8", language))
+        hashes[name] = hashlib.sha256(content.encode("utf-8")).hexdigest()
+    return items, hashes
+
+
+class TestAnalysisCache:
+    def test_round_trip_and_hit_counts(self, cache):
+        key = ("abc", "python", "PythonAnalyzer:1+crossref:1")
+        cache.put_many([(key, "PythonAnalyzer", (["imports"], ["exports"], ["deps"], []))])
+
+        found = cache.get_many([key, ("missing", "python", "PythonAnalyzer:1+crossref:1")])
+
+        assert found == {key: (["imports"], ["exports"], ["deps"], [])}
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_persists_across_instances(self, tmp_path):
+        key = ("abc", "python", "v1")
+        first = AnalysisCache(tmp_path / "cache.db")
+        first.put_many([(key, "PythonAnalyzer", "payload")])
+        first.close()
+
+        second = AnalysisCache(tmp_path / "cache.db")
+        assert second.get_many([key]) == {key: "payload"}
+        second.close()
+
+    def test_version_bump_invalidates_only_that_analyzer(self, cache):
+        cache.put_many([
+            (("h1", "python", "PythonAnalyzer:1+crossref:1"), "PythonAnalyzer", "py"),
+            (("h2", "markdown", "MarkdownAnalyzer:1+crossref:1"), "MarkdownAnalyzer", "md"),
+        ])
+
+        removed = cache.purge_stale_versions({
+            "PythonAnalyzer": "PythonAnalyzer:2+crossref:1",
+            "MarkdownAnalyzer": "MarkdownAnalyzer:1+crossref:1",
+        })
+
+        assert removed == 1
+        assert cache.get_stats()["analyzers"] == {"MarkdownAnalyzer:MarkdownAnalyzer:1+crossref:1": 1}
+
+    def test_evicts_least_recently_used_within_budget(self, tmp_path):
+        cache = AnalysisCache(tmp_path / "cache.db", max_bytes=20_000)
+        payload = "x" * 1000
+        keep = ("hot", "python", "v1")
+        cache.put_many([(keep, "PythonAnalyzer", payload)])
+
+        for i in range(60):
+            cache.put_many([((f"h{i}", "python", "v1"), "PythonAnalyzer", payload)])
+            cache.get_many([keep])  # Keep one entry hot
+
+        stats = cache.get_stats()
+        assert stats["size_bytes"] <= 20_000
+        assert stats["evictions"] > 0
+        assert cache.get_many([keep]) == {keep: payload}
+        assert cache.get_many([("h0", "python", "v1")]) == {}
+        cache.close()
+
+
+class TestContentAnalyzerCache:
+    FILES = {
+        "a.py": ("import os\nfrom pkg.util import helper\n\ndef run():\n    return helper()\n", "python"),
+        "README.md": ("# Project\nSee the [guide](docs/guide.md).\n", "markdown"),
+        # Same content as README.md under a non-hub name: shares the cache entry
+        "notes.md": ("# Project\nSee the [guide](docs/guide.md).\n", "markdown"),
+    }
+
+    async def test_cached_results_match_fresh_analysis(self, tmp_path, cache):
+        items, hashes = write_files(tmp_path, self.FILES)
+        fresh = await ContentAnalyzer(max_workers=1).analyze_files(items)
+
+        analyzer = make_analyzer(cache)
+        first = await analyzer.analyze_files(items, hashes)
+        assert cache.hits == 0
+
+        # Second run must not need the files at all
+        for path, *_ in items:
+            (tmp_path / path).unlink()
+        second = await analyzer.analyze_files(items, hashes)
+
+        assert cache.hits == 2  # README.md and notes.md share one entry
+        assert list(second) == list(fresh) == list(first)
+        for name in fresh:
+            second[name].encoding = fresh[name].encoding
+            assert second[name] == fresh[name], name
+        assert second["README.md"].hub_file_candidates == ["README.md"]
+        assert second["notes.md"].hub_file_candidates == []
+
+    async def test_changed_hash_is_reanalyzed(self, tmp_path, cache):
+        items, hashes = write_files(tmp_path, self.FILES)
+        analyzer = make_analyzer(cache)
+        await analyzer.analyze_files(items, hashes)
+
+        (tmp_path / "a.py").write_text("import json\n", encoding="utf-8")
+        hashes["a.py"] = "changed"
+        results = await analyzer.analyze_files(items, hashes)
+
+        assert [imp.module for imp in results["a.py"].imports] == ["json"]
+
+    async def test_analyzer_version_bump_misses(self, tmp_path, cache, monkeypatch):
+        items, hashes = write_files(tmp_path, self.FILES)
+        await make_analyzer(cache).analyze_files(items, hashes)
+
+        monkeypatch.setattr(PythonAnalyzer, "version", PythonAnalyzer.version + ".1")
+        analyzer = make_analyzer(cache)
+        cache.purge_stale_versions(analyzer.get_analyzer_versions())
+        hits_before = cache.hits
+        await analyzer.analyze_files(items, hashes)
+
+        # Only the Python file is re-analyzed; the shared markdown entry still hits
+        assert cache.hits - hits_before == 1
+        assert cache.misses == 2 + 1
+
+    async def test_entries_in_an_older_payload_format_are_not_served(self, tmp_path, cache):
+        items, hashes = write_files(tmp_path, {"main.go": ("package main\n", "go")})
+        # What the cache held before symbols joined the payload
+        cache.put_many([
+            ((hashes["main.go"], "go", "NoLanguageAnalyzer:1+crossref:1"), "NoLanguageAnalyzer", ([], [], [], [])),
+        ])
+        analyzer = make_analyzer(cache)
+
+        assert cache.purge_stale_versions(analyzer.get_analyzer_versions()) == 1
+        results = await analyzer.analyze_files(items, hashes)
+
+        assert results["main.go"].language == "go" and cache.hits == 0
+
+    async def test_malformed_payload_is_a_miss(self, tmp_path, cache):
+        items, hashes = write_files(tmp_path, {"a.py": self.FILES["a.py"]})
+        analyzer = make_analyzer(cache)
+        key, name = analyzer._cache_key(hashes["a.py"], "python")
+        cache.put_many([(key, name, ("imports", "exports"))])
+
+        results = await analyzer.analyze_files(items, hashes)
+
+        assert [imp.module for imp in results["a.py"].imports] == ["os", "pkg.util.helper"]
+        # The re-analysis replaced the bad entry
+        assert len(cache.get_many([key])[key]) == 5
@@ -0,0 +1,116 @@
+"""Tests for the background analysis daemon."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from src.mcp_server.daemon import AnalysisDaemon
+
+
+class FakeScanner:
+    def __init__(self):
+        self.project_name = "proj"
+        self.scan_generation = 0
+        self.monitor = SimpleNamespace(change_buffer=SimpleNamespace(pending_count=0))
+        self.callbacks = []
+
+    def add_callback(self, event_type, callback):
+        self.callbacks.append(callback)
+
+    def remove_callback(self, event_type, callback):
+        self.callbacks.remove(callback)
+        return True
+
+    def apply_change(self):
+        """What the monitor does after committing a change batch."""
+        self.scan_generation += 1
+        for callback in self.callbacks:
+            callback({"change_count": 1})
+
+
+class FakeStore:
+    """Builds snapshots of the scanner's generation after a short delay."""
+
+    def __init__(self, build_seconds=0.05):
+        self.scanner = FakeScanner()
+        self.snapshot = None
+        self.build_seconds = build_seconds
+        self.refresh_interval = 30.0
+        self.builds = 0
+        self.forced = 0
+
+    async def get_scanner(self, root, project_name=None, enable_monitoring=False):
+        return self.scanner
+
+    def is_current(self, snapshot, scanner):
+        return snapshot.scan_generation == scanner.scan_generation
+
+    def peek(self, project_path):
+        return self.snapshot
+
+    async def get(self, project_path, project_name=None, refresh=False):
+        if self.snapshot is not None and not refresh and self.is_current(self.snapshot, self.scanner):
+            return self.snapshot
+        generation = self.scanner.scan_generation
+        await asyncio.sleep(self.build_seconds)
+        self.builds += 1
+        self.forced += refresh
+        self.snapshot = SimpleNamespace(scan_generation=generation, built_at=time.time())
+        return self.snapshot
+
+
+class TestAnalysisDaemon:
+    async def test_reads_do_not_wait_for_the_first_build(self, tmp_path):
+        store = FakeStore()
+        daemon = AnalysisDaemon(store, wait_timeout=5)
+        try:
+            snapshot, status = await daemon.read(str(tmp_path))
+            assert snapshot is None and status["state"] == "warming"
+
+            snapshot, status = await daemon.read(str(tmp_path), wait=True)
+            assert snapshot is store.snapshot
+            assert status["state"] == "fresh" and status["generations_behind"] == 0
+        finally:
+            await daemon.stop()
+
+    async def test_changes_are_picked_up_in_the_background(self, tmp_path):
+        store = FakeStore()
+        daemon = AnalysisDaemon(store, wait_timeout=5)
+        try:
+            await daemon.read(str(tmp_path), wait=True)
+
+            store.scanner.apply_change()
+            snapshot, status = await daemon.read(str(tmp_path))
+            assert snapshot.scan_generation == 0
+            assert status["state"] == "stale" and status["generations_behind"] == 1
+
+            snapshot, status = await daemon.read(str(tmp_path), wait=True)
+            assert snapshot.scan_generation == 1 and status["fresh"]
+            assert store.builds == 2
+        finally:
+            await daemon.stop()
+
+    async def test_pending_monitor_changes_mark_the_snapshot_stale(self, tmp_path):
+        store = FakeStore()
+        daemon = AnalysisDaemon(store, wait_timeout=0.1)
+        try:
+            await daemon.read(str(tmp_path), wait=True)
+            store.scanner.monitor.change_buffer.pending_count = 3
+
+            _, status = await daemon.read(str(tmp_path), wait=True)
+
+            assert status["state"] == "stale" and status["pending_changes"] == 3
+        finally:
+            await daemon.stop()
+
+    async def test_refresh_forces_a_rescan(self, tmp_path):
+        store = FakeStore()
+        daemon = AnalysisDaemon(store, wait_timeout=5)
+        try:
+            await daemon.read(str(tmp_path), wait=True)
+
+            _, status = await daemon.read(str(tmp_path), refresh=True)
+
+            assert store.forced == 1 and status["fresh"]
+        finally:
+            await daemon.stop()
@@ -0,0 +1,178 @@
+"""Tests for the single-pass language analyzers."""
+
+import ast
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from src.analyzer.content_analyzer import (
+    ContentAnalyzer,
+    JavaScriptAnalyzer,
+    MarkdownAnalyzer,
+    PythonAnalyzer,
+    read_file_content,
+)
+
+PYTHON_SOURCE = """\
+import os
+import yaml as y
+from pkg.util import helper, other as alias
+from . import sibling
+
+__all__ = ["run", "Config"]
+
+
+class Config:
+    def _load(self):
+        import json
+        return json
+
+
+async def run():
+    return helper()
+
+
+def _private():
+    pass
+"""
+
+
+class TestPythonAnalyzer:
+    def test_single_walk_collects_everything(self):
+        analysis = PythonAnalyzer().analyze(PYTHON_SOURCE)
+
+        assert [imp.module for imp in analysis.imports] == [
+            "os", "yaml", "pkg.util.helper", "pkg.util.other", "json",
+        ]
+        assert analysis.exports == ["run", "Config", "Config", "run"]
+        assert analysis.dependencies == ["json", "os", "pkg", "yaml"]
+        assert sorted(analysis.symbols) == ["Config", "_load", "_private", "run"]
+
+    def test_parses_once(self, monkeypatch):
+        calls = []
+        real_parse = ast.parse
+        monkeypatch.setattr(ast, "parse", lambda *a, **k: calls.append(1) or real_parse(*a, **k))
+
+        result = ContentAnalyzer(max_workers=1).analyze_file("mod.py", PYTHON_SOURCE, "python")
+
+        assert len(calls) == 1
+        assert result.dependencies == ["json", "os", "pkg", "yaml"]
+        assert "_private" in result.symbols and "_private" not in result.exports
+
+    def test_syntax_error_falls_back_to_regex(self):
+        analysis = PythonAnalyzer().analyze("import os\nfrom a.b import c as d\n__all__ = ['x']\ndef broken(:\n")
+
+        assert [imp.module for imp in analysis.imports] == ["os", "a.b.c"]
+        assert analysis.exports == ["x"]
+        assert analysis.dependencies == ["a", "os"]
+
+    @pytest.mark.parametrize("method", ["analyze_imports", "analyze_exports", "analyze_dependencies"])
+    def test_per_aspect_methods_match_analyze(self, method):
+        analyzer = PythonAnalyzer()
+        args = (PYTHON_SOURCE, "mod.py") if method == "analyze_imports" else (PYTHON_SOURCE,)
+        field = method.replace("analyze_", "")
+
+        assert getattr(analyzer, method)(*args) == getattr(analyzer.analyze(PYTHON_SOURCE), field)
+
+
+class TestOtherAnalyzers:
+    def test_javascript(self):
+        analysis = JavaScriptAnalyzer().analyze(
+            "import React from 'react';\n"
+            "import { a } from './local';\n"
+            "const s = require('@scope/pkg/sub');\n"
+            "export default App;\n"
+            "export function render() {}\n"
+            "class Widget {}\n"
+        )
+
+        assert analysis.dependencies == ["@scope/pkg", "react"]
+        assert analysis.exports == ["default", "render"]
+        assert analysis.symbols == ["render", "Widget"]
+
+    def test_markdown_links_and_headings(self):
+        analysis = MarkdownAnalyzer().analyze(
+            "# Guide\nSee [setup](docs/setup.md#install) and [site](https://example.com).\n"
+            "[ref]: docs/api.md\n## API\n"
+        )
+
+        assert [imp.module for imp in analysis.imports] == ["docs/setup.md#install", "docs/api.md"]
+        assert analysis.dependencies == ["docs/api.md", "docs/setup.md"]
+        assert analysis.exports == ["Guide", "API"]
+
+
+def make_items(root, count):
+    items = []
+    for i in range(count):
+        path = root / f"mod{i}.py"
+        path.write_text(f"import os\nfrom pkg import mod{(i + 1) % count}\n\ndef f{i}():\n    pass\n", encoding="utf-8")
+        items.append((str(path), path.name, "utf-8", "python"))
+    return items
+
+
+async def collect(analyzer, items, **kwargs):
+    return {result.file_path: result async for result in analyzer.iter_analysis_results(items, **kwargs)}
+
+
+class BrokenExecutor:
+    """Executor whose every task fails as if its worker process had died."""
+
+    def submit(self, fn, *args):
+        future = concurrent.futures.Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+
+class TestParallelAnalysis:
+    def test_read_falls_back_through_encodings(self, tmp_path):
+        path = tmp_path / "legacy.md"
+        path.write_bytes("caf\xe9\n".encode("latin-1"))
+
+        assert read_file_content(path, "utf-8", "legacy.md") == ("caf\xe9\n", "latin-1")
+        assert read_file_content(path, "no-such-codec", "legacy.md") == ("caf\xe9\n", "latin-1")
+        assert read_file_content(tmp_path / "gone.md", None, "gone.md") == (None, None)
+
+    def test_unreadable_items_are_skipped(self, tmp_path):
+        items = make_items(tmp_path, 2) + [(str(tmp_path / "gone.py"), "gone.py", None, "python")]
+
+        results = ContentAnalyzer(max_workers=1).analyze_work_items(items)
+
+        assert [result.file_path for result in results] == ["mod0.py", "mod1.py"]
+        assert results[0].encoding == "utf-8" and results[0].exports == ["f0"]
+
+    async def test_small_jobs_stay_out_of_the_process_pool(self, tmp_path):
+        analyzer = ContentAnalyzer(max_workers=4)
+
+        results = await collect(analyzer, make_items(tmp_path, 5))
+
+        assert sorted(results) == [f"mod{i}.py" for i in range(5)]
+        assert analyzer._executor is None
+
+    async def test_process_pool_matches_in_process_analysis(self, tmp_path):
+        items = make_items(tmp_path, ContentAnalyzer.PARALLEL_THRESHOLD + 6)
+        analyzer = ContentAnalyzer(max_workers=2)
+        try:
+            results = await collect(analyzer, items)
+            assert analyzer._executor._mp_context.get_start_method() == "spawn"
+        finally:
+            analyzer.shutdown()
+
+        expected = {r.file_path: r for r in ContentAnalyzer(max_workers=1).analyze_work_items(items)}
+        assert results == expected
+
+    async def test_broken_pool_falls_back_to_in_process_analysis(self, tmp_path, monkeypatch):
+        items = make_items(tmp_path, ContentAnalyzer.PARALLEL_THRESHOLD)
+        analyzer = ContentAnalyzer(max_workers=2)
+        monkeypatch.setattr(analyzer, "_get_executor", BrokenExecutor)
+
+        results = await collect(analyzer, items, chunk_size=10)
+
+        assert len(results) == len(items)
+
+    async def test_analyze_files_keeps_item_order(self, tmp_path):
+        items = make_items(tmp_path, 6)
+
+        results = await ContentAnalyzer(max_workers=1).analyze_files(list(reversed(items)))
+
+        assert list(results) == [f"mod{i}.py" for i in reversed(range(6))]
@@ -0,0 +1,289 @@
+"""Tests for cross-reference header probing and project verification."""
+
+import hashlib
+import os
+import threading
+import time
+
+import pytest
+
+# simple_server is written against the mcp 1.x FastMCP API
+pytest.importorskip("mcp.server.fastmcp")
+
+from src.mcp_server import simple_server
+from src.mcp_server.simple_server import (
+    HEADER_PROBE_INITIAL_BYTES,
+    VerificationManifest,
+    probe_crossref_header,
+    verify_project_sync,
+)
+
+
+def header(hub="SYSTEM.md", extra_lines=0):
+    lines = ["---", "MANDATORY READING: You HAVE TO read SYSTEM.md first, then this file."]
+    if hub is not None:
+        lines.append(f"Cross-reference: {hub}")
+    lines += [f"Related files: ['file{i}.md']" for i in range(extra_lines)]
+    return "\n".join(lines + ["---", "", ""])
+
+
+def write_hub(root, entries):
+    lines = ["# Hub", "", "## 📚 Mandatory Reading Order", ""]
+    lines += [f"{i}. [{entry}]({entry})" for i, entry in enumerate(entries, 1)]
+    (root / "SYSTEM.md").write_text("\n".join(lines + ["", "## Notes", "- [not an entry](x.md)", ""]), encoding="utf-8")
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A project whose hub lists a.md and docs/b.md; docs/c.md has no header."""
+    monkeypatch.setattr(simple_server.transaction_logger, "log_file", tmp_path / "operations.log")
+    root = tmp_path / "project"
+    (root / "docs").mkdir(parents=True)
+    (root / "a.md").write_text(header() + "# A\n", encoding="utf-8")
+    (root / "docs" / "b.md").write_text(header("OLD.md") + "# B\n", encoding="utf-8")
+    (root / "docs" / "c.md").write_text("# C\n", encoding="utf-8")
+    write_hub(root, ["a.md", os.path.join("docs", "b.md")])
+    return root
+
+
+@pytest.fixture(autouse=True)
+def manifest_dir(tmp_path, monkeypatch):
+    """Keep manifests out of the real user cache."""
+    manifest_dir = tmp_path / "manifests"
+    monkeypatch.setenv("CROSSREF_MANIFEST_DIR", str(manifest_dir))
+    return manifest_dir
+
+
+def tree_listing(root):
+    return sorted(str(path.relative_to(root)) for path in root.rglob("*"))
+
+
+def touch(path, text):
+    """Change a file's content and make sure its stat changes too."""
+    stat = path.stat()
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestProbeCrossrefHeader:
+    @pytest.mark.parametrize("content, status, cross_reference", [
+        (header() + "# Doc\n", "ok", "SYSTEM.md"),
+        (header("OLD_HUB.md") + "# Doc\n", "wrong_hub", "OLD_HUB.md"),
+        (header(hub=None) + "# Doc\n", "incorrect", None),
+        ("---\nMANDATORY READING: never closed\n" + "text\n" * 10, "incorrect", None),
+        ("# Just a document\n", "missing", None),
+        (header().replace("\n", "\r\n") + "# Windows\r\n", "ok", "SYSTEM.md"),
+    ])
+    def test_classifies_headers(self, tmp_path, content, status, cross_reference):
+        path = tmp_path / "doc.md"
+        path.write_bytes(content.encode("utf-8"))
+
+        record = probe_crossref_header(path)
+
+        assert (record["status"], record["cross_reference"]) == (status, cross_reference)
+
+    def test_reads_only_a_prefix_of_large_files(self, tmp_path):
+        path = tmp_path / "big.md"
+        path.write_text(header() + "body text\n" * 100_000, encoding="utf-8")
+
+        record = probe_crossref_header(path)
+
+        assert record["status"] == "ok"
+        assert record["bytes_read"] == HEADER_PROBE_INITIAL_BYTES
+
+    def test_grows_the_read_for_long_headers(self, tmp_path):
+        path = tmp_path / "long.md"
+        content = header(extra_lines=200)
+        path.write_text(content + "body text\n" * 10_000, encoding="utf-8")
+
+        record = probe_crossref_header(path)
+
+        assert record["status"] == "ok"
+        assert len(content) < record["bytes_read"] <= 4 * len(content)
+
+    def test_stops_at_max_bytes(self, tmp_path):
+        path = tmp_path / "unclosed.md"
+        path.write_text("---\nMANDATORY READING: x\n" + "line\n" * 10_000, encoding="utf-8")
+
+        record = probe_crossref_header(path, max_bytes=8192)
+
+        assert record == {"status": "incorrect", "cross_reference": None, "bytes_read": 8192}
+
+    def test_unreadable_file_is_missing(self, tmp_path):
+        assert probe_crossref_header(tmp_path / "absent.md")["status"] == "missing"
+
+
+class TestVerificationManifest:
+    def test_first_refresh_probes_everything(self, project):
+        manifest = VerificationManifest(project)
+
+        stats = manifest.refresh()
+
+        assert (stats["files_probed"], stats["files_unchanged"], stats["hub_reparsed"]) == (3, 0, True)
+        assert {rel: entry["status"] for rel, entry in manifest.files.items()} == {
+            "a.md": "ok", os.path.join("docs", "b.md"): "wrong_hub", os.path.join("docs", "c.md"): "missing",
+        }
+        assert manifest.hub_membership() == {"a.md", os.path.join("docs", "b.md")}
+
+    def test_unchanged_tree_probes_nothing(self, project):
+        manifest = VerificationManifest(project)
+        manifest.refresh()
+        saved = manifest.manifest_path.stat().st_mtime_ns
+
+        stats = manifest.refresh()
+
+        assert (stats["files_probed"], stats["files_unchanged"], stats["hub_reparsed"]) == (0, 3, False)
+        assert stats["header_bytes_read"] == 0
+        assert manifest.manifest_path.stat().st_mtime_ns == saved
+
+    def test_only_changed_files_are_reprobed(self, project):
+        manifest = VerificationManifest(project)
+        manifest.refresh()
+
+        touch(project / "docs" / "c.md", header() + "# C\n")
+        (project / "a.md").unlink()
+        (project / "d.md").write_text("# D\n", encoding="utf-8")
+        stats = manifest.refresh()
+
+        assert (stats["files_probed"], stats["files_removed"], stats["hub_reparsed"]) == (2, 1, False)
+        assert manifest.files[os.path.join("docs", "c.md")]["status"] == "ok"
+        assert "a.md" not in manifest.files and manifest.files["d.md"]["status"] == "missing"
+
+    def test_hub_is_reparsed_when_it_changes(self, project):
+        manifest = VerificationManifest(project)
+        manifest.refresh()
+
+        touch(project / "SYSTEM.md", "# Hub\n\n## Mandatory Reading\n- [a.md](a.md)\n")
+        stats = manifest.refresh()
+
+        assert stats["hub_reparsed"] and stats["files_probed"] == 0
+        assert manifest.hub_membership() == {"a.md"}
+
+    def test_manifest_persists_across_instances(self, project):
+        VerificationManifest(project).refresh()
+
+        reloaded = VerificationManifest(project)
+        stats = reloaded.refresh()
+
+        assert stats["files_probed"] == 0 and not stats["hub_reparsed"]
+
+    def test_each_hub_keeps_its_own_manifest(self, project):
+        (project / "INDEX.md").write_text("# Index\n", encoding="utf-8")
+        VerificationManifest(project).refresh()
+
+        other = VerificationManifest(project, hub_file_name="INDEX.md")
+        assert other.files == {}
+        other.refresh()
+
+        # Alternating hubs does not throw the other hub's manifest away
+        again = VerificationManifest(project)
+        assert again.refresh()["files_probed"] == 0
+        assert again.manifest_path != other.manifest_path
+
+    def test_manifest_is_kept_out_of_the_project(self, project, manifest_dir):
+        before = tree_listing(project)
+
+        manifest = VerificationManifest(project)
+        manifest.refresh()
+
+        assert tree_listing(project) == before
+        assert manifest.manifest_path.parent == manifest_dir
+        assert manifest.manifest_path.name == hashlib.sha256(
+            f"{project.resolve()}\0SYSTEM.md".encode("utf-8")
+        ).hexdigest() + ".json"
+
+    def test_same_project_through_another_path_shares_the_manifest(self, project):
+        VerificationManifest(project).refresh()
+
+        manifest = VerificationManifest(project / "docs" / "..")
+
+        assert manifest.refresh()["files_probed"] == 0
+
+    def test_defaults_to_the_user_cache_directory(self, project, tmp_path, monkeypatch):
+        monkeypatch.delenv("CROSSREF_MANIFEST_DIR")
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+
+        manifest = VerificationManifest(project)
+
+        assert manifest.manifest_path.parent == tmp_path / "home" / ".cache" / "universal-crossref" / "manifests"
+
+    def test_location_can_be_overridden(self, project, tmp_path):
+        manifest = VerificationManifest(project, manifest_path=tmp_path / "custom" / "manifest.json")
+
+        manifest.refresh()
+
+        assert (tmp_path / "custom" / "manifest.json").exists()
+
+
+class TestVerifyProjectSync:
+    def test_reports_header_and_hub_issues(self, project):
+        report = verify_project_sync(str(project))
+
+        assert report["sync_status"] == "issues_found"
+        assert report["missing_headers"] == [os.path.join("docs", "c.md")]
+        assert report["wrong_hub_reference"] == [os.path.join("docs", "b.md")]
+        assert report["missing_from_hub"] == [os.path.join("docs", "c.md")]
+        assert report["extra_in_hub"] == []
+
+    def test_verification_writes_nothing_into_the_project(self, project):
+        before = tree_listing(project)
+
+        verify_project_sync(str(project))
+
+        assert tree_listing(project) == before
+
+    def test_fixed_project_is_perfect(self, project):
+        verify_project_sync(str(project))
+
+        touch(project / "docs" / "b.md", header() + "# B\n")
+        touch(project / "docs" / "c.md", header() + "# C\n")
+        write_hub(project, ["a.md", os.path.join("docs", "b.md"), os.path.join("docs", "c.md")])
+        report = verify_project_sync(str(project))
+
+        assert report["sync_status"] == "perfect"
+        assert report["manifest"]["files_probed"] == 2
+
+
+class TestParallelProbing:
+    @pytest.fixture
+    def many_files(self, project):
+        for i in range(40):
+            content = header() if i % 3 == 0 else header("OLD.md") if i % 3 == 1 else ""
+            (project / "docs" / f"page{i:02d}.md").write_text(content + f"# Page {i}\n", encoding="utf-8")
+        return project
+
+    def test_parallel_refresh_matches_serial(self, many_files, tmp_path):
+        serial = VerificationManifest(many_files, manifest_path=tmp_path / "serial.json")
+        parallel = VerificationManifest(many_files, manifest_path=tmp_path / "parallel.json")
+
+        serial_stats = serial.refresh(max_workers=1)
+        parallel_stats = parallel.refresh(max_workers=8)
+
+        assert parallel.files == serial.files
+        assert parallel_stats["files_probed"] == serial_stats["files_probed"] == 43
+        assert parallel_stats["header_bytes_read"] == serial_stats["header_bytes_read"]
+        assert parallel_stats["max_workers"] == 8
+
+    def test_probes_fan_out_over_worker_threads(self, many_files, monkeypatch):
+        threads = set()
+        real_probe = simple_server.probe_crossref_header
+
+        def slow_probe(*args, **kwargs):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.005)
+            return real_probe(*args, **kwargs)
+
+        monkeypatch.setattr(simple_server, "probe_crossref_header", slow_probe)
+        manifest = VerificationManifest(many_files)
+        rel_paths = sorted(rel for rel, _ in manifest._walk())
+
+        probes = manifest._probe_files(rel_paths, max_workers=4)
+
+        assert list(probes) == rel_paths  # Input order, whichever probe finished first
+        assert len(threads) > 1 and all(name.startswith("header-probe") for name in threads)
+
+    def test_verify_project_sync_honours_max_workers(self, many_files):
+        report = verify_project_sync(str(many_files), max_workers=4)
+
+        assert report["manifest"]["max_workers"] == 4
+        assert len(report["missing_headers"]) == 14  # docs/c.md and every third page
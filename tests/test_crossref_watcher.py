@@ -0,0 +1,257 @@
+"""Tests for the markdown auto-watcher."""
+
+import os
+import threading
+import time
+
+import pytest
+
+# simple_server is written against the mcp 1.x FastMCP API
+pytest.importorskip("mcp.server.fastmcp")
+
+from watchdog.events import DirCreatedEvent, FileMovedEvent, FileSystemEvent
+
+from src.mcp_server import simple_server
+from src.mcp_server.simple_server import CrossRefEventHandler, MarkdownPathIndex, WatcherEventQueue
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "docs" / "deep").mkdir(parents=True)
+    for rel in ["README.md", "SYSTEM.md", "notes.txt", "docs/guide.md", "docs/deep/api.md"]:
+        (tmp_path / rel).write_text("# x\n", encoding="utf-8")
+    return tmp_path
+
+
+class TestMarkdownPathIndex:
+    def test_seed_walks_the_tree_once(self, tree):
+        index = MarkdownPathIndex(tree, "SYSTEM.md")
+
+        assert index.seed() == 3
+        assert sorted(index.all_paths()) == sorted(
+            ["README.md", os.path.join("docs", "guide.md"), os.path.join("docs", "deep", "api.md")]
+        )
+
+    def test_seed_replaces_previous_contents(self, tree):
+        index = MarkdownPathIndex(tree, "SYSTEM.md")
+        index.add("gone.md")
+
+        index.seed()
+
+        assert "gone.md" not in index.all_paths() and len(index) == 3
+
+    def test_add_ignores_the_hub_and_non_markdown(self, tmp_path):
+        index = MarkdownPathIndex(tmp_path, "SYSTEM.md")
+
+        for rel in ["a.md", "SYSTEM.md", "image.png", os.path.join("sub", "SYSTEM.md"), "a.md"]:
+            index.add(rel)
+
+        assert index.all_paths() == ["a.md"]
+
+    def test_discard_and_move(self, tmp_path):
+        index = MarkdownPathIndex(tmp_path, "SYSTEM.md")
+        for rel in ["a.md", "b.md", "c.md"]:
+            index.add(rel)
+
+        index.discard("b.md")
+        index.discard("never-indexed.md")
+        index.move("a.md", "renamed.md")
+        index.move("c.md", "c.txt")
+
+        assert index.all_paths() == ["renamed.md"]
+
+    def test_related_keeps_insertion_order(self, tmp_path):
+        index = MarkdownPathIndex(tmp_path, "SYSTEM.md")
+        for rel in ["a.md", "b.md", "c.md", "d.md"]:
+            index.add(rel)
+
+        assert index.related(exclude="a.md") == ["b.md", "c.md"]
+        assert index.related(exclude="c.md", limit=3) == ["a.md", "b.md", "d.md"]
+        assert MarkdownPathIndex(tmp_path, "SYSTEM.md").related(exclude="a.md") == []
+
+
+class RecordingHandler:
+    """Stands in for CrossRefEventHandler on the worker side of the queue."""
+
+    hub_file_name = "SYSTEM.md"
+
+    def __init__(self, fail_on=None):
+        self.active = True
+        self.fail_on = fail_on
+        self.events = []
+        self.rescans = []
+        self.threads = set()
+
+    def process_event(self, kind, path, src_path=None):
+        self.threads.add(threading.current_thread().name)
+        if path == self.fail_on:
+            raise RuntimeError("boom")
+        self.events.append((kind, path, src_path))
+
+    def rescan(self, dirs):
+        self.rescans.append(dirs)
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+def pending(queue):
+    return [(r["kind"], r["path"], r["src_path"]) for r in queue.pending.values()]
+
+
+@pytest.fixture
+def handler():
+    return RecordingHandler()
+
+
+@pytest.fixture
+def held_queue(handler):
+    """A queue whose records never settle, so coalescing can be inspected."""
+    queue = WatcherEventQueue(max_pending=3, settle_seconds=3600)
+    yield queue
+    queue.drop_handler(handler)
+
+
+class TestWatcherEventQueue:
+    def test_writes_to_a_new_file_coalesce_into_one_create(self, held_queue, handler):
+        held_queue.enqueue(handler, "created", "a.md")
+        held_queue.enqueue(handler, "modified", "a.md")
+        held_queue.enqueue(handler, "modified", "a.md")
+        held_queue.enqueue(handler, "modified", "untracked.md")
+
+        assert pending(held_queue) == [("created", "a.md", None)]
+        assert held_queue.get_status()["coalesced"] == 2
+
+    def test_create_then_delete_cancels_out(self, held_queue, handler):
+        held_queue.enqueue(handler, "created", "a.md")
+        held_queue.enqueue(handler, "deleted", "a.md")
+
+        assert pending(held_queue) == []
+
+    def test_moves_follow_the_pending_record(self, held_queue, handler):
+        held_queue.enqueue(handler, "created", "draft.md")
+        held_queue.enqueue(handler, "moved", "final.md", src_path="draft.md")
+        held_queue.enqueue(handler, "moved", "b.md", src_path="a.md")
+        held_queue.enqueue(handler, "moved", "c.md", src_path="b.md")
+
+        assert pending(held_queue) == [("created", "final.md", None), ("moved", "c.md", "a.md")]
+
+        held_queue.enqueue(handler, "deleted", "c.md")
+
+        assert pending(held_queue) == [("created", "final.md", None), ("deleted", "a.md", None)]
+
+    def test_overflow_remembers_directories_to_rescan(self, held_queue, handler):
+        for rel in ["a.md", "b.md", "c.md", os.path.join("docs", "d.md"), os.path.join("docs", "e.md")]:
+            held_queue.enqueue(handler, "created", rel)
+        held_queue.enqueue(handler, "created", "a.md")  # Already queued: still accepted
+
+        assert len(held_queue.pending) == 3
+        assert held_queue.rescans[id(handler)] == (handler, {"docs"})
+        assert held_queue.get_status()["overflows"] == 2
+
+    def test_scattered_overflow_rescans_the_whole_tree(self, held_queue, handler, monkeypatch):
+        monkeypatch.setattr(WatcherEventQueue, "MAX_RESCAN_DIRS", 2)
+        for i in range(6):
+            held_queue.enqueue(handler, "created", os.path.join(f"dir{i}", "a.md"))
+
+        assert held_queue.rescans[id(handler)] == (handler, None)
+
+    def test_events_are_processed_on_worker_threads(self, handler):
+        queue = WatcherEventQueue(workers=2, settle_seconds=0)
+        queue.enqueue(handler, "created", "a.md")
+        queue.enqueue(handler, "deleted", "b.md")
+
+        wait_for(lambda: queue.get_status()["processed"] == 2)
+
+        assert sorted(handler.events) == [("created", "a.md", None), ("deleted", "b.md", None)]
+        assert threading.current_thread().name not in handler.threads
+        assert all(name.startswith("crossref-watch-worker") for name in handler.threads)
+
+    def test_records_wait_until_the_path_settles(self, handler):
+        queue = WatcherEventQueue(settle_seconds=0.2)
+        queue.enqueue(handler, "created", "a.md")
+
+        time.sleep(0.05)
+        assert handler.events == []
+        wait_for(lambda: handler.events == [("created", "a.md", None)])
+
+    def test_overflowed_handlers_are_rescanned_after_the_backlog(self, handler):
+        queue = WatcherEventQueue(max_pending=1, settle_seconds=0.05)
+        queue.enqueue(handler, "created", "a.md")
+        queue.enqueue(handler, "created", os.path.join("docs", "b.md"))
+
+        wait_for(lambda: queue.get_status()["rescans"] == 1)
+
+        assert handler.events == [("created", "a.md", None)]
+        assert handler.rescans == [{"docs"}]
+
+    def test_failing_event_does_not_stop_the_workers(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(simple_server.transaction_logger, "log_file", tmp_path / "operations.log")
+        handler = RecordingHandler(fail_on="bad.md")
+        queue = WatcherEventQueue(workers=1, settle_seconds=0)
+        queue.enqueue(handler, "created", "bad.md")
+        queue.enqueue(handler, "created", "good.md")
+
+        wait_for(lambda: queue.get_status()["processed"] == 1)
+
+        assert handler.events == [("created", "good.md", None)]
+        assert queue.get_status()["errors"] == 1
+
+    def test_drop_handler_forgets_queued_work(self, held_queue, handler):
+        held_queue.enqueue(handler, "created", "a.md")
+        held_queue.rescans[id(handler)] = (handler, None)
+
+        held_queue.drop_handler(handler)
+
+        assert pending(held_queue) == [] and held_queue.rescans == {}
+
+
+class TestCrossRefEventHandler:
+    @pytest.fixture
+    def queue(self):
+        class ListQueue:
+            def __init__(self):
+                self.events = []
+
+            def enqueue(self, handler, kind, path, src_path=None):
+                self.events.append((kind, path, src_path))
+
+        return ListQueue()
+
+    def test_callbacks_only_enqueue_relative_paths(self, tmp_path, queue):
+        handler = CrossRefEventHandler(tmp_path, "SYSTEM.md", event_queue=queue)
+
+        handler.on_created(FileSystemEvent(str(tmp_path / "docs" / "a.md")))
+        handler.on_modified(FileSystemEvent(str(tmp_path / "docs" / "a.md")))
+        handler.on_deleted(FileSystemEvent(str(tmp_path / "old.md")))
+        handler.on_moved(FileMovedEvent(str(tmp_path / "draft.txt"), str(tmp_path / "final.md")))
+
+        assert queue.events == [
+            ("created", os.path.join("docs", "a.md"), None),
+            ("modified", os.path.join("docs", "a.md"), None),
+            ("deleted", "old.md", None),
+            ("moved", "final.md", "draft.txt"),
+        ]
+
+    def test_callbacks_ignore_the_hub_directories_and_outside_paths(self, tmp_path, queue):
+        handler = CrossRefEventHandler(tmp_path, "SYSTEM.md", event_queue=queue)
+
+        handler.on_created(FileSystemEvent(str(tmp_path / "SYSTEM.md")))
+        handler.on_created(FileSystemEvent(str(tmp_path / "image.png")))
+        handler.on_created(DirCreatedEvent(str(tmp_path / "dir.md")))
+        handler.on_created(FileSystemEvent(str(tmp_path.parent / "elsewhere.md")))
+
+        assert queue.events == []
+
+    def test_relative_project_root_is_resolved(self, tmp_path, queue, monkeypatch):
+        monkeypatch.chdir(tmp_path.parent)
+        handler = CrossRefEventHandler(tmp_path.name, "SYSTEM.md", event_queue=queue)
+
+        handler.on_created(FileSystemEvent(str(tmp_path / "a.md")))
+
+        assert queue.events == [("created", "a.md", None)]
@@ -0,0 +1,395 @@
+"""Tests for the real-time file monitor."""
+
+import asyncio
+import contextlib
+import itertools
+import os
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from watchdog.events import (
+    DirCreatedEvent,
+    DirDeletedEvent,
+    DirModifiedEvent,
+    DirMovedEvent,
+    FileCreatedEvent,
+    FileDeletedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+)
+
+from src.database.models import FileStatus
+from src.scanner import file_monitor
+from src.scanner.file_monitor import ChangeBuffer, FileChangeEvent, FileMonitor
+
+SCANNING_CONFIG = {"include_patterns": ["*.py", "*.md"], "exclude_patterns": ["**/build/**"]}
+
+
+class FakeFileRepo:
+    """In-memory stand-in for the bulk file repository operations the monitor uses."""
+
+    def __init__(self, root):
+        self.root = root
+        self.rows = {}
+        self.calls = []
+        self._ids = itertools.count(1)
+
+    def add(self, relative_path, status=FileStatus.DISCOVERED, **fields):
+        row = SimpleNamespace(
+            id=next(self._ids),
+            relative_path=relative_path,
+            path=str(self.root / relative_path),
+            status=status,
+            size_bytes=None,
+            file_modified_at=None,
+            content_hash="",
+        )
+        row.__dict__.update(fields)
+        self.rows[row.id] = row
+        return row
+
+    def live(self):
+        return {row.relative_path: row for row in self.rows.values() if row.status != FileStatus.DELETED}
+
+    def _under(self, prefix):
+        prefix = prefix.rstrip(os.sep)
+        return [row for row in self.rows.values() if not prefix or row.relative_path.startswith(prefix + os.sep)]
+
+    async def get_by_paths(self, session, project_id, relative_paths):
+        self.calls.append("get_by_paths")
+        wanted = set(relative_paths)
+        files = {}
+        for row in self.rows.values():
+            current = files.get(row.relative_path)
+            if row.relative_path in wanted and (current is None or current.status == FileStatus.DELETED):
+                files[row.relative_path] = row
+        return files
+
+    async def bulk_create(self, session, file_data):
+        self.calls.append("bulk_create")
+        for data in file_data:
+            self.add(data["relative_path"], **{k: v for k, v in data.items() if k != "relative_path"})
+        return len(file_data)
+
+    async def bulk_update(self, session, updates):
+        self.calls.append("bulk_update")
+        for row, values in updates:
+            row.__dict__.update(values)
+        return len(updates)
+
+    async def get_files_under_prefix(self, session, project_id, prefix):
+        self.calls.append("get_files_under_prefix")
+        return self._under(prefix)
+
+    async def rename_prefix(self, session, project_id, old_prefix, new_prefix, root_path):
+        self.calls.append("rename_prefix")
+        await self.mark_deleted_under_prefix(session, project_id, new_prefix)
+        renamed = 0
+        for row in self._under(old_prefix):
+            if row.status != FileStatus.DELETED:
+                row.relative_path = new_prefix + row.relative_path[len(old_prefix):]
+                row.path = os.path.join(root_path, row.relative_path)
+                renamed += 1
+        return renamed
+
+    async def mark_deleted_under_prefix(self, session, project_id, prefix):
+        self.calls.append("mark_deleted_under_prefix")
+        return await self._mark([row.id for row in self._under(prefix)])
+
+    async def mark_deleted(self, session, file_ids):
+        self.calls.append("mark_deleted")
+        return await self._mark(file_ids)
+
+    async def _mark(self, file_ids):
+        marked = 0
+        for file_id in file_ids:
+            if self.rows[file_id].status != FileStatus.DELETED:
+                self.rows[file_id].status = FileStatus.DELETED
+                marked += 1
+        return marked
+
+
+def write(path, text="x = 1\n"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "project"
+    write(root / "docs" / "a.md", "# A\n")
+    write(root / "docs" / "sub" / "b.py")
+    write(root / "main.py")
+    return root
+
+
+@pytest.fixture
+def repo(root, monkeypatch):
+    repo = FakeFileRepo(root)
+    repo.sessions = 0
+
+    @contextlib.asynccontextmanager
+    async def fake_session():
+        repo.sessions += 1
+        yield None
+
+    monkeypatch.setattr(file_monitor, "file_repo", repo)
+    monkeypatch.setattr(file_monitor, "get_db_session", fake_session)
+    for relative_path in ["docs/a.md", "docs/sub/b.py", "main.py"]:
+        repo.add(relative_path)
+    return repo
+
+
+@pytest.fixture
+def monitor(root):
+    return FileMonitor(1, root, config=SCANNING_CONFIG, buffer_time=0.05)
+
+
+async def feed(monitor, *events):
+    """Deliver watchdog events and process the resulting batch."""
+    for event_type, event in events:
+        await monitor._handle_event(event_type, event)
+    await monitor._process_changes(await monitor.change_buffer.flush_all())
+
+
+class TestEventFiltering:
+    async def test_moves_across_the_root_become_creates_and_deletes(self, root, tmp_path, monitor):
+        await monitor._handle_event("moved", FileMovedEvent(str(root / "main.py"), str(tmp_path / "main.py")))
+        await monitor._handle_event("moved", FileMovedEvent(str(tmp_path / "in.py"), str(root / "in.py")))
+        write(root / "in.py")
+
+        changes = await monitor.change_buffer.flush_all()
+
+        assert [(c.event_type, c.file_path.name, c.old_path) for c in changes] == [
+            ("deleted", "main.py", None), ("created", "in.py", None),
+        ]
+
+    async def test_directory_modifications_and_outside_paths_are_ignored(self, root, tmp_path, monitor):
+        await monitor._handle_event("modified", DirModifiedEvent(str(root / "docs")))
+        await monitor._handle_event("created", FileCreatedEvent(str(tmp_path / "elsewhere.py")))
+        await monitor._handle_event("modified", DirModifiedEvent(str(root)))
+
+        assert monitor.change_buffer.pending_count == 0 and monitor.events_received == 3
+
+
+class TestDirectoryChanges:
+    async def test_moved_directory_is_renamed_in_one_update(self, root, repo, monitor):
+        ids = {path: row.id for path, row in repo.live().items()}
+        shutil.move(root / "docs", root / "guide")
+
+        await feed(
+            monitor,
+            ("moved", DirMovedEvent(str(root / "docs"), str(root / "guide"))),
+            ("moved", DirMovedEvent(str(root / "docs" / "sub"), str(root / "guide" / "sub"))),
+            ("moved", FileMovedEvent(str(root / "docs" / "a.md"), str(root / "guide" / "a.md"))),
+            ("moved", FileMovedEvent(str(root / "docs" / "sub" / "b.py"), str(root / "guide" / "sub" / "b.py"))),
+        )
+
+        live = repo.live()
+        assert sorted(live) == ["guide/a.md", "guide/sub/b.py", "main.py"]
+        assert live["guide/a.md"].id == ids["docs/a.md"]  # Same row, new path
+        assert repo.calls.count("rename_prefix") == 1 and "get_by_paths" not in repo.calls
+        assert monitor.rows_renamed == 2 and monitor.directory_changes_processed == 1
+
+    async def test_deleted_directory_is_marked_in_one_update(self, root, repo, monitor):
+        shutil.rmtree(root / "docs")
+
+        await feed(
+            monitor,
+            ("deleted", FileDeletedEvent(str(root / "docs" / "sub" / "b.py"))),
+            ("deleted", DirDeletedEvent(str(root / "docs" / "sub"))),
+            ("deleted", FileDeletedEvent(str(root / "docs" / "a.md"))),
+            ("deleted", DirDeletedEvent(str(root / "docs"))),
+        )
+
+        assert sorted(repo.live()) == ["main.py"]
+        assert repo.calls == ["mark_deleted_under_prefix"]
+        assert monitor.rows_marked_deleted == 2
+
+    async def test_created_directory_is_diffed_against_disk(self, root, repo, monitor):
+        # Moved in from outside: only the directory itself is reported
+        write(root / "vendor" / "lib.py")
+        write(root / "vendor" / "deep" / "util.py")
+
+        await feed(monitor, ("created", DirCreatedEvent(str(root / "vendor"))))
+
+        assert {"vendor/lib.py", "vendor/deep/util.py"} <= set(repo.live())
+        assert monitor.directory_changes_processed == 1
+
+    async def test_recreated_directory_keeps_surviving_rows(self, root, repo, monitor):
+        original = repo.live()["docs/a.md"].id
+        shutil.rmtree(root / "docs")
+        write(root / "docs" / "a.md", "# A again\n")
+
+        await feed(
+            monitor,
+            ("deleted", DirDeletedEvent(str(root / "docs"))),
+            ("created", DirCreatedEvent(str(root / "docs"))),
+            ("created", FileCreatedEvent(str(root / "docs" / "a.md"))),
+        )
+
+        live = repo.live()
+        assert sorted(live) == ["docs/a.md", "main.py"]
+        assert live["docs/a.md"].id == original and live["docs/a.md"].size_bytes == len("# A again\n")
+
+    async def test_reconcile_subtree_revives_deleted_rows(self, root, repo, monitor):
+        repo.live()["docs/a.md"].status = FileStatus.DELETED
+        write(root / "docs" / "new.md", "# New\n")
+        os.remove(root / "docs" / "sub" / "b.py")
+
+        stats = await monitor.reconcile_subtree(root / "docs")
+
+        assert stats == {"scanned": 2, "created": 1, "updated": 1, "deleted": 1}
+        assert sorted(repo.live()) == ["docs/a.md", "docs/new.md", "main.py"]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(file_monitor, "time", clock)
+    return clock
+
+
+def change(name, event_type="modified"):
+    return FileChangeEvent(event_type, Path("/project") / name)
+
+
+class TestChangeBuffer:
+    async def test_changes_wait_for_the_buffer_time(self, clock):
+        buffer = ChangeBuffer(buffer_time=2.0, batch_window=0)
+        await buffer.add_change(change("a.py"))
+
+        assert await buffer.get_ready_changes() == []
+        assert buffer.next_ready_in() == 2.0
+
+        clock.now += 2.0
+        assert [c.file_path.name for c in await buffer.get_ready_changes()] == ["a.py"]
+        assert buffer.pending_count == 0 and buffer.next_ready_in() is None
+
+    async def test_later_events_replace_earlier_ones_and_restart_the_wait(self, clock):
+        buffer = ChangeBuffer(buffer_time=2.0, batch_window=0)
+        await buffer.add_change(change("a.py", "created"))
+        clock.now += 1.5
+        await buffer.add_change(change("a.py", "modified"))
+
+        clock.now += 1.0
+        assert await buffer.get_ready_changes() == []  # The superseded entry is skipped
+
+        clock.now += 1.0
+        assert [c.event_type for c in await buffer.get_ready_changes()] == ["modified"]
+
+    async def test_changes_due_within_the_batch_window_are_collected_together(self, clock):
+        buffer = ChangeBuffer(buffer_time=2.0, batch_window=0.5)
+        for name, delay in [("a.py", 0.0), ("b.py", 0.3), ("c.py", 1.0)]:
+            clock.now += delay
+            await buffer.add_change(change(name))
+
+        clock.now = 1002.0
+        assert [c.file_path.name for c in await buffer.get_ready_changes()] == ["a.py", "b.py"]
+        assert buffer.pending_count == 1
+
+    async def test_reaching_capacity_forces_a_flush(self, clock):
+        buffer = ChangeBuffer(buffer_time=60.0, max_size=3)
+        for name in ["a.py", "b.py", "c.py"]:
+            await buffer.add_change(change(name))
+
+        assert buffer.forced_flushes == 1 and buffer.next_ready_in() == 0.0
+        assert len(await buffer.get_ready_changes()) == 3
+        assert buffer.next_ready_in() is None
+
+    async def test_superseded_heap_entries_are_compacted(self, clock):
+        buffer = ChangeBuffer(buffer_time=2.0)
+        for _ in range(500):
+            clock.now += 0.001
+            await buffer.add_change(change("hot.py"))
+
+        assert buffer.pending_count == 1 and len(buffer._heap) <= 2 + 64
+
+    async def test_first_change_wakes_an_idle_waiter(self):
+        buffer = ChangeBuffer(buffer_time=0.0)
+        waiter = asyncio.create_task(buffer.wait_ready())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+
+        await buffer.add_change(change("a.py"))
+
+        await asyncio.wait_for(waiter, timeout=1.0)
+
+
+class TestFileChangeBatches:
+    async def test_mixed_batch_uses_one_session_and_bulk_queries(self, root, repo, monitor):
+        ids = {path: row.id for path, row in repo.live().items()}
+        write(root / "new.py")
+        write(root / "main.py", "x = 2\n")
+        os.remove(root / "docs" / "a.md")
+        os.rename(root / "docs" / "sub" / "b.py", root / "docs" / "b.py")
+
+        await feed(
+            monitor,
+            ("created", FileCreatedEvent(str(root / "new.py"))),
+            ("modified", FileModifiedEvent(str(root / "main.py"))),
+            ("deleted", FileDeletedEvent(str(root / "docs" / "a.md"))),
+            ("moved", FileMovedEvent(str(root / "docs" / "sub" / "b.py"), str(root / "docs" / "b.py"))),
+        )
+
+        live = repo.live()
+        assert sorted(live) == ["docs/b.py", "main.py", "new.py"]
+        assert live["docs/b.py"].id == ids["docs/sub/b.py"] and live["main.py"].size_bytes == 6
+        assert repo.sessions == 1
+        assert repo.calls == ["get_by_paths", "bulk_update", "bulk_create", "mark_deleted"]
+        assert (monitor.changes_processed, monitor.batches_processed, monitor.rows_marked_deleted) == (4, 1, 1)
+
+    async def test_move_over_a_tracked_file_retires_the_old_row(self, root, repo, monitor):
+        moved = repo.live()["main.py"].id
+        os.replace(root / "main.py", root / "docs" / "a.md")
+
+        await feed(monitor, ("moved", FileMovedEvent(str(root / "main.py"), str(root / "docs" / "a.md"))))
+
+        assert [row.id for row in repo.live().values() if row.relative_path == "docs/a.md"] == [moved]
+        assert sorted(repo.live()) == ["docs/a.md", "docs/sub/b.py"]
+
+    async def test_move_of_an_untracked_file_is_recorded_as_created(self, root, repo, monitor):
+        write(root / "draft.py")
+        os.rename(root / "draft.py", root / "final.py")
+
+        await feed(monitor, ("moved", FileMovedEvent(str(root / "draft.py"), str(root / "final.py"))))
+
+        assert "final.py" in repo.live() and "draft.py" not in repo.live()
+
+    async def test_move_into_an_excluded_directory_deletes_the_row(self, root, repo, monitor):
+        (root / "build").mkdir()
+        os.rename(root / "main.py", root / "build" / "main.py")
+
+        await feed(monitor, ("moved", FileMovedEvent(str(root / "main.py"), str(root / "build" / "main.py"))))
+
+        assert sorted(repo.live()) == ["docs/a.md", "docs/sub/b.py"]
+
+    async def test_directory_moved_into_an_excluded_directory_is_deleted(self, root, repo, monitor):
+        (root / "build").mkdir()
+        shutil.move(root / "docs", root / "build" / "docs")
+
+        await feed(monitor, ("moved", DirMovedEvent(str(root / "docs"), str(root / "build" / "docs"))))
+
+        assert sorted(repo.live()) == ["main.py"]
+
+    async def test_directory_and_file_changes_share_the_transaction(self, root, repo, monitor):
+        shutil.rmtree(root / "docs")
+        write(root / "new.py")
+
+        await feed(
+            monitor,
+            ("deleted", DirDeletedEvent(str(root / "docs"))),
+            ("created", FileCreatedEvent(str(root / "new.py"))),
+        )
+
+        assert repo.sessions == 1 and sorted(repo.live()) == ["main.py", "new.py"]
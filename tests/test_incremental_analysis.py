@@ -0,0 +1,158 @@
+"""Tests for incremental relationship analysis."""
+
+import random
+
+import pytest
+
+from src.analyzer.content_analyzer import AnalysisResult, ContentPattern, CrossReference
+from src.analyzer.incremental import IncrementalRelationshipIndex
+from src.analyzer.relationship_detector import DependencyGraphBuilder, RelationshipDetector
+
+DEPENDENCIES = ["os", "json", "requests", "numpy", "yaml", "click"]
+EXPORTS = ["run", "main", "Config", "load", "save"]
+PATTERN_TYPES = ["docstring", "todo", "main_guard", "type_hints"]
+
+
+def random_result(rng: random.Random, path: str, names) -> AnalysisResult:
+    language = "markdown" if path.endswith(".md") else "python"
+    targets = rng.sample(names, k=min(len(names), rng.randint(0, 3))) + rng.sample(["os", ".sibling"], k=1)
+    patterns = [ContentPattern(t, t, 1) for t in rng.sample(PATTERN_TYPES, k=rng.randint(0, 2))]
+    hubs = [n for n in names if n.endswith(".md")]
+    if hubs and rng.random() < 0.5:
+        referenced = rng.sample(hubs, k=1)
+        patterns.append(ContentPattern(
+            "cross_ref_header", f"See {referenced[0]}", 1, metadata={"referenced_files": referenced}
+        ))
+    return AnalysisResult(
+        file_path=path,
+        cross_references=[
+            CrossReference(path, target.rsplit("/", 1)[-1].split(".")[0] if not target.startswith(".") else target,
+                           "import", line_number=i, context=f"import {target}")
+            for i, target in enumerate(targets)
+        ],
+        patterns=patterns,
+        dependencies=rng.sample(DEPENDENCIES, k=rng.randint(0, 3)),
+        exports=rng.sample(EXPORTS, k=rng.randint(0, 2)),
+        hub_file_candidates=[path] if path.endswith("README.md") else [],
+        language=language,
+    )
+
+
+def snapshot(relationships, graph):
+    edges = {
+        (r.source_file, r.target_file): (
+            r.relationship_type, r.strength, r.confidence, r.bidirectional, r.evidence,
+            r.metadata.get("merged_types"),
+        )
+        for r in relationships
+    }
+    return {
+        "edges": edges,
+        "nodes": graph.nodes,
+        "hubs": set(graph.hub_files),
+        "depth": graph.depth_map,
+        "clusters": {frozenset(c) for c in graph.clusters},
+    }
+
+
+def make_detector(semantic_top_k=20):
+    detector = RelationshipDetector()
+    detector.semantic_top_k = semantic_top_k
+    return detector
+
+
+def full_snapshot(results, semantic_top_k=20):
+    detector = make_detector(semantic_top_k)
+    relationships = detector.detect_relationships(results)
+    return snapshot(relationships, DependencyGraphBuilder().build_graph(relationships))
+
+
+def make_index(semantic_top_k=20):
+    return IncrementalRelationshipIndex(make_detector(semantic_top_k), DependencyGraphBuilder())
+
+
+class TestIncrementalRelationshipIndex:
+    @pytest.mark.parametrize("semantic_top_k", [20, 2])
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_full_detection_across_changes(self, seed, semantic_top_k):
+        rng = random.Random(seed)
+        names = [f"pkg/mod{i}.py" for i in range(12)] + ["README.md", "docs/guide.md", "docs/README.md"]
+        index = make_index(semantic_top_k)
+        index.apply({name: random_result(rng, name, names) for name in names})
+        assert snapshot(index.relationships, index.graph.to_graph()) == full_snapshot(index.results, semantic_top_k)
+
+        for step in range(15):
+            changes = {}
+            for name in rng.sample(names, k=rng.randint(1, 3)):
+                if name in index.results and rng.random() < 0.3:
+                    changes[name] = None  # Deleted
+                else:
+                    changes[name] = random_result(rng, name, names)
+            index.apply(changes)
+
+            assert snapshot(index.relationships, index.graph.to_graph()) == full_snapshot(
+                index.results, semantic_top_k
+            ), step
+
+    def test_unrelated_change_recomputes_only_its_relationships(self):
+        results = {
+            f"pkg/mod{i}.py": AnalysisResult(
+                file_path=f"pkg/mod{i}.py",
+                cross_references=[CrossReference(f"pkg/mod{i}.py", f"mod{i + 1}", "import", line_number=1)],
+                language="python",
+            )
+            for i in range(200)
+        }
+        index = make_index()
+        index.apply(results)
+
+        stats = index.apply({
+            "pkg/mod50.py": AnalysisResult(
+                file_path="pkg/mod50.py",
+                cross_references=[CrossReference("pkg/mod50.py", "json", "import", line_number=1)],
+                language="python",
+            )
+        })
+
+        # mod50 -> mod51 is replaced by mod50 -> json
+        assert stats["relationships_recomputed"] == 2
+        assert stats["import_sources_rechecked"] == 0
+        assert ("pkg/mod50.py", "json") in index.graph.edges
+
+    def test_added_file_rechecks_imports_of_its_stem(self):
+        index = make_index()
+        index.apply({
+            "a.py": AnalysisResult(
+                file_path="a.py",
+                cross_references=[CrossReference("a.py", "b", "import", line_number=1)],
+                language="python",
+            )
+        })
+        assert index.graph.edges[("a.py", "b")].strength == 0.3  # External until b.py exists
+
+        stats = index.apply({"b.py": AnalysisResult(file_path="b.py", language="python")})
+
+        assert stats["import_sources_rechecked"] == 1
+        assert ("a.py", "b") not in index.graph.edges
+        assert index.graph.edges[("a.py", "b.py")].strength == 1.0
+
+        index.apply({"b.py": None})
+        assert index.graph.edges[("a.py", "b")].strength == 0.3
+
+    def test_cycles_follow_changed_imports(self):
+        def importing(path, *targets):
+            return AnalysisResult(
+                file_path=path,
+                cross_references=[CrossReference(path, t, "import", line_number=1) for t in targets],
+            )
+
+        index = make_index()
+        index.apply({"a.py": importing("a.py", "b.py"), "b.py": importing("b.py", "c.py"), "c.py": importing("c.py")})
+        assert index.graph.to_graph().cycles == []
+
+        index.apply({"c.py": importing("c.py", "a.py")})
+        cycles = index.graph.to_graph().cycles
+        assert [set(cycle) for cycle in cycles] == [{"a.py", "b.py", "c.py"}]
+
+        index.apply({"b.py": importing("b.py")})
+        assert index.graph.to_graph().cycles == []
@@ -0,0 +1,234 @@
+"""Tests for the async PDF extraction job scheduler and task store."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+# simple_server is written against the mcp 1.x FastMCP API
+pytest.importorskip("mcp.server.fastmcp")
+
+from src.mcp_server import simple_server
+from src.mcp_server.simple_server import PDFExtractionTask, PDFJobScheduler, PDFTaskCancelled, PDFTaskStore
+
+
+class FakeExtraction:
+    """Stands in for process_pdf_async: records dispatch order and runs until released."""
+
+    def __init__(self, store):
+        self.store = store
+        self.started = []
+        self.release = threading.Event()
+
+    async def __call__(self, task_id, pdf_path, params):
+        task = self.store.get(task_id)
+        self.started.append(pdf_path)
+        try:
+            while not self.release.is_set():
+                task.raise_if_cancelled()
+                await asyncio.sleep(0.005)
+            task.update_status("creating_files", 80)
+            task.complete({"success": True, "pdf": pdf_path})
+        except PDFTaskCancelled:
+            task.cancel()
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+def make_task(name, priority=0):
+    return PDFExtractionTask(f"task-{name}", name, {}, priority)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return PDFTaskStore(tmp_path / "tasks.db")
+
+
+@pytest.fixture
+def extraction(store, monkeypatch):
+    extraction = FakeExtraction(store)
+    monkeypatch.setattr(simple_server, "process_pdf_async", extraction)
+    yield extraction
+    extraction.release.set()
+
+
+@pytest.fixture
+def scheduler(store, extraction):
+    scheduler = PDFJobScheduler(store, max_workers=1, max_queue_size=3)
+    yield scheduler
+    scheduler.shutdown()
+
+
+class TestPDFJobScheduler:
+    def test_runs_queued_jobs_by_priority_then_submission(self, scheduler, extraction, store):
+        blocker = make_task("blocker")
+        scheduler.submit(blocker)
+        wait_for(lambda: extraction.started == ["blocker"])
+
+        for name, priority in [("low", 0), ("high", 5), ("low-2", 0)]:
+            assert scheduler.submit(make_task(name, priority))
+        assert scheduler.queue_position("task-high") == 1
+        assert scheduler.queue_position("task-low-2") == 3
+
+        extraction.release.set()
+        wait_for(lambda: store.get("task-low-2").is_finished())
+
+        assert extraction.started == ["blocker", "high", "low", "low-2"]
+        assert scheduler.get_throughput()["completed"] == 4
+
+    def test_rejects_jobs_when_the_queue_is_full(self, scheduler, extraction):
+        scheduler.submit(make_task("running"))
+        wait_for(lambda: extraction.started == ["running"])
+
+        accepted = [scheduler.submit(make_task(f"queued-{i}")) for i in range(4)]
+
+        assert accepted == [True, True, True, False]
+        status = scheduler.get_status()
+        assert status["queued"] == 3 and status["running"] == 1
+        assert status["throughput"]["rejected"] == 1
+
+    def test_cancel_queued_job_never_runs(self, scheduler, extraction, store):
+        scheduler.submit(make_task("running"))
+        wait_for(lambda: extraction.started == ["running"])
+        scheduler.submit(make_task("queued"))
+
+        assert scheduler.cancel("task-queued")
+        extraction.release.set()
+        wait_for(lambda: store.get("task-running").is_finished())
+
+        assert store.get("task-queued").status == "cancelled"
+        assert extraction.started == ["running"]
+        assert scheduler.queue_position("task-queued") is None
+
+    def test_cancel_running_job_stops_at_the_next_checkpoint(self, scheduler, extraction, store):
+        scheduler.submit(make_task("running"))
+        wait_for(lambda: extraction.started == ["running"])
+
+        assert scheduler.cancel("task-running")
+        wait_for(lambda: store.get("task-running").is_finished())
+
+        assert store.get("task-running").status == "cancelled"
+        assert not scheduler.cancel("task-running")  # Already finished
+        wait_for(lambda: not scheduler.running)
+
+    def test_eta_uses_recent_job_durations(self, scheduler, extraction, store):
+        scheduler.completed_durations.append((time.time(), 10.0))
+        scheduler.submit(make_task("running"))
+        wait_for(lambda: extraction.started == ["running"])
+        queued = make_task("queued")
+        scheduler.submit(queued)
+
+        # One job running ahead of it, then its own run
+        assert scheduler.estimate_eta_seconds(queued) == 20.0
+        assert 0 < scheduler.estimate_eta_seconds(store.get("task-running")) <= 10.0
+
+        extraction.release.set()
+        wait_for(lambda: store.get("task-queued").is_finished())
+        assert scheduler.estimate_eta_seconds(store.get("task-queued")) == 0.0
+
+    def test_extraction_workers_use_spawn(self, scheduler):
+        pool = scheduler.get_process_pool()
+
+        assert pool._mp_context.get_start_method() == "spawn"
+        assert scheduler.get_process_pool() is pool
+
+
+class TestPDFTaskStore:
+    def test_database_is_opened_on_first_use(self, tmp_path):
+        store = PDFTaskStore(tmp_path / "cache" / "tasks.db")
+        assert not (tmp_path / "cache").exists()
+
+        store.save(make_task("a"))
+
+        assert (tmp_path / "cache" / "tasks.db").exists()
+
+    def test_defaults_to_the_user_cache_directory(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path))
+
+        store = PDFTaskStore()
+
+        assert store.db_path == str(tmp_path / ".cache" / "universal-crossref" / "crossref_tasks.db")
+
+    def test_tasks_survive_a_restart(self, tmp_path):
+        task = make_task("a", priority=3)
+        PDFTaskStore(tmp_path / "tasks.db").save(task)
+        task.complete({"files": 2})
+
+        loaded = PDFTaskStore(tmp_path / "tasks.db").get("task-a")
+
+        assert (loaded.status, loaded.priority, loaded.result) == ("completed", 3, {"files": 2})
+        assert loaded.end_time == task.end_time
+
+    def test_memory_holds_the_recent_and_the_running(self, tmp_path):
+        store = PDFTaskStore(tmp_path / "tasks.db", cache_size=2)
+        running = make_task("running")
+        store.save(running)
+        store.pin(running)
+        for name in "abc":
+            store.save(make_task(name))
+
+        assert list(store.cache) == ["task-b", "task-c"]
+        assert store.get("task-running") is running
+        # Evicted tasks are reloaded from the database
+        assert store.get("task-a").pdf_path == "a"
+        assert list(store.cache) == ["task-c", "task-a"]
+
+    def test_finished_tasks_expire_after_the_ttl(self, tmp_path):
+        store = PDFTaskStore(tmp_path / "tasks.db", ttl_seconds=60)
+        old, recent, queued = make_task("old"), make_task("recent"), make_task("queued")
+        for task in (old, recent):
+            store.save(task)
+            task.complete({})
+        old.end_time = old.end_time.replace(year=old.end_time.year - 1)
+        store.save(old)
+        store.save(queued)
+
+        assert store.evict_expired(force=True) == 1
+        assert store.get("task-old") is None
+        assert store.count() == 2
+        assert store.evict_expired() == 0  # Throttled
+
+    def test_progress_within_a_stage_is_coalesced(self, tmp_path):
+        store = PDFTaskStore(tmp_path / "tasks.db", progress_interval=60)
+        task = make_task("a")
+        store.save(task)
+        store.pin(task)
+        task.update_status("creating_files", 75)
+        for done in range(1, 21):
+            task.update_status("creating_files", 75 + done)
+
+        row = store.conn.execute("SELECT status, progress FROM pdf_tasks").fetchone()
+        assert row == ("creating_files", 75.0)
+        assert store.get("task-a").progress == 95
+
+        task.complete({})
+        assert store.conn.execute("SELECT status, progress FROM pdf_tasks").fetchone() == ("completed", 100.0)
+
+    def test_resume_requeues_unfinished_tasks(self, tmp_path, extraction):
+        previous = PDFTaskStore(tmp_path / "tasks.db")
+        for task in (make_task("queued", 1), make_task("running", 2), make_task("done"), make_task("cancelling")):
+            previous.save(task)
+        previous.get("task-running").update_status("extracting_text", 15)
+        previous.get("task-done").complete({})
+        cancelling = previous.get("task-cancelling")
+        cancelling.cancel_requested = True
+        cancelling.update_status("cancelling")
+
+        store = PDFTaskStore(tmp_path / "tasks.db")
+        scheduler = PDFJobScheduler(store, max_workers=1)
+        try:
+            extraction.release.set()
+            assert scheduler.resume_pending() == 2
+            wait_for(lambda: store.get("task-queued").is_finished())
+        finally:
+            scheduler.shutdown()
+
+        assert extraction.started == ["running", "queued"]
+        assert store.get("task-cancelling").status == "cancelled"
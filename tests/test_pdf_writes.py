@@ -0,0 +1,163 @@
+"""Tests for writing extracted PDF chapters to disk."""
+
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+# simple_server is written against the mcp 1.x FastMCP API
+pytest.importorskip("mcp.server.fastmcp")
+
+from src.mcp_server import simple_server
+from src.mcp_server.simple_server import (
+    chapter_filename,
+    render_chapter_documents,
+    render_pdf_hub_content,
+    write_documents_batch,
+)
+
+PDF = Path("/books/My Book-v2.pdf")
+CHUNKS = [
+    {"title": "Opening", "content": "First line\nsecond line of the opening chapter.", "word_count": 7},
+    {"title": "Middle", "content": "The middle chapter.", "word_count": 3},
+    {"title": "Ending", "content": "The end.", "word_count": 2},
+]
+CROSS_REFS = {chapter_filename(PDF, 1): [chapter_filename(PDF, 2)]}
+
+
+def render(hub_file_name="hub.md"):
+    documents = render_chapter_documents(PDF, CHUNKS, CROSS_REFS, hub_file_name, 0.9, "text")
+    hub = render_pdf_hub_content(PDF, CHUNKS, CROSS_REFS, 12, 0.9, "text")
+    return documents + [(hub_file_name, hub)]
+
+
+def mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+class TestRendering:
+    def test_chapter_documents(self):
+        documents = render()
+
+        assert [name for name, _ in documents] == [
+            "mybookv2_chapter_01.md", "mybookv2_chapter_02.md", "mybookv2_chapter_03.md", "hub.md",
+        ]
+        first = documents[0][1]
+        assert first.startswith("---\nMANDATORY READING: You HAVE TO read hub.md first, then this file.")
+        assert "Related files: ['mybookv2_chapter_02.md']" in first and "Chapter: 1 of 3" in first
+
+    def test_hub_preview_is_a_single_line(self):
+        hub = render()[-1][1]
+
+        assert "- **Preview**: First line second line of the opening chapter...." in hub
+        assert "- **Related chapters**: 1 intelligent connections" in hub
+
+
+class TestWriteDocumentsBatch:
+    def test_writes_every_document_in_order(self, tmp_path, monkeypatch):
+        syncs = []
+        monkeypatch.setattr(simple_server, "_fsync_directory", syncs.append)
+        progress = []
+        documents = render()
+
+        result = write_documents_batch(tmp_path, documents, max_workers=4,
+                                       progress_callback=lambda done, total: progress.append((done, total)))
+
+        assert result["paths"] == [str(tmp_path / name) for name, _ in documents]
+        assert result["written"] == result["paths"] and result["skipped"] == []
+        for name, content in documents:
+            assert (tmp_path / name).read_text(encoding="utf-8") == content
+        assert progress == [(i, 4) for i in range(1, 5)]
+        assert syncs == [tmp_path]  # One directory sync for the whole batch
+        assert sorted(os.listdir(tmp_path)) == sorted(name for name, _ in documents)
+
+    def test_files_get_normal_permissions(self, tmp_path):
+        umask = os.umask(0o022)
+        os.umask(umask)
+        existing = tmp_path / "hub.md"
+        existing.write_text("old", encoding="utf-8")
+        os.chmod(existing, 0o640)
+
+        write_documents_batch(tmp_path, render())
+
+        assert mode(tmp_path / "mybookv2_chapter_01.md") == 0o666 & ~umask
+        assert mode(existing) == 0o640
+
+    def test_failed_write_leaves_no_temp_files(self, tmp_path):
+        # A directory in the way makes the final rename fail
+        (tmp_path / "mybookv2_chapter_02.md").mkdir()
+
+        with pytest.raises(OSError):
+            write_documents_batch(tmp_path, render())
+
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+        assert (tmp_path / "mybookv2_chapter_01.md").exists()
+
+    def test_empty_batch(self, tmp_path):
+        assert write_documents_batch(tmp_path, []) == {"paths": [], "written": [], "skipped": []}
+
+
+class TestIncrementalWrites:
+    @staticmethod
+    def restamp(documents, stamp):
+        """The same documents rendered at another time."""
+        restamped = []
+        for name, content in documents:
+            lines = [
+                f"Last updated: {stamp}" if line.startswith("Last updated:")
+                else f"**Extracted**: {stamp}  " if line.startswith("**Extracted**:")
+                else line
+                for line in content.split("\n")
+            ]
+            restamped.append((name, "\n".join(lines)))
+        return restamped
+
+    def test_timestamp_only_changes_are_skipped(self, tmp_path):
+        documents = self.restamp(render(), "2024-01-01 10:00:00")
+        write_documents_batch(tmp_path, documents)
+        before = {name: os.stat(tmp_path / name).st_mtime_ns for name, _ in documents}
+
+        result = write_documents_batch(tmp_path, self.restamp(render(), "2024-06-30 23:59:59"), incremental=True)
+
+        assert result["written"] == [] and len(result["skipped"]) == 4
+        assert {name: os.stat(tmp_path / name).st_mtime_ns for name, _ in documents} == before
+        # Skipped files keep their old timestamp
+        assert "Last updated: 2024-01-01 10:00:00" in (tmp_path / documents[0][0]).read_text(encoding="utf-8")
+
+    def test_changed_documents_are_rewritten(self, tmp_path, monkeypatch):
+        documents = render()
+        write_documents_batch(tmp_path, documents)
+        syncs = []
+        monkeypatch.setattr(simple_server, "_fsync_directory", syncs.append)
+
+        documents[1] = (documents[1][0], documents[1][1].replace("The middle chapter.", "A revised middle."))
+        documents[2] = (documents[2][0], documents[2][1] + "\nAppendix.\n")
+        result = write_documents_batch(tmp_path, documents, incremental=True)
+
+        assert result["written"] == [str(tmp_path / documents[i][0]) for i in (1, 2)]
+        assert (tmp_path / documents[1][0]).read_text(encoding="utf-8") == documents[1][1]
+        assert syncs == [tmp_path]
+
+    def test_unchanged_rerun_does_not_sync(self, tmp_path, monkeypatch):
+        documents = render()
+        write_documents_batch(tmp_path, documents)
+        syncs = []
+        monkeypatch.setattr(simple_server, "_fsync_directory", syncs.append)
+
+        write_documents_batch(tmp_path, documents, incremental=True)
+
+        assert syncs == []
+
+    def test_full_rewrite_without_incremental(self, tmp_path):
+        documents = render()
+        write_documents_batch(tmp_path, documents)
+
+        result = write_documents_batch(tmp_path, documents)
+
+        assert len(result["written"]) == 4 and result["skipped"] == []
+
+    def test_new_files_are_written(self, tmp_path):
+        result = write_documents_batch(tmp_path, render(), incremental=True)
+
+        assert len(result["written"]) == 4
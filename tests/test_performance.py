@@ -0,0 +1,438 @@
+"""Tests for the resource monitor, resizable limiter and AIMD concurrency controller."""
+
+import asyncio
+import os
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from src.scanner.file_scanner import AsyncFileScanner
+from src.scanner.performance import (
+    _USAGE_FIELDS,
+    AIMDController,
+    PerformanceTracker,
+    ResizableLimiter,
+    ResourceLimiter,
+    ResourceMonitor,
+    ResourceUsage,
+    ScannerPerformanceManager,
+)
+
+
+def make_usage(cpu_percent: float = 10.0, memory_percent: float = 10.0) -> ResourceUsage:
+    return ResourceUsage(
+        timestamp=datetime.now(),
+        cpu_percent=cpu_percent,
+        memory_mb=100.0,
+        memory_percent=memory_percent,
+        disk_io_read_mb=0.0,
+        disk_io_write_mb=0.0,
+        open_files=0,
+        active_threads=1,
+    )
+
+
+class TestResourceMonitor:
+    def test_rolling_aggregates_match_full_scan(self):
+        monitor = ResourceMonitor(max_samples=50, window_minutes=10)
+        rng = random.Random(7)
+        start = datetime.now() - timedelta(minutes=30)
+        for i in range(200):
+            monitor._record_sample(ResourceUsage(
+                timestamp=start + timedelta(seconds=9 * i),
+                cpu_percent=rng.uniform(0, 100),
+                memory_mb=rng.uniform(50, 500),
+                memory_percent=rng.uniform(0, 50),
+                disk_io_read_mb=rng.uniform(0, 10),
+                disk_io_write_mb=rng.uniform(0, 10),
+                open_files=rng.randint(0, 5000),
+                active_threads=rng.randint(1, 64),
+            ))
+            
+            cutoff = monitor._samples[-1].timestamp - timedelta(minutes=10)
+            window = [sample for sample in monitor._samples if sample.timestamp >= cutoff]
+            assert len(monitor._window) == len(window)
+            assert monitor._window_peaks[0] is max(window, key=lambda x: x.memory_mb)
+            for field, total in zip(_USAGE_FIELDS, monitor._window_sums):
+                assert total == pytest.approx(sum(getattr(s, field) for s in window))
+        
+        assert len(monitor._samples) == 50
+    
+    async def test_sampler_reads_process_state(self):
+        monitor = ResourceMonitor()
+        usage = await monitor._collect_usage()
+        
+        rss_mb = monitor._process.memory_info().rss / (1024 * 1024)
+        assert usage.memory_mb == pytest.approx(rss_mb, rel=0.2)
+        assert 0 < usage.memory_percent < 100
+        if os.path.isdir("/proc/self/fd"):
+            assert abs(usage.open_files - len(os.listdir("/proc/self/fd"))) <= 2
+        assert usage.active_threads >= 1
+
+
+class TestResizableLimiter:
+    async def test_respects_limit(self):
+        limiter = ResizableLimiter(3)
+        peak = 0
+        
+        async def worker():
+            nonlocal peak
+            async with limiter:
+                peak = max(peak, limiter.in_use)
+                await asyncio.sleep(0.005)
+        
+        await asyncio.gather(*(worker() for _ in range(20)))
+        assert peak == 3
+        assert limiter.in_use == 0
+    
+    async def test_shrink_keeps_held_permits_and_blocks_new_ones(self):
+        limiter = ResizableLimiter(4)
+        for _ in range(4):
+            await limiter.acquire()
+        
+        limiter.resize(2)
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        
+        # Two releases only bring in_use down to the new limit
+        limiter.release()
+        limiter.release()
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        assert limiter.in_use == 2
+        
+        limiter.release()
+        await asyncio.sleep(0)
+        assert waiter.done()
+        assert limiter.in_use == 2
+    
+    async def test_grow_wakes_waiters(self):
+        limiter = ResizableLimiter(1)
+        await limiter.acquire()
+        waiters = [asyncio.create_task(limiter.acquire()) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert limiter.waiting == 3
+        
+        limiter.resize(4)
+        await asyncio.sleep(0)
+        assert all(waiter.done() for waiter in waiters)
+        assert limiter.in_use == 4
+    
+    async def test_cancelled_waiter_does_not_leak_permit(self):
+        limiter = ResizableLimiter(1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        
+        limiter.release()
+        assert limiter.in_use == 0
+        await asyncio.wait_for(limiter.acquire(), timeout=1)
+        assert limiter.in_use == 1
+    
+    async def test_permit_accounting_under_random_resizes(self):
+        limiter = ResizableLimiter(4)
+        violations = []
+        
+        async def worker():
+            async with limiter:
+                # A new admission never pushes in_use beyond the limit at grant time
+                if limiter.in_use > max(limiter.limit, 1) and limiter.waiting == 0:
+                    violations.append(limiter.in_use)
+                await asyncio.sleep(0.001)
+        
+        async def resizer():
+            for limit in [1, 8, 2, 6, 3, 1, 5] * 3:
+                limiter.resize(limit)
+                await asyncio.sleep(0.002)
+        
+        await asyncio.gather(resizer(), *(worker() for _ in range(200)))
+        assert limiter.in_use == 0
+        assert limiter.waiting == 0
+    
+    def test_over_release_raises(self):
+        limiter = ResizableLimiter(1)
+        with pytest.raises(RuntimeError):
+            limiter.release()
+        with pytest.raises(ValueError):
+            limiter.resize(0)
+
+
+class SimulatedWorkload:
+    """Closed-loop workload on a virtual clock feeding an AIMDController.
+    
+    Demand is unbounded, so the limiter is always saturated. Each window of
+    ``interval`` seconds completes throughput * interval files at the given
+    mean latency:
+    
+    - I/O-bound: every slot waits ``service_time`` independently, so
+      throughput scales with the limit and latency stays flat.
+    - CPU-bound: slots share ``cores``; beyond that, extra slots only queue,
+      so throughput is capped and latency grows with the limit.
+    """
+    
+    def __init__(self, initial_limit: int, max_limit: int, service_time: float = 0.01,
+                 cores: int = 0, file_size: int = 4096, interval: float = 1.0):
+        self.now = 0.0
+        self.service_time = service_time
+        self.cores = cores
+        self.file_size = file_size
+        self.interval = interval
+        self.limiter = ResizableLimiter(initial_limit)
+        self.tracker = PerformanceTracker()
+        self.controller = AIMDController(
+            self.limiter, self.tracker, max_limit=max_limit, interval=interval,
+            clock=lambda: self.now,
+        )
+        self.limits = []
+        self.throughputs = []
+    
+    def _window(self, limit: int):
+        if self.cores:
+            throughput = min(limit, self.cores) / self.service_time
+            latency = self.service_time * max(1.0, limit / self.cores)
+        else:
+            throughput = limit / self.service_time
+            latency = self.service_time
+        return throughput, latency
+    
+    def run(self, windows: int) -> None:
+        for _ in range(windows):
+            throughput, latency = self._window(self.limiter.limit)
+            for _ in range(int(throughput * self.interval)):
+                self.tracker.record_file(self.file_size, latency=latency)
+            self.limiter.saturated = True
+            self.now += self.interval
+            self.controller.maybe_adjust()
+            self.limits.append(self.limiter.limit)
+            self.throughputs.append(throughput)
+    
+    def mean_limit(self, last: int) -> float:
+        return sum(self.limits[-last:]) / last
+
+
+class TestAIMDController:
+    def test_io_bound_workload_scales_to_max(self):
+        workload = SimulatedWorkload(initial_limit=2, max_limit=32)
+        workload.run(40)
+        
+        assert workload.limiter.limit == 32
+        assert workload.controller.adjustments["decrease"] == 0
+    
+    def test_cpu_bound_workload_settles_near_capacity(self):
+        workload = SimulatedWorkload(initial_limit=16, max_limit=32, cores=4)
+        workload.run(60)
+        
+        # Sawtooth around the core count instead of growing to max_limit
+        assert workload.controller.adjustments["decrease"] > 0
+        assert max(workload.limits[-20:]) <= 8
+        assert workload.mean_limit(20) >= 3
+        # Never shrinks far enough to starve the cores for long
+        assert sum(workload.throughputs[-20:]) / 20 >= 0.85 * 4 / workload.service_time
+    
+    def test_workload_shift_from_cpu_to_io_bound_recovers(self):
+        workload = SimulatedWorkload(initial_limit=8, max_limit=32, cores=2)
+        workload.run(30)
+        assert workload.limiter.limit <= 4
+        
+        workload.cores = 0
+        workload.run(60)
+        assert workload.limiter.limit == 32
+    
+    def test_resource_pressure_decreases_multiplicatively(self):
+        now = [0.0]
+        limiter = ResizableLimiter(10)
+        tracker = PerformanceTracker()
+        controller = AIMDController(limiter, tracker, max_limit=16, interval=1.0, clock=lambda: now[0])
+        
+        now[0] = 2.0
+        assert controller.adjust(make_usage(cpu_percent=99.0)) == "decrease"
+        assert limiter.limit == 7
+        
+        now[0] = 4.0
+        controller.adjust(make_usage(memory_percent=95.0))
+        assert limiter.limit == 4
+    
+    def test_holds_without_saturation(self):
+        now = [0.0]
+        limiter = ResizableLimiter(4)
+        tracker = PerformanceTracker()
+        controller = AIMDController(limiter, tracker, interval=1.0, clock=lambda: now[0])
+        
+        for _ in range(50):
+            tracker.record_file(1024, latency=0.01)
+        now[0] = 1.0
+        
+        # Workers never had to wait, so more of them would not help
+        assert controller.adjust() == "hold"
+        assert limiter.limit == 4
+    
+    def test_error_rate_triggers_decrease(self):
+        now = [0.0]
+        limiter = ResizableLimiter(8)
+        tracker = PerformanceTracker()
+        controller = AIMDController(limiter, tracker, interval=1.0, clock=lambda: now[0])
+        
+        for index in range(40):
+            tracker.record_file(1024, error=index % 3 == 0, latency=0.01)
+        now[0] = 1.0
+        
+        assert controller.adjust() == "decrease"
+        assert limiter.limit < 8
+
+
+def make_settings(**overrides):
+    settings = dict(
+        emergency_memory_limit_mb=10_000,
+        memory_limit_mb=5_000,
+        cpu_usage_limit=80.0,
+        auto_pause_on_high_load=True,
+        max_concurrent_workers=2,
+    )
+    settings.update(overrides)
+    return SimpleNamespace(**settings)
+
+
+class TestResourceLimiter:
+    async def test_pauses_on_high_cpu_and_resumes_with_hysteresis(self):
+        limiter = ResourceLimiter(make_settings(), ResourceMonitor())
+        events = []
+        limiter.add_callback(lambda event, details: events.append((event, details["reason"])))
+        
+        limiter._check_limits(make_usage(cpu_percent=95))
+        assert limiter.is_paused()
+        
+        limiter._check_limits(make_usage(cpu_percent=70))  # Below the limit, above the 80% band
+        assert limiter.is_paused()
+        
+        limiter._check_limits(make_usage(cpu_percent=60))
+        assert not limiter.is_paused()
+        assert events == [("pause", "cpu_limit"), ("resume", "cpu_recovered")]
+    
+    async def test_waiters_wake_on_resume(self):
+        limiter = ResourceLimiter(make_settings(), ResourceMonitor())
+        limiter._check_limits(make_usage(cpu_percent=95))
+        waiter = asyncio.create_task(limiter.wait_until_resumed(timeout=5))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        
+        limiter._check_limits(make_usage(cpu_percent=10))
+        
+        assert await asyncio.wait_for(waiter, timeout=1) is True
+    
+    async def test_wait_times_out_while_still_paused(self):
+        limiter = ResourceLimiter(make_settings(), ResourceMonitor())
+        limiter._check_limits(make_usage(cpu_percent=95))
+        
+        assert await limiter.wait_until_resumed(timeout=0.01) is False
+
+
+class TestScannerPerformanceManager:
+    async def test_acquire_worker_waits_out_a_pause(self):
+        manager = ScannerPerformanceManager(make_settings())
+        manager.resource_limiter._check_limits(make_usage(cpu_percent=95))
+        acquire = asyncio.create_task(manager.acquire_worker())
+        await asyncio.sleep(0.01)
+        assert not acquire.done()
+        
+        manager.resource_limiter._check_limits(make_usage(cpu_percent=10))
+        started_at = await asyncio.wait_for(acquire, timeout=1)
+        manager.release_worker(100, started_at=started_at)
+        
+        assert manager.concurrency_manager.active_workers == 0
+    
+    async def test_acquire_worker_gives_up_after_the_pause_timeout(self):
+        manager = ScannerPerformanceManager(make_settings(), pause_timeout=0.01)
+        manager.resource_limiter._check_limits(make_usage(cpu_percent=95))
+        
+        with pytest.raises(RuntimeError, match="paused"):
+            await manager.acquire_worker()
+    
+    async def test_emergency_stop_releases_paused_waiters(self):
+        manager = ScannerPerformanceManager(make_settings())
+        limiter = manager.resource_limiter
+        limiter._check_limits(make_usage(cpu_percent=95))
+        acquire = asyncio.create_task(manager.acquire_worker())
+        await asyncio.sleep(0.01)
+        
+        limiter._check_limits(ResourceUsage(**{**make_usage(cpu_percent=95).__dict__, "memory_mb": 20_000}))
+        
+        with pytest.raises(RuntimeError, match="Emergency"):
+            await asyncio.wait_for(acquire, timeout=1)
+
+
+class TestScanPipeline:
+    @pytest.fixture
+    def project(self, tmp_path):
+        for i in range(7):
+            (tmp_path / f"module{i}.py").write_text(f"x = {i}\n", encoding="utf-8")
+        return tmp_path
+    
+    def make_scanner(self, project, manager=None):
+        scanner = AsyncFileScanner(
+            1, project, config={"include_patterns": ["*.py"]}, performance_manager=manager
+        )
+        scanner.batch_size = 3
+        scanner._running = True
+        return scanner
+    
+    async def test_analysis_and_saves_run_in_worker_slots(self, project):
+        manager = ScannerPerformanceManager(make_settings())
+        slots = {"held": 0, "peak": 0, "granted": 0}
+        acquire, release = manager.acquire_worker, manager.release_worker
+        
+        async def counting_acquire():
+            started_at = await acquire()
+            slots["granted"] += 1
+            slots["held"] += 1
+            slots["peak"] = max(slots["peak"], slots["held"])
+            return started_at
+        
+        def counting_release(*args, **kwargs):
+            slots["held"] -= 1
+            release(*args, **kwargs)
+        
+        manager.acquire_worker, manager.release_worker = counting_acquire, counting_release
+        batches = []
+        
+        async def save(batch):
+            batches.append(sorted(info.name for info in batch))
+        
+        await self.make_scanner(project, manager)._run_pipeline(save)
+        
+        assert sorted(name for batch in batches for name in batch) == [f"module{i}.py" for i in range(7)]
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+        assert slots["granted"] == 7 + 3  # One per file, one per batch save
+        assert slots["held"] == 0 and slots["peak"] <= manager.concurrency_manager.current_workers
+        assert manager.concurrency_manager.get_performance_metrics().total_files == 7  # Batch saves are not files
+    
+    async def test_discovery_waits_while_paused(self, project):
+        scanner = self.make_scanner(project)
+        batches = []
+        
+        async def save(batch):
+            batches.append(batch)
+        
+        scanner.pause()
+        run = asyncio.create_task(scanner._run_pipeline(save))
+        await asyncio.sleep(0.05)
+        assert scanner.stats.files_processed == 0
+        
+        scanner.resume()
+        await asyncio.wait_for(run, timeout=5)
+        
+        assert scanner.stats.files_processed == 7 and sum(len(batch) for batch in batches) == 7
+    
+    async def test_failed_save_stops_the_pipeline(self, project):
+        scanner = self.make_scanner(project)
+        
+        async def save(batch):
+            raise OSError("disk full")
+        
+        with pytest.raises(OSError, match="disk full"):
+            await asyncio.wait_for(scanner._run_pipeline(save), timeout=5)
+        assert not scanner._running
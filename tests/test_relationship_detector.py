@@ -0,0 +1,160 @@
+"""Tests for relationship detection."""
+
+import random
+
+import pytest
+
+from src.analyzer.content_analyzer import AnalysisResult, ContentPattern, CrossReference
+from src.analyzer.relationship_detector import ModuleIndex, RelationshipDetector
+
+FILES = [
+    "src/pkg/__init__.py",
+    "src/pkg/util.py",
+    "src/pkg/sub/util.py",
+    "src/app.py",
+    "web/components/index.js",
+    "web/components/Button.jsx",
+    "web/main.js",
+    "docs/guide.md",
+]
+
+
+class TestModuleIndex:
+    @pytest.mark.parametrize("import_path, source, expected", [
+        ("src.pkg.util", "src/app.py", "src/pkg/util.py"),
+        ("pkg.util.helper", "src/app.py", "src/pkg/util.py"),  # from pkg.util import helper
+        ("src.pkg", "src/app.py", "src/pkg/__init__.py"),
+        ("pkg.missing_name", "src/app.py", "src/pkg/__init__.py"),
+        ("sub.util", "src/app.py", "src/pkg/sub/util.py"),
+        ("util", "src/pkg/sub/other.py", "src/pkg/sub/util.py"),  # Nearest of two util modules
+        ("util", "src/pkg/other.py", "src/pkg/util.py"),
+        ("./components", "web/main.js", "web/components/index.js"),
+        ("./components/Button", "web/main.js", "web/components/Button.jsx"),
+        ("../main.js", "web/components/Button.jsx", "web/main.js"),
+        ("lib/guide", "src/app.py", "docs/guide.md"),  # Stem match, as before
+        ("requests", "src/app.py", None),
+        ("./missing", "web/main.js", None),
+        ("../../outside", "web/main.js", None),
+    ])
+    def test_resolve(self, import_path, source, expected):
+        assert ModuleIndex(FILES).resolve(import_path, source) == expected
+
+    def test_never_resolves_to_the_importer(self):
+        index = ModuleIndex(["json.py"])
+
+        assert index.resolve("json", "json.py") is None
+        assert index.resolve("json", "other.py") == "json.py"
+
+    def test_remove(self):
+        index = ModuleIndex(FILES)
+        index.remove("src/pkg/sub/util.py")
+
+        assert index.resolve("util", "src/pkg/sub/other.py") == "src/pkg/util.py"
+        assert index.resolve("sub.util", "src/app.py") is None
+
+
+class TestImportRelationships:
+    def test_imports_point_at_resolved_files(self):
+        def importing(path, *targets):
+            return AnalysisResult(
+                file_path=path,
+                cross_references=[CrossReference(path, t, "import", line_number=1) for t in targets],
+            )
+
+        results = {
+            "src/app.py": importing("src/app.py", "pkg.util.helper", "os", ".relative"),
+            "src/pkg/util.py": importing("src/pkg/util.py"),
+        }
+
+        relationships = RelationshipDetector()._detect_import_relationships(results)
+        by_target = {r.target_file: r for r in relationships}
+
+        assert by_target["src/pkg/util.py"].strength == 1.0
+        assert by_target["src/pkg/util.py"].metadata["import_path"] == "pkg.util.helper"
+        assert by_target["os"].strength == 0.3
+        assert by_target[".relative"].strength == 1.0  # Unresolved relative imports stay internal
+
+
+def random_project(seed: int, files: int = 40):
+    rng = random.Random(seed)
+    results = {}
+    for i in range(files):
+        path = f"pkg/mod{i}.py" if i % 4 else f"docs/page{i}.md"
+        results[path] = AnalysisResult(
+            file_path=path,
+            exports=rng.sample(["run", "main", "Config", "load", "save", "App"], k=rng.randint(0, 3)),
+            dependencies=rng.sample(["os", "json", "yaml", "numpy", "click", "re", "typing"], k=rng.randint(0, 3)),
+            patterns=[ContentPattern(t, t, 1) for t in rng.sample(["docstring", "todo", "main_guard"], k=rng.randint(0, 3))],
+            language="markdown" if path.endswith(".md") else "python",
+        )
+    return results
+
+
+def exhaustive_semantic(detector, results):
+    """Every same-language pair, as detection worked before candidate generation."""
+    relationships = []
+    groups = {}
+    for path, result in results.items():
+        groups.setdefault(result.language, []).append(path)
+    for files in groups.values():
+        for i, file1 in enumerate(files):
+            for file2 in files[i + 1:]:
+                rel = detector._semantic_relationship(file1, file2, results[file1], results[file2])
+                if rel:
+                    relationships.append(rel)
+    return relationships
+
+
+def as_tuples(relationships):
+    return [(r.source_file, r.target_file, r.strength, r.evidence, r.metadata) for r in relationships]
+
+
+class TestSemanticRelationships:
+    @pytest.mark.parametrize("seed", range(5))
+    @pytest.mark.parametrize("vectorized", [False, True])
+    def test_candidates_match_exhaustive_comparison(self, seed, vectorized):
+        if vectorized:
+            pytest.importorskip("numpy")
+        detector = RelationshipDetector()
+        detector.semantic_top_k = 0
+        detector.semantic_vectorized = vectorized
+        results = random_project(seed)
+
+        expected = exhaustive_semantic(detector, results)
+
+        assert expected
+        assert as_tuples(detector._detect_semantic_relationships(results)) == as_tuples(expected)
+
+    def test_pattern_only_pairs_are_not_candidates(self):
+        features = [(set(), set(), {"docstring", "todo"})] * 3 + [({"run"}, set(), set())] * 2
+
+        assert RelationshipDetector._semantic_candidates(features) == [(3, 4)]
+
+    @pytest.mark.parametrize("vectorized", [False, True])
+    def test_top_k_cap(self, vectorized):
+        if vectorized:
+            pytest.importorskip("numpy")
+        detector = RelationshipDetector()
+        detector.semantic_top_k = 2
+        detector.semantic_vectorized = vectorized
+        results = random_project(0)
+        # A clique of near-identical modules, where every pair is similar
+        for i in range(8):
+            path = f"app/view{i}.py"
+            results[path] = AnalysisResult(
+                file_path=path,
+                exports=["App", "render", f"view{i}"],
+                dependencies=["os", "json", "flask"],
+                language="python",
+            )
+
+        uncapped = exhaustive_semantic(detector, results)
+        kept = detector._detect_semantic_relationships(results)
+
+        for path in results:
+            mine = [r for r in uncapped if path in (r.source_file, r.target_file)]
+            top = sorted(mine, key=lambda r: -r.strength)[:2]
+            # A file's strongest pairs survive; the rest only via the other file's top-k
+            assert all(r in kept for r in top)
+        assert len(kept) < len(uncapped)
+        assert len(kept) <= 2 * len(results)
@@ -0,0 +1,141 @@
+"""Tests for the fair-share multi-project scan scheduler."""
+
+import asyncio
+
+import pytest
+
+from src.scanner.scheduler import FairShareScheduler, ProjectTicket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def run_project(scheduler: FairShareScheduler, ticket: ProjectTicket, files: int,
+                      batch_size: int = 10, workers: int = 4, trace: list = None) -> None:
+    """Scan `files` fake files with a small worker pool, checkpointing per batch."""
+    await scheduler.admit(ticket)
+    remaining = iter(range(files))
+    done = 0
+    lock = asyncio.Lock()
+
+    async def worker():
+        nonlocal done
+        for _ in remaining:
+            async with ticket.slot():
+                if trace is not None:
+                    trace.append(ticket.name)
+                await asyncio.sleep(0)
+            async with lock:
+                done += 1
+                if done % batch_size == 0:
+                    await ticket.checkpoint(done)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(workers)))
+    finally:
+        scheduler.finish(ticket)
+
+
+class TestFairShareScheduler:
+    async def test_slots_shared_by_weight(self):
+        scheduler = FairShareScheduler(total_slots=2, max_active_projects=2, min_batches_before_preempt=10**6)
+        heavy = scheduler.register("heavy", weight=3.0, size_hint=1000)
+        light = scheduler.register("light", weight=1.0, size_hint=1000)
+        trace = []
+
+        await asyncio.gather(
+            run_project(scheduler, heavy, 400, trace=trace),
+            run_project(scheduler, light, 400, trace=trace),
+        )
+
+        # While both compete, grants follow the 3:1 weights
+        contended = trace[:400]
+        share = contended.count("heavy") / len(contended)
+        assert share == pytest.approx(0.75, abs=0.05)
+        assert scheduler.get_stats()["slots_in_use"] == 0
+
+    async def test_small_and_recent_projects_admitted_first(self):
+        clock = FakeClock()
+        clock.now = 1000.0
+        scheduler = FairShareScheduler(total_slots=4, max_active_projects=1, clock=clock, aging_seconds=0)
+        order = []
+
+        big = scheduler.register("big", size_hint=500_000)
+        small = scheduler.register("small", size_hint=200)
+        recent = scheduler.register("recent", size_hint=600, last_change=clock.now - 10)
+        stale = scheduler.register("stale", size_hint=600)
+
+        async def run(ticket):
+            await scheduler.admit(ticket)
+            order.append(ticket.name)
+            await asyncio.sleep(0)
+            scheduler.finish(ticket)
+
+        # Hold the only seat so every project queues before admission starts
+        blocker = scheduler.register("blocker", size_hint=1)
+        await scheduler.admit(blocker)
+        tasks = [asyncio.create_task(run(t)) for t in (big, stale, recent, small)]
+        await asyncio.sleep(0)
+        scheduler.finish(blocker)
+        await asyncio.gather(*tasks)
+
+        assert order == ["small", "recent", "stale", "big"]
+
+    async def test_large_project_preempted_at_batch_boundary(self):
+        scheduler = FairShareScheduler(total_slots=2, max_active_projects=1, min_batches_before_preempt=2)
+        big = scheduler.register("big", size_hint=10_000)
+        big_task = asyncio.create_task(run_project(scheduler, big, 300))
+        while big.batches < 3:
+            await asyncio.sleep(0)
+
+        small = scheduler.register("small", size_hint=40)
+        await run_project(scheduler, small, 40)
+
+        # The small project ran to completion while the big one was parked
+        assert big.preemptions == 1
+        assert big.state == ProjectTicket.ACTIVE
+        assert not big_task.done()
+        await big_task
+        assert big.files_done == 300
+        assert scheduler.get_stats()["projects"]["small"]["state"] == ProjectTicket.DONE
+
+    async def test_no_preemption_before_minimum_batches(self):
+        scheduler = FairShareScheduler(total_slots=2, max_active_projects=1, min_batches_before_preempt=5)
+        big = scheduler.register("big", size_hint=10_000)
+        await scheduler.admit(big)
+        small = scheduler.register("small", size_hint=10)
+        small_admit = asyncio.create_task(scheduler.admit(small))
+        await asyncio.sleep(0)
+
+        for _ in range(4):
+            await big.checkpoint()
+        assert big.state == ProjectTicket.ACTIVE and not small_admit.done()
+
+        checkpoint = asyncio.create_task(big.checkpoint())
+        await asyncio.sleep(0)
+        assert small.state == ProjectTicket.ACTIVE and big.state == ProjectTicket.PENDING
+
+        await small_admit
+        scheduler.finish(small)
+        await checkpoint
+        assert big.state == ProjectTicket.ACTIVE
+
+    async def test_cancelled_slot_waiter_does_not_leak(self):
+        scheduler = FairShareScheduler(total_slots=1)
+        ticket = scheduler.register("p")
+        await scheduler.admit(ticket)
+        await ticket.acquire()
+        waiter = asyncio.create_task(ticket.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        ticket.release()
+        assert scheduler.get_stats()["slots_in_use"] == 0
+        async with ticket.slot():
+            assert ticket.slots_held == 1
@@ -0,0 +1,142 @@
+"""Tests for the project tools of the MCP server."""
+
+import pytest
+
+# server.py is written against the mcp 1.x low-level server API
+pytest.importorskip("mcp.server.fastmcp")
+
+from src.analyzer import AnalysisPipeline
+from src.analyzer.content_analyzer import AnalysisResult, CrossReference
+from src.analyzer.incremental import IncrementalRelationshipIndex
+from src.analyzer.relationship_detector import DependencyGraphBuilder, RelationshipDetector
+from src.mcp_server import server
+from src.mcp_server.daemon import AnalysisDaemon
+from src.mcp_server.snapshots import ProjectSnapshot
+from tests.test_analysis_daemon import FakeStore
+
+PROJECT_TOOLS = ["analyze_project", "get_crossref_recommendations", "detect_hub_files", "analyze_relationships"]
+
+
+def make_report():
+    results = {
+        "app.py": AnalysisResult(
+            file_path="app.py",
+            cross_references=[CrossReference("app.py", "util", "import", context="import util")],
+            dependencies=["os"],
+            exports=["main"],
+            language="python",
+        ),
+        "util.py": AnalysisResult(file_path="util.py", dependencies=["os"], exports=["helper"], language="python"),
+        "README.md": AnalysisResult(file_path="README.md", hub_file_candidates=["README.md"], language="markdown"),
+    }
+    index = IncrementalRelationshipIndex(RelationshipDetector(), DependencyGraphBuilder())
+    index.apply(results)
+    return AnalysisPipeline()._build_report(1, index)
+
+
+class RecordingStore:
+    """Serves one prebuilt snapshot and records how it was asked for."""
+
+    def __init__(self, root):
+        self.calls = []
+        self.snapshot = ProjectSnapshot(
+            root_path=str(root),
+            project_name=root.name,
+            project_id=1,
+            report=make_report(),
+            content_hashes={"app.py": "h1", "util.py": "h2", "README.md": "h3"},
+            scan_generation=1,
+        )
+
+    async def get(self, project_path, project_name=None, refresh=False):
+        self.calls.append((project_path, project_name, refresh))
+        return self.snapshot
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = RecordingStore(tmp_path)
+    monkeypatch.setattr(server, "_initialized", True)
+    monkeypatch.setattr(server, "snapshot_store", store)
+    monkeypatch.setattr(server, "analysis_daemon", None)
+    return store
+
+
+async def call(name, **arguments):
+    [content] = await server.call_tool(name, arguments)
+    return content.text
+
+
+class TestProjectTools:
+    @pytest.mark.parametrize("tool", PROJECT_TOOLS)
+    async def test_reads_the_shared_snapshot(self, tool, tmp_path, store):
+        text = await call(tool, project_path=str(tmp_path))
+
+        assert "❌" not in text
+        assert store.calls == [(str(tmp_path), tmp_path.name if tool == "analyze_project" else None, False)]
+
+    @pytest.mark.parametrize("tool", PROJECT_TOOLS)
+    async def test_passes_project_name_and_refresh(self, tool, tmp_path, store):
+        await call(tool, project_path=str(tmp_path), project_name="named", refresh=True)
+
+        assert store.calls == [(str(tmp_path), "named", True)]
+
+    @pytest.mark.parametrize("tool", PROJECT_TOOLS + ["register_project"])
+    async def test_missing_project_path(self, tool, tmp_path, store):
+        text = await call(tool, project_path=str(tmp_path / "missing"))
+
+        assert text.startswith("❌ Project path not found") and store.calls == []
+
+    async def test_analyze_project_report(self, tmp_path, store):
+        text = await call("analyze_project", project_path=str(tmp_path))
+
+        assert "- **Files Analyzed**: 3" in text
+        assert f"- **Relationships**: {len(store.snapshot.relationships)}" in text
+        assert "- **python**: 2 files" in text
+
+    async def test_detect_hub_files_report(self, tmp_path, store):
+        graph = store.snapshot.dependency_graph
+        graph.hub_files = ["util.py"]
+
+        text = await call("detect_hub_files", project_path=str(tmp_path))
+
+        in_degree = sum(1 for r in store.snapshot.relationships if r.target_file == "util.py")
+        assert f"## `util.py`\n- **Connections**: {in_degree}" in text
+
+    async def test_analyze_relationships_report(self, tmp_path, store):
+        graph = store.snapshot.dependency_graph
+
+        text = await call("analyze_relationships", project_path=str(tmp_path))
+
+        assert f"- **Nodes**: {len(graph.nodes)}\n- **Edges**: {len(graph.edges)}" in text
+        assert "No Dependency Cycles" in text
+
+
+class TestDaemonMode:
+    @pytest.fixture
+    async def daemon(self, monkeypatch):
+        daemon = AnalysisDaemon(FakeStore(), wait_timeout=5)
+        monkeypatch.setattr(server, "_initialized", True)
+        monkeypatch.setattr(server, "analysis_daemon", daemon)
+        yield daemon
+        await daemon.stop()
+
+    @pytest.mark.parametrize("tool", PROJECT_TOOLS)
+    async def test_warming_project_answers_without_waiting(self, tool, tmp_path, daemon):
+        text = await call(tool, project_path=str(tmp_path))
+
+        assert "still being analyzed in the background" in text
+
+    async def test_register_project(self, tmp_path, daemon):
+        text = await call("register_project", project_path=str(tmp_path))
+
+        assert text.startswith("# 🔄 Background Analysis: proj")
+        assert f"- **Root**: {tmp_path.resolve()}" in text
+
+    async def test_register_project_requires_daemon_mode(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(server, "_initialized", True)
+        monkeypatch.setattr(server, "analysis_daemon", None)
+
+        text = await call("register_project", project_path=str(tmp_path))
+
+        assert "Background analysis is disabled" in text
@@ -0,0 +1,194 @@
+"""Tests for the shared per-project analysis snapshots."""
+
+import contextlib
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.mcp_server import snapshots
+from src.mcp_server.snapshots import ProjectSnapshotStore, file_fingerprint
+
+
+def file_record(path, content_hash, size=10, mtime=datetime(2024, 1, 1)):
+    return SimpleNamespace(relative_path=path, content_hash=content_hash, size_bytes=size, file_modified_at=mtime)
+
+
+class FakeScanner:
+    def __init__(self, name, root_path, monitored=False):
+        self.project_name = name
+        self.project_id = 7
+        self.root_path = root_path
+        self.monitor = object() if monitored else None
+        self.is_running = False
+        self.scan_generation = 0
+        self.scans = 0
+
+    async def initialize(self):
+        self.is_running = True
+
+    async def scan_project(self):
+        self.scans += 1
+        self.scan_generation += 1
+        return SimpleNamespace(files_processed=0)
+
+    async def trigger_incremental_scan(self):
+        self.scans += 1
+        self.scan_generation += 1
+
+
+class FakeOrchestrator:
+    def __init__(self, monitored=False):
+        self.monitored = monitored
+        self.scanners = {}
+
+    async def get_project(self, name):
+        return self.scanners.get(name)
+
+    async def add_project(self, project_name, root_path, **kwargs):
+        if project_name not in self.scanners:
+            self.scanners[project_name] = FakeScanner(project_name, root_path, self.monitored)
+        return self.scanners[project_name]
+
+
+class FakePipeline:
+    def __init__(self):
+        self.calls = []
+        self.resets = []
+
+    async def incremental_analysis(self, project_id, changed_files):
+        self.calls.append(sorted(changed_files))
+        return SimpleNamespace(content_results={}, relationships=[])
+
+    def reset(self, project_id=None):
+        self.resets.append(project_id)
+
+
+@pytest.fixture
+def files(monkeypatch):
+    """The project's file records, as the database would return them."""
+    records = {}
+
+    @contextlib.asynccontextmanager
+    async def fake_session():
+        yield None
+
+    async def get_text_files(session, project_id):
+        return list(records.values())
+
+    monkeypatch.setattr(snapshots, "get_db_session", fake_session)
+    monkeypatch.setattr(snapshots.file_repo, "get_text_files_by_project", get_text_files)
+    return records
+
+
+def make_store(monitored=False, refresh_interval=30.0):
+    store = ProjectSnapshotStore(FakeOrchestrator(monitored), refresh_interval=refresh_interval)
+    store.pipeline = FakePipeline()
+    return store
+
+
+class TestFileFingerprint:
+    def test_uses_the_content_hash(self):
+        assert file_fingerprint(file_record("a.py", "abc")) == "abc"
+
+    def test_unhashed_files_fall_back_to_size_and_mtime(self):
+        before = file_fingerprint(file_record("test_a.py", ""))
+
+        assert file_fingerprint(file_record("test_a.py", None)) == before
+        assert file_fingerprint(file_record("test_a.py", "", size=11)) != before
+        assert file_fingerprint(file_record("test_a.py", "", mtime=datetime(2024, 1, 2))) != before
+
+
+class TestProjectSnapshotStore:
+    async def test_tools_share_one_snapshot(self, tmp_path, files):
+        files["a.py"] = file_record("a.py", "h1")
+        store = make_store()
+
+        first = await store.get(str(tmp_path))
+        second = await store.get(str(tmp_path / "."), project_name="other-name")
+
+        assert second is first
+        assert store.pipeline.calls == [[]]  # One full analysis
+        assert (store.hits, store.misses) == (1, 1)
+
+    async def test_only_changed_files_are_reanalyzed(self, tmp_path, files):
+        files["a.py"] = file_record("a.py", "h1")
+        files["b.py"] = file_record("b.py", "h2")
+        store = make_store()
+        first = await store.get(str(tmp_path))
+
+        files["b.py"] = file_record("b.py", "h3")
+        files["c.py"] = file_record("c.py", "h4")
+        del files["a.py"]
+        refreshed = await store.get(str(tmp_path), refresh=True)
+
+        assert refreshed is not first and refreshed.refreshes == 1
+        assert store.pipeline.calls[-1] == ["a.py", "b.py", "c.py"]
+
+    async def test_unchanged_rescan_keeps_the_snapshot(self, tmp_path, files):
+        files["a.py"] = file_record("a.py", "h1")
+        store = make_store()
+        first = await store.get(str(tmp_path))
+
+        again = await store.get(str(tmp_path), refresh=True)
+
+        assert again is first and again.scan_generation == 2
+        assert len(store.pipeline.calls) == 1
+
+    async def test_edits_to_unhashed_files_are_picked_up(self, tmp_path, files):
+        # Test and build files are analyzed but the scanner stores no hash for them
+        files["tests/test_a.py"] = file_record("tests/test_a.py", "")
+        files["package.json"] = file_record("package.json", "")
+        store = make_store()
+        await store.get(str(tmp_path))
+
+        files["package.json"] = file_record("package.json", "", size=42)
+        await store.get(str(tmp_path), refresh=True)
+
+        assert store.pipeline.calls[-1] == ["package.json"]
+
+    async def test_unmonitored_snapshot_expires_after_the_refresh_interval(self, tmp_path, files):
+        files["a.py"] = file_record("a.py", "h1")
+        store = make_store(refresh_interval=0)
+        await store.get(str(tmp_path))
+        scanner = store.orchestrator.scanners[tmp_path.name]
+
+        await store.get(str(tmp_path))
+
+        assert scanner.scans == 2 and store.misses == 2
+
+    async def test_monitored_snapshot_follows_the_scan_generation(self, tmp_path, files):
+        files["a.py"] = file_record("a.py", "h1")
+        store = make_store(monitored=True, refresh_interval=0)
+        snapshot = await store.get(str(tmp_path))
+        scanner = store.orchestrator.scanners[tmp_path.name]
+
+        assert store.is_current(snapshot, scanner)
+        # The monitor applied a change batch
+        scanner.scan_generation += 1
+        files["a.py"] = file_record("a.py", "h2")
+        refreshed = await store.get(str(tmp_path))
+
+        assert scanner.scans == 1  # No rescan: the monitor already stored the change
+        assert store.pipeline.calls[-1] == ["a.py"] and refreshed.scan_generation == scanner.scan_generation
+
+    async def test_same_directory_name_elsewhere_gets_its_own_project(self, tmp_path, files):
+        store = make_store()
+        (tmp_path / "one" / "app").mkdir(parents=True)
+        (tmp_path / "two" / "app").mkdir(parents=True)
+
+        await store.get(str(tmp_path / "one" / "app"))
+        await store.get(str(tmp_path / "two" / "app"))
+
+        names = sorted(store.orchestrator.scanners)
+        assert len(names) == 2 and names[0] == "app" and names[1].startswith("app_")
+
+    async def test_invalidate_resets_the_pipeline(self, tmp_path, files):
+        files["a.py"] = file_record("a.py", "h1")
+        store = make_store()
+        await store.get(str(tmp_path))
+
+        store.invalidate(str(tmp_path))
+
+        assert store.peek(str(tmp_path)) is None
+        assert store.pipeline.resets == [7, 7]  # Before the first build, then on invalidate
@@ -0,0 +1,126 @@
+"""Tests for the shared process-wide watch service."""
+
+import time
+
+import pytest
+from watchdog.events import FileCreatedEvent, FileMovedEvent, FileSystemEventHandler
+
+from src.utils.watch_service import WatchService
+
+
+class RecordingHandler(FileSystemEventHandler):
+    def __init__(self, fail=False):
+        super().__init__()
+        self.fail = fail
+        self.paths = []
+
+    def dispatch(self, event):
+        if self.fail:
+            raise RuntimeError("boom")
+        self.paths.append(event.src_path)
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def service():
+    service = WatchService()
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for rel in ["project", "project/sub", "other"]:
+        (tmp_path / rel).mkdir()
+    return tmp_path
+
+
+class TestWatchService:
+    def test_nested_roots_share_one_recursive_watch(self, service, tree):
+        outer, inner = RecordingHandler(), RecordingHandler()
+
+        service.schedule(inner, tree / "project" / "sub")
+        service.schedule(outer, tree / "project")
+        service.schedule(RecordingHandler(), tree / "other")
+
+        status = service.get_status()
+        assert [root["root"] for root in status["roots"]] == [str(tree / "other"), str(tree / "project")]
+        assert status["registrations"] == 3
+        assert status["roots"][1]["handlers"] == 2
+        assert status["observer_running"]
+
+    def test_removing_the_parent_restores_the_child_watch(self, service, tree):
+        outer, inner = RecordingHandler(), RecordingHandler()
+        service.schedule(outer, tree / "project")
+        service.schedule(inner, tree / "project" / "sub")
+
+        service.unschedule(outer, tree / "project")
+
+        assert [root["root"] for root in service.get_status()["roots"]] == [str(tree / "project" / "sub")]
+
+    def test_registrations_are_reference_counted(self, service, tree):
+        handler = RecordingHandler()
+        service.schedule(handler, tree / "project")
+        service.schedule(handler, str(tree / "project" / "sub" / ".."))
+
+        assert service.unschedule(handler, tree / "project")
+        assert service.get_status()["scheduled_watches"] == 1
+        assert service.unschedule(handler, tree / "project")
+        assert service.get_status()["scheduled_watches"] == 0
+        assert not service.unschedule(handler, tree / "project")
+
+    def test_events_reach_only_handlers_whose_root_contains_them(self, service, tree):
+        project, sub, other = RecordingHandler(), RecordingHandler(), RecordingHandler()
+        flat = RecordingHandler()
+        service.schedule(project, tree / "project")
+        service.schedule(sub, tree / "project" / "sub")
+        service.schedule(other, tree / "other")
+        service.schedule(flat, tree / "project", recursive=False)
+
+        service._dispatch(FileCreatedEvent(str(tree / "project" / "sub" / "a.md")))
+        service._dispatch(FileCreatedEvent(str(tree / "project" / "b.md")))
+
+        assert len(project.paths) == 2 and len(sub.paths) == 1 and other.paths == []
+        assert flat.paths == [str(tree / "project" / "b.md")]
+        assert service.get_status()["events_dispatched"] == 2
+
+    def test_moves_reach_both_source_and_destination_roots(self, service, tree):
+        project, other = RecordingHandler(), RecordingHandler()
+        service.schedule(project, tree / "project")
+        service.schedule(other, tree / "other")
+
+        service._dispatch(FileMovedEvent(str(tree / "project" / "a.md"), str(tree / "other" / "a.md")))
+
+        assert len(project.paths) == 1 and len(other.paths) == 1
+
+    def test_failing_handler_does_not_block_the_others(self, service, tree):
+        healthy = RecordingHandler()
+        service.schedule(RecordingHandler(fail=True), tree / "project")
+        service.schedule(healthy, tree / "project")
+
+        service._dispatch(FileCreatedEvent(str(tree / "project" / "a.md")))
+
+        assert healthy.paths == [str(tree / "project" / "a.md")]
+
+    def test_file_system_events_are_delivered(self, service, tree):
+        handler = RecordingHandler()
+        service.schedule(handler, tree / "project")
+
+        (tree / "project" / "sub" / "new.md").write_text("# new\n", encoding="utf-8")
+
+        wait_for(lambda: str(tree / "project" / "sub" / "new.md") in handler.paths)
+
+    def test_shutdown_stops_the_observer(self, service, tree):
+        service.schedule(RecordingHandler(), tree / "project")
+
+        service.shutdown()
+
+        status = service.get_status()
+        assert not status["observer_running"] and status["registrations"] == 0